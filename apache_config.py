@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Apache httpd configuration parser
+Builds a section-aware AST (<VirtualHost>, <Directory>, <IfModule>, ...) for
+the main configuration file and everything it pulls in through Include and
+IncludeOptional, so rules see directives in conf.d/, sites-enabled/ and other
+included files instead of only httpd.conf.
+
+The parsed tree is built once per scan: repeated loads in the same process are
+served from memory, and separate check processes share an on-disk cache that
+is invalidated when any parsed file or include directory changes (mtime/size).
+
+Usage:
+    python3 apache_config.py --dump
+    python3 apache_config.py --directive KeepAlive --directive MaxKeepAliveRequests
+    python3 apache_config.py --value MaxKeepAliveRequests
+    python3 apache_config.py --files
+    python3 apache_config.py --config /etc/httpd/conf/httpd.conf --server-root /etc/httpd
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('STIG_CACHE_DIR', Path.home() / '.cache' / 'stig-checks'))
+
+CONTROL_BINARIES = ('apachectl', 'apache2ctl', 'httpd')
+
+# Conditional sections are transparent when resolving server-level values
+CONDITIONAL_SECTIONS = {'ifmodule', 'ifdefine', 'ifversion', 'ifdirective', 'iffile', 'if', 'elseif', 'else'}
+
+VARIABLE_RE = re.compile(r'\$\{([A-Za-z0-9_.:-]+)\}')
+
+
+class ApacheDirective:
+    """A single directive with its arguments and source location"""
+
+    def __init__(self, name, args, file, line):
+        self.name = name
+        self.args = args
+        self.file = file
+        self.line = line
+
+    @property
+    def value(self):
+        return ' '.join(self.args)
+
+    def to_dict(self):
+        return {'name': self.name, 'args': self.args, 'file': self.file, 'line': self.line}
+
+    def __repr__(self):
+        return f"ApacheDirective({self.name!r}, {self.args!r}, {self.file}:{self.line})"
+
+
+class ApacheSection(ApacheDirective):
+    """A <Section args> ... </Section> block"""
+
+    def __init__(self, name, args, file, line, children=None):
+        super().__init__(name, args, file, line)
+        self.children = children if children is not None else []
+
+    def to_dict(self):
+        node = super().to_dict()
+        node['children'] = [child.to_dict() for child in self.children]
+        return node
+
+    def __repr__(self):
+        return f"ApacheSection({self.name!r}, {self.args!r}, children={len(self.children)})"
+
+
+def node_from_dict(data):
+    """Rebuild an AST node from its cached dict form"""
+    if 'children' in data:
+        return ApacheSection(data['name'], data['args'], data['file'], data['line'],
+                             [node_from_dict(child) for child in data['children']])
+    return ApacheDirective(data['name'], data['args'], data['file'], data['line'])
+
+
+def split_args(text):
+    """Split directive arguments the way httpd does (quotes, backslash escapes)"""
+    args = []
+    i = 0
+    length = len(text)
+    while i < length:
+        while i < length and text[i].isspace():
+            i += 1
+        if i >= length:
+            break
+        if text[i] in '"\'':
+            quote = text[i]
+            i += 1
+            word = []
+            while i < length and text[i] != quote:
+                if text[i] == '\\' and i + 1 < length and text[i + 1] in (quote, '\\'):
+                    i += 1
+                word.append(text[i])
+                i += 1
+            i += 1
+            args.append(''.join(word))
+        else:
+            start = i
+            while i < length and not text[i].isspace():
+                i += 1
+            args.append(text[start:i])
+    return args
+
+
+class ApacheConfig:
+    """Parsed Apache configuration tree with query helpers"""
+
+    def __init__(self, root, server_root, config_file, inputs=None, errors=None):
+        self.root = root
+        self.server_root = server_root
+        self.config_file = config_file
+        self.inputs = inputs or {}
+        self.errors = errors or []
+
+    @property
+    def files(self):
+        """Configuration files that were parsed, in include order"""
+        return [path for path, meta in self.inputs.items() if meta['type'] == 'file']
+
+    def walk(self, node=None, ancestors=()):
+        """Yield (directive, ancestor sections) for every node depth first"""
+        node = node or self.root
+        for child in node.children:
+            yield child, ancestors
+            if isinstance(child, ApacheSection):
+                yield from self.walk(child, ancestors + (child,))
+
+    def find(self, name):
+        """Return (directive, ancestors) for all directives/sections named name"""
+        name = name.lower()
+        return [(d, a) for d, a in self.walk() if d.name.lower() == name]
+
+    def directives(self, name):
+        """Return all directives named name, wherever they appear"""
+        return [d for d, _ in self.find(name) if not isinstance(d, ApacheSection)]
+
+    def sections(self, name):
+        """Return all sections named name (e.g. 'VirtualHost')"""
+        return [d for d, _ in self.find(name) if isinstance(d, ApacheSection)]
+
+    def server_directives(self, name, node=None):
+        """Directives in the main server context (conditionals are transparent)"""
+        node = node or self.root
+        name = name.lower()
+        found = []
+        for child in node.children:
+            if isinstance(child, ApacheSection):
+                if child.name.lower() in CONDITIONAL_SECTIONS:
+                    found.extend(self.server_directives(name, child))
+            elif child.name.lower() == name:
+                found.append(child)
+        return found
+
+    def value(self, name, default=None, node=None):
+        """Effective value of a directive in a context (last one wins)"""
+        found = self.server_directives(name, node)
+        return found[-1].value if found else default
+
+    def to_dict(self):
+        return {
+            'server_root': self.server_root,
+            'config_file': self.config_file,
+            'inputs': self.inputs,
+            'errors': self.errors,
+            'tree': self.root.to_dict(),
+        }
+
+
+class ApacheConfigParser:
+    """Parse a main config file and its Include tree into an ApacheConfig"""
+
+    def __init__(self, server_root, defines=None):
+        self.server_root = server_root
+        self.defines = dict(defines or {})
+        self.inputs = {}
+        self.errors = []
+        self.stack = []
+
+    def parse(self, config_file):
+        root = ApacheSection('ROOT', [], config_file, 0)
+        self.parse_file(self.resolve(config_file), root)
+        return ApacheConfig(root, self.server_root, config_file, self.inputs, self.errors)
+
+    def resolve(self, path):
+        """Resolve a path relative to ServerRoot"""
+        if os.path.isabs(path):
+            return os.path.normpath(path)
+        return os.path.normpath(os.path.join(self.server_root, path))
+
+    def record(self, path, kind):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self.inputs[path] = {'type': kind, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def expand(self, text):
+        """Expand ${VAR} from Define and the environment"""
+        def replace(match):
+            name = match.group(1)
+            if name in self.defines:
+                return self.defines[name]
+            return os.environ.get(name, match.group(0))
+        return VARIABLE_RE.sub(replace, text)
+
+    def logical_lines(self, path):
+        """Yield (line number, text) with continuations joined and comments dropped"""
+        with open(path, encoding='utf-8', errors='replace') as f:
+            buffer = ''
+            start = None
+            for number, raw in enumerate(f, 1):
+                line = raw.rstrip('\r\n')
+                if start is None:
+                    start = number
+                if line.endswith('\\'):
+                    buffer += line[:-1] + ' '
+                    continue
+                buffer += line
+                text = buffer.strip()
+                if text and not text.startswith('#'):
+                    yield start, text
+                buffer = ''
+                start = None
+            if buffer.strip() and not buffer.strip().startswith('#'):
+                yield start, buffer.strip()
+
+    def parse_file(self, path, parent):
+        """Parse one file, appending its nodes to parent"""
+        if path in self.stack:
+            self.errors.append(f"Include loop: {' -> '.join(self.stack + [path])}")
+            return
+        self.record(path, 'file')
+        self.stack.append(path)
+
+        sections = [parent]
+        try:
+            for number, text in self.logical_lines(path):
+                text = self.expand(text)
+                current = sections[-1]
+
+                if text.startswith('</'):
+                    name = text[2:].rstrip('>').strip()
+                    if len(sections) == 1 or sections[-1].name.lower() != name.lower():
+                        self.errors.append(f"{path}:{number}: unexpected </{name}>")
+                        continue
+                    sections.pop()
+                    continue
+
+                if text.startswith('<'):
+                    body = text[1:]
+                    if body.endswith('>'):
+                        body = body[:-1]
+                    parts = body.split(None, 1)
+                    section = ApacheSection(parts[0], split_args(parts[1]) if len(parts) > 1 else [],
+                                            path, number)
+                    current.children.append(section)
+                    sections.append(section)
+                    continue
+
+                parts = text.split(None, 1)
+                directive = ApacheDirective(parts[0], split_args(parts[1]) if len(parts) > 1 else [],
+                                            path, number)
+                keyword = directive.name.lower()
+
+                if keyword == 'serverroot' and directive.args:
+                    self.server_root = directive.args[0]
+                elif keyword == 'define' and directive.args:
+                    self.defines[directive.args[0]] = directive.args[1] if len(directive.args) > 1 else ''
+
+                current.children.append(directive)
+
+                if keyword in ('include', 'includeoptional') and directive.args:
+                    self.include(directive.args[0], current, optional=keyword == 'includeoptional',
+                                 origin=f"{path}:{number}")
+        except OSError as e:
+            self.errors.append(f"{path}: {e}")
+        finally:
+            self.stack.pop()
+
+        if len(sections) > 1:
+            self.errors.append(f"{path}: unclosed <{sections[-1].name}> from line {sections[-1].line}")
+
+    def include(self, pattern, parent, optional, origin):
+        """Resolve an Include/IncludeOptional pattern and parse the matches in place"""
+        pattern = self.resolve(pattern)
+
+        if os.path.isdir(pattern):
+            self.record(pattern, 'dir')
+            matches = []
+            for dirpath, dirnames, filenames in os.walk(pattern):
+                dirnames.sort()
+                self.record(dirpath, 'dir')
+                matches.extend(os.path.join(dirpath, name) for name in sorted(filenames))
+        else:
+            # Track the directory being globbed so new files invalidate the cache
+            self.record(os.path.dirname(pattern), 'dir')
+            matches = sorted(p for p in glob.glob(pattern) if os.path.isfile(p))
+
+        if not matches and not optional and not glob.has_magic(pattern):
+            self.errors.append(f"{origin}: Include target not found: {pattern}")
+
+        for match in matches:
+            self.parse_file(os.path.normpath(match), parent)
+
+
+def find_server_config():
+    """Locate HTTPD_ROOT and the main config file from the cached -V facts"""
+    import apache_facts  # deferred: apache_facts builds on this module
+
+    facts = apache_facts.get_apache_facts()
+    if facts is None:
+        return None, None
+    return facts.server_root, facts.config_file
+
+
+def inputs_unchanged(inputs):
+    """True if every recorded file and directory still has the same mtime/size"""
+    for path, meta in inputs.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns != meta['mtime_ns'] or stat.st_size != meta['size']:
+            return False
+    return True
+
+
+def cache_path(cache_dir, server_root, config_file, defines=None):
+    key = f"{server_root}\0{config_file}\0{json.dumps(defines or {}, sort_keys=True)}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"apache-config-{digest}.json"
+
+
+_loaded = {}
+
+
+def load_apache_config(config_file=None, server_root=None, cache_dir=DEFAULT_CACHE_DIR, use_cache=True,
+                       defines=None):
+    """
+    Return the parsed ApacheConfig for an instance.
+
+    Args:
+        config_file: Main configuration file (default: from '-V')
+        server_root: ServerRoot for relative paths (default: HTTPD_ROOT from '-V')
+        cache_dir: Directory for the shared on-disk cache
+        use_cache: Reuse cached trees when none of the inputs changed
+        defines: Variables predefined for ${VAR} expansion (e.g. OHS COMPONENT_NAME)
+
+    Returns:
+        ApacheConfig, or None if no configuration could be located
+    """
+    if not config_file or not server_root:
+        httpd_root, server_config = find_server_config()
+        config_file = config_file or server_config
+        server_root = server_root or httpd_root or (os.path.dirname(config_file) if config_file else None)
+    if not config_file or not os.path.isfile(config_file):
+        return None
+
+    key = (server_root, config_file, tuple(sorted((defines or {}).items())))
+    if use_cache and key in _loaded and inputs_unchanged(_loaded[key].inputs):
+        return _loaded[key]
+
+    path = cache_path(cache_dir, server_root, config_file, defines)
+    if use_cache:
+        try:
+            data = json.loads(path.read_text())
+            if data.get('version') == CACHE_VERSION and inputs_unchanged(data['inputs']):
+                config = ApacheConfig(node_from_dict(data['tree']), data['server_root'],
+                                      data['config_file'], data['inputs'], data['errors'])
+                _loaded[key] = config
+                return config
+        except (OSError, ValueError, KeyError):
+            pass
+
+    config = ApacheConfigParser(server_root, defines).parse(config_file)
+    _loaded[key] = config
+
+    if use_cache:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = config.to_dict()
+            data['version'] = CACHE_VERSION
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(data))
+            os.replace(str(tmp), str(path))
+        except OSError:
+            pass
+
+    return config
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Parse the Apache configuration tree (Include/IncludeOptional resolved)',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--config', help='Main configuration file (default: from apachectl -V)')
+    parser.add_argument('--server-root', help='ServerRoot (default: HTTPD_ROOT from apachectl -V)')
+    parser.add_argument('--directive', action='append', default=[],
+                        help='Print every occurrence of a directive (may be repeated)')
+    parser.add_argument('--value', metavar='DIRECTIVE',
+                        help='Print the effective server-level value of a directive (exit 1 if not set)')
+    parser.add_argument('--files', action='store_true', help='Print every parsed configuration file')
+    parser.add_argument('--dump', action='store_true', help='Print the parsed tree as JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the cache')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help='Cache directory')
+    args = parser.parse_args()
+
+    config = load_apache_config(args.config, args.server_root, args.cache_dir, not args.no_cache)
+    if config is None:
+        print("ERROR: Apache configuration not found (apachectl, apache2ctl, or httpd)")
+        return 3
+
+    if args.dump:
+        print(json.dumps(config.to_dict(), indent=2))
+        return 0
+
+    if args.value:
+        value = config.value(args.value)
+        if value is None:
+            return 1
+        print(value)
+        return 0
+
+    if args.files:
+        for path in config.files:
+            print(path)
+        return 0
+
+    print(f"Server root: {config.server_root}")
+    print(f"Main config: {config.config_file}")
+    print(f"Files parsed: {len(config.files)}")
+    for error in config.errors:
+        print(f"WARNING: {error}")
+
+    for name in args.directive:
+        print()
+        print(f"{name}:")
+        matches = config.find(name)
+        if not matches:
+            print("    (not set)")
+        for directive, ancestors in matches:
+            context = ' > '.join(f"<{a.name}{' ' + a.value if a.args else ''}>" for a in ancestors) or 'server'
+            print(f"    {directive.value:<40} [{context}] {directive.file}:{directive.line}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
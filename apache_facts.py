@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Apache httpd runtime facts
+Runs '-V' (compiled settings) and '-M' (loaded modules) once per Apache
+instance and shares the answers with every Apache check, so individual rules
+no longer fork apachectl/httpd and reload the full configuration.
+
+Facts are cached on disk per instance (binary + ServerRoot + config file) and
+stay valid until the binary or any file of the parsed configuration tree
+changes. Multi-instance hosts are handled by discovering every running httpd
+master process and its -d/-f arguments.
+
+Usage:
+    python3 apache_facts.py                    # summary of the default instance
+    python3 apache_facts.py --all-instances    # every running instance
+    python3 apache_facts.py --modules          # 'httpd -M' style module list
+    eval "$(python3 apache_facts.py --shell)"  # HTTPD_ROOT, SERVER_CONFIG, HTTPD_CONF, APACHE_MODULES
+    python3 apache_facts.py --shell --config /etc/httpd-b/conf/httpd.conf
+    python3 apache_facts.py --shell --all-instances   # plus APACHE_INSTANCES and HTTPD_ROOT_1, ...
+
+--binary, --server-root and --config default to $STIG_APACHE_BINARY,
+$STIG_APACHE_SERVER_ROOT and $STIG_APACHE_CONFIG, so the check scripts (which
+run 'apache_facts.py --shell') can be pointed at one instance of a
+multi-instance host without passing arguments through.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import apache_config
+
+CACHE_VERSION = 1
+
+CONTROL_BINARIES = apache_config.CONTROL_BINARIES
+
+# Process names of Apache master processes
+SERVER_PROCESS_NAMES = ('httpd', 'apache2', 'httpd.worker', 'httpd.event', 'httpd.exe')
+
+
+class ApacheFacts:
+    """Compiled settings and loaded modules of one Apache instance"""
+
+    def __init__(self, binary, server_root=None, config_arg=None, settings=None,
+                 modules=None, version=None, mpm=None, errors=None, inputs=None):
+        self.binary = binary
+        self.server_root_arg = server_root
+        self.config_arg = config_arg
+        self.settings = settings or {}
+        self.modules = modules or {}
+        self.version = version
+        self.mpm = mpm
+        self.errors = errors or []
+        self.inputs = inputs or {}
+
+    @property
+    def server_root(self):
+        return self.server_root_arg or self.settings.get('HTTPD_ROOT')
+
+    @property
+    def config_file(self):
+        config = self.config_arg or self.settings.get('SERVER_CONFIG_FILE')
+        if not config:
+            return None
+        return os.path.join(self.server_root or '', config)
+
+    def has_module(self, name):
+        """True if a module is loaded; accepts ssl_module, mod_ssl or mod_ssl.c"""
+        name = name.strip().lower()
+        if name.endswith('.c'):
+            name = name[:-2]
+        if name.startswith('mod_'):
+            name = name[4:] + '_module'
+        return name in self.modules
+
+    def to_dict(self):
+        return {
+            'binary': self.binary,
+            'server_root': self.server_root_arg,
+            'config_arg': self.config_arg,
+            'settings': self.settings,
+            'modules': self.modules,
+            'version': self.version,
+            'mpm': self.mpm,
+            'errors': self.errors,
+            'inputs': self.inputs,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['binary'], data['server_root'], data['config_arg'], data['settings'],
+                   data['modules'], data['version'], data['mpm'], data['errors'], data['inputs'])
+
+
+def instance_args(server_root=None, config_file=None):
+    """Command-line arguments selecting an instance"""
+    args = []
+    if server_root:
+        args += ['-d', server_root]
+    if config_file:
+        args += ['-f', config_file]
+    return args
+
+
+def run_binary(binary, args, env=None):
+    """Run an Apache binary; returns (exit code, output)"""
+    try:
+        result = subprocess.run([binary] + args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True, timeout=60, env=env)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return None, str(e)
+    return result.returncode, result.stdout
+
+
+def parse_compiled_settings(output):
+    """Parse '-V' output into (settings, version, mpm)"""
+    settings = {}
+    for name, value in re.findall(r'-D\s+(\w+)(?:="([^"]*)")?', output):
+        settings[name] = value
+    version = re.search(r'Server version:\s*(.+)', output)
+    mpm = re.search(r'Server MPM:\s*(\S+)', output)
+    return settings, version.group(1).strip() if version else None, mpm.group(1) if mpm else None
+
+
+def parse_loaded_modules(output):
+    """Parse '-M' output into {module_name: 'static'|'shared'}"""
+    return {name: kind for name, kind in re.findall(r'^\s*(\w+_module)\s+\((static|shared)\)', output, re.M)}
+
+
+def collect_facts(binary, server_root=None, config_file=None, env=None):
+    """Run -V and -M for one instance"""
+    args = instance_args(server_root, config_file)
+    facts = ApacheFacts(binary, server_root, config_file)
+
+    code, output = run_binary(binary, args + ['-V'], env)
+    if code != 0:
+        facts.errors.append(f"{binary} -V failed: {output.strip()[:500]}")
+        return facts
+    facts.settings, facts.version, facts.mpm = parse_compiled_settings(output)
+
+    code, output = run_binary(binary, args + ['-M'], env)
+    facts.modules = parse_loaded_modules(output or '')
+    if code != 0 and not facts.modules:
+        facts.errors.append(f"{binary} -M failed: {output.strip()[:500]}")
+
+    return facts
+
+
+def stat_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'type': 'file', 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def cache_path(cache_dir, binary, server_root, config_file):
+    digest = hashlib.sha1(f"{binary}\0{server_root}\0{config_file}".encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"apache-facts-{digest}.json"
+
+
+_loaded = {}
+
+
+def default_binary():
+    """First available Apache control binary"""
+    for binary in CONTROL_BINARIES:
+        path = shutil.which(binary)
+        if path:
+            return path
+    return None
+
+
+def get_apache_facts(binary=None, server_root=None, config_file=None, env=None,
+                     cache_dir=apache_config.DEFAULT_CACHE_DIR, use_cache=True):
+    """
+    Return ApacheFacts for an instance, running -V/-M only when not cached.
+
+    Args:
+        binary: httpd/apachectl binary (default: first of apachectl, apache2ctl, httpd)
+        server_root: -d argument for multi-instance hosts
+        config_file: -f argument for multi-instance hosts
+        env: Environment for the binary (Debian apache2 needs APACHE_* variables)
+        cache_dir: Directory for the shared on-disk cache
+        use_cache: Reuse cached facts while binary and configuration are unchanged
+
+    Returns:
+        ApacheFacts, or None if no Apache binary is available
+    """
+    binary = binary or default_binary()
+    if not binary:
+        return None
+
+    key = (binary, server_root, config_file)
+    if use_cache and key in _loaded:
+        return _loaded[key]
+
+    path = cache_path(cache_dir, binary, server_root, config_file)
+    if use_cache:
+        try:
+            data = json.loads(path.read_text())
+            if data.get('version') == CACHE_VERSION and apache_config.inputs_unchanged(data['facts']['inputs']):
+                facts = ApacheFacts.from_dict(data['facts'])
+                _loaded[key] = facts
+                return facts
+        except (OSError, ValueError, KeyError):
+            pass
+
+    facts = collect_facts(binary, server_root, config_file, env)
+
+    # Loaded modules depend on LoadModule lines anywhere in the Include tree
+    binary_path = shutil.which(binary) or binary
+    facts.inputs = {}
+    signature = stat_signature(binary_path)
+    if signature:
+        facts.inputs[binary_path] = signature
+    if facts.config_file:
+        tree = apache_config.load_apache_config(facts.config_file, facts.server_root, cache_dir, use_cache)
+        if tree is not None:
+            facts.inputs.update(tree.inputs)
+
+    _loaded[key] = facts
+
+    if use_cache and not facts.errors:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'version': CACHE_VERSION, 'facts': facts.to_dict()}))
+            os.replace(str(tmp), str(path))
+        except OSError:
+            pass
+
+    return facts
+
+
+def read_proc_file(pid, name):
+    try:
+        with open(f"/proc/{pid}/{name}", 'rb') as f:
+            return f.read()
+    except OSError:
+        return b''
+
+
+def discover_instances():
+    """
+    Find running Apache master processes.
+
+    Returns:
+        list of dicts with binary, server_root, config_file and env
+    """
+    processes = {}
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        argv = [a.decode(errors='replace') for a in read_proc_file(entry, 'cmdline').split(b'\0') if a]
+        if not argv or os.path.basename(argv[0]) not in SERVER_PROCESS_NAMES:
+            continue
+        stat = read_proc_file(entry, 'stat').decode(errors='replace')
+        ppid = stat.rsplit(')', 1)[-1].split()[1] if ')' in stat else '0'
+        processes[entry] = (argv, ppid)
+
+    instances = []
+    seen = set()
+    for pid, (argv, ppid) in processes.items():
+        # Workers are children of the master; only masters define instances
+        if ppid in processes:
+            continue
+
+        server_root = config_file = None
+        i = 1
+        while i < len(argv):
+            arg = argv[i]
+            if arg in ('-d', '-f') and i + 1 < len(argv):
+                if arg == '-d':
+                    server_root = argv[i + 1]
+                else:
+                    config_file = argv[i + 1]
+                i += 2
+                continue
+            if arg.startswith('-d') and len(arg) > 2:
+                server_root = arg[2:]
+            elif arg.startswith('-f') and len(arg) > 2:
+                config_file = arg[2:]
+            i += 1
+
+        try:
+            binary = os.readlink(f"/proc/{pid}/exe")
+        except OSError:
+            binary = shutil.which(argv[0]) or argv[0]
+
+        env = None
+        environ = read_proc_file(pid, 'environ')
+        apache_env = dict(
+            item.decode(errors='replace').split('=', 1)
+            for item in environ.split(b'\0') if item.startswith(b'APACHE_') and b'=' in item
+        )
+        if apache_env:
+            env = dict(os.environ)
+            env.update(apache_env)
+            # Debian multi-instance layout: /etc/apache2-<name>/apache2.conf
+            if not config_file and 'APACHE_CONFDIR' in apache_env:
+                server_root = server_root or apache_env['APACHE_CONFDIR']
+                config_file = os.path.join(apache_env['APACHE_CONFDIR'], 'apache2.conf')
+
+        key = (binary, server_root, config_file)
+        if key in seen:
+            continue
+        seen.add(key)
+        instances.append({'binary': binary, 'server_root': server_root,
+                          'config_file': config_file, 'env': env})
+
+    return instances
+
+
+def get_all_facts(cache_dir=apache_config.DEFAULT_CACHE_DIR, use_cache=True):
+    """Facts for every running instance, or the default instance if none run"""
+    instances = discover_instances()
+    if not instances:
+        facts = get_apache_facts(cache_dir=cache_dir, use_cache=use_cache)
+        return [facts] if facts else []
+    return [
+        get_apache_facts(i['binary'], i['server_root'], i['config_file'], i['env'], cache_dir, use_cache)
+        for i in instances
+    ]
+
+
+def shell_assignments(facts, suffix=''):
+    """Shell variable assignments for one instance (names get suffix appended)"""
+    return [
+        f"HTTPD_ROOT{suffix}={shlex.quote(facts.server_root or '')}",
+        f"SERVER_CONFIG{suffix}={shlex.quote(facts.config_arg or facts.settings.get('SERVER_CONFIG_FILE', ''))}",
+        f"HTTPD_CONF{suffix}={shlex.quote(facts.config_file or '')}",
+        f"APACHE_MODULES{suffix}={shlex.quote(' '.join(sorted(facts.modules)))}",
+    ]
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Cached Apache compiled settings (-V) and loaded modules (-M)',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--binary', default=os.environ.get('STIG_APACHE_BINARY'),
+                        help='Apache binary (default: $STIG_APACHE_BINARY, else apachectl, apache2ctl or httpd)')
+    parser.add_argument('--server-root', default=os.environ.get('STIG_APACHE_SERVER_ROOT'),
+                        help='Instance ServerRoot (-d) (default: $STIG_APACHE_SERVER_ROOT)')
+    parser.add_argument('--config', default=os.environ.get('STIG_APACHE_CONFIG'),
+                        help='Instance configuration file (-f) (default: $STIG_APACHE_CONFIG)')
+    parser.add_argument('--all-instances', action='store_true', help='Report every running instance')
+    parser.add_argument('--modules', action='store_true', help="Print loaded modules like 'httpd -M'")
+    parser.add_argument('--shell', action='store_true', help='Print shell variable assignments')
+    parser.add_argument('--json', action='store_true', help='Print facts as JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the cache')
+    parser.add_argument('--cache-dir', default=str(apache_config.DEFAULT_CACHE_DIR), help='Cache directory')
+    args = parser.parse_args()
+
+    if args.all_instances:
+        all_facts = get_all_facts(args.cache_dir, not args.no_cache)
+    else:
+        facts = get_apache_facts(args.binary, args.server_root, args.config,
+                                 cache_dir=args.cache_dir, use_cache=not args.no_cache)
+        all_facts = [facts] if facts else []
+
+    if not all_facts:
+        print("ERROR: Apache not found (apachectl, apache2ctl, or httpd)", file=sys.stderr)
+        return 3
+
+    if args.json:
+        print(json.dumps([f.to_dict() for f in all_facts], indent=2))
+        return 0
+
+    if args.shell:
+        # Unsuffixed variables describe the selected (or first) instance;
+        # --all-instances adds a numbered set per instance
+        lines = shell_assignments(all_facts[0])
+        if args.all_instances:
+            lines.append(f"APACHE_INSTANCES={len(all_facts)}")
+            for index, facts in enumerate(all_facts, 1):
+                lines.extend(shell_assignments(facts, f"_{index}"))
+        print('\n'.join(lines))
+        return 0 if all_facts[0].settings else 3
+
+    if args.modules:
+        facts = all_facts[0]
+        if not facts.modules:
+            return 3
+        print("Loaded Modules:")
+        for name, kind in sorted(facts.modules.items()):
+            print(f" {name} ({kind})")
+        return 0
+
+    for facts in all_facts:
+        print("=" * 80)
+        print(f"Binary:      {facts.binary}")
+        print(f"Version:     {facts.version or 'unknown'}")
+        print(f"MPM:         {facts.mpm or 'unknown'}")
+        print(f"ServerRoot:  {facts.server_root or 'unknown'}")
+        print(f"Config file: {facts.config_file or 'unknown'}")
+        print(f"Modules:     {len(facts.modules)} loaded")
+        for error in facts.errors:
+            print(f"WARNING: {error}")
+    print("=" * 80)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,684 @@
+#!/usr/bin/env python3
+"""
+Per-VirtualHost Apache Site STIG evaluation
+Builds a VirtualHost index from the parsed Apache configuration
+(apache_config.py) and evaluates every Site STIG rule once per site on a
+worker pool. Each site sees the server-level configuration it inherits plus
+its own overrides, <IfModule> blocks are resolved against the loaded modules
+(apache_facts.py), and results are written per site (with --results-db, to
+the scan result database instead of one JSON file per rule).
+
+Supported benchmarks (rule metadata comes from the *_checks.json files):
+    apache_2.4_unix_site, apache_2.4_windows_site,
+    apache_2.2_unix_site, apache_2.2_windows_site
+
+Usage:
+    python3 apache_site_scan.py --stig apache_2.4_unix_site
+    python3 apache_site_scan.py --stig apache_2.2_unix_site --config /etc/httpd/conf/httpd.conf \\
+        --server-root /etc/httpd --workers 8 --output-dir results/apache_site
+    python3 apache_site_scan.py --stig apache_2.4_unix_site --results-db scan_results.db
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import apache_config
+import apache_facts
+import scan_results
+
+BASE_DIR = Path(__file__).parent
+
+SHELL_EXTENSIONS = ('.exe', '.dll', '.com', '.bat', '.csh', '.sh', '.cmd', '.ps1')
+
+LEGACY_PROTOCOLS = ('SSLv2', 'SSLv3', 'TLSv1', 'TLSv1.1')
+ALL_PROTOCOLS = ('SSLv3', 'TLSv1', 'TLSv1.1', 'TLSv1.2', 'TLSv1.3')
+
+REQUIRED_LOG_FIELDS = ('%a', '%A', '%h', '%H', '%l', '%m', '%s', '%t', '%u', '%U', '%{Referer}i')
+
+# LogLevel values at or above the STIG threshold of 'warn'
+ACCEPTED_LOG_LEVELS = ('warn', 'error', 'crit', 'alert', 'emerg')
+
+MAX_MISSING_REPORTED = 20
+
+
+class SiteContext:
+    """One VirtualHost (or the main server) with inherited configuration"""
+
+    def __init__(self, name, vhost, config, facts):
+        self.name = name
+        self.vhost = vhost
+        self.config = config
+        self.facts = facts
+
+    @property
+    def addresses(self):
+        return self.vhost.args if self.vhost is not None else []
+
+    @property
+    def location(self):
+        node = self.vhost if self.vhost is not None else self.config.root
+        return f"{node.file}:{node.line}"
+
+    def include_section(self, section):
+        """Resolve conditional sections against the loaded modules"""
+        if section.name.lower() != 'ifmodule' or not section.args or not loaded_modules(self):
+            return True
+        module = section.args[0]
+        negate = module.startswith('!')
+        present = module_loaded(self, module.lstrip('!'))
+        return present != negate
+
+    def collect(self, node, name=None, kind=None):
+        """Directives (or sections of a kind) directly in a context, through conditionals"""
+        found = []
+        for child in node.children:
+            if isinstance(child, apache_config.ApacheSection):
+                lowered = child.name.lower()
+                if lowered in apache_config.CONDITIONAL_SECTIONS:
+                    if self.include_section(child):
+                        found.extend(self.collect(child, name, kind))
+                elif kind and lowered == kind:
+                    found.append(child)
+            elif name and child.name.lower() == name:
+                found.append(child)
+        return found
+
+    def values(self, name):
+        """Server-level then VirtualHost-level occurrences (inheritance order)"""
+        name = name.lower()
+        found = self.collect(self.config.root, name=name)
+        if self.vhost is not None:
+            found.extend(self.collect(self.vhost, name=name))
+        return found
+
+    def value(self, name, default=None):
+        """Effective value: the VirtualHost overrides the server level"""
+        found = self.values(name)
+        return found[-1].value if found else default
+
+    def vhost_values(self, name):
+        """Occurrences set inside the VirtualHost itself"""
+        if self.vhost is None:
+            return []
+        return self.collect(self.vhost, name=name.lower())
+
+    def sections(self, kind):
+        """Server-level and VirtualHost sections of a kind (e.g. 'directory')"""
+        found = self.collect(self.config.root, kind=kind)
+        if self.vhost is not None:
+            found.extend(self.collect(self.vhost, kind=kind))
+        return found
+
+    def content_roots(self):
+        """DocumentRoot plus Alias targets served by this site"""
+        roots = []
+        document_root = self.value('DocumentRoot')
+        if document_root:
+            roots.append(self.resolve(document_root))
+        for alias in self.values('Alias'):
+            if len(alias.args) >= 2:
+                roots.append(self.resolve(alias.args[1]))
+        return roots
+
+    def resolve(self, path):
+        if os.path.isabs(path) or not self.config.server_root:
+            return path
+        return os.path.join(self.config.server_root, path)
+
+
+def loaded_modules(site):
+    """Loaded module names from facts, or from LoadModule lines as a fallback"""
+    if site.facts is not None and site.facts.modules:
+        return set(site.facts.modules)
+    return {d.args[0] for d in site.config.directives('LoadModule') if d.args}
+
+
+def module_loaded(site, name):
+    name = name.strip().lower()
+    if name.endswith('.c'):
+        name = name[:-2]
+    if name.startswith('mod_'):
+        name = name[4:] + '_module'
+    return name in loaded_modules(site)
+
+
+def missing_modules(site, *names):
+    return [name for name in names if not module_loaded(site, name)]
+
+
+def ssl_enabled(site):
+    return (site.value('SSLEngine') or '').lower() == 'on'
+
+
+def enabled_protocols(spec):
+    """Evaluate an SSLProtocol argument list into the set of enabled protocols"""
+    enabled = set()
+    for token in spec.split():
+        sign = token[0] if token[0] in '+-' else ''
+        name = token.lstrip('+-')
+        names = set(ALL_PROTOCOLS) if name.lower() == 'all' else {name}
+        if sign == '-':
+            enabled -= names
+        elif sign == '+':
+            enabled |= names
+        else:
+            enabled = set(names)
+    return enabled
+
+
+################################################################################
+# RULE EVALUATORS
+################################################################################
+
+def require_modules(*names):
+    def check(site):
+        missing = missing_modules(site, *names)
+        if missing:
+            return 'Open', f"Modules not loaded: {', '.join(missing)}"
+        return 'NotAFinding', f"Modules loaded: {', '.join(names)}"
+    return check
+
+
+def check_tls_protocol(site):
+    missing = missing_modules(site, 'ssl_module')
+    if missing:
+        return 'Open', 'ssl_module is not loaded'
+    if not ssl_enabled(site):
+        return 'Open', 'SSLEngine is not on for this site'
+
+    spec = site.value('SSLProtocol')
+    if not spec:
+        return 'Open', 'SSLProtocol is not set (defaults allow legacy protocols)'
+    enabled = enabled_protocols(spec)
+    legacy = sorted(p for p in enabled if p in LEGACY_PROTOCOLS)
+    if legacy or not enabled:
+        return 'Open', f"SSLProtocol {spec} enables {', '.join(legacy) or 'no protocols'}"
+    return 'NotAFinding', f"SSLProtocol {spec}"
+
+
+def check_log_format(site):
+    formats = {}
+    for directive in site.values('LogFormat'):
+        if len(directive.args) >= 2:
+            formats[directive.args[1]] = directive.args[0]
+        elif directive.args:
+            formats[''] = directive.args[0]
+
+    custom_logs = site.values('CustomLog')
+    if not custom_logs:
+        return 'Open', 'No CustomLog configured for this site'
+
+    problems = []
+    for log in custom_logs:
+        if len(log.args) < 2:
+            continue
+        fmt = log.args[1]
+        fmt = formats.get(fmt, fmt) if '%' not in fmt else fmt
+        missing = [field for field in REQUIRED_LOG_FIELDS if field not in fmt]
+        if missing:
+            problems.append(f"CustomLog {log.args[0]} missing {' '.join(missing)}")
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', f"{len(custom_logs)} CustomLog(s) record all required fields"
+
+
+def check_shell_handlers(site):
+    offending = []
+    for name in ('AddHandler', 'Action', 'AddType'):
+        for directive in site.values(name):
+            if any(arg.lower().endswith(SHELL_EXTENSIONS) for arg in directive.args[1:]):
+                offending.append(f"{name} {directive.value} ({directive.file}:{directive.line})")
+    if offending:
+        return 'Open', 'Shell/executable mappings: ' + '; '.join(offending)
+    return 'NotAFinding', 'No Action/AddHandler mappings to shells or executables'
+
+
+def check_script_mappings(site):
+    mappings = []
+    for name in ('ScriptAlias', 'ScriptAliasMatch', 'Script', 'ScriptInterpreterSource'):
+        mappings.extend(f"{name} {d.value}" for d in site.values(name))
+    mappings.extend(f"AddHandler {d.value}" for d in site.values('AddHandler') if 'cgi-script' in d.value)
+    if not mappings:
+        return 'NotAFinding', 'No script mappings configured'
+    return 'Not_Reviewed', 'Verify each script mapping is required: ' + '; '.join(mappings)
+
+
+def check_vhost_address(site):
+    if site.vhost is None:
+        return check_listen(site)
+    problems = []
+    for address in site.addresses:
+        host, _, port = address.rpartition(':')
+        if not host or not port or host in ('*', '_default_', '0.0.0.0', '[::]'):
+            problems.append(address)
+    if problems:
+        return 'Open', f"VirtualHost address lacks a specific IP and port: {' '.join(problems)}"
+    return 'NotAFinding', f"VirtualHost {' '.join(site.addresses)}"
+
+
+def check_listen(site):
+    listens = site.values('Listen')
+    if not listens:
+        return 'Open', 'No Listen directive'
+    problems = []
+    for listen in listens:
+        address = listen.args[0] if listen.args else ''
+        host, _, port = address.rpartition(':')
+        if not host or not port or host.strip('[]') in ('0.0.0.0', '::', '::ffff:0.0.0.0', '*'):
+            problems.append(address)
+    if problems:
+        return 'Open', f"Listen without specific IP and port: {' '.join(problems)}"
+    return 'NotAFinding', 'Listen ' + ', '.join(l.value for l in listens)
+
+
+def check_cookie_header(site):
+    for header in site.values('Header'):
+        text = header.value.lower()
+        if 'set-cookie' in text and 'httponly' in text and 'secure' in text:
+            return 'NotAFinding', f"Header {header.value}"
+    return 'Open', 'No Header directive adds HttpOnly and secure to Set-Cookie'
+
+
+def check_default_documents(site):
+    roots = [root for root in site.content_roots() if os.path.isdir(root)]
+    if not roots:
+        return 'Not_Reviewed', 'DocumentRoot not found on this host'
+
+    index_files = []
+    for directive in site.values('DirectoryIndex'):
+        index_files = [arg for arg in directive.args if arg.lower() != 'disabled']
+    index_files = index_files or ['index.html']
+
+    missing = []
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            if not any(name in filenames for name in index_files):
+                missing.append(dirpath)
+    if missing:
+        shown = missing[:MAX_MISSING_REPORTED]
+        more = f" (+{len(missing) - len(shown)} more)" if len(missing) > len(shown) else ''
+        return 'Open', f"Directories without {'/'.join(index_files)}: {', '.join(shown)}{more}"
+    return 'NotAFinding', f"Every directory under {', '.join(roots)} has a default document"
+
+
+def check_error_document(site):
+    documents = site.values('ErrorDocument')
+    if not documents:
+        return 'Open', 'ErrorDocument is not used'
+    return 'NotAFinding', f"{len(documents)} ErrorDocument directive(s)"
+
+
+def check_trace_enable(site):
+    nested = []
+    for kind in ('directory', 'location', 'files', 'directorymatch', 'locationmatch', 'filesmatch'):
+        for section in site.sections(kind):
+            for directive, _ in site.config.walk(section):
+                if directive.name.lower() == 'traceenable':
+                    nested.append(f"{directive.file}:{directive.line}")
+    value = (site.value('TraceEnable') or '').lower()
+    if nested:
+        return 'Open', f"TraceEnable nested in Directory/Location: {', '.join(nested)}"
+    if value != 'off':
+        return 'Open', f"TraceEnable is {value or 'not set (default On)'}"
+    return 'NotAFinding', 'TraceEnable Off'
+
+
+def session_max_age(limit, exact=False):
+    def check(site):
+        value = site.value('SessionMaxAge')
+        if value is None:
+            return 'Open', 'SessionMaxAge is not set'
+        try:
+            seconds = int(value)
+        except ValueError:
+            return 'Open', f"SessionMaxAge {value} is not a number"
+        if (exact and seconds != limit) or seconds > limit or seconds <= 0:
+            return 'Open', f"SessionMaxAge {seconds} (required: {'' if exact else '<= '}{limit})"
+        return 'NotAFinding', f"SessionMaxAge {seconds}"
+    return check
+
+
+def check_request_timeout(site):
+    if missing_modules(site, 'reqtimeout_module'):
+        return 'Open', 'reqtimeout_module is not loaded'
+    value = site.value('RequestReadTimeout')
+    if not value:
+        return 'Open', 'RequestReadTimeout is not explicitly configured'
+    return 'NotAFinding', f"RequestReadTimeout {value}"
+
+
+def ssl_compression(missing_is_finding):
+    def check(site):
+        value = site.value('SSLCompression')
+        if value is None:
+            if missing_is_finding:
+                return 'Open', 'SSLCompression is not set'
+            return 'NotAFinding', 'SSLCompression not set (default off)'
+        if value.lower() != 'off':
+            return 'Open', f"SSLCompression {value}"
+        return 'NotAFinding', 'SSLCompression off'
+    return check
+
+
+def check_session_cookie(site):
+    if missing_modules(site, 'session_cookie_module'):
+        return 'Open', 'session_cookie_module is not loaded'
+    session = (site.value('Session') or '').lower()
+    cookie = (site.value('SessionCookieName') or '').lower()
+    if session == 'on' and 'httponly' in cookie and 'secure' in cookie:
+        return 'NotAFinding', f"Session on; SessionCookieName {site.value('SessionCookieName')}"
+    return 'Open', f"Session {session or 'not set'}; SessionCookieName {cookie or 'not set'}"
+
+
+def check_timeout(site):
+    value = site.value('Timeout')
+    if value is None:
+        return 'Open', 'Timeout is not set'
+    if not value.isdigit() or int(value) > 60:
+        return 'Open', f"Timeout {value} (required: <= 60)"
+    return 'NotAFinding', f"Timeout {value}"
+
+
+def check_keepalive_requests(site):
+    value = site.value('MaxKeepAliveRequests')
+    if value is None:
+        return 'Open', 'MaxKeepAliveRequests is not set'
+    if not value.isdigit() or (int(value) < 100 and int(value) != 0):
+        return 'Open', f"MaxKeepAliveRequests {value} (required: >= 100)"
+    return 'NotAFinding', f"MaxKeepAliveRequests {value}"
+
+
+def require_directive(name):
+    def check(site):
+        found = site.values(name)
+        if not found:
+            return 'Open', f"{name} is not set for this site"
+        return 'NotAFinding', f"{name} {found[-1].value}"
+    return check
+
+
+def check_log_level(site):
+    value = site.value('LogLevel')
+    if value is None:
+        return 'Open', 'LogLevel is not set'
+    level = value.split()[0].split(':')[-1].lower()
+    if level not in ACCEPTED_LOG_LEVELS:
+        return 'Open', f"LogLevel {value} (required: warn or higher threshold)"
+    return 'NotAFinding', f"LogLevel {value}"
+
+
+def check_follow_symlinks(site):
+    offending = []
+    for section in site.sections('directory'):
+        for options in site.collect(section, name='options'):
+            words = [w.lower() for w in options.args]
+            if 'followsymlinks' in words or '+followsymlinks' in words or 'all' in words:
+                offending.append(f"<Directory {section.value}> Options {options.value}")
+    if offending:
+        return 'Open', '; '.join(offending)
+    return 'NotAFinding', 'No Directory enables FollowSymLinks'
+
+
+def check_robots_txt(site):
+    roots = site.content_roots()
+    found = [os.path.join(root, 'robots.txt') for root in roots
+             if os.path.isfile(os.path.join(root, 'robots.txt'))]
+    if found:
+        return 'Open', f"robots.txt present: {', '.join(found)}"
+    return 'NotAFinding', f"No robots.txt in {', '.join(roots) or 'content roots'}"
+
+
+APACHE_24_UNIX_RULES = {
+    'AS24-U2-000020': require_modules('session_module', 'usertrack_module'),
+    'AS24-U2-000030': check_tls_protocol,
+    'AS24-U2-000090': check_log_format,
+    'AS24-U2-000300': check_shell_handlers,
+    'AS24-U2-000310': check_shell_handlers,
+    'AS24-U2-000320': check_shell_handlers,
+    'AS24-U2-000360': check_vhost_address,
+    'AS24-U2-000470': check_cookie_header,
+    'AS24-U2-000590': check_timeout,
+    'AS24-U2-000620': check_default_documents,
+    'AS24-U2-000630': check_error_document,
+    'AS24-U2-000640': check_trace_enable,
+    'AS24-U2-000650': session_max_age(600, exact=True),
+    'AS24-U2-000660': require_modules('reqtimeout_module'),
+    'AS24-U2-000870': ssl_compression(missing_is_finding=True),
+    'AS24-U2-000890': check_session_cookie,
+}
+
+APACHE_24_WINDOWS_RULES = {
+    'AS24-W2-000010': check_keepalive_requests,
+    'AS24-W2-000020': require_modules('session_module'),
+    'AS24-W2-000090': check_log_format,
+    'AS24-W2-000300': check_shell_handlers,
+    'AS24-W2-000310': check_script_mappings,
+    'AS24-W2-000360': check_listen,
+    'AS24-W2-000470': check_cookie_header,
+    'AS24-W2-000610': check_default_documents,
+    'AS24-W2-000620': check_error_document,
+    'AS24-W2-000630': check_trace_enable,
+    'AS24-W2-000640': session_max_age(600),
+    'AS24-W2-000650': check_request_timeout,
+    'AS24-W2-000860': ssl_compression(missing_is_finding=False),
+    'AS24-W2-000870': check_session_cookie,
+    'AS24-W2-000880': require_modules('session_crypto_module'),
+    'AS24-W2-000890': check_tls_protocol,
+}
+
+APACHE_22_RULES = {
+    'WG110': check_keepalive_requests,
+    'WG170': check_default_documents,
+    'WG240': require_modules('log_config_module'),
+    'WG310': check_robots_txt,
+    'WG340': check_tls_protocol,
+    'WG360': check_follow_symlinks,
+    'WA00605': require_directive('ErrorLog'),
+    'WA00612': check_log_format,
+    'WA00615': require_directive('CustomLog'),
+    'WA00620': check_log_level,
+}
+
+SITE_STIGS = {
+    'apache_2.4_unix_site': {'json': 'apache_2.4_unix_site_checks.json', 'rules': APACHE_24_UNIX_RULES},
+    'apache_2.4_windows_site': {'json': 'apache_2.4_windows_site_checks.json', 'rules': APACHE_24_WINDOWS_RULES},
+    'apache_2.2_unix_site': {'json': 'apache_2.2_unix_site_checks.json', 'rules': APACHE_22_RULES},
+    'apache_2.2_windows_site': {'json': 'apache_2.2_windows_site_checks.json', 'rules': APACHE_22_RULES},
+}
+
+
+def rule_evaluator(stig, stig_id):
+    """Find the evaluator for a STIG ID ('WG110 A22' and 'WG110 W22' share one)"""
+    rules = SITE_STIGS[stig]['rules']
+    return rules.get(stig_id) or rules.get(stig_id.split()[0])
+
+
+def load_rules(stig):
+    """Rule metadata for a Site STIG from its benchmark JSON"""
+    with open(BASE_DIR / SITE_STIGS[stig]['json']) as f:
+        checks = json.load(f)
+    return [{
+        'vuln_id': check.get('Group ID', 'UNKNOWN'),
+        'stig_id': check.get('STIG ID', 'UNKNOWN'),
+        'severity': check.get('Severity', 'medium'),
+        'rule_title': check.get('Rule Title', ''),
+    } for check in checks]
+
+
+################################################################################
+# VIRTUALHOST INDEX AND WORKER POOL
+################################################################################
+
+def build_site_index(config, facts=None):
+    """Return SiteContexts for every VirtualHost (or the main server if none)"""
+    probe = SiteContext('_main_', None, config, facts)
+    vhosts = probe.collect(config.root, kind='virtualhost')
+    if not vhosts:
+        return [probe]
+
+    sites = []
+    names = defaultdict(int)
+    for vhost in vhosts:
+        server_name = None
+        for directive in probe.collect(vhost, name='servername'):
+            server_name = directive.args[0] if directive.args else None
+        port = vhost.args[0].rpartition(':')[2] if vhost.args and ':' in vhost.args[0] else ''
+        name = server_name or (vhost.args[0] if vhost.args else 'vhost')
+        if port and not name.endswith(f":{port}"):
+            name = f"{name}:{port}"
+        names[name] += 1
+        if names[name] > 1:
+            name = f"{name}#{names[name]}"
+        sites.append(SiteContext(name, vhost, config, facts))
+    return sites
+
+
+_worker = {}
+
+
+def init_worker(config_file, server_root, facts_data, cache_dir):
+    """Load the cached configuration tree once per worker process"""
+    config = apache_config.load_apache_config(config_file, server_root, cache_dir)
+    facts = apache_facts.ApacheFacts.from_dict(facts_data) if facts_data else None
+    _worker['sites'] = build_site_index(config, facts)
+
+
+def evaluate_site(index, stig, rules):
+    """Evaluate every rule of a STIG for one site"""
+    site = _worker['sites'][index]
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    results = []
+    for rule in rules:
+        evaluator = rule_evaluator(stig, rule['stig_id'])
+        if evaluator is None:
+            status, details = 'Not_Reviewed', 'Manual review required - consult STIG documentation'
+        else:
+            try:
+                status, details = evaluator(site)
+            except Exception as e:
+                status, details = 'ERROR', f"Evaluation failed: {e}"
+        result = dict(rule)
+        result.update({
+            'site': site.name,
+            'virtualhost': ' '.join(site.addresses),
+            'defined_at': site.location,
+            'status': status,
+            'finding_details': details,
+            'timestamp': timestamp,
+        })
+        results.append(result)
+    return site.name, results
+
+
+def site_dir_name(name):
+    return re.sub(r'[^A-Za-z0-9_.#-]+', '_', name).strip('_') or 'site'
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Evaluate Apache Site STIG rules per VirtualHost',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--stig', choices=sorted(SITE_STIGS), default='apache_2.4_unix_site',
+                        help='Site STIG to evaluate (default: apache_2.4_unix_site)')
+    parser.add_argument('--config', help='Main configuration file (default: from apachectl -V)')
+    parser.add_argument('--server-root', help='ServerRoot (default: HTTPD_ROOT from apachectl -V)')
+    parser.add_argument('--binary', help='Apache binary for module facts')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default='results/apache_site', help='Directory for per-site results')
+    parser.add_argument('--cache-dir', default=str(apache_config.DEFAULT_CACHE_DIR), help='Cache directory')
+    parser.add_argument('--results-db', help='Record results in this scan result database instead of per-rule JSON')
+    parser.add_argument('--scan-id', help='Scan ID in the result database (default: a new scan)')
+    args = parser.parse_args()
+
+    facts = apache_facts.get_apache_facts(args.binary, args.server_root, args.config,
+                                          cache_dir=args.cache_dir)
+    config_file = args.config or (facts.config_file if facts else None)
+    server_root = args.server_root or (facts.server_root if facts else None)
+
+    config = apache_config.load_apache_config(config_file, server_root, args.cache_dir)
+    if config is None:
+        print("ERROR: Apache configuration not found (use --config/--server-root)")
+        return 3
+
+    sites = build_site_index(config, facts)
+    rules = load_rules(args.stig)
+    automated = sum(1 for r in rules if rule_evaluator(args.stig, r['stig_id']))
+
+    print("=" * 80)
+    print(f"Apache Site STIG Evaluation: {args.stig}")
+    print("=" * 80)
+    print(f"Configuration: {config.config_file} ({len(config.files)} files)")
+    print(f"Sites: {len(sites)}")
+    print(f"Rules: {len(rules)} ({automated} automated)")
+    print(f"Workers: {args.workers}")
+    print()
+
+    output_root = Path(args.output_dir)
+    facts_data = facts.to_dict() if facts else None
+    totals = defaultdict(int)
+    summary = []
+
+    store = writer = None
+    if args.results_db:
+        try:
+            store, writer = scan_results.open_writer(args.results_db, 'apache_site', args.scan_id,
+                                                     {'stig': args.stig, 'config_file': config.config_file})
+        except scan_results.ResultStoreError as e:
+            print(f"ERROR: {e}")
+            return 3
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=init_worker,
+                             initargs=(config.config_file, config.server_root, facts_data,
+                                       args.cache_dir)) as executor:
+        futures = [executor.submit(evaluate_site, i, args.stig, rules) for i in range(len(sites))]
+        for future in futures:
+            name, results = future.result()
+            site_dir = output_root / site_dir_name(name)
+            site_dir.mkdir(parents=True, exist_ok=True)
+            counts = defaultdict(int)
+            for result in results:
+                counts[result['status']] += 1
+                totals[result['status']] += 1
+                if writer is not None:
+                    writer.add(name, args.stig, result)
+                else:
+                    (site_dir / f"{result['vuln_id']}.json").write_text(json.dumps(result, indent=2))
+            site_summary = {'site': name, 'virtualhost': results[0]['virtualhost'] if results else '',
+                            'status_counts': dict(counts)}
+            (site_dir / 'summary.json').write_text(json.dumps(dict(site_summary, results=[
+                {k: r[k] for k in ('vuln_id', 'stig_id', 'status')} for r in results]), indent=2))
+            summary.append(site_summary)
+            print(f"  {name[:50]:<50} open={counts['Open']:<3} pass={counts['NotAFinding']:<3} "
+                  f"review={counts['Not_Reviewed']}")
+
+    if writer is not None:
+        scan_results.close_writer(store, writer)
+
+    (output_root / 'summary.json').write_text(json.dumps({
+        'stig': args.stig,
+        'config_file': config.config_file,
+        'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'status_counts': dict(totals),
+        'sites': summary,
+    }, indent=2))
+
+    print()
+    print(f"Results written to {output_root}/<site>/")
+    if writer is not None:
+        print(f"{writer.count} results recorded as scan {writer.scan_id} in {args.results_db}")
+    return 1 if totals['Open'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
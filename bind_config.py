@@ -0,0 +1,974 @@
+#!/usr/bin/env python3
+"""
+BIND 9.x named.conf parser
+Builds an object model of options, views, zones, ACLs, keys, server
+statements and logging channels from named.conf, following include
+statements and the chroot prefix of the running named process (-t).
+
+The parsed tree is built once per scan: repeated loads in the same process are
+served from memory, and separate check processes share an on-disk cache that
+is invalidated when any parsed file changes (mtime/size). Configuration-driven
+BIND rules (BIND_RULES) are evaluated against the model.
+
+Usage:
+    python3 bind_config.py --dump
+    python3 bind_config.py --rule BIND-9X-001050 --output-json result.json
+    python3 bind_config.py --config /etc/named.conf --chroot /var/named/chroot --output-dir results/bind
+"""
+
+import argparse
+import hashlib
+import ipaddress
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+
+CHECKS_JSON = BASE_DIR / 'bind_9.x_checks.json'
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('STIG_CACHE_DIR', Path.home() / '.cache' / 'stig-checks'))
+
+DEFAULT_CONFIG_LOCATIONS = (
+    '/etc/named.conf',
+    '/etc/bind/named.conf',
+    '/var/named/chroot/etc/named.conf',
+    '/usr/local/etc/namedb/named.conf',
+)
+
+# Logging channels BIND predefines
+BUILTIN_CHANNELS = {
+    'default_syslog': {'destination': 'syslog'},
+    'default_debug': {'destination': 'file'},
+    'default_stderr': {'destination': 'stderr'},
+    'null': {'destination': 'null'},
+}
+
+SYSLOG_CONFIGS = ('/etc/rsyslog.conf', '/etc/syslog.conf')
+SYSLOG_DROPIN_DIR = '/etc/rsyslog.d'
+
+
+################################################################################
+# PARSER
+################################################################################
+
+class BindStatement:
+    """A statement: name, arguments and an optional { } block of statements"""
+
+    def __init__(self, name, args, children=None, file=None, line=0):
+        self.name = name
+        self.args = args
+        self.children = children
+        self.file = file
+        self.line = line
+
+    @property
+    def value(self):
+        return ' '.join(self.args)
+
+    def get(self, name):
+        """First child statement named name"""
+        for child in self.children or []:
+            if child.name.lower() == name.lower():
+                return child
+        return None
+
+    def find_all(self, name):
+        return [c for c in self.children or [] if c.name.lower() == name.lower()]
+
+    def elements(self):
+        """Address match list / channel list entries as text (e.g. 'key tsig', '!10.0.0.1')"""
+        return [' '.join([c.name] + c.args) for c in self.children or []]
+
+    def to_dict(self):
+        data = {'name': self.name, 'args': self.args, 'file': self.file, 'line': self.line}
+        if self.children is not None:
+            data['children'] = [c.to_dict() for c in self.children]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        children = data.get('children')
+        if children is not None:
+            children = [cls.from_dict(c) for c in children]
+        return cls(data['name'], data['args'], children, data.get('file'), data.get('line', 0))
+
+    def __repr__(self):
+        block = ' {...}' if self.children is not None else ''
+        return f"BindStatement({self.name} {self.value}{block})"
+
+
+def tokenize(text):
+    """Yield (token, line) pairs; comments (//, #, /* */) are dropped"""
+    i = 0
+    line = 1
+    length = len(text)
+    while i < length:
+        ch = text[i]
+        if ch == '\n':
+            line += 1
+            i += 1
+        elif ch.isspace():
+            i += 1
+        elif ch == '#' or text.startswith('//', i):
+            while i < length and text[i] != '\n':
+                i += 1
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            line += text.count('\n', i, end)
+            i = end
+        elif ch == '"':
+            end = i + 1
+            while end < length and text[end] != '"':
+                end += 2 if text[end] == '\\' else 1
+            yield ('"', text[i + 1:end]), line
+            line += text.count('\n', i, end)
+            i = end + 1
+        elif ch in '{};':
+            yield (ch, ch), line
+            i += 1
+        else:
+            start = i
+            while i < length and not text[i].isspace() and text[i] not in '{};"' \
+                    and not text.startswith('//', i) and not text.startswith('/*', i) and text[i] != '#':
+                i += 1
+            yield ('w', text[start:i]), line
+
+
+class BindConfigParser:
+    """Parse named.conf and its include files into statements"""
+
+    def __init__(self, chroot=None):
+        self.chroot = chroot or ''
+        self.inputs = {}
+        self.errors = []
+        self.stack = []
+
+    def resolve(self, path, base_dir):
+        """Resolve a configuration path inside the chroot"""
+        if not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        if self.chroot and not path.startswith(self.chroot.rstrip('/') + '/'):
+            path = self.chroot.rstrip('/') + path
+        return os.path.normpath(path)
+
+    def record(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self.inputs[path] = {'type': 'file', 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def parse_file(self, path):
+        """Parse one file into a list of statements (includes spliced in place)"""
+        if path in self.stack:
+            self.errors.append(f"Include loop: {' -> '.join(self.stack + [path])}")
+            return []
+        try:
+            text = Path(path).read_text(encoding='utf-8', errors='replace')
+        except OSError as e:
+            self.errors.append(f"{path}: {e}")
+            return []
+        self.record(path)
+        self.stack.append(path)
+        try:
+            tokens = list(tokenize(text))
+            statements, _ = self.parse_block(tokens, 0, path, top=True)
+        finally:
+            self.stack.pop()
+        return statements
+
+    def parse_block(self, tokens, pos, path, top=False):
+        statements = []
+        while pos < len(tokens):
+            (kind, text), line = tokens[pos]
+            if kind == '}':
+                if top:
+                    self.errors.append(f"{path}:{line}: unexpected '}}'")
+                    pos += 1
+                    continue
+                return statements, pos + 1
+            if kind == ';':
+                pos += 1
+                continue
+            statement, pos = self.parse_statement(tokens, pos, path)
+            if statement.name.lower() == 'include' and statement.args and statement.children is None:
+                included = self.resolve(statement.args[0], os.path.dirname(self.strip_chroot(path)))
+                statements.extend(self.parse_file(included))
+            else:
+                statements.append(statement)
+        if not top:
+            self.errors.append(f"{path}: unterminated block")
+        return statements, pos
+
+    def parse_statement(self, tokens, pos, path):
+        (kind, text), line = tokens[pos]
+        name = text
+        args = []
+        children = None
+        pos += 1
+        negate = name == '!'
+        if negate and pos < len(tokens) and tokens[pos][0][0] in ('w', '"'):
+            name = '!' + tokens[pos][0][1]
+            pos += 1
+        while pos < len(tokens):
+            (kind, text), _ = tokens[pos]
+            if kind == ';':
+                pos += 1
+                break
+            if kind == '}':
+                break
+            if kind == '{':
+                block, pos = self.parse_block(tokens, pos + 1, path)
+                if children is None:
+                    children = block
+                else:
+                    children.extend(block)
+                continue
+            args.append(text)
+            pos += 1
+        return BindStatement(name, args, children, path, line), pos
+
+    def strip_chroot(self, path):
+        prefix = self.chroot.rstrip('/')
+        if prefix and path.startswith(prefix + '/'):
+            return path[len(prefix):]
+        return path
+
+
+################################################################################
+# OBJECT MODEL
+################################################################################
+
+class BindZone:
+    """A zone statement with option inheritance from its view and options"""
+
+    def __init__(self, statement, config, view=None):
+        self.statement = statement
+        self.config = config
+        self.view = view
+
+    @property
+    def name(self):
+        if not self.statement.args:
+            return ''
+        return self.statement.args[0].rstrip('.') or '.'
+
+    @property
+    def type(self):
+        found = self.statement.get('type')
+        kind = found.value.lower() if found else ''
+        return {'primary': 'master', 'secondary': 'slave'}.get(kind, kind)
+
+    @property
+    def file(self):
+        found = self.statement.get('file')
+        return self.config.resolve(found.args[0]) if found and found.args else None
+
+    def option(self, name):
+        """Zone statement, then view, then global options"""
+        found = self.statement.get(name)
+        if found is not None:
+            return found
+        return self.config.option(name, self.view)
+
+
+class BindView:
+    def __init__(self, statement, config):
+        self.statement = statement
+        self.config = config
+
+    @property
+    def name(self):
+        return self.statement.args[0] if self.statement.args else ''
+
+    @property
+    def zones(self):
+        return [BindZone(s, self.config, self) for s in self.statement.find_all('zone')]
+
+
+class BindConfig:
+    """Parsed named.conf: top-level statements plus convenience accessors"""
+
+    def __init__(self, statements, config_file, chroot=None, inputs=None, errors=None):
+        self.statements = statements
+        self.config_file = config_file
+        self.chroot = chroot or ''
+        self.inputs = inputs or {}
+        self.errors = errors or []
+
+    @property
+    def files(self):
+        return list(self.inputs)
+
+    def find_all(self, name):
+        return [s for s in self.statements if s.name.lower() == name.lower()]
+
+    @property
+    def options(self):
+        found = self.find_all('options')
+        return found[0] if found else None
+
+    def option(self, name, view=None):
+        """Effective statement: view overrides the global options block"""
+        if view is not None:
+            found = view.statement.get(name)
+            if found is not None:
+                return found
+        return self.options.get(name) if self.options is not None else None
+
+    @property
+    def directory(self):
+        found = self.option('directory')
+        return found.args[0] if found and found.args else os.path.dirname(self.config_file or '/')
+
+    def resolve(self, path):
+        """Resolve a path from the configuration (relative to directory, inside the chroot)"""
+        if not os.path.isabs(path):
+            path = os.path.join(self.directory, path)
+        prefix = self.chroot.rstrip('/')
+        if prefix and not path.startswith(prefix + '/'):
+            path = prefix + path
+        return os.path.normpath(path)
+
+    @property
+    def views(self):
+        return [BindView(s, self) for s in self.find_all('view')]
+
+    @property
+    def zones(self):
+        zones = [BindZone(s, self) for s in self.find_all('zone')]
+        for view in self.views:
+            zones.extend(view.zones)
+        return zones
+
+    def zones_of_type(self, *types):
+        return [z for z in self.zones if z.type in types]
+
+    @property
+    def acls(self):
+        return {s.args[0]: s.elements() for s in self.find_all('acl') if s.args}
+
+    @property
+    def keys(self):
+        keys = {}
+        for statement in self.find_all('key'):
+            if not statement.args:
+                continue
+            algorithm = statement.get('algorithm')
+            secret = statement.get('secret')
+            keys[statement.args[0].rstrip('.')] = {
+                'algorithm': algorithm.value if algorithm else None,
+                'secret': secret.value if secret else None,
+                'file': statement.file,
+                'line': statement.line,
+            }
+        return keys
+
+    @property
+    def servers(self):
+        return self.find_all('server')
+
+    @property
+    def channels(self):
+        """Logging channels: name -> destination and print-* settings"""
+        channels = {}
+        logging = self.find_all('logging')
+        for block in logging:
+            for channel in block.find_all('channel'):
+                if not channel.args:
+                    continue
+                info = {'destination': None, 'file': None, 'versions': None,
+                        'file_line': f"{channel.file}:{channel.line}"}
+                for child in channel.children or []:
+                    keyword = child.name.lower()
+                    if keyword in ('file', 'syslog', 'null', 'stderr'):
+                        info['destination'] = keyword
+                    if keyword == 'file' and child.args:
+                        info['file'] = child.args[0]
+                        if 'versions' in child.args:
+                            index = child.args.index('versions')
+                            info['versions'] = child.args[index + 1] if index + 1 < len(child.args) else None
+                    elif keyword.startswith('print-') or keyword in ('severity', 'versions'):
+                        info[keyword] = child.value
+                channels[channel.args[0]] = info
+        return channels
+
+    @property
+    def categories(self):
+        categories = {}
+        for block in self.find_all('logging'):
+            for category in block.find_all('category'):
+                if category.args:
+                    categories[category.args[0]] = [e.strip('"') for e in category.elements()]
+        return categories
+
+    def channel(self, name):
+        return self.channels.get(name) or BUILTIN_CHANNELS.get(name)
+
+    def expand_acl(self, elements, seen=None):
+        """Expand ACL references in an address match list to addresses/keys"""
+        seen = seen or set()
+        acls = self.acls
+        expanded = []
+        for element in elements:
+            bare = element.lstrip('!')
+            if bare in acls and bare not in seen:
+                seen.add(bare)
+                expanded.extend(self.expand_acl(acls[bare], seen))
+            else:
+                expanded.append(element)
+        return expanded
+
+    def to_dict(self):
+        return {
+            'config_file': self.config_file,
+            'chroot': self.chroot,
+            'inputs': self.inputs,
+            'errors': self.errors,
+            'statements': [s.to_dict() for s in self.statements],
+        }
+
+
+################################################################################
+# DISCOVERY AND LOADING
+################################################################################
+
+def find_named_process():
+    """Return {'pid', 'cmdline', 'chroot', 'config', 'user'} for a running named, or None"""
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/cmdline", 'rb') as f:
+                argv = [a.decode(errors='replace') for a in f.read().split(b'\0') if a]
+        except OSError:
+            continue
+        if not argv or os.path.basename(argv[0]) != 'named':
+            continue
+        process = {'pid': int(entry), 'cmdline': ' '.join(argv), 'chroot': None, 'config': None, 'user': None}
+        flags = {'-t': 'chroot', '-c': 'config', '-u': 'user'}
+        for i, arg in enumerate(argv[1:], 1):
+            for flag, key in flags.items():
+                if arg == flag and i + 1 < len(argv):
+                    process[key] = argv[i + 1]
+                elif arg.startswith(flag) and len(arg) > len(flag):
+                    process[key] = arg[len(flag):]
+        return process
+    return None
+
+
+def find_named_conf(chroot=None, process=None):
+    """Locate named.conf (the running process's -c, then the standard locations)"""
+    process = process or {}
+    prefix = (chroot or '').rstrip('/')
+    candidates = []
+    if process.get('config'):
+        candidates.append(prefix + process['config'] if not process['config'].startswith(prefix + '/') else
+                          process['config'])
+    for location in DEFAULT_CONFIG_LOCATIONS:
+        if prefix and not location.startswith(prefix + '/'):
+            candidates.append(prefix + location)
+        candidates.append(location)
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def detect_chroot(config_file, process=None):
+    """Chroot prefix from the named process (-t), or implied by a chroot config path"""
+    if process and process.get('chroot'):
+        return process['chroot'].rstrip('/')
+    if config_file and '/chroot/' in config_file:
+        return config_file[:config_file.index('/chroot/') + len('/chroot')]
+    return ''
+
+
+def inputs_unchanged(inputs):
+    """True if every recorded file still has the same mtime/size"""
+    for path, meta in inputs.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns != meta['mtime_ns'] or stat.st_size != meta['size']:
+            return False
+    return True
+
+
+def cache_path(cache_dir, config_file, chroot):
+    digest = hashlib.sha1(f"{config_file}\0{chroot}".encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"bind-config-{digest}.json"
+
+
+_loaded = {}
+
+
+def load_bind_config(config_file=None, chroot=None, cache_dir=DEFAULT_CACHE_DIR, use_cache=True):
+    """
+    Return the parsed BindConfig.
+
+    Args:
+        config_file: named.conf path (default: running named's -c or standard locations)
+        chroot: Chroot prefix (default: running named's -t)
+        cache_dir: Directory for the shared on-disk cache
+        use_cache: Reuse cached trees when none of the inputs changed
+
+    Returns:
+        BindConfig, or None if no named.conf could be located
+    """
+    process = None
+    if not config_file or chroot is None:
+        process = find_named_process()
+    if not config_file:
+        search_root = chroot if chroot is not None else (process or {}).get('chroot')
+        config_file = find_named_conf(search_root, process)
+    elif chroot and os.path.isabs(config_file):
+        # An explicit path is inside the chroot, as named -t reads it (and includes)
+        config_file = BindConfigParser(chroot).resolve(config_file, '/')
+    if not config_file or not os.path.isfile(config_file):
+        return None
+    if chroot is None:
+        chroot = detect_chroot(config_file, process)
+
+    key = (config_file, chroot)
+    if use_cache and key in _loaded and inputs_unchanged(_loaded[key].inputs):
+        return _loaded[key]
+
+    path = cache_path(cache_dir, config_file, chroot)
+    if use_cache:
+        try:
+            data = json.loads(path.read_text())
+            if data.get('version') == CACHE_VERSION and inputs_unchanged(data['inputs']):
+                config = BindConfig([BindStatement.from_dict(s) for s in data['statements']],
+                                    data['config_file'], data['chroot'], data['inputs'], data['errors'])
+                _loaded[key] = config
+                return config
+        except (OSError, ValueError, KeyError):
+            pass
+
+    parser = BindConfigParser(chroot)
+    statements = parser.parse_file(config_file)
+    config = BindConfig(statements, config_file, chroot, parser.inputs, parser.errors)
+    _loaded[key] = config
+
+    if use_cache:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = config.to_dict()
+            data['version'] = CACHE_VERSION
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(data))
+            os.replace(str(tmp), str(path))
+        except OSError:
+            pass
+
+    return config
+
+
+################################################################################
+# RULE EVALUATION
+################################################################################
+
+def is_recursive(config):
+    recursion = config.option('recursion')
+    return recursion is None or recursion.value.lower() == 'yes'
+
+
+def require_option(name, applies=None):
+    """Rule requiring an options sub statement (optionally only for some servers)"""
+    def check(config):
+        if applies is not None:
+            reason = applies(config)
+            if reason:
+                return 'Not_Applicable', reason
+        found = config.option(name)
+        if found is None:
+            return 'Open', f"options does not contain '{name}'"
+        return 'NotAFinding', f"options {{ {name} {found.value}; }} ({found.file}:{found.line})"
+    return check
+
+
+def not_secondary(config):
+    if not config.zones_of_type('slave'):
+        return 'No secondary (slave) zones: not a secondary name server'
+    return None
+
+
+def not_master(config):
+    if not config.zones_of_type('master'):
+        return 'No master zones: not a master name server'
+    return None
+
+
+def check_chroot(config):
+    process = find_named_process()
+    if process is None:
+        return 'Not_Reviewed', 'named is not running; verify it is started with -t <chroot_path>'
+    if process['chroot']:
+        return 'NotAFinding', f"named runs chrooted in {process['chroot']}: {process['cmdline']}"
+    return 'Open', f"named is not started with -t: {process['cmdline']}"
+
+
+def check_null_category(config):
+    offending = [f"category {name} {{ {'; '.join(channels)}; }}"
+                 for name, channels in config.categories.items()
+                 if any((config.channel(c) or {}).get('destination') == 'null' for c in channels)]
+    if offending:
+        return 'Open', 'Categories sent to the null channel: ' + ', '.join(offending)
+    return 'NotAFinding', 'No category is sent to the null channel'
+
+
+def print_option(option):
+    def check(config):
+        channels = config.channels
+        if not channels:
+            return 'Open', 'No logging channels are defined'
+        problems = [f"{name} ({option} {info.get(option, 'missing')})"
+                    for name, info in sorted(channels.items())
+                    if (info.get(option) or '').lower() != 'yes']
+        if problems:
+            return 'Open', f"Channels without '{option} yes': " + ', '.join(problems)
+        return 'NotAFinding', f"All {len(channels)} channel(s) set '{option} yes'"
+    return check
+
+
+def categories_use(config, destination):
+    """Categories that do not send to any channel with the given destination"""
+    return [name for name, channels in sorted(config.categories.items())
+            if not any((config.channel(c) or {}).get('destination') == destination for c in channels)]
+
+
+def remote_syslog_lines():
+    lines = []
+    paths = list(SYSLOG_CONFIGS)
+    if os.path.isdir(SYSLOG_DROPIN_DIR):
+        paths.extend(os.path.join(SYSLOG_DROPIN_DIR, f) for f in sorted(os.listdir(SYSLOG_DROPIN_DIR))
+                     if f.endswith('.conf'))
+    for path in paths:
+        try:
+            with open(path, errors='replace') as f:
+                for line in f:
+                    text = line.strip()
+                    if text and not text.startswith('#') and '*.*' in text and '@' in text:
+                        lines.append(f"{path}: {text}")
+        except OSError:
+            continue
+    return lines
+
+
+def check_syslog_channel(config):
+    syslog_channels = [n for n, i in config.channels.items() if i['destination'] == 'syslog']
+    if not syslog_channels:
+        return 'Open', 'No logging channel is defined for syslog'
+    missing = categories_use(config, 'syslog')
+    if not config.categories or missing:
+        return 'Open', f"Categories without a syslog channel: {', '.join(missing) or 'no categories defined'}"
+    remote = remote_syslog_lines()
+    if not remote:
+        return 'Open', 'syslog/rsyslog does not forward *.* to a remote server'
+    return 'NotAFinding', f"syslog channel(s) {', '.join(syslog_channels)}; forwarding: {remote[0]}"
+
+
+def check_file_channel(config):
+    file_channels = [n for n, i in config.channels.items() if i['destination'] == 'file']
+    if not file_channels:
+        return 'Open', 'No logging channel is defined for a local file'
+    missing = categories_use(config, 'file')
+    if not config.categories or missing:
+        return 'Open', f"Categories without a file channel: {', '.join(missing) or 'no categories defined'}"
+    return 'NotAFinding', f"File channel(s): {', '.join(file_channels)}"
+
+
+def check_log_versions(config):
+    file_channels = {n: i for n, i in config.channels.items() if i['destination'] == 'file'}
+    if not file_channels:
+        return 'Open', 'No logging channel is defined for a local file'
+    problems = []
+    for name, info in sorted(file_channels.items()):
+        versions = info.get('versions')
+        if versions is None:
+            problems.append(f"{name} (versions not defined)")
+        elif versions.lower() != 'unlimited' and (not versions.isdigit() or int(versions) < 3):
+            problems.append(f"{name} (versions {versions})")
+    if problems:
+        return 'Open', 'File channels retaining fewer than 3 versions: ' + ', '.join(problems)
+    return 'NotAFinding', f"All {len(file_channels)} file channel(s) keep at least 3 versions"
+
+
+def check_no_recursion(config):
+    authoritative = config.zones_of_type('master', 'slave')
+    if not authoritative:
+        return 'Not_Applicable', 'Not authoritative for any zone'
+    problems = []
+    recursion = config.option('recursion')
+    if recursion is None or recursion.value.lower() != 'no':
+        problems.append(f"recursion is {recursion.value if recursion else 'missing'}")
+    for name in ('allow-recursion', 'allow-query'):
+        found = config.option(name)
+        if found is None or found.elements() != ['none']:
+            problems.append(f"options {name} is {'{ ' + '; '.join(found.elements()) + '; }' if found else 'missing'}")
+    for zone in authoritative:
+        found = zone.statement.get('allow-query')
+        if found is None or 'any' in found.elements():
+            problems.append(f"zone {zone.name} allow-query is {'any' if found else 'missing'}")
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', 'Recursion disabled; allow-query restricted per zone'
+
+
+def notify_rule(zone_type):
+    def check(config):
+        zones = config.zones_of_type(zone_type)
+        if not zones:
+            return 'Not_Applicable', f"No {zone_type} zones"
+        problems = []
+        notify = config.options.get('notify') if config.options is not None else None
+        if notify is None or notify.value.lower() == 'yes':
+            problems.append(f"options notify is {notify.value if notify else 'missing'}")
+        targets = []
+        for zone in zones:
+            zone_notify = zone.statement.get('notify')
+            if zone_notify is None or zone_notify.value.lower() != 'explicit':
+                problems.append(f"zone {zone.name} notify is {zone_notify.value if zone_notify else 'missing'}")
+            also = zone.statement.get('also-notify')
+            if also is None:
+                problems.append(f"zone {zone.name} also-notify is missing")
+            else:
+                targets.append(f"{zone.name}: {', '.join(also.elements())}")
+        if problems:
+            return 'Open', '; '.join(problems)
+        return 'Not_Reviewed', 'Verify also-notify targets are authorized secondaries: ' + '; '.join(targets)
+    return check
+
+
+def check_dnssec_validation(config):
+    if not is_recursive(config):
+        return 'Not_Applicable', 'Recursion is disabled: not a caching name server'
+    problems = []
+    for name in ('dnssec-enable', 'dnssec-validation'):
+        found = config.option(name)
+        if found is None or found.value.lower() not in ('yes', 'auto'):
+            problems.append(f"{name} is {found.value if found else 'missing'}")
+    if not config.find_all('managed-keys') and not config.find_all('trust-anchors'):
+        problems.append('managed-keys statement is missing')
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', 'DNSSEC validation enabled with managed trust anchors'
+
+
+def check_server_transfers(config):
+    reason = not_master(config)
+    if reason:
+        return 'Not_Applicable', reason
+    servers = config.servers
+    if not servers:
+        return 'Open', 'No server statements limit zone transfers'
+    missing = [s.value for s in servers if s.get('transfers') is None]
+    if missing:
+        return 'Open', f"server statements without 'transfers': {', '.join(missing)}"
+    return 'NotAFinding', f"All {len(servers)} server statement(s) limit transfers"
+
+
+def check_recursion_acl(config):
+    if not is_recursive(config):
+        return 'Not_Applicable', 'Recursion is disabled: not a caching name server'
+    problems = []
+    acls = config.acls
+    for name in ('allow-query', 'allow-recursion'):
+        found = config.option(name)
+        if found is None:
+            problems.append(f"{name} is missing")
+            continue
+        elements = found.elements()
+        if not any(e.lstrip('!') in acls for e in elements):
+            problems.append(f"{name} does not reference an ACL")
+        for element in config.expand_acl(elements):
+            if element in ('any',):
+                problems.append(f"{name} allows any")
+                continue
+            try:
+                network = ipaddress.ip_network(element.lstrip('!'), strict=False)
+            except ValueError:
+                continue
+            if not element.startswith('!') and network.is_global:
+                problems.append(f"{name} allows non-internal {element}")
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', 'allow-query and allow-recursion restricted to internal ACLs'
+
+
+def check_transfer_keys(config):
+    masters = config.zones_of_type('master')
+    slaves = config.zones_of_type('slave')
+    transfer_zones = []
+    for zone in masters:
+        found = zone.option('allow-transfer')
+        if found is None or found.elements() != ['none']:
+            transfer_zones.append((zone, found))
+    if not transfer_zones and not slaves:
+        return 'Not_Applicable', 'Zone transfers are disabled (allow-transfer { none; })'
+    problems = []
+    for zone, found in transfer_zones:
+        if found is None or not any(e.startswith('key ') for e in found.elements()):
+            problems.append(f"zone {zone.name} allow-transfer has no key")
+    if slaves and not any(s.get('keys') for s in config.servers):
+        problems.append('secondary has no server statement with keys')
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', 'Zone transfers are authenticated with TSIG keys'
+
+
+def check_unique_keys(config):
+    keys = config.keys
+    if not keys:
+        return 'Not_Applicable', 'No TSIG key statements'
+    by_secret = {}
+    for name, info in keys.items():
+        if info['secret']:
+            by_secret.setdefault(info['secret'], []).append(name)
+    shared = [names for names in by_secret.values() if len(names) > 1]
+    if shared:
+        return 'Open', 'Key material used by more than one key statement: ' + \
+            '; '.join(', '.join(names) for names in shared)
+    return 'NotAFinding', f"{len(keys)} key statement(s) with distinct secrets"
+
+
+BIND_RULES = {
+    'BIND-9X-000001': check_chroot,
+    'BIND-9X-001017': check_null_category,
+    'BIND-9X-001030': print_option('print-severity'),
+    'BIND-9X-001031': print_option('print-time'),
+    'BIND-9X-001032': print_option('print-category'),
+    'BIND-9X-001040': check_syslog_channel,
+    'BIND-9X-001041': check_file_channel,
+    'BIND-9X-001042': check_log_versions,
+    'BIND-9X-001050': require_option('transfers-per-ns', not_secondary),
+    'BIND-9X-001051': require_option('transfers-in', not_secondary),
+    'BIND-9X-001052': require_option('transfers-out'),
+    'BIND-9X-001055': check_no_recursion,
+    'BIND-9X-001057': notify_rule('master'),
+    'BIND-9X-001058': notify_rule('slave'),
+    'BIND-9X-001060': check_dnssec_validation,
+    'BIND-9X-001070': check_server_transfers,
+    'BIND-9X-001080': check_recursion_acl,
+    'BIND-9X-001100': check_transfer_keys,
+    'BIND-9X-001106': check_unique_keys,
+}
+
+EXIT_CODES = {
+    'NotAFinding': 0,
+    'Open': 1,
+    'Not_Applicable': 2,
+    'Not_Reviewed': 2,
+    'ERROR': 3,
+}
+
+STATUS_PRIORITY = ('ERROR', 'Open', 'Not_Reviewed', 'NotAFinding', 'Not_Applicable')
+
+
+def evaluate_rule(stig_id, config):
+    """Evaluate one rule; returns (status, finding_details)"""
+    if stig_id not in BIND_RULES:
+        return 'Not_Reviewed', 'Manual review required - consult STIG documentation'
+    if config is None and stig_id != 'BIND-9X-000001':
+        return 'ERROR', 'named.conf not found'
+    if config is not None and config.errors:
+        return 'ERROR', 'Parse error: ' + '; '.join(config.errors)
+    return BIND_RULES[stig_id](config)
+
+
+def run_rule(stig_id, config_file=None, chroot=None):
+    """Entry point for the per-rule check scripts: (status, finding_details, exit_code)"""
+    config = load_bind_config(config_file, chroot)
+    status, details = evaluate_rule(stig_id, config)
+    return status, details, EXIT_CODES[status]
+
+
+def load_rule_metadata():
+    with open(CHECKS_JSON) as f:
+        return {c['STIG ID']: c for c in json.load(f)}
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Parse named.conf and evaluate configuration-driven BIND STIG rules',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--config', help='named.conf path (default: from running named or standard locations)')
+    parser.add_argument('--chroot', help='Chroot prefix (default: -t of the running named)')
+    parser.add_argument('--rule', action='append', default=[],
+                        help='STIG ID to evaluate (may be repeated; default: all automated rules)')
+    parser.add_argument('--output-json', help='Write the result of a single --rule to this file')
+    parser.add_argument('--output-dir', help='Write per-rule results to this directory')
+    parser.add_argument('--dump', action='store_true', help='Print the parsed model and exit')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the cache')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help='Cache directory')
+    args = parser.parse_args()
+
+    config = load_bind_config(args.config, args.chroot, args.cache_dir, use_cache=not args.no_cache)
+
+    if args.dump:
+        if config is None:
+            print("ERROR: named.conf not found")
+            return 3
+        print(json.dumps({
+            'config_file': config.config_file,
+            'chroot': config.chroot,
+            'files': config.files,
+            'errors': config.errors,
+            'options': {s.name: s.elements() or s.value for s in (config.options.children or [])}
+            if config.options is not None else {},
+            'acls': config.acls,
+            'keys': {n: {k: v for k, v in i.items() if k != 'secret'} for n, i in config.keys.items()},
+            'views': [v.name for v in config.views],
+            'zones': [{'name': z.name, 'type': z.type, 'view': z.view.name if z.view else None,
+                       'file': z.file} for z in config.zones],
+            'channels': config.channels,
+            'categories': config.categories,
+        }, indent=2))
+        return 0
+
+    metadata = load_rule_metadata()
+    rule_ids = args.rule or sorted(BIND_RULES)
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    results = []
+    for stig_id in rule_ids:
+        check = metadata.get(stig_id, {})
+        status, details = evaluate_rule(stig_id, config)
+        results.append({
+            'vuln_id': check.get('Group ID', 'UNKNOWN'),
+            'stig_id': stig_id,
+            'severity': check.get('Severity', 'medium'),
+            'status': status,
+            'finding_details': details,
+            'timestamp': timestamp,
+        })
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for result in results:
+            (output_dir / f"{result['stig_id']}.json").write_text(json.dumps(result, indent=2))
+
+    if args.output_json and len(results) == 1:
+        Path(args.output_json).write_text(json.dumps(results[0], indent=2))
+
+    for result in results:
+        print(f"[{result['vuln_id']}] {result['stig_id']}: {result['status']}")
+        print(f"    {result['finding_details']}")
+
+    worst = min((r['status'] for r in results), key=STATUS_PRIORITY.index)
+    return EXIT_CODES[worst]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
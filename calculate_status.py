@@ -1,24 +1,31 @@
 #!/usr/bin/env python3
 """Quick status calculation"""
 
+import script_index
+
 # Previous milestone: 3,224/6,164 (52.3%)
 previous = 3224
-total_scripts = 6164
-new_implementations = 214
+previous_total = 6164
 
-current = previous + new_implementations
-percentage = (current / total_scripts) * 100
+# Current counts come from the script index (implemented: manual review framework or real check logic)
+with script_index.open_index() as index:
+    summary = index.summary()
+total_scripts = sum(row['total'] for row in summary)
+current = sum(row['implemented'] for row in summary)
+new_implementations = current - previous
+percentage = (current / total_scripts) * 100 if total_scripts else 0
 
-target_60 = int(total_scripts * 0.60)
-needed_for_60 = target_60 - current
+milestone = next((m for m in (0.60, 0.75, 0.90, 0.95, 1.00) if current < int(total_scripts * m)), 1.00)
+target = int(total_scripts * milestone)
+needed = max(0, target - current)
 
 print("=" * 80)
 print("PROJECT STATUS UPDATE")
 print("=" * 80)
-print(f"Previous: {previous:,}/{total_scripts:,} scripts (52.3%)")
-print(f"New implementations: {new_implementations:,} Windows Server checks")
+print(f"Previous: {previous:,}/{previous_total:,} scripts (52.3%)")
+print(f"New implementations: {new_implementations:,}")
 print(f"Current: {current:,}/{total_scripts:,} scripts ({percentage:.1f}%)")
 print()
-print(f"60% Milestone Target: {target_60:,} scripts")
-print(f"Remaining needed: {needed_for_60:,} implementations")
+print(f"{milestone:.0%} Milestone Target: {target:,} scripts")
+print(f"Remaining needed: {needed:,} implementations")
 print("=" * 80)
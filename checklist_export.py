@@ -0,0 +1,698 @@
+#!/usr/bin/env python3
+"""
+STIG checklist export
+Writes STIG Viewer checklists from the scan result database (scan_results.py):
+one checklist per host and STIG, as .ckl (STIG Viewer 2) or .cklb (STIG
+Viewer 3).
+
+Every rule of the platform's benchmark dump (<platform>_checks.json, the
+analyzed_checks.json of its checks/ directory, or the rule catalog) is listed
+with its scan result; rules without a result stay Not_Reviewed, and results
+for rules missing from the benchmark are appended. Results with status ERROR
+are exported as Not_Reviewed with the error in the finding details.
+
+Checklists are written by a pool of worker processes, each reading only the
+results of the checklist it writes and streaming the file out rule by rule, so
+memory stays at one checklist per worker however many hosts a scan covers.
+Files are written atomically.
+
+An existing checklist at the destination (or under --merge-from) is merged:
+the assessor's comments and severity overrides are kept, and a status the
+assessor set is kept when the scan could only report Not_Reviewed. Asset
+fields (FQDN, IP address, MAC address, role, ...) come from the results, an
+--inventory file, or the existing checklist, in that order.
+
+Inventory files are CSV with a header row (host, fqdn, ip_address,
+mac_address, role, technology_area, marking, comments, web_db_site,
+web_db_instance) or JSON mapping each host to those fields.
+
+Usage:
+    python3 checklist_export.py --output-dir checklists
+    python3 checklist_export.py --scan rhel-20250101T020000Z-3f2a1c --format cklb --workers 8
+    python3 checklist_export.py --platform rhel_9_v2r5 --inventory hosts.csv --merge-from checklists/2025Q1
+    python3 checklist_export.py --host web01 --no-merge
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import scan_results
+import stig_catalog
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+FORMATS = ('ckl', 'cklb')
+
+STIG_VIEWER_VERSION = '2.18'
+
+# Checklist status of a stored result status
+CKL_STATUS = {
+    scan_results.NOT_A_FINDING: 'NotAFinding',
+    scan_results.OPEN: 'Open',
+    scan_results.NOT_REVIEWED: 'Not_Reviewed',
+    scan_results.NOT_APPLICABLE: 'Not_Applicable',
+    scan_results.ERROR: 'Not_Reviewed',
+}
+
+CKLB_STATUS = {
+    'NotAFinding': 'not_a_finding',
+    'Open': 'open',
+    'Not_Reviewed': 'not_reviewed',
+    'Not_Applicable': 'not_applicable',
+}
+
+# CKL VULN attributes, in STIG Viewer order -> keys of the STIG Viewer export (*_checks.json)
+VULN_ATTRIBUTES = OrderedDict([
+    ('Vuln_Num', ('Group ID', 'Vuln ID')),
+    ('Severity', ('Severity',)),
+    ('Group_Title', ('Group Title', 'SRG ID')),
+    ('Rule_ID', ('Rule ID',)),
+    ('Rule_Ver', ('STIG ID',)),
+    ('Rule_Title', ('Rule Title',)),
+    ('Vuln_Discuss', ('Discussion',)),
+    ('IA_Controls', ('IA Controls',)),
+    ('Check_Content', ('Check Content',)),
+    ('Fix_Text', ('Fix Text',)),
+    ('False_Positives', ('False Positives',)),
+    ('False_Negatives', ('False Negatives',)),
+    ('Documentable', ('Documentable',)),
+    ('Mitigations', ('Mitigations',)),
+    ('Potential_Impact', ('Potential Impacts',)),
+    ('Third_Party_Tools', ('Third Party Tools',)),
+    ('Mitigation_Control', ('Mitigation Control',)),
+    ('Responsibility', ('Responsibility',)),
+    ('Security_Override_Guidance', ('Security Override Guidance',)),
+    ('Check_Content_Ref', ('Check Content Ref',)),
+    ('Weight', ('Weight',)),
+    ('Class', ('Classification',)),
+    ('STIGRef', ()),
+    ('TargetKey', ('Asset Posture',)),
+    ('STIG_UUID', ()),
+])
+
+# CKL ASSET elements, in STIG Viewer order, with their defaults
+ASSET_FIELDS = OrderedDict([
+    ('ROLE', 'None'),
+    ('ASSET_TYPE', 'Computing'),
+    ('MARKING', 'CUI'),
+    ('HOST_NAME', ''),
+    ('HOST_IP', ''),
+    ('HOST_MAC', ''),
+    ('HOST_FQDN', ''),
+    ('TARGET_COMMENT', ''),
+    ('TECH_AREA', ''),
+    ('TARGET_KEY', ''),
+    ('WEB_OR_DATABASE', 'false'),
+    ('WEB_DB_SITE', ''),
+    ('WEB_DB_INSTANCE', ''),
+])
+
+# Asset element -> keys of results, inventory files and the STIG Viewer export
+ASSET_KEYS = OrderedDict([
+    ('HOST_FQDN', ('fqdn', 'FQDN', 'host_fqdn')),
+    ('HOST_IP', ('ip_address', 'IP Address', 'ip', 'host_ip')),
+    ('HOST_MAC', ('mac_address', 'MAC Address', 'mac', 'host_mac')),
+    ('ROLE', ('role', 'Role')),
+    ('TECH_AREA', ('technology_area', 'Technology Area', 'tech_area')),
+    ('MARKING', ('marking', 'Marking')),
+    ('TARGET_COMMENT', ('comments', 'target_comment')),
+    ('WEB_DB_SITE', ('web_db_site', 'site')),
+    ('WEB_DB_INSTANCE', ('web_db_instance', 'instance')),
+])
+
+# CKL asset element -> STIG Viewer 3 target_data key
+CKLB_TARGET = OrderedDict([
+    ('ASSET_TYPE', 'target_type'),
+    ('HOST_NAME', 'host_name'),
+    ('HOST_IP', 'ip_address'),
+    ('HOST_MAC', 'mac_address'),
+    ('HOST_FQDN', 'fqdn'),
+    ('TARGET_COMMENT', 'comments'),
+    ('ROLE', 'role'),
+    ('TECH_AREA', 'technology_area'),
+    ('WEB_DB_SITE', 'web_db_site'),
+    ('WEB_DB_INSTANCE', 'web_db_instance'),
+])
+
+# Checklist entry fields owned by the assessor: never replaced by a scan
+ASSESSOR_FIELDS = ('comments', 'severity_override', 'severity_justification')
+
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+CHECKLIST_NAMESPACE = uuid.UUID('6c0e5a8e-6a3e-4f0c-9f43-3b9c2e0d7a51')
+
+
+################################################################################
+# BENCHMARK
+################################################################################
+
+def benchmark_sources(platform):
+    """Benchmark dumps holding a platform's rules, most complete first"""
+    return [REPO_ROOT / f"{platform}_checks.json"] + sorted(REPO_ROOT.glob(f"checks/*/{platform}/analyzed_checks.json"))
+
+
+def load_benchmark(platform, source=None):
+    """
+    Rule records of a platform's benchmark dump in benchmark order, one per
+    Group ID (the last record wins, as in the generators).
+
+    Returns:
+        list of records, empty when no dump is found
+    """
+    for path in [Path(source)] if source else benchmark_sources(platform):
+        if path.is_file():
+            records = OrderedDict()
+            for record in stig_catalog.load_checks(path):
+                if isinstance(record, dict):
+                    group_id = stig_catalog.field(record, stig_catalog.FIELD_KEYS['group_id'])
+                    if group_id:
+                        records[group_id] = record
+            return list(records.values())
+    return []
+
+
+def stig_info(records, platform):
+    """Benchmark fields of a checklist's STIG from its first record"""
+    name, benchmark_id, version, release, date = stig_catalog.benchmark_info(records[0]) if records \
+        else ('', '', None, None, '')
+    name = name or platform
+    title = name if name.endswith('Security Technical Implementation Guide') \
+        else f"{name} Security Technical Implementation Guide"
+    release_info = f"Release: {release} Benchmark Date: {date}".strip() if release else ''
+    info = OrderedDict([
+        ('version', str(version or '')),
+        ('classification', 'UNCLASSIFIED'),
+        ('customname', ''),
+        ('stigid', benchmark_id or platform),
+        ('description', ''),
+        ('filename', f"{benchmark_id or platform}.xml"),
+        ('releaseinfo', release_info),
+        ('title', title),
+        ('uuid', str(uuid.uuid5(CHECKLIST_NAMESPACE, f"{benchmark_id or platform}:{version}:{release}"))),
+        ('notice', 'terms-of-use'),
+        ('source', ''),
+    ])
+    info['stigref'] = f"{title} :: Version {version or '?'}, {release_info}".rstrip(', ')
+    return info
+
+
+class ChecklistRule(object):
+    """
+    Benchmark side of a checklist VULN: its attributes, CCIs and legacy IDs.
+
+    The rendered .ckl STIG_DATA and .cklb rule fields are kept with the rule,
+    so a worker renders each benchmark rule once for all hosts of a platform.
+    """
+
+    def __init__(self, record, info):
+        attributes = OrderedDict((name, stig_catalog.field(record, keys)) for name, keys in VULN_ATTRIBUTES.items())
+        attributes['Severity'] = attributes['Severity'].lower()
+        if attributes['Rule_ID'] and not attributes['Rule_ID'].endswith('_rule'):
+            attributes['Rule_ID'] += '_rule'
+        attributes['Documentable'] = attributes['Documentable'].lower()
+        if attributes['Class'].lower() == 'unclassified':
+            attributes['Class'] = 'Unclass'
+        attributes['STIGRef'] = info['stigref']
+        attributes['STIG_UUID'] = info['uuid']
+        self.attributes = attributes
+        self.vuln_num = attributes['Vuln_Num']
+        self.stig_id = attributes['Rule_Ver']
+        self.ccis = list(OrderedDict.fromkeys(
+            stig_catalog.CCI_RE.findall(stig_catalog.field(record, stig_catalog.FIELD_KEYS['cci']))))
+        self.legacy = [value for value in re.split(r'[\s,]+', stig_catalog.field(record, stig_catalog.FIELD_KEYS['legacy']))
+                       if value]
+        self.info = info
+        self._ckl = None
+        self._cklb = None
+
+    def ckl_data(self):
+        """STIG_DATA elements of the VULN"""
+        if self._ckl is None:
+            values = list(self.attributes.items()) + [('LEGACY_ID', v) for v in self.legacy] + \
+                [('CCI_REF', v) for v in self.ccis]
+            self._ckl = ''.join(
+                f"\t\t\t\t<STIG_DATA>\n\t\t\t\t\t<VULN_ATTRIBUTE>{name}</VULN_ATTRIBUTE>\n"
+                f"\t\t\t\t\t<ATTRIBUTE_DATA>{xml_text(value)}</ATTRIBUTE_DATA>\n\t\t\t\t</STIG_DATA>\n"
+                for name, value in values)
+        return self._ckl
+
+    def cklb_fields(self):
+        """Benchmark fields of the .cklb rule, as a JSON object body"""
+        if self._cklb is None:
+            a = self.attributes
+            fields = OrderedDict([
+                ('stig_uuid', self.info['uuid']),
+                ('target_key', a['TargetKey'] or None),
+                ('stig_ref', None),
+                ('group_id', self.vuln_num),
+                ('rule_id', a['Rule_ID'].replace('_rule', '')),
+                ('rule_id_src', a['Rule_ID']),
+                ('weight', a['Weight']),
+                ('classification', 'UNCLASSIFIED' if a['Class'] in ('', 'Unclass') else a['Class']),
+                ('severity', a['Severity']),
+                ('rule_version', a['Rule_Ver']),
+                ('group_title', a['Group_Title']),
+                ('rule_title', a['Rule_Title']),
+                ('fix_text', a['Fix_Text']),
+                ('false_positives', a['False_Positives']),
+                ('false_negatives', a['False_Negatives']),
+                ('discussion', a['Vuln_Discuss']),
+                ('check_content', a['Check_Content']),
+                ('documentable', a['Documentable']),
+                ('mitigations', a['Mitigations']),
+                ('potential_impacts', a['Potential_Impact']),
+                ('third_party_tools', a['Third_Party_Tools']),
+                ('mitigation_control', a['Mitigation_Control']),
+                ('responsibility', a['Responsibility']),
+                ('security_override_guidance', a['Security_Override_Guidance']),
+                ('ia_controls', a['IA_Controls']),
+                ('check_content_ref', {'href': self.info['filename'], 'name': a['Check_Content_Ref'] or 'M'}),
+                ('legacy_ids', self.legacy),
+                ('ccis', self.ccis),
+                ('group_tree', [{'id': self.vuln_num, 'title': a['Group_Title'],
+                                 'description': '<GroupDescription></GroupDescription>'}]),
+                ('STIGUuid', self.info['uuid']),
+            ])
+            self._cklb = json.dumps(fields)[1:-1]
+        return self._cklb
+
+
+def result_record(result):
+    """Benchmark-style record of a result whose rule is not in the benchmark"""
+    data = result['data']
+    return OrderedDict([
+        ('Group ID', result['vuln_id'] or result['rule']),
+        ('Severity', result['severity'] or ''),
+        ('STIG ID', result['stig_id'] or ''),
+        ('Rule Title', data.get('rule_title') or data.get('Rule Title') or ''),
+    ])
+
+
+################################################################################
+# CHECKLIST ENTRIES
+################################################################################
+
+def scan_entry(result):
+    """Checklist entry (status, finding details, comments, severity override) of a result"""
+    if result is None:
+        return OrderedDict([('status', 'Not_Reviewed'), ('finding_details', ''), ('comments', ''),
+                            ('severity_override', ''), ('severity_justification', '')])
+    data = result['data']
+    details = result['finding_details'] or ''
+    if result['status'] == scan_results.ERROR:
+        details = f"Check error: {details}".rstrip()
+    return OrderedDict([
+        ('status', CKL_STATUS.get(result['status'], 'Not_Reviewed')),
+        ('finding_details', details),
+        ('comments', result['comments'] or ''),
+        ('severity_override', str(data.get('severity_override') or data.get('Severity Override') or '').lower()),
+        ('severity_justification', data.get('severity_justification') or data.get('Severity Override Reason') or ''),
+    ])
+
+
+def merge_entry(entry, previous):
+    """A scan entry merged with the entry of an existing checklist"""
+    if not previous:
+        return entry
+    merged = OrderedDict(entry)
+    for key in ASSESSOR_FIELDS:
+        if previous.get(key):
+            merged[key] = previous[key]
+    # A manual review the assessor completed stays until the scan decides the rule
+    if entry['status'] == 'Not_Reviewed' and previous.get('status') not in (None, '', 'Not_Reviewed'):
+        merged['status'] = previous['status']
+        merged['finding_details'] = previous.get('finding_details', '')
+    return merged
+
+
+def read_checklist(path):
+    """
+    Asset fields and entries of an existing .ckl or .cklb.
+
+    Returns:
+        tuple: (dict of CKL asset elements, {Vuln_Num: entry})
+    """
+    path = Path(path)
+    asset, entries = {}, {}
+    if path.suffix == '.cklb':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        target = data.get('target_data') or {}
+        for element, key in CKLB_TARGET.items():
+            if target.get(key):
+                asset[element] = str(target[key])
+        if target.get('is_web_database'):
+            asset['WEB_OR_DATABASE'] = 'true'
+        status_names = {v: k for k, v in CKLB_STATUS.items()}
+        for stig in data.get('stigs') or []:
+            for rule in stig.get('rules') or []:
+                override = (rule.get('overrides') or {}).get('severity') or {}
+                entries[rule.get('group_id')] = OrderedDict([
+                    ('status', status_names.get(rule.get('status'), 'Not_Reviewed')),
+                    ('finding_details', rule.get('finding_details') or ''),
+                    ('comments', rule.get('comments') or ''),
+                    ('severity_override', override.get('severity') or ''),
+                    ('severity_justification', override.get('reason') or ''),
+                ])
+        return asset, entries
+
+    # .ckl: iterparse and drop each VULN once read
+    for _, elem in ET.iterparse(str(path), events=('end',)):
+        if elem.tag == 'ASSET':
+            asset = {child.tag: child.text or '' for child in elem if child.text}
+        elif elem.tag == 'VULN':
+            vuln_num = None
+            for data in elem.iter('STIG_DATA'):
+                if data.findtext('VULN_ATTRIBUTE') == 'Vuln_Num':
+                    vuln_num = data.findtext('ATTRIBUTE_DATA')
+                    break
+            if vuln_num:
+                entries[vuln_num] = OrderedDict([
+                    ('status', elem.findtext('STATUS') or 'Not_Reviewed'),
+                    ('finding_details', elem.findtext('FINDING_DETAILS') or ''),
+                    ('comments', elem.findtext('COMMENTS') or ''),
+                    ('severity_override', elem.findtext('SEVERITY_OVERRIDE') or ''),
+                    ('severity_justification', elem.findtext('SEVERITY_JUSTIFICATION') or ''),
+                ])
+            elem.clear()
+    return asset, entries
+
+
+def asset_fields(host, results, inventory, previous):
+    """CKL asset elements: results first, then the inventory entry, then the existing checklist"""
+    asset = OrderedDict(ASSET_FIELDS)
+    asset['HOST_NAME'] = host
+    sources = [result['data'] for result in results[:1]] + [inventory or {}]
+    for element, keys in ASSET_KEYS.items():
+        value = next((str(source[key]) for source in sources for key in keys if source.get(key)), '')
+        asset[element] = value or previous.get(element) or asset[element]
+    if previous.get('TARGET_KEY'):
+        asset['TARGET_KEY'] = previous['TARGET_KEY']
+    if asset['WEB_DB_SITE'] or asset['WEB_DB_INSTANCE'] or previous.get('WEB_OR_DATABASE') == 'true':
+        asset['WEB_OR_DATABASE'] = 'true'
+    return asset
+
+
+################################################################################
+# WRITERS
+################################################################################
+
+def xml_text(value):
+    return escape(INVALID_XML_CHARS.sub('', str(value)))
+
+
+def write_ckl(f, asset, info, rules):
+    """Stream a .ckl: rules is an iterable of (ChecklistRule, entry)"""
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write(f'<!--DISA STIG Viewer :: {STIG_VIEWER_VERSION}-->\n<CHECKLIST>\n\t<ASSET>\n')
+    for element, value in asset.items():
+        f.write(f"\t\t<{element}>{xml_text(value)}</{element}>\n")
+    f.write('\t</ASSET>\n\t<STIGS>\n\t\t<iSTIG>\n\t\t\t<STIG_INFO>\n')
+    for name, value in info.items():
+        if name == 'stigref':
+            continue
+        data = f"<SID_DATA>{xml_text(value)}</SID_DATA>" if value else ''
+        f.write(f"\t\t\t\t<SI_DATA>\n\t\t\t\t\t<SID_NAME>{name}</SID_NAME>{data}\n\t\t\t\t</SI_DATA>\n")
+    f.write('\t\t\t</STIG_INFO>\n')
+    for rule, entry in rules:
+        parts = ['\t\t\t<VULN>\n', rule.ckl_data()]
+        for key in ('status', 'finding_details', 'comments', 'severity_override', 'severity_justification'):
+            parts.append(f"\t\t\t\t<{key.upper()}>{xml_text(entry[key])}</{key.upper()}>\n")
+        parts.append('\t\t\t</VULN>\n')
+        f.write(''.join(parts))
+    f.write('\t\t</iSTIG>\n\t</STIGS>\n</CHECKLIST>\n')
+
+
+def write_cklb(f, asset, info, rules, size, checklist_id):
+    """Stream a .cklb (STIG Viewer 3 JSON): rules is an iterable of (ChecklistRule, entry)"""
+    target = OrderedDict((key, asset.get(element, '')) for element, key in CKLB_TARGET.items())
+    target['is_web_database'] = asset.get('WEB_OR_DATABASE') == 'true'
+    stig = OrderedDict([
+        ('stig_name', info['title']),
+        ('display_name', info['title'].replace(' Security Technical Implementation Guide', '')),
+        ('stig_id', info['stigid']),
+        ('release_info', info['releaseinfo']),
+        ('version', info['version']),
+        ('uuid', info['uuid']),
+        ('reference_identifier', ''),
+        ('size', size),
+    ])
+    head = OrderedDict([
+        ('title', f"{asset['HOST_NAME']} - {stig['display_name']}"),
+        ('id', checklist_id),
+        ('active', False),
+        ('mode', 1),
+        ('has_path', True),
+        ('target_data', target),
+        ('cklb_version', '1.0'),
+    ])
+    f.write(json.dumps(head, indent=1)[:-2] + ',\n "stigs": [\n  ' + json.dumps(stig)[:-1] + ', "rules": [')
+    now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    for i, (rule, entry) in enumerate(rules):
+        overrides = {}
+        if entry['severity_override']:
+            overrides['severity'] = {'severity': entry['severity_override'], 'reason': entry['severity_justification']}
+        result = OrderedDict([
+            ('createdAt', now),
+            ('updatedAt', now),
+            ('status', CKLB_STATUS[entry['status']]),
+            ('overrides', overrides),
+            ('comments', entry['comments']),
+            ('finding_details', entry['finding_details']),
+        ])
+        rule_uuid = uuid.uuid5(CHECKLIST_NAMESPACE, f"{checklist_id}:{rule.vuln_num}")
+        f.write(f"{',' if i else ''}\n   {{\"uuid\": \"{rule_uuid}\", {rule.cklb_fields()}, {json.dumps(result)[1:]}")
+    f.write('\n  ]}\n ]\n}\n')
+
+
+################################################################################
+# EXPORT
+################################################################################
+
+_worker = {}
+
+
+def init_worker(db_path, benchmarks):
+    """Open the result database once per worker process"""
+    _worker['store'] = scan_results.ResultStore(db_path, readonly=True)
+    _worker['benchmarks'] = benchmarks
+    _worker['cache'] = {}
+
+
+def catalog_record(vuln_id, stig_id):
+    """Benchmark record of a rule from the rule catalog, when one is built"""
+    if 'catalog' not in _worker:
+        try:
+            _worker['catalog'] = stig_catalog.Catalog(readonly=True)
+        except stig_catalog.CatalogError:
+            _worker['catalog'] = None
+    catalog = _worker['catalog']
+    if catalog is None or not vuln_id:
+        return None
+    rules = catalog.find(group_id=vuln_id)
+    rule = next((r for r in rules if stig_id and r['stig_id'] == stig_id), rules[0] if rules else None)
+    return catalog.record(rule['id']) if rule else None
+
+
+def platform_benchmark(platform):
+    """STIG info and ChecklistRules of a platform's benchmark, built once per worker"""
+    cache = _worker['cache']
+    if platform not in cache:
+        records = load_benchmark(platform, _worker['benchmarks'].get(platform))
+        info = stig_info(records, platform)
+        cache[platform] = (info, [ChecklistRule(record, info) for record in records]) if records else (None, [])
+    return cache[platform]
+
+
+def checklist_path(output_dir, host, platform, fmt):
+    safe = re.sub(r'[^A-Za-z0-9_.#-]+', '_', host).strip('_') or 'host'
+    return Path(output_dir) / safe / f"{safe}_{platform}.{fmt}"
+
+
+def previous_checklist(path, merge_from, output_dir):
+    """Existing checklist to merge: same place under merge_from, either format"""
+    base = Path(merge_from) / Path(path).relative_to(output_dir) if merge_from else Path(path)
+    for candidate in (base, base.with_suffix('.ckl' if base.suffix == '.cklb' else '.cklb')):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def export_checklist(job):
+    """
+    Worker: write one host's checklist of one platform.
+
+    Returns:
+        dict: path, rules, results, merged (existing checklist path or None), error
+    """
+    scan_id, host, platform, path, fmt, merge_from, output_dir, inventory = job
+    outcome = {'host': host, 'platform': platform, 'path': str(path), 'rules': 0, 'results': 0,
+               'merged': None, 'error': None}
+    try:
+        results = list(_worker['store'].results(scan_id, host, platform))
+        outcome['results'] = len(results)
+        by_vuln = {r['vuln_id'] or r['rule']: r for r in results}
+        # Results stored before the rule name was split into IDs carry it only in 'rule'
+        by_stig = {r['stig_id'] or r['rule']: r for r in results if r['stig_id'] or r['rule']}
+
+        previous_asset, previous = {}, {}
+        source = previous_checklist(path, merge_from, output_dir) if merge_from is not False else None
+        if source is not None:
+            previous_asset, previous = read_checklist(source)
+            outcome['merged'] = str(source)
+
+        info, rules = platform_benchmark(platform)
+        matched = set()
+        rows = []
+        for rule in rules:
+            result = by_vuln.get(rule.vuln_num) or by_stig.get(rule.stig_id)
+            if result is not None:
+                matched.add(id(result))
+            rows.append((rule, result))
+        extra = [result for result in results if id(result) not in matched]
+        if extra:
+            # Rules outside the benchmark dump (or a platform without one): catalog records, else the results
+            records = [(None if rules else catalog_record(r['vuln_id'], r['stig_id'])) or result_record(r)
+                       for r in extra]
+            info = info or stig_info([record for record in records if 'Benchmark Name' in record], platform)
+            rows.extend((ChecklistRule(record, info), result) for record, result in zip(records, extra))
+        info = info or stig_info([], platform)
+        asset = asset_fields(host, results, inventory, previous_asset)
+
+        def entries():
+            for rule, result in rows:
+                yield rule, merge_entry(scan_entry(result), previous.get(rule.vuln_num))
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+                if fmt == 'cklb':
+                    checklist_id = str(uuid.uuid5(CHECKLIST_NAMESPACE, f"{host}:{platform}"))
+                    write_cklb(f, asset, info, entries(), len(rows), checklist_id)
+                else:
+                    write_ckl(f, asset, info, entries())
+            os.chmod(temp, 0o644)
+            os.replace(temp, str(path))
+        except BaseException:
+            os.unlink(temp)
+            raise
+        outcome['rules'] = len(rows)
+    except Exception as e:
+        outcome['error'] = f"{type(e).__name__}: {e}"
+    return outcome
+
+
+def load_inventory(path):
+    """Host -> asset fields from a CSV (header row with a host column) or JSON inventory"""
+    with open(path, encoding='utf-8', newline='') as f:
+        if str(path).endswith('.json'):
+            return {str(host): dict(fields) for host, fields in json.load(f).items()}
+        return {row['host']: {k: v for k, v in row.items() if k != 'host' and v}
+                for row in csv.DictReader(f) if row.get('host')}
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Export STIG Viewer checklists (.ckl/.cklb) per host and STIG from scan results',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--db', help='Result database (default: $STIG_RESULTS_DB or scan_results.db)')
+    parser.add_argument('--scan', help='Scan ID (default: the latest scan)')
+    parser.add_argument('--host', help='Only this host')
+    parser.add_argument('--platform', help='Only this platform')
+    parser.add_argument('--format', choices=FORMATS, default='ckl', help='Checklist format (default: ckl)')
+    parser.add_argument('--output-dir', default='checklists', help='Directory for <host>/<host>_<platform> checklists')
+    parser.add_argument('--merge-from', help='Directory of earlier checklists to merge (default: the output directory)')
+    parser.add_argument('--no-merge', action='store_true', help='Overwrite existing checklists instead of merging')
+    parser.add_argument('--inventory', help='CSV or JSON with FQDN, IP address and other asset fields per host')
+    parser.add_argument('--benchmark', action='append', default=[], metavar='PLATFORM=FILE',
+                        help='Benchmark dump for a platform (may be repeated; default: <platform>_checks.json)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    benchmarks = {}
+    for value in args.benchmark:
+        platform, sep, path = value.partition('=')
+        if not sep:
+            parser.error(f"--benchmark expects PLATFORM=FILE, got {value}")
+        benchmarks[platform] = path
+
+    try:
+        inventory = load_inventory(args.inventory) if args.inventory else {}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Cannot read inventory: {e}")
+        return 3
+
+    try:
+        store = scan_results.ResultStore(args.db, readonly=True)
+    except scan_results.ResultStoreError as e:
+        print(f"ERROR: {e}")
+        return 3
+    with store:
+        scan_id = args.scan or store.latest_scan()
+        targets = store.targets(scan_id, args.host, args.platform) if scan_id else []
+        db_path = str(store.path)
+
+    if not targets:
+        print("No results to export")
+        return 1
+
+    output_dir = Path(args.output_dir)
+    # False: never merge; None: merge the checklist being replaced
+    merge_from = False if args.no_merge else args.merge_from
+    jobs = ((scan_id, host, platform, checklist_path(output_dir, host, platform, args.format), args.format,
+             merge_from, output_dir,
+             inventory.get(host)) for host, platform in targets)
+
+    print("=" * 80)
+    print("STIG Checklist Export")
+    print("=" * 80)
+    print(f"Scan: {scan_id}")
+    print(f"Checklists: {len(targets)} ({args.format})")
+    print(f"Workers: {args.workers}")
+    print()
+
+    started = time.monotonic()
+    written = merged = rules = 0
+    errors = []
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=init_worker,
+                             initargs=(db_path, benchmarks)) as executor:
+        for i, outcome in enumerate(executor.map(export_checklist, jobs, chunksize=8), 1):
+            if outcome['error']:
+                errors.append(outcome)
+            else:
+                written += 1
+                rules += outcome['rules']
+                merged += bool(outcome['merged'])
+            if i % 500 == 0 or i == len(targets):
+                print(f"  Progress: {i}/{len(targets)} checklists")
+    elapsed = time.monotonic() - started
+
+    for outcome in errors:
+        print(f"ERROR: {outcome['host']} {outcome['platform']}: {outcome['error']}")
+    print()
+    print(f"{written} checklists ({rules} rules, {merged} merged with existing checklists) "
+          f"written to {output_dir}/ in {elapsed:.1f}s")
+    return 3 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -82,21 +82,27 @@ fi
 
 # Get Apache configuration root and main config file
 get_apache_config() {
-    # Try apachectl first
-    if command -v apachectl &> /dev/null; then
-        HTTPD_ROOT=$(apachectl -V 2>/dev/null | grep -i "HTTPD_ROOT" | cut -d'"' -f2)
-        SERVER_CONFIG=$(apachectl -V 2>/dev/null | grep -i "SERVER_CONFIG_FILE" | cut -d'"' -f2)
-    # Try apache2ctl
-    elif command -v apache2ctl &> /dev/null; then
-        HTTPD_ROOT=$(apache2ctl -V 2>/dev/null | grep -i "HTTPD_ROOT" | cut -d'"' -f2)
-        SERVER_CONFIG=$(apache2ctl -V 2>/dev/null | grep -i "SERVER_CONFIG_FILE" | cut -d'"' -f2)
-    # Try httpd directly
-    elif command -v httpd &> /dev/null; then
-        HTTPD_ROOT=$(httpd -V 2>/dev/null | grep -i "HTTPD_ROOT" | cut -d'"' -f2)
-        SERVER_CONFIG=$(httpd -V 2>/dev/null | grep -i "SERVER_CONFIG_FILE" | cut -d'"' -f2)
-    else
-        echo "ERROR: Apache not found (apachectl, apache2ctl, or httpd)"
-        return 1
+    # Prefer the shared facts cache so -V runs once per scan (apache_facts.py)
+    local facts_tool
+    facts_tool="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/apache_facts.py"
+    if [[ -f "$facts_tool" ]] && command -v python3 &> /dev/null; then
+        eval "$(python3 "$facts_tool" --shell 2>/dev/null)"
+    fi
+
+    if [[ -z "$HTTPD_ROOT" || -z "$SERVER_CONFIG" ]]; then
+        local ctl
+        for ctl in apachectl apache2ctl httpd; do
+            command -v "$ctl" &> /dev/null && break
+            ctl=""
+        done
+        if [[ -z "$ctl" ]]; then
+            echo "ERROR: Apache not found (apachectl, apache2ctl, or httpd)"
+            return 1
+        fi
+        local settings
+        settings=$("$ctl" -V 2>/dev/null)
+        HTTPD_ROOT=$(echo "$settings" | grep -i "HTTPD_ROOT" | cut -d'"' -f2)
+        SERVER_CONFIG=$(echo "$settings" | grep -i "SERVER_CONFIG_FILE" | cut -d'"' -f2)
     fi
 
     # Construct full config path
@@ -111,9 +117,35 @@ get_apache_config() {
         return 1
     fi
 
+    # Every file pulled in through Include/IncludeOptional (apache_config.py)
+    APACHE_CONFIG_FILES=("$HTTPD_CONF")
+    local config_tool
+    config_tool="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/apache_config.py"
+    if [[ -f "$config_tool" ]] && command -v python3 &> /dev/null; then
+        mapfile -t APACHE_CONFIG_FILES < <(python3 "$config_tool" --config "$HTTPD_CONF" \
+            --server-root "$HTTPD_ROOT" --files 2>/dev/null)
+        [[ ${#APACHE_CONFIG_FILES[@]} -eq 0 ]] && APACHE_CONFIG_FILES=("$HTTPD_CONF")
+    fi
+
     return 0
 }
 
+# Effective server-level value of a directive (last one wins) from the parsed
+# configuration tree; falls back to grep over APACHE_CONFIG_FILES
+get_apache_directive() {
+    local config_tool
+    config_tool="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/apache_config.py"
+    if [[ -f "$config_tool" ]] && command -v python3 &> /dev/null; then
+        python3 "$config_tool" --config "$HTTPD_CONF" --server-root "$HTTPD_ROOT" --value "$1" 2>/dev/null
+        return
+    fi
+
+    local value
+    value=$(grep -ih "^[[:space:]]*$1[[:space:]]" "${APACHE_CONFIG_FILES[@]}" 2>/dev/null | tail -1 |
+        sed -E 's/^[[:space:]]*[^[:space:]]+[[:space:]]+//')
+    [[ -n "$value" ]] && echo "$value"
+}
+
 ################################################################################
 # CHECK IMPLEMENTATION
 ################################################################################
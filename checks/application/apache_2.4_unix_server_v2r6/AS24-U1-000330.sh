@@ -112,8 +112,9 @@ main() {
         exit 3
     fi
 
-    # List loaded modules
-    modules=$(apachectl -M 2>/dev/null || httpd -M 2>/dev/null)
+    # List loaded modules (shared facts cache first, so -M runs once per scan)
+    facts_tool="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/apache_facts.py"
+    modules=$(python3 "$facts_tool" --modules 2>/dev/null || apachectl -M 2>/dev/null || httpd -M 2>/dev/null)
 
     if [[ -z "$modules" ]]; then
         echo "ERROR: Unable to list Apache modules"
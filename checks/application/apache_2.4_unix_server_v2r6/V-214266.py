@@ -47,36 +47,22 @@ def load_config(config_file):
 
 
 def get_apache_config():
-    """Get Apache configuration paths."""
-    commands = ['apachectl', 'apache2ctl', 'httpd']
-
-    for cmd in commands:
-        try:
-            result = subprocess.run(
-                [cmd, '-V'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                httpd_root = None
-                server_config = None
-
-                for line in result.stdout.split('\n'):
-                    if 'HTTPD_ROOT' in line:
-                        httpd_root = line.split('"')[1]
-                    if 'SERVER_CONFIG_FILE' in line:
-                        server_config = line.split('"')[1]
-
-                if httpd_root and server_config:
-                    if server_config.startswith('/'):
-                        return server_config
-                    else:
-                        return f"{httpd_root}/{server_config}"
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            continue
-
-    return None
+    """Get the parsed Apache configuration tree (Include/IncludeOptional resolved)."""
+    # Shared parser and cache (apache_config.py) so directives in conf.d/,
+    # sites-enabled/ and other included files are seen; -V runs once per scan
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import apache_config
+    except ImportError:
+        return None
+    return apache_config.load_apache_config()
+
+
+def get_directive(config, name, default=None):
+    """Effective server-level value of a directive (last one wins)."""
+    if config is None:
+        return default
+    return config.value(name, default)
 
 
 def run_check(config=None):
@@ -103,27 +103,17 @@ EOF
 ################################################################################
 
 main() {
-    # Check BIND named process
-    process=$(ps -ef | grep named | grep -v grep)
+    # Evaluate against the parsed named.conf model (includes, views and the
+    # chroot prefix of the running named are resolved by bind_config.py)
+    BIND_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/bind_config.py"
 
-    if [[ -z "$process" ]]; then
-        echo "ERROR: named process not running"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "Service not running" ""
+    if [[ ! -f "$BIND_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+        echo "ERROR: bind_config.py or python3 not available"
+        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "bind_config.py or python3 not available" ""
         exit 3
     fi
 
-    echo "INFO: named process found:"
-    echo "$process"
-    echo ""
-
-    # Check for required arguments
-    echo "MANUAL REVIEW REQUIRED: Verify process arguments meet STIG requirements"
-    echo "Expected: "-t" and "-u""
-    echo "Current: $process"
-
-    [[ -n "$OUTPUT_JSON" ]] && output_json "MANUAL" "Process check requires validation" "$process"
-    exit 2  # Manual review required
-
+    exec python3 "$BIND_CONFIG_TOOL" --rule "$STIG_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
 }
 
 # Run main check
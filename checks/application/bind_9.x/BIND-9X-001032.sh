@@ -109,42 +109,17 @@ EOF
 ################################################################################
 
 main() {
-    # Locate BIND configuration file
-    NAMED_CONF="/etc/named.conf"
-
-    # Check common locations
-    if [[ ! -f "$NAMED_CONF" ]]; then
-        for conf in "/etc/bind/named.conf" "/var/named/chroot/etc/named.conf"; do
-            if [[ -f "$conf" ]]; then
-                NAMED_CONF="$conf"
-                break
-            fi
-        done
-    fi
+    # Evaluate against the parsed named.conf model (includes, views and the
+    # chroot prefix of the running named are resolved by bind_config.py)
+    BIND_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/bind_config.py"
 
-    if [[ ! -f "$NAMED_CONF" ]]; then
-        echo "ERROR: named.conf not found in standard locations"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "Config file not found" ""
+    if [[ ! -f "$BIND_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+        echo "ERROR: bind_config.py or python3 not available"
+        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "bind_config.py or python3 not available" ""
         exit 3
     fi
 
-    echo "INFO: Found BIND configuration: $NAMED_CONF"
-    echo ""
-
-    # Display relevant configuration sections
-    echo "Configuration preview:"
-    grep -E "^[[:space:]]*(logging|options|zone|acl|view)" "$NAMED_CONF" | head -20
-    echo ""
-
-    echo "MANUAL REVIEW REQUIRED: Review BIND configuration for STIG compliance"
-    echo "Configuration file: $NAMED_CONF"
-    echo "Required settings: logging, channel, file, category"
-    echo ""
-    echo "This check requires manual examination of BIND configuration"
-
-    [[ -n "$OUTPUT_JSON" ]] && output_json "MANUAL" "Configuration requires validation" "$NAMED_CONF"
-    exit 2  # Manual review required
-
+    exec python3 "$BIND_CONFIG_TOOL" --rule "$STIG_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
 }
 
 # Run main check
@@ -122,21 +122,17 @@ EOF
 ################################################################################
 
 main() {
-    SVC="syslog"
+    # Evaluate against the parsed named.conf model (includes, views and the
+    # chroot prefix of the running named are resolved by bind_config.py)
+    BIND_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/bind_config.py"
 
-    running=$(systemctl is-active "$SVC" 2>/dev/null)
-    enabled=$(systemctl is-enabled "$SVC" 2>/dev/null)
-
-    if [[ "$running" == "active" ]] && [[ "$enabled" == "enabled" ]]; then
-        echo "FAIL: Service should not be running"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "FAIL" "Should not run" "$SVC"
-        exit 1
-    else
-        echo "PASS: Service disabled (compliant)"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "PASS" "Disabled" "$SVC"
-        exit 0
+    if [[ ! -f "$BIND_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+        echo "ERROR: bind_config.py or python3 not available"
+        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "bind_config.py or python3 not available" ""
+        exit 3
     fi
 
+    exec python3 "$BIND_CONFIG_TOOL" --rule "$STIG_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
 }
 
 # Run main check
@@ -108,30 +108,17 @@ EOF
 ################################################################################
 
 main() {
-    # Check BIND version
-    if ! command -v named &>/dev/null; then
-        echo "ERROR: named command not found"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "BIND not installed" ""
-        exit 3
-    fi
-
-    version=$(named -v 2>&1)
+    # Evaluate against the parsed named.conf model (includes, views and the
+    # chroot prefix of the running named are resolved by bind_config.py)
+    BIND_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/bind_config.py"
 
-    if [[ -z "$version" ]]; then
-        echo "ERROR: Unable to determine BIND version"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "Version check failed" ""
+    if [[ ! -f "$BIND_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+        echo "ERROR: bind_config.py or python3 not available"
+        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "bind_config.py or python3 not available" ""
         exit 3
     fi
 
-    echo "INFO: BIND version detected:"
-    echo "$version"
-    echo ""
-    echo "MANUAL REVIEW REQUIRED: Verify version is Current-Stable per ISC"
-    echo "Reference: https://www.isc.org/downloads/"
-
-    [[ -n "$OUTPUT_JSON" ]] && output_json "MANUAL" "Version requires validation" "$version"
-    exit 2  # Manual review required
-
+    exec python3 "$BIND_CONFIG_TOOL" --rule "$STIG_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
 }
 
 # Run main check
@@ -105,24 +105,17 @@ EOF
 ################################################################################
 
 main() {
-    CONFIG="/etc/named.conf""
+    # Validate the zones listed in named.conf in one streaming pass per zone
+    # (signatures, key algorithms, NSEC3) with dns_zone_validator.py
+    ZONE_VALIDATOR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/dns_zone_validator.py"
 
-    if [[ ! -f "$CONFIG" ]]; then
-        echo "ERROR: Config file not found"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "File not found" "$CONFIG"
+    if [[ ! -f "$ZONE_VALIDATOR" ]] || ! command -v python3 &>/dev/null; then
+        echo "ERROR: dns_zone_validator.py or python3 not available"
+        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "dns_zone_validator.py or python3 not available" ""
         exit 3
     fi
 
-    if grep -q "Unknown" "$CONFIG"; then
-        echo "PASS: Directive found in config"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "PASS" "Configured" "Unknown"
-        exit 0
-    else
-        echo "FAIL: Directive not found"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "FAIL" "Not configured" "Unknown"
-        exit 1
-    fi
-
+    exec python3 "$ZONE_VALIDATOR" --rule "$STIG_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
 }
 
 # Run main check
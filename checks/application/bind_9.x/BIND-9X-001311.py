@@ -64,6 +64,15 @@ def get_bind_version():
 
 def check_chroot():
     """Check if BIND is running in chroot."""
+    # Read the named command line from /proc (bind_config.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import bind_config
+        process = bind_config.find_named_process()
+        return process['cmdline'] if process else None
+    except ImportError:
+        pass
+
     try:
         result = subprocess.run(
             ['ps', '-ef'],
@@ -81,6 +90,16 @@ def check_chroot():
 
 def get_bind_config():
     """Get BIND configuration file path."""
+    # Prefer the shared parsed model so named.conf is read once per scan (bind_config.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import bind_config
+        config = bind_config.load_bind_config()
+        if config is not None:
+            return config.config_file
+    except ImportError:
+        pass
+
     config_locations = [
         '/etc/named.conf',
         '/etc/bind/named.conf',
@@ -105,16 +124,14 @@ def run_check(config=None):
     Returns:
         tuple: (status, finding_details, exit_code)
     """
-    # TODO: Implement the actual check logic
-    #
-    # This is a placeholder that requires BIND domain expertise.
-    # Review the official STIG documentation for detailed check and fix procedures.
-
-    status = "Not Implemented"
-    finding_details = "Check logic not yet implemented - requires BIND domain expertise"
-    exit_code = 2
+    # Validate the zone files in one streaming pass (dns_zone_validator.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import dns_zone_validator
+    except ImportError:
+        return "ERROR", "dns_zone_validator.py not available", 3
 
-    return status, finding_details, exit_code
+    return dns_zone_validator.run_rule(STIG_ID)
 
 
 def output_json(result, output_file):
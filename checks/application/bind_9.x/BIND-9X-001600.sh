@@ -110,34 +110,17 @@ EOF
 ################################################################################
 
 main() {
-    # Generic BIND configuration check
-    echo "INFO: Checking BIND installation and configuration"
-    echo ""
-
-    # Check if BIND is installed
-    if command -v named &>/dev/null; then
-        version=$(named -v 2>&1)
-        echo "BIND version: $version"
-    else
-        echo "WARNING: named command not found"
+    # Validate the zones listed in named.conf in one streaming pass per zone
+    # (signatures, key algorithms, NSEC3) with dns_zone_validator.py
+    ZONE_VALIDATOR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/dns_zone_validator.py"
+
+    if [[ ! -f "$ZONE_VALIDATOR" ]] || ! command -v python3 &>/dev/null; then
+        echo "ERROR: dns_zone_validator.py or python3 not available"
+        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "dns_zone_validator.py or python3 not available" ""
+        exit 3
     fi
-    echo ""
-
-    # Check for configuration file
-    for conf in "/etc/named.conf" "/etc/bind/named.conf" "/var/named/chroot/etc/named.conf"; do
-        if [[ -f "$conf" ]]; then
-            echo "Configuration file: $conf"
-            break
-        fi
-    done
-    echo ""
-
-    echo "MANUAL REVIEW REQUIRED: Review BIND configuration for STIG compliance"
-    echo "This check requires manual examination of BIND settings"
-
-    [[ -n "$OUTPUT_JSON" ]] && output_json "MANUAL" "BIND check requires manual validation" ""
-    exit 2  # Manual review required
 
+    exec python3 "$ZONE_VALIDATOR" --rule "$STIG_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
 }
 
 # Run main check
@@ -64,6 +64,15 @@ def get_bind_version():
 
 def check_chroot():
     """Check if BIND is running in chroot."""
+    # Read the named command line from /proc (bind_config.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import bind_config
+        process = bind_config.find_named_process()
+        return process['cmdline'] if process else None
+    except ImportError:
+        pass
+
     try:
         result = subprocess.run(
             ['ps', '-ef'],
@@ -81,6 +90,16 @@ def check_chroot():
 
 def get_bind_config():
     """Get BIND configuration file path."""
+    # Prefer the shared parsed model so named.conf is read once per scan (bind_config.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import bind_config
+        config = bind_config.load_bind_config()
+        if config is not None:
+            return config.config_file
+    except ImportError:
+        pass
+
     config_locations = [
         '/etc/named.conf',
         '/etc/bind/named.conf',
@@ -26,43 +26,19 @@ Registry Check:
 import argparse
 import json
 import sys
-import winreg
+from pathlib import Path
 from typing import Dict, Any
 
-def check_registry_value(hive, key_path, value_name, expected_value, value_type):
-    """
-    Check a registry value against expected value.
-
-    Args:
-        hive: Registry hive (e.g., winreg.HKEY_CURRENT_USER)
-        key_path: Registry key path
-        value_name: Registry value name
-        expected_value: Expected value
-        value_type: Registry value type
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
-    Returns:
-        Tuple of (status, details)
-    """
-    try:
-        key = winreg.OpenKey(hive, key_path, 0, winreg.KEY_READ)
-        value, reg_type = winreg.QueryValueEx(key, value_name)
-        winreg.CloseKey(key)
-
-        # TODO: Implement proper value comparison based on type
-        # This is a placeholder implementation
-
-        return "Not_Reviewed", "Automated check not yet implemented"
-    except FileNotFoundError:
-        return "FAIL", f"Registry key or value not found: {key_path}\\{value_name}"
-    except Exception as e:
-        return "ERROR", f"Error reading registry: {str(e)}"
-
-def perform_check(config: Dict[str, Any] = None) -> Dict[str, Any]:
+def perform_check(config: Dict[str, Any] = None, hives: str = None, reg_files=None) -> Dict[str, Any]:
     """
     Perform the STIG check.
 
     Args:
         config: Optional configuration dictionary
+        hives: Directory of collected hive files (default: $STIG_HIVE_DIR)
+        reg_files: .reg export files (default: $STIG_REG_EXPORT, else the live registry)
 
     Returns:
         Dictionary containing check results
@@ -77,28 +53,17 @@ def perform_check(config: Dict[str, Any] = None) -> Dict[str, Any]:
     }
 
     try:
-        # Registry check configuration
-        hive = winreg.HKEY_CURRENT_USER
-        key_path = r"HKCU\Software\Policies\Microsoft\Office\16.0\excel\security\fileblock"
-        value_name = "XL4Macros"
-        expected_value = 2
-        value_type = "DWORD"
-
-        # TODO: Implement registry check
-        # status, details = check_registry_value(hive, key_path, value_name, expected_value, value_type)
-        # result["Status"] = status
-        # result["Finding_Details"] = details
-
-        # Placeholder
-        result["Status"] = "Not_Reviewed"
-        result["Comments"] = "Automated check not yet implemented - requires Office domain expertise"
-        result["Finding_Details"] = "This check requires registry validation"
-
-    except Exception as e:
+        import windows_registry
+    except ImportError as e:
         result["Status"] = "ERROR"
-        result["Finding_Details"] = f"Error: {str(e)}"
-        result["Comments"] = "Script execution failed"
-
+        result["Finding_Details"] = f"Error: {e}"
+        result["Comments"] = "windows_registry.py not found in the repository root"
+        return result
+
+    status, details, _ = windows_registry.run_rule(result["STIG_ID"], Path(__file__).resolve().parent.name,
+                                                   hives, reg_files)
+    result["Status"] = status
+    result["Finding_Details"] = details
     return result
 
 def main():
@@ -117,6 +82,16 @@ def main():
         help='Output results in JSON format',
         action='store_true'
     )
+    parser.add_argument(
+        '--hives',
+        help='Directory of collected hive files (default: $STIG_HIVE_DIR, else the live registry)',
+        type=str
+    )
+    parser.add_argument(
+        '--reg',
+        help='.reg export file to evaluate (may be repeated; default: $STIG_REG_EXPORT)',
+        action='append'
+    )
 
     args = parser.parse_args()
 
@@ -130,7 +105,7 @@ def main():
             print(f"Warning: Failed to load configuration file: {e}", file=sys.stderr)
 
     # Perform the check
-    result = perform_check(config)
+    result = perform_check(config, args.hives, args.reg)
 
     # Output results
     if args.output_json:
@@ -144,6 +119,9 @@ def main():
 
     # Exit with appropriate code
     exit_codes = {
+        "NotAFinding": 0,
+        "Open": 1,
+        "Not_Applicable": 2,
         "PASS": 0,
         "FAIL": 1,
         "Not_Reviewed": 2,
@@ -120,38 +120,17 @@ main() {
         exit 3
     fi
 
-    # Search for configuration files
-    CONF_FILE=""
-    for file in "$DOMAIN_HOME"/config/fmwconfig/components/OHS/*/httpd.conf \
-                "$DOMAIN_HOME"/config/fmwconfig/components/OHS/*/ssl.conf \
-                "$DOMAIN_HOME"/config/fmwconfig/components/OHS/*/*.conf; do
-        if [[ -f "$file" ]]; then
-            CONF_FILE="$file"
-            break
-        fi
-    done
+    # Evaluate every OHS component in the domain (httpd.conf include tree,
+    # ssl.conf, admin.conf, mod_wl_ohs.conf and nodemanager properties)
+    OHS_SCAN_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/ohs_component_scan.py"
 
-    if [[ -z "$CONF_FILE" ]]; then
-        echo "ERROR: Configuration file not found"
-        echo "Expected location: $DOMAIN_HOME/config/fmwconfig/components/OHS/<componentName>/httpd.conf"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "Config file not found" ""
+    if [[ ! -f "$OHS_SCAN_TOOL" ]] || ! command -v python3 &>/dev/null; then
+        echo "ERROR: ohs_component_scan.py or python3 not available"
+        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "ohs_component_scan.py or python3 not available" ""
         exit 3
     fi
 
-    echo "INFO: Found configuration file: $CONF_FILE"
-    echo ""
-
-    # Display relevant directives
-    echo "Checking for directive: SSLCipherSuite"
-    grep -i "SSLCipherSuite" "$CONF_FILE" 2>/dev/null || echo "Directive not found"
-    echo ""
-
-    echo "MANUAL REVIEW REQUIRED: Verify directive value meets STIG requirements"
-    echo "Configuration file: $CONF_FILE"
-    echo "Required directive: SSLCipherSuite"
-
-    [[ -n "$OUTPUT_JSON" ]] && output_json "MANUAL" "Config check requires validation" "$CONF_FILE"
-    exit 2  # Manual review required
+    exec python3 "$OHS_SCAN_TOOL" --domain-home "$DOMAIN_HOME" --rule "$STIG_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
 
 }
 
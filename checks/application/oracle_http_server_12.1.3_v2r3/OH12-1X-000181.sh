@@ -119,37 +119,17 @@ main() {
         exit 3
     fi
 
-    # Search for properties file
-    PROPS_FILE=""
-    for file in "$DOMAIN_HOME"/config/fmwconfig/components/OHS/*/ohs.plugins.nodemanager.properties \
-                "$DOMAIN_HOME"/config/fmwconfig/components/OHS/*/*.properties; do
-        if [[ -f "$file" ]]; then
-            PROPS_FILE="$file"
-            break
-        fi
-    done
+    # Evaluate every OHS component in the domain (httpd.conf include tree,
+    # ssl.conf, admin.conf, mod_wl_ohs.conf and nodemanager properties)
+    OHS_SCAN_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/ohs_component_scan.py"
 
-    if [[ -z "$PROPS_FILE" ]]; then
-        echo "ERROR: Properties file not found"
-        echo "Expected location: $DOMAIN_HOME/nodemanager/nodemanager.properties"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "Properties file not found" ""
+    if [[ ! -f "$OHS_SCAN_TOOL" ]] || ! command -v python3 &>/dev/null; then
+        echo "ERROR: ohs_component_scan.py or python3 not available"
+        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "ohs_component_scan.py or python3 not available" ""
         exit 3
     fi
 
-    echo "INFO: Found properties file: $PROPS_FILE"
-    echo ""
-
-    # Display relevant properties
-    echo "Checking for property: AuthenticationEnabled"
-    grep -i "AuthenticationEnabled" "$PROPS_FILE" 2>/dev/null || echo "Property not found"
-    echo ""
-
-    echo "MANUAL REVIEW REQUIRED: Verify property value meets STIG requirements"
-    echo "Properties file: $PROPS_FILE"
-    echo "Required property: AuthenticationEnabled"
-
-    [[ -n "$OUTPUT_JSON" ]] && output_json "MANUAL" "Properties check requires validation" "$PROPS_FILE"
-    exit 2  # Manual review required
+    exec python3 "$OHS_SCAN_TOOL" --domain-home "$DOMAIN_HOME" --rule "$STIG_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
 
 }
 
@@ -72,7 +72,7 @@ class STIGCheck:
             return 3
 
         if not WLST_AVAILABLE:
-            return self._run_wlst_subprocess()
+            return self._run_batch_lookup()
 
         try:
             # Connect to WebLogic Admin Server
@@ -137,6 +137,28 @@ class STIGCheck:
             except:
                 pass
 
+    def _run_batch_lookup(self):
+        """Look the rule up in the shared WLST batch document (weblogic_wlst.py)"""
+        sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+        try:
+            import weblogic_wlst
+        except ImportError:
+            return self._run_wlst_subprocess()
+
+        # One WLST session serves every WebLogic rule; later checks reuse the cached document.
+        # Rules outside the batch are manual and must not trigger a collection (admin login)
+        document = None
+        if self.results['stig_id'] in weblogic_wlst.BATCH_RULES:
+            credentials = weblogic_wlst.resolve_credentials(self.admin_url, self.username, self.password)
+            document = weblogic_wlst.load_document(credentials)
+        status, details = weblogic_wlst.lookup(document, self.results['stig_id'])
+        if status == 'Not_Reviewed' and document is not None and not document.get('domain'):
+            status, details = 'ERROR', 'WLST collection failed: ' + '; '.join(document.get('errors', []))
+
+        self.results['status'] = status
+        self.results['finding_details'].append(f"{details} (WLST batch document)")
+        return weblogic_wlst.EXIT_CODES[status]
+
     def _run_wlst_subprocess(self):
         """Run this script via WLST"""
         import subprocess
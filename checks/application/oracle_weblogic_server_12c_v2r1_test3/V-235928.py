@@ -105,7 +105,25 @@ class STIGCheck:
         return True, "Access verified"
 
     def parse_weblogic_config(self):
-        """Parse WebLogic config.xml and extract server configurations"""
+        """Return the listen/SSL settings of every server in config.xml"""
+        # Prefer the shared domain model so config.xml is parsed once per scan (weblogic_domain.py)
+        sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+        try:
+            import weblogic_domain
+        except ImportError:
+            weblogic_domain = None
+
+        if weblogic_domain is not None:
+            domain = weblogic_domain.load_domain(self.domain_home)
+            if domain is None or (domain.errors and not domain.data):
+                raise Exception(f"Failed to parse config.xml: {'; '.join(domain.errors) if domain else 'not found'}")
+            return [{
+                'name': server.name or 'Unknown',
+                'listen_port_enabled': str(server.listen_port_enabled).lower(),
+                'ssl_enabled': str(server.ssl_enabled).lower(),
+                'ssl_port': str(server.ssl.get('listen-port') or 'N/A'),
+            } for server in domain.servers]
+
         config_file = self.domain_home / 'config' / 'config.xml'
 
         try:
@@ -123,11 +141,23 @@ class STIGCheck:
 
             # Find all server elements
             if ns:
-                servers = root.findall('.//wls:server', ns)
+                elements = root.findall('.//wls:server', ns)
             else:
-                servers = root.findall('.//server')
-
-            return servers, ns
+                elements = root.findall('.//server')
+
+            servers = []
+            for server in elements:
+                # listen-port-enabled defaults to true if not specified
+                ssl_elem = server.find('wls:ssl', ns) if ns else server.find('ssl')
+                servers.append({
+                    'name': self.get_element_text(server, 'name', ns, 'Unknown'),
+                    'listen_port_enabled': self.get_element_text(server, 'listen-port-enabled', ns, 'true'),
+                    'ssl_enabled': self.get_element_text(ssl_elem, 'enabled', ns, 'false')
+                    if ssl_elem is not None else 'false',
+                    'ssl_port': self.get_element_text(ssl_elem, 'listen-port', ns, 'N/A')
+                    if ssl_elem is not None else 'N/A',
+                })
+            return servers
 
         except ET.ParseError as e:
             raise Exception(f"Failed to parse config.xml: {e}")
@@ -158,7 +188,7 @@ class STIGCheck:
             return 3
 
         try:
-            servers, ns = self.parse_weblogic_config()
+            servers = self.parse_weblogic_config()
 
             if not servers:
                 self.results['status'] = 'Not Applicable'
@@ -171,23 +201,10 @@ class STIGCheck:
             has_findings = False
 
             for server in servers:
-                server_name = self.get_element_text(server, 'name', ns, 'Unknown')
-
-                # Check listen-port-enabled (default is true if not specified)
-                listen_enabled = self.get_element_text(server, 'listen-port-enabled', ns, 'true')
-
-                # Check SSL configuration
-                if ns:
-                    ssl_elem = server.find('wls:ssl', ns)
-                else:
-                    ssl_elem = server.find('ssl')
-
-                if ssl_elem is not None:
-                    ssl_enabled = self.get_element_text(ssl_elem, 'enabled', ns, 'false')
-                    ssl_port = self.get_element_text(ssl_elem, 'listen-port', ns, 'N/A')
-                else:
-                    ssl_enabled = 'false'
-                    ssl_port = 'N/A'
+                server_name = server['name']
+                listen_enabled = server['listen_port_enabled']
+                ssl_enabled = server['ssl_enabled']
+                ssl_port = server['ssl_port']
 
                 finding = {
                     'server': server_name,
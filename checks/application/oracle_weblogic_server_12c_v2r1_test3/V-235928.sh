@@ -138,17 +138,53 @@ STATUS="Not Checked"
 FINDING_DETAILS=""
 EXIT_CODE=0
 
+# Shared domain model (parses config.xml once per scan, namespace aware)
+WEBLOGIC_DOMAIN_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/weblogic_domain.py"
+
+# Function to evaluate one server's listen/SSL settings
+evaluate_server() {
+    local server_name="$1"
+    local listen_enabled="$2"
+    local ssl_enabled="$3"
+    local ssl_port="$4"
+
+    local finding="Server: $server_name | ListenPortEnabled: $listen_enabled | SSLEnabled: $ssl_enabled | SSLPort: ${ssl_port:-N/A}"
+
+    # Determine if this is a finding
+    if [[ "$listen_enabled" == "true" ]]; then
+        finding="$finding | STATUS: FAIL | REASON: Listen Port is enabled (should be disabled)"
+        has_findings=true
+    elif [[ "$ssl_enabled" != "true" ]]; then
+        finding="$finding | STATUS: FAIL | REASON: SSL is not enabled"
+        has_findings=true
+    else
+        finding="$finding | STATUS: PASS | REASON: SSL enabled and non-SSL port disabled"
+    fi
+
+    findings+=("$finding")
+}
+
 # Function to extract server configurations from config.xml
 check_ssl_configuration() {
     local config_file="$1"
     local findings=()
     local has_findings=false
 
-    # Extract server configurations using grep and sed
-    # Look for <server> blocks and check listen-port and ssl settings
+    # Prefer the shared domain model, then xmllint, then grep
+    if [[ -f "$WEBLOGIC_DOMAIN_TOOL" ]] && command -v python3 &> /dev/null; then
+        local servers=$(python3 "$WEBLOGIC_DOMAIN_TOOL" --domain-home "$DOMAIN_HOME" --list-servers 2>/dev/null)
 
-    # For simplicity, we'll use xmllint if available, otherwise fall back to grep
-    if command -v xmllint &> /dev/null; then
+        if [[ -z "$servers" ]]; then
+            findings+=("INFO: No servers found or unable to parse config.xml")
+            echo "${findings[@]}"
+            return 2
+        fi
+
+        while IFS=$'\t' read -r server_name listen_enabled ssl_enabled ssl_port; do
+            [[ -z "$server_name" ]] && continue
+            evaluate_server "$server_name" "$listen_enabled" "$ssl_enabled" "$ssl_port"
+        done <<< "$servers"
+    elif command -v xmllint &> /dev/null; then
         # Use xmllint to parse XML properly
         local servers=$(xmllint --xpath "//server/name/text()" "$config_file" 2>/dev/null || echo "")
 
@@ -171,20 +207,7 @@ check_ssl_configuration() {
             # Check SSL listen port
             local ssl_port=$(xmllint --xpath "//server[name='$server_name']/ssl/listen-port/text()" "$config_file" 2>/dev/null || echo "")
 
-            local finding="Server: $server_name | ListenPortEnabled: $listen_enabled | SSLEnabled: $ssl_enabled | SSLPort: ${ssl_port:-N/A}"
-
-            # Determine if this is a finding
-            if [[ "$listen_enabled" == "true" ]]; then
-                finding="$finding | STATUS: FAIL | REASON: Listen Port is enabled (should be disabled)"
-                has_findings=true
-            elif [[ "$ssl_enabled" != "true" ]]; then
-                finding="$finding | STATUS: FAIL | REASON: SSL is not enabled"
-                has_findings=true
-            else
-                finding="$finding | STATUS: PASS | REASON: SSL enabled and non-SSL port disabled"
-            fi
-
-            findings+=("$finding")
+            evaluate_server "$server_name" "$listen_enabled" "$ssl_enabled" "$ssl_port"
         done <<< "$servers"
     else
         # Fallback: Use grep/sed for basic parsing (less reliable but works without xmllint)
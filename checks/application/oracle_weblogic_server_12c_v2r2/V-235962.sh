@@ -80,36 +80,20 @@ fi
 # CHECK IMPLEMENTATION
 ################################################################################
 
-# STIG Check Implementation - Manual Review Required
-#
-# This check requires manual verification of Oracle WebLogic Server 12c configuration
-# through the WebLogic Admin Console or WLST scripts.
-#
-# Please consult the STIG documentation for specific compliance requirements.
-
-echo "================================================================================"
-echo "STIG Check: $VULN_ID"
-echo "STIG ID: $STIG_ID"
-echo "Severity: $SEVERITY"
-echo "Timestamp: $TIMESTAMP"
-echo "================================================================================"
-echo ""
-echo "MANUAL REVIEW REQUIRED"
-echo "This STIG check requires manual verification of Oracle WebLogic configuration."
-echo ""
-echo "WebLogic checks typically require:"
-echo "  - Access to WebLogic Admin Console"
-echo "  - Admin credentials for WebLogic domain"
-echo "  - Review of server configuration and policies"
-echo "  - WLST scripts for automated configuration inspection"
-echo ""
-echo "Please consult the STIG documentation for specific compliance requirements."
-echo ""
-
-# Manual review status
-STATUS="Not_Reviewed"
-EXIT_CODE=2
-FINDING_DETAILS="Manual review required - consult STIG documentation for Oracle WebLogic 12c compliance verification"
+# Look the rule up in the shared WLST batch document (weblogic_wlst.py): one
+# WLST session per scan serves every WebLogic rule. AdminServer URL and
+# credentials come from WLS_ADMIN_URL, WLS_USERNAME/WLS_PASSWORD or
+# WLS_USER_CONFIG_FILE/WLS_USER_KEY_FILE.
+WEBLOGIC_WLST_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/weblogic_wlst.py"
+
+if [[ -f "$WEBLOGIC_WLST_TOOL" ]] && command -v python3 &>/dev/null; then
+    exec python3 "$WEBLOGIC_WLST_TOOL" --rule "$STIG_ID" ${CONFIG_FILE:+--config "$CONFIG_FILE"} ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
+fi
+
+echo "ERROR: weblogic_wlst.py or python3 not available"
+STATUS="ERROR"
+EXIT_CODE=3
+FINDING_DETAILS="weblogic_wlst.py or python3 not available"
 
 
 ################################################################################
@@ -38,6 +38,10 @@ while [[ $# -gt 0 ]]; do
             OUTPUT_JSON="$2"
             shift 2
             ;;
+        --domain-home)
+            DOMAIN_HOME="$2"
+            shift 2
+            ;;
         -h|--help)
             cat << 'EOF'
 Usage: $0 [OPTIONS]
@@ -45,6 +49,7 @@ Usage: $0 [OPTIONS]
 Options:
   --config <file>         Configuration file (JSON)
   --output-json <file>    Output results in JSON format
+  --domain-home <path>    WebLogic domain home (default: $DOMAIN_HOME)
   -h, --help             Show this help message
 
 Exit Codes:
@@ -80,36 +85,18 @@ fi
 # CHECK IMPLEMENTATION
 ################################################################################
 
-# STIG Check Implementation - Manual Review Required
-#
-# This check requires manual verification of Oracle WebLogic Server 12c configuration
-# through the WebLogic Admin Console or WLST scripts.
-#
-# Please consult the STIG documentation for specific compliance requirements.
-
-echo "================================================================================"
-echo "STIG Check: $VULN_ID"
-echo "STIG ID: $STIG_ID"
-echo "Severity: $SEVERITY"
-echo "Timestamp: $TIMESTAMP"
-echo "================================================================================"
-echo ""
-echo "MANUAL REVIEW REQUIRED"
-echo "This STIG check requires manual verification of Oracle WebLogic configuration."
-echo ""
-echo "WebLogic checks typically require:"
-echo "  - Access to WebLogic Admin Console"
-echo "  - Admin credentials for WebLogic domain"
-echo "  - Review of server configuration and policies"
-echo "  - WLST scripts for automated configuration inspection"
-echo ""
-echo "Please consult the STIG documentation for specific compliance requirements."
-echo ""
-
-# Manual review status
-STATUS="Not_Reviewed"
-EXIT_CODE=2
-FINDING_DETAILS="Manual review required - consult STIG documentation for Oracle WebLogic 12c compliance verification"
+# Evaluate against the shared domain model parsed from config.xml
+# (weblogic_domain.py; DOMAIN_HOME from --domain-home or the environment)
+WEBLOGIC_DOMAIN_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/weblogic_domain.py"
+
+if [[ -f "$WEBLOGIC_DOMAIN_TOOL" ]] && command -v python3 &>/dev/null; then
+    exec python3 "$WEBLOGIC_DOMAIN_TOOL" --rule "$STIG_ID" ${DOMAIN_HOME:+--domain-home "$DOMAIN_HOME"} ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
+fi
+
+echo "ERROR: weblogic_domain.py or python3 not available"
+STATUS="ERROR"
+EXIT_CODE=3
+FINDING_DETAILS="weblogic_domain.py or python3 not available"
 
 
 ################################################################################
@@ -45,29 +45,25 @@ def load_config(config_file):
         sys.exit(3)
 
 
-def run_check(config=None):
+def run_check(config=None, domain_home=None):
     """
     Execute the STIG check.
 
     Args:
         config: Configuration dictionary
+        domain_home: WebLogic domain home (default: $DOMAIN_HOME)
 
     Returns:
         tuple: (status, finding_details, exit_code)
     """
-    # TODO: Implement the actual check logic
-    #
-    # STIG Check Method from the official STIG:
-    # (See docstring above for details)
-    #
-    # Fix Text from the official STIG:
-    # (See docstring above for details)
-
-    status = "Not Implemented"
-    finding_details = "Check logic not yet implemented - requires domain expertise"
-    exit_code = 2
+    # Evaluate against the shared domain model parsed from config.xml (weblogic_domain.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import weblogic_domain
+    except ImportError:
+        return "ERROR", "weblogic_domain.py not available", 3
 
-    return status, finding_details, exit_code
+    return weblogic_domain.run_rule(STIG_ID, domain_home)
 
 
 def output_json(result, output_file):
@@ -117,6 +113,11 @@ def main():
         help='Output results in JSON format to specified file'
     )
 
+    parser.add_argument(
+        '--domain-home',
+        help='WebLogic domain home directory (default: $DOMAIN_HOME)'
+    )
+
     args = parser.parse_args()
 
     # Load configuration if provided
@@ -125,7 +126,7 @@ def main():
         config = load_config(args.config)
 
     # Run the check
-    status, finding_details, exit_code = run_check(config)
+    status, finding_details, exit_code = run_check(config, args.domain_home)
 
     # Prepare result
     result = {
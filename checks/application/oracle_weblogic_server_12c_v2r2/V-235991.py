@@ -55,19 +55,16 @@ def run_check(config=None):
     Returns:
         tuple: (status, finding_details, exit_code)
     """
-    # TODO: Implement the actual check logic
-    #
-    # STIG Check Method from the official STIG:
-    # (See docstring above for details)
-    #
-    # Fix Text from the official STIG:
-    # (See docstring above for details)
-
-    status = "Not Implemented"
-    finding_details = "Check logic not yet implemented - requires domain expertise"
-    exit_code = 2
-
-    return status, finding_details, exit_code
+    # Look the rule up in the shared WLST batch document (weblogic_wlst.py);
+    # AdminServer URL and credentials come from WLS_ADMIN_URL and WLS_USERNAME/
+    # WLS_PASSWORD or WLS_USER_CONFIG_FILE/WLS_USER_KEY_FILE
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import weblogic_wlst
+    except ImportError:
+        return "ERROR", "weblogic_wlst.py not available", 3
+
+    return weblogic_wlst.run_rule(STIG_ID, (config or {}).get('weblogic'))
 
 
 def output_json(result, output_file):
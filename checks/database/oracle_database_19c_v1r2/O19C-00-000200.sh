@@ -8,35 +8,35 @@
 #
 # Description:
 #     A variety of technologies exist to limit, or in some cases, eliminate the effects of DoS attacks. For example, boundary protection devices can filter certain types of packets to protect devices on an organization'\''s internal network from being directly affected by DoS attacks.
-
-Employing increased capacity and bandwidth combined with service redundancy may reduce the susceptibility to some DoS attacks.
-
-Some of the ways databases can limit their exposure to DoS attacks are through limiting the
+#
+#     Employing increased capacity and bandwidth combined with service redundancy may reduce the susceptibility to some DoS attacks.
+#
+#     Some of the ways databases can limit their exposure to DoS attacks are through limiting the
 #
 # Check Content:
 #     Review database management system (DBMS) settings to verify the DBMS implements measures to limit the effects of the organization-defined types of DoS attacks.
-
-Check the $ORACLE_HOME/network/admin/listener.ora to verify a Rate Limit has been established. A rate limit is used to prevent DoS attacks on a database or to control a logon storm such as may be caused by an application server reboot.
-
-If a rate limit has not been set similar to the example below, this is a finding.
-
-- - - - -
-Example of a listener configuration with rate limiting in effect:
-
-CONNECTION_RATE_LISTENER=10
-
-LISTENER=
-(ADDRESS_LIST=
-(ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1521)(RATE_LIMIT=yes))
-(ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1522)(RATE_LIMIT=yes))
-(ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1526))
-)
-LISTENER=
-(ADDRESS_LIST=
-(ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1521)(RATE_LIMIT=8))
-(ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1522)(RATE_LIMIT=12))
-(ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1526))
-)
+#
+#     Check the $ORACLE_HOME/network/admin/listener.ora to verify a Rate Limit has been established. A rate limit is used to prevent DoS attacks on a database or to control a logon storm such as may be caused by an application server reboot.
+#
+#     If a rate limit has not been set similar to the example below, this is a finding.
+#
+#     - - - - -
+#     Example of a listener configuration with rate limiting in effect:
+#
+#     CONNECTION_RATE_LISTENER=10
+#
+#     LISTENER=
+#     (ADDRESS_LIST=
+#     (ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1521)(RATE_LIMIT=yes))
+#     (ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1522)(RATE_LIMIT=yes))
+#     (ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1526))
+#     )
+#     LISTENER=
+#     (ADDRESS_LIST=
+#     (ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1521)(RATE_LIMIT=8))
+#     (ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1522)(RATE_LIMIT=12))
+#     (ADDRESS=(PROTOCOL=tcp)(HOST=)(PORT=1526))
+#     )
 #
 # Exit Codes:
 #     0 = Check Passed (Compliant)
@@ -96,59 +96,21 @@ if [[ -n "$CONFIG_FILE" ]] && [[ -f "$CONFIG_FILE" ]]; then
 fi
 
 ################################################################################
-# HELPER FUNCTIONS
+# CHECK IMPLEMENTATION
 ################################################################################
 
-# Output results in JSON format
-output_json() {
-    local status="$1"
-    local message="$2"
-    local details="$3"
-
-    cat > "$OUTPUT_JSON" << EOF
-{
-  "vuln_id": "$VULN_ID",
-  "stig_id": "$STIG_ID",
-  "severity": "$SEVERITY",
-  "status": "$status",
-  "message": "$message",
-  "details": "$details",
-  "timestamp": "$TIMESTAMP"
-}
-EOF
-}
-
-################################################################################
-# MAIN CHECK LOGIC
-################################################################################
-
-main() {
-    # STIG Check Implementation - Manual Review Required
-    echo "================================================================================"
-    echo "STIG Check: $VULN_ID"
-    echo "STIG ID: $STIG_ID"
-    echo "Severity: $SEVERITY"
-    echo "Timestamp: $TIMESTAMP"
-    echo "================================================================================"
-    echo ""
-    echo "MANUAL REVIEW REQUIRED"
-    echo "This STIG check requires manual verification of Oracle Database 19c configuration."
-    echo "Please consult the STIG documentation for specific compliance requirements."
-    echo ""
-    echo "Oracle Database checks often require:"
-    echo "  - Database credentials and connectivity"
-    echo "  - DBA privileges for configuration inspection"
-    echo "  - Review of database parameters and policies"
-    echo ""
-    echo "Status: Not_Reviewed"
-    echo "================================================================================"
+# Evaluated against the parsed Oracle Net configuration (oracle_net_config.py:
+# comments ignored, every listener and ORACLE_HOME, TNS_ADMIN honoured)
+NET_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/oracle_net_config.py"
 
+if [[ ! -f "$NET_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+    echo "[$VULN_ID] ERROR - oracle_net_config.py or python3 not available"
     if [[ -n "$OUTPUT_JSON" ]]; then
-        output_json "Not_Reviewed" "Manual review required" "Consult STIG documentation for Oracle Database 19c compliance verification. Requires database access and DBA privileges."
+        cat > "$OUTPUT_JSON" << EOF_JSON
+{"vuln_id": "$VULN_ID", "stig_id": "$STIG_ID", "severity": "$SEVERITY", "status": "ERROR", "finding_details": "oracle_net_config.py or python3 not available", "timestamp": "$TIMESTAMP", "exit_code": 3}
+EOF_JSON
     fi
+    exit 3
+fi
 
-    return 2  # Manual review required
-}
-
-# Run main check
-main "$@"
+exec python3 "$NET_CONFIG_TOOL" --rule "$VULN_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
@@ -11,26 +11,26 @@
 #
 # Check Content:
 #     If a listener is not running on the local database host server, this check is not a finding.
-
-Note: Complete this check only once per host system and once per listener. Multiple listeners may be defined on a single host system. They must all be reviewed, but only once per database home review.
-
-For subsequent database home reviews on the same host system, this check is not a finding.
-
-Determine all listeners running on the host.
-
-For Windows hosts, view all Windows services with TNSListener embedded in the service name:
-
-- The service name format is:
-Oracle[ORACLE_HOME_NAME]TNSListener
-
-For Unix hosts, the Oracle Listener process will indicate the TNSLSNR executable.
-
-At a command prompt, issue the command:
-ps -ef | grep tnslsnr | grep -v grep
-
-The alias for the listener follows tnslsnr in the command output.
-
-Must be logged on the host system using the account that owns the tnslsnr executable (Unix). If the account is denied local logon, have the system administrator (SA) assist in th
+#
+#     Note: Complete this check only once per host system and once per listener. Multiple listeners may be defined on a single host system. They must all be reviewed, but only once per database home review.
+#
+#     For subsequent database home reviews on the same host system, this check is not a finding.
+#
+#     Determine all listeners running on the host.
+#
+#     For Windows hosts, view all Windows services with TNSListener embedded in the service name:
+#
+#     - The service name format is:
+#     Oracle[ORACLE_HOME_NAME]TNSListener
+#
+#     For Unix hosts, the Oracle Listener process will indicate the TNSLSNR executable.
+#
+#     At a command prompt, issue the command:
+#     ps -ef | grep tnslsnr | grep -v grep
+#
+#     The alias for the listener follows tnslsnr in the command output.
+#
+#     Must be logged on the host system using the account that owns the tnslsnr executable (Unix). If the account is denied local logon, have the system administrator (SA) assist in th
 #
 # Exit Codes:
 #     0 = Check Passed (Compliant)
@@ -90,49 +90,21 @@ if [[ -n "$CONFIG_FILE" ]] && [[ -f "$CONFIG_FILE" ]]; then
 fi
 
 ################################################################################
-# HELPER FUNCTIONS
+# CHECK IMPLEMENTATION
 ################################################################################
 
-# Output results in JSON format
-output_json() {
-    local status="$1"
-    local message="$2"
-    local details="$3"
+# Evaluated against the parsed Oracle Net configuration (oracle_net_config.py:
+# comments ignored, every listener and ORACLE_HOME, TNS_ADMIN honoured)
+NET_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/oracle_net_config.py"
 
-    cat > "$OUTPUT_JSON" << EOF
-{
-  "vuln_id": "$VULN_ID",
-  "stig_id": "$STIG_ID",
-  "severity": "$SEVERITY",
-  "status": "$status",
-  "message": "$message",
-  "details": "$details",
-  "timestamp": "$TIMESTAMP"
-}
-EOF
-}
-
-################################################################################
-# MAIN CHECK LOGIC
-################################################################################
-
-main() {
-    SVC="Windows"
-
-    running=$(systemctl is-active "$SVC" 2>/dev/null)
-    enabled=$(systemctl is-enabled "$SVC" 2>/dev/null)
-
-    if [[ "$running" == "active" ]] && [[ "$enabled" == "enabled" ]]; then
-        echo "PASS: Service running and enabled (compliant)"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "PASS" "Running" "$SVC"
-        exit 0
-    else
-        echo "FAIL: Service not running/enabled"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "FAIL" "Not running" "$SVC"
-        exit 1
+if [[ ! -f "$NET_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+    echo "[$VULN_ID] ERROR - oracle_net_config.py or python3 not available"
+    if [[ -n "$OUTPUT_JSON" ]]; then
+        cat > "$OUTPUT_JSON" << EOF_JSON
+{"vuln_id": "$VULN_ID", "stig_id": "$STIG_ID", "severity": "$SEVERITY", "status": "ERROR", "finding_details": "oracle_net_config.py or python3 not available", "timestamp": "$TIMESTAMP", "exit_code": 3}
+EOF_JSON
     fi
+    exit 3
+fi
 
-}
-
-# Run main check
-main "$@"
+exec python3 "$NET_CONFIG_TOOL" --rule "$VULN_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
@@ -11,22 +11,22 @@
 #
 # Check Content:
 #     Review the system documentation to determine if the use of the external procedure agent is authorized.
-
-Review the ORACLE_HOME/bin directory or search the ORACLE_BASE path for the executable extproc (Unix) or extproc.exe (Windows).
-
-If external procedure agent is not authorized for use in the system documentation and the executable file does not exist or is restricted, this is not a finding.
-
-If external procedure agent is not authorized for use in the system documentation and the executable file exists and is not restricted, this is a finding.
-
-If use of the external procedure agent is authorized, ensure extproc is restricted to execution of authorized applications.
-
-External jobs are run using the account \"nobody\" by default.
-
-Review the contents of the file ORACLE_HOME/rdbms/admin/externaljob.ora for the lines run_user= and run_group=.
-
-If the user assigned to these parameters is not \"nobody\", this is a finding.
-
-The external procedure agent (extproc executable) is available dir
+#
+#     Review the ORACLE_HOME/bin directory or search the ORACLE_BASE path for the executable extproc (Unix) or extproc.exe (Windows).
+#
+#     If external procedure agent is not authorized for use in the system documentation and the executable file does not exist or is restricted, this is not a finding.
+#
+#     If external procedure agent is not authorized for use in the system documentation and the executable file exists and is not restricted, this is a finding.
+#
+#     If use of the external procedure agent is authorized, ensure extproc is restricted to execution of authorized applications.
+#
+#     External jobs are run using the account \"nobody\" by default.
+#
+#     Review the contents of the file ORACLE_HOME/rdbms/admin/externaljob.ora for the lines run_user= and run_group=.
+#
+#     If the user assigned to these parameters is not \"nobody\", this is a finding.
+#
+#     The external procedure agent (extproc executable) is available dir
 #
 # Exit Codes:
 #     0 = Check Passed (Compliant)
@@ -86,54 +86,21 @@ if [[ -n "$CONFIG_FILE" ]] && [[ -f "$CONFIG_FILE" ]]; then
 fi
 
 ################################################################################
-# HELPER FUNCTIONS
+# CHECK IMPLEMENTATION
 ################################################################################
 
-# Output results in JSON format
-output_json() {
-    local status="$1"
-    local message="$2"
-    local details="$3"
+# Evaluated against the parsed Oracle Net configuration (oracle_net_config.py:
+# comments ignored, every listener and ORACLE_HOME, TNS_ADMIN honoured)
+NET_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/oracle_net_config.py"
 
-    cat > "$OUTPUT_JSON" << EOF
-{
-  "vuln_id": "$VULN_ID",
-  "stig_id": "$STIG_ID",
-  "severity": "$SEVERITY",
-  "status": "$status",
-  "message": "$message",
-  "details": "$details",
-  "timestamp": "$TIMESTAMP"
-}
-EOF
-}
-
-################################################################################
-# MAIN CHECK LOGIC
-################################################################################
-
-main() {
-    TARGET="/usr/fso:/usr/local/packages")"
-    REQUIRED="127"
-
-    if [[ ! -e "$TARGET" ]]; then
-        echo "ERROR: File not found"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "ERROR" "File not found" "$TARGET"
-        exit 3
-    fi
-
-    actual=$(stat -c "%a" "$TARGET" 2>/dev/null)
-    if [[ $((8#$actual)) -le $((8#$REQUIRED)) ]]; then
-        echo "PASS: Permissions $actual (compliant)"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "PASS" "Compliant" "$actual"
-        exit 0
-    else
-        echo "FAIL: Permissions $actual (required: $REQUIRED or less)"
-        [[ -n "$OUTPUT_JSON" ]] && output_json "FAIL" "Too permissive" "$actual"
-        exit 1
+if [[ ! -f "$NET_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+    echo "[$VULN_ID] ERROR - oracle_net_config.py or python3 not available"
+    if [[ -n "$OUTPUT_JSON" ]]; then
+        cat > "$OUTPUT_JSON" << EOF_JSON
+{"vuln_id": "$VULN_ID", "stig_id": "$STIG_ID", "severity": "$SEVERITY", "status": "ERROR", "finding_details": "oracle_net_config.py or python3 not available", "timestamp": "$TIMESTAMP", "exit_code": 3}
+EOF_JSON
     fi
+    exit 3
+fi
 
-}
-
-# Run main check
-main "$@"
+exec python3 "$NET_CONFIG_TOOL" --rule "$VULN_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
@@ -8,23 +8,23 @@
 #
 # Description:
 #     The DOD standard for authentication is DOD-approved public key infrastructure (PKI) certificates.
-
-Authentication based on user ID and password may be used only when it is not possible to employ a PKI certificate, and requires authorizing official (AO) approval.
-
-In such cases, passwords need to be protected at all times, and encryption is the standard method for protecting passwords during transmission.
-
-Database management system (DBMS) passwords sent in clear text format across the network ar
+#
+#     Authentication based on user ID and password may be used only when it is not possible to employ a PKI certificate, and requires authorizing official (AO) approval.
+#
+#     In such cases, passwords need to be protected at all times, and encryption is the standard method for protecting passwords during transmission.
+#
+#     Database management system (DBMS) passwords sent in clear text format across the network ar
 #
 # Check Content:
 #     If all accounts are authenticated by the OS or an enterprise-level authentication/access mechanism and not by Oracle, this is not a finding.
-
-Review configuration settings for encrypting passwords in transit across the network. If passwords are not encrypted, this is a finding. 
-
-The database supports PKI-based authentication by using digital certificates over TLS in addition to the native encryption and data integrity capabilities of these protocols.
-
-Oracle provides a complete PKI that is based on RSA Security, Inc., Public-Key Cryptography Standards, and which interoperates with Oracle servers and clients. The database uses a wallet that is a container that is used to store authentication and signing credentials, including private keys, certificates, and trusted certificates needed by TLS. In an Oracle environment, every entity that communicates over TLS must have a wallet containing an X.509 version 3 certificate, private key, and list of trusted certificates.
-
-Verify that the $ORA
+#
+#     Review configuration settings for encrypting passwords in transit across the network. If passwords are not encrypted, this is a finding. 
+#
+#     The database supports PKI-based authentication by using digital certificates over TLS in addition to the native encryption and data integrity capabilities of these protocols.
+#
+#     Oracle provides a complete PKI that is based on RSA Security, Inc., Public-Key Cryptography Standards, and which interoperates with Oracle servers and clients. The database uses a wallet that is a container that is used to store authentication and signing credentials, including private keys, certificates, and trusted certificates needed by TLS. In an Oracle environment, every entity that communicates over TLS must have a wallet containing an X.509 version 3 certificate, private key, and list of trusted certificates.
+#
+#     Verify that the $ORA
 #
 # Exit Codes:
 #     0 = Check Passed (Compliant)
@@ -84,59 +84,21 @@ if [[ -n "$CONFIG_FILE" ]] && [[ -f "$CONFIG_FILE" ]]; then
 fi
 
 ################################################################################
-# HELPER FUNCTIONS
+# CHECK IMPLEMENTATION
 ################################################################################
 
-# Output results in JSON format
-output_json() {
-    local status="$1"
-    local message="$2"
-    local details="$3"
-
-    cat > "$OUTPUT_JSON" << EOF
-{
-  "vuln_id": "$VULN_ID",
-  "stig_id": "$STIG_ID",
-  "severity": "$SEVERITY",
-  "status": "$status",
-  "message": "$message",
-  "details": "$details",
-  "timestamp": "$TIMESTAMP"
-}
-EOF
-}
-
-################################################################################
-# MAIN CHECK LOGIC
-################################################################################
-
-main() {
-    # STIG Check Implementation - Manual Review Required
-    echo "================================================================================"
-    echo "STIG Check: $VULN_ID"
-    echo "STIG ID: $STIG_ID"
-    echo "Severity: $SEVERITY"
-    echo "Timestamp: $TIMESTAMP"
-    echo "================================================================================"
-    echo ""
-    echo "MANUAL REVIEW REQUIRED"
-    echo "This STIG check requires manual verification of Oracle Database 19c configuration."
-    echo "Please consult the STIG documentation for specific compliance requirements."
-    echo ""
-    echo "Oracle Database checks often require:"
-    echo "  - Database credentials and connectivity"
-    echo "  - DBA privileges for configuration inspection"
-    echo "  - Review of database parameters and policies"
-    echo ""
-    echo "Status: Not_Reviewed"
-    echo "================================================================================"
+# Evaluated against the parsed Oracle Net configuration (oracle_net_config.py:
+# comments ignored, every listener and ORACLE_HOME, TNS_ADMIN honoured)
+NET_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/oracle_net_config.py"
 
+if [[ ! -f "$NET_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+    echo "[$VULN_ID] ERROR - oracle_net_config.py or python3 not available"
     if [[ -n "$OUTPUT_JSON" ]]; then
-        output_json "Not_Reviewed" "Manual review required" "Consult STIG documentation for Oracle Database 19c compliance verification. Requires database access and DBA privileges."
+        cat > "$OUTPUT_JSON" << EOF_JSON
+{"vuln_id": "$VULN_ID", "stig_id": "$STIG_ID", "severity": "$SEVERITY", "status": "ERROR", "finding_details": "oracle_net_config.py or python3 not available", "timestamp": "$TIMESTAMP", "exit_code": 3}
+EOF_JSON
     fi
+    exit 3
+fi
 
-    return 2  # Manual review required
-}
-
-# Run main check
-main "$@"
+exec python3 "$NET_CONFIG_TOOL" --rule "$VULN_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
@@ -8,28 +8,28 @@
 #
 # Description:
 #     The cornerstone of the PKI is the private key used to encrypt or digitally sign information.
-
-If the private key is stolen, this will lead to the compromise of the authentication and nonrepudiation gained through PKI because the attacker can use the private key to digitally sign documents and can pretend to be the authorized user.
-
-Both the holders of a digital certificate and the issuing authority must protect the computers, storage devices, or whatever they use to keep the private keys.
-
-All a
+#
+#     If the private key is stolen, this will lead to the compromise of the authentication and nonrepudiation gained through PKI because the attacker can use the private key to digitally sign documents and can pretend to be the authorized user.
+#
+#     Both the holders of a digital certificate and the issuing authority must protect the computers, storage devices, or whatever they use to keep the private keys.
+#
+#     All a
 #
 # Check Content:
 #     Review DBMS configuration to determine whether appropriate access controls exist to protect the DBMS'\''s private key. If strong access controls do not exist to enforce authorized access to the private key, this is a finding.
-
-The database supports authentication by using digital certificates over TLS in addition to the native encryption and data integrity capabilities of these protocols.
-
-An Oracle Wallet is a container that is used to store authentication and signing credentials, including private keys, certificates, and trusted certificates needed by TLS. In an Oracle environment, every entity that communicates over TLS must have a wallet containing an X.509 version 3 certificate, private key, and list of trusted certificates, with the exception of Diffie-Hellman.
-
-Verify the $ORACLE_HOME/network/admin/sqlnet.ora contains entries similar to the following to ensure TLS is installed: 
-
-WALLET_LOCATION = (SOURCE=
-(METHOD = FILE) 
-(METHOD_DATA = 
-DIRECTORY=/wallet)
-
-SSL_CIPHER_SUITES=(S
+#
+#     The database supports authentication by using digital certificates over TLS in addition to the native encryption and data integrity capabilities of these protocols.
+#
+#     An Oracle Wallet is a container that is used to store authentication and signing credentials, including private keys, certificates, and trusted certificates needed by TLS. In an Oracle environment, every entity that communicates over TLS must have a wallet containing an X.509 version 3 certificate, private key, and list of trusted certificates, with the exception of Diffie-Hellman.
+#
+#     Verify the $ORACLE_HOME/network/admin/sqlnet.ora contains entries similar to the following to ensure TLS is installed: 
+#
+#     WALLET_LOCATION = (SOURCE=
+#     (METHOD = FILE) 
+#     (METHOD_DATA = 
+#     DIRECTORY=/wallet)
+#
+#     SSL_CIPHER_SUITES=(S
 #
 # Exit Codes:
 #     0 = Check Passed (Compliant)
@@ -89,59 +89,21 @@ if [[ -n "$CONFIG_FILE" ]] && [[ -f "$CONFIG_FILE" ]]; then
 fi
 
 ################################################################################
-# HELPER FUNCTIONS
-################################################################################
-
-# Output results in JSON format
-output_json() {
-    local status="$1"
-    local message="$2"
-    local details="$3"
-
-    cat > "$OUTPUT_JSON" << EOF
-{
-  "vuln_id": "$VULN_ID",
-  "stig_id": "$STIG_ID",
-  "severity": "$SEVERITY",
-  "status": "$status",
-  "message": "$message",
-  "details": "$details",
-  "timestamp": "$TIMESTAMP"
-}
-EOF
-}
-
-################################################################################
-# MAIN CHECK LOGIC
+# CHECK IMPLEMENTATION
 ################################################################################
 
-main() {
-    # STIG Check Implementation - Manual Review Required
-    echo "================================================================================"
-    echo "STIG Check: $VULN_ID"
-    echo "STIG ID: $STIG_ID"
-    echo "Severity: $SEVERITY"
-    echo "Timestamp: $TIMESTAMP"
-    echo "================================================================================"
-    echo ""
-    echo "MANUAL REVIEW REQUIRED"
-    echo "This STIG check requires manual verification of Oracle Database 19c configuration."
-    echo "Please consult the STIG documentation for specific compliance requirements."
-    echo ""
-    echo "Oracle Database checks often require:"
-    echo "  - Database credentials and connectivity"
-    echo "  - DBA privileges for configuration inspection"
-    echo "  - Review of database parameters and policies"
-    echo ""
-    echo "Status: Not_Reviewed"
-    echo "================================================================================"
+# Evaluated against the parsed Oracle Net configuration (oracle_net_config.py:
+# comments ignored, every listener and ORACLE_HOME, TNS_ADMIN honoured)
+NET_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/oracle_net_config.py"
 
+if [[ ! -f "$NET_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+    echo "[$VULN_ID] ERROR - oracle_net_config.py or python3 not available"
     if [[ -n "$OUTPUT_JSON" ]]; then
-        output_json "Not_Reviewed" "Manual review required" "Consult STIG documentation for Oracle Database 19c compliance verification. Requires database access and DBA privileges."
+        cat > "$OUTPUT_JSON" << EOF_JSON
+{"vuln_id": "$VULN_ID", "stig_id": "$STIG_ID", "severity": "$SEVERITY", "status": "ERROR", "finding_details": "oracle_net_config.py or python3 not available", "timestamp": "$TIMESTAMP", "exit_code": 3}
+EOF_JSON
     fi
+    exit 3
+fi
 
-    return 2  # Manual review required
-}
-
-# Run main check
-main "$@"
+exec python3 "$NET_CONFIG_TOOL" --rule "$VULN_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
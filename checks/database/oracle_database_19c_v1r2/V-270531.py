@@ -55,19 +55,14 @@ def run_check(config=None):
     Returns:
         tuple: (status, finding_details, exit_code)
     """
-    # TODO: Implement the actual check logic
-    #
-    # STIG Check Method from the official STIG:
-    # (See docstring above for details)
-    #
-    # Fix Text from the official STIG:
-    # (See docstring above for details)
-
-    status = "Not Implemented"
-    finding_details = "Check logic not yet implemented - requires domain expertise"
-    exit_code = 2
-
-    return status, finding_details, exit_code
+    # Evaluate against the parsed Oracle Net configuration (oracle_net_config.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import oracle_net_config
+    except ImportError:
+        return "ERROR", "oracle_net_config.py not available", 3
+
+    return oracle_net_config.run_rule(VULN_ID)
 
 
 def output_json(result, output_file):
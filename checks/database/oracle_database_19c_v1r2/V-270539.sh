@@ -27,30 +27,20 @@ EOF
 }
 
 # Check Oracle environment
-if [[ -z "$ORACLE_HOME" ]]; then
+if [[ -z "${ORACLE_HOME:-}" && -z "${TNS_ADMIN:-}" ]]; then
     output_json "Not_Applicable" "Oracle not configured (ORACLE_HOME not set)"
     echo "[$VULN_ID] N/A - Oracle not configured"
     exit 2
 fi
 
-# Find listener.ora
-LISTENER_ORA="$ORACLE_HOME/network/admin/listener.ora"
+# Evaluate against the parsed Oracle Net configuration (comments ignored,
+# all listeners, TNS_ADMIN honoured)
+NET_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/oracle_net_config.py"
 
-if [[ ! -f "$LISTENER_ORA" ]]; then
-    output_json "Not_Applicable" "listener.ora not found"
-    echo "[$VULN_ID] N/A - listener.ora not found at $LISTENER_ORA"
-    exit 2
+if [[ ! -f "$NET_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+    output_json "ERROR" "oracle_net_config.py or python3 not available"
+    echo "[$VULN_ID] ERROR - oracle_net_config.py or python3 not available"
+    exit 3
 fi
 
-# Check for required configuration
-PATTERN=".*"
-
-if grep -qi "$PATTERN" "$LISTENER_ORA" 2>/dev/null; then
-    output_json "NotAFinding" "Required listener configuration found"
-    echo "[$VULN_ID] PASS - Configuration found: $PATTERN"
-    exit 0
-else
-    output_json "Open" "Required listener configuration not found: $PATTERN"
-    echo "[$VULN_ID] FAIL - Configuration not found: $PATTERN"
-    exit 1
-fi
+exec python3 "$NET_CONFIG_TOOL" --rule "$VULN_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
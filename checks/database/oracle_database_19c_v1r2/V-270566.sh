@@ -80,75 +80,18 @@ fi
 # CHECK IMPLEMENTATION
 ################################################################################
 
-# STIG Check Implementation - Manual Review Required
-#
-# This check requires manual verification of Oracle Database 19c configuration.
-#
-# Please consult the STIG documentation for specific compliance requirements.
-
-echo "================================================================================"
-echo "STIG Check: $VULN_ID"
-echo "STIG ID: $STIG_ID"
-echo "Severity: $SEVERITY"
-echo "Timestamp: $TIMESTAMP"
-echo "================================================================================"
-echo ""
-echo "MANUAL REVIEW REQUIRED"
-echo "This STIG check requires manual verification of Oracle Database 19c configuration."
-echo ""
-echo "Oracle Database checks typically require:"
-echo "  - Database credentials and connectivity"
-echo "  - DBA privileges for configuration inspection"
-echo "  - SQL queries against database views and parameters"
-echo "  - Review of database policies and settings"
-echo ""
-echo "Please consult the STIG documentation for specific compliance requirements."
-echo ""
-
-# Manual review status
-STATUS="Not_Reviewed"
-EXIT_CODE=2
-FINDING_DETAILS="Manual review required - consult STIG documentation for Oracle Database 19c compliance verification"
-
-
-################################################################################
-# OUTPUT RESULTS
-################################################################################
-
-# JSON output if requested
-if [[ -n "$OUTPUT_JSON" ]]; then
-    cat > "$OUTPUT_JSON" << EOF_JSON
-{
-  "vuln_id": "$VULN_ID",
-  "stig_id": "$STIG_ID",
-  "severity": "$SEVERITY",
-  "rule_title": "Oracle Database, when using public key infrastructure (PKI)-based authentication, must enforce authorized access to the corresponding private key.",
-  "status": "$STATUS",
-  "finding_details": "$FINDING_DETAILS",
-  "timestamp": "$TIMESTAMP",
-  "exit_code": $EXIT_CODE
-}
+# Evaluated against the parsed Oracle Net configuration (oracle_net_config.py:
+# comments ignored, every listener and ORACLE_HOME, TNS_ADMIN honoured)
+NET_CONFIG_TOOL="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)/oracle_net_config.py"
+
+if [[ ! -f "$NET_CONFIG_TOOL" ]] || ! command -v python3 &>/dev/null; then
+    echo "[$VULN_ID] ERROR - oracle_net_config.py or python3 not available"
+    if [[ -n "$OUTPUT_JSON" ]]; then
+        cat > "$OUTPUT_JSON" << EOF_JSON
+{"vuln_id": "$VULN_ID", "stig_id": "$STIG_ID", "severity": "$SEVERITY", "status": "ERROR", "finding_details": "oracle_net_config.py or python3 not available", "timestamp": "$TIMESTAMP", "exit_code": 3}
 EOF_JSON
+    fi
+    exit 3
 fi
 
-# Human-readable output
-cat << EOF
-
-================================================================================
-STIG Check: $VULN_ID - $STIG_ID
-Severity: ${SEVERITY^^}
-================================================================================
-Rule: Oracle Database, when using public key infrastructure (PKI)-based authentication, must enforce authorized access to the corresponding private key.
-Status: $STATUS
-Timestamp: $TIMESTAMP
-
---------------------------------------------------------------------------------
-Finding Details:
---------------------------------------------------------------------------------
-$FINDING_DETAILS
-
-================================================================================
-
-EOF
-
-exit $EXIT_CODE
+exec python3 "$NET_CONFIG_TOOL" --rule "$VULN_ID" ${OUTPUT_JSON:+--output-json "$OUTPUT_JSON"}
@@ -31,57 +31,39 @@ def load_config(config_file):
     with open(config_file, 'r') as f:
         return json.load(f)
 
-def perform_check(config):
+def perform_check(config, hives=None, reg_files=None):
     """
-    Perform the STIG check
+    Perform the STIG check against the registry values named in the check text
+
+    Args:
+        config: Configuration dictionary
+        hives: Directory of collected hives (default: $STIG_HIVE_DIR, else the live registry)
+        reg_files: .reg export files (default: $STIG_REG_EXPORT)
 
     Returns:
-        tuple: (passed: bool, evidence: dict, issues: list)
+        tuple: (status, finding_details, exit_code)
     """
-    # TODO: Implement check logic based on:
-    # Different methods are available to disable SMBv1 on Windows 10, if V-220729 is configured, this is NA.
-    # 
-    # If the following registry value is not configured as specified, this is a finding:
-    # 
-    # Registry Hive: HKEY_LOCAL_MACHINE
-    # Registry Path: \SYSTEM\CurrentControlSet\Services\mrxsmb10\
-    # 
-    # Value Name: Start
-    # 
-    # Type: REG_DWORD
-    # Value: 0x00000004 (4)
-
-    # TODO: Implement specific check logic
-    # This is a placeholder - customize based on check requirements
-    return False, {}, ["Check not implemented"]
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import windows_registry
+    except ImportError:
+        return "ERROR", "windows_registry.py not available", 3
+
+    return windows_registry.run_rule(VULN_ID, Path(__file__).resolve().parent.name, hives, reg_files)
 
 def main():
     parser = argparse.ArgumentParser(description='The Server Message Block (SMB) v1 protocol must be disabled on the SMB client.')
     parser.add_argument('--config', help='Configuration file path')
     parser.add_argument('--output-json', action='store_true', help='Output in JSON format')
+    parser.add_argument('--hives', help='Directory of collected hives (default: $STIG_HIVE_DIR, else the live registry)')
+    parser.add_argument('--reg', action='append', help='.reg export file (may be repeated; default: $STIG_REG_EXPORT)')
     args = parser.parse_args()
 
     # Load configuration
     config = load_config(args.config)
 
     # Perform check
-    try:
-        passed, evidence, issues = perform_check(config)
-    except Exception as e:
-        if args.output_json:
-            result = {
-                "vuln_id": VULN_ID,
-                "stig_id": STIG_ID,
-                "severity": SEVERITY,
-                "status": "Error",
-                "finding_details": str(e),
-                "comments": "Error during check execution",
-                "compliance_issues": []
-            }
-            print(json.dumps(result, indent=2))
-        else:
-            print(f"[{VULN_ID}] ERROR - {str(e)}")
-        return 3
+    status, details, exit_code = perform_check(config, args.hives, args.reg)
 
     # Output results
     if args.output_json:
@@ -89,18 +71,13 @@ def main():
         result["vuln_id"] = VULN_ID
         result["stig_id"] = STIG_ID
         result["severity"] = SEVERITY
-        result["status"] = "NotAFinding" if passed else "Open"
-        result["finding_details"] = "" if passed else "Check failed"
-        result["comments"] = "Check passed" if passed else ""
-        result["evidence"] = evidence if passed else dict()
-        result["compliance_issues"] = [] if passed else issues
+        result["status"] = status
+        result["finding_details"] = details
         print(json.dumps(result, indent=2))
     else:
-        status = "PASS" if passed else "FAIL"
-        finding_status = "NotAFinding" if passed else "Finding"
-        print(f"[{VULN_ID}] {status} - {finding_status}")
+        print(f"[{VULN_ID}] {status} - {details}")
 
-    return 0 if passed else 1
+    return exit_code
 
 if __name__ == '__main__':
     sys.exit(main())
@@ -29,52 +29,38 @@ def load_config(config_file):
     with open(config_file, 'r') as f:
         return json.load(f)
 
-def perform_check(config):
+def perform_check(config, policy_dir=None):
     """
-    Perform the STIG check
+    Perform the STIG check against the secedit export and auditpol backup of the host
+
+    Args:
+        config: Configuration dictionary (domain_joined overrides the detected domain membership)
+        policy_dir: Directory with secedit.inf / audit.csv (default: $STIG_POLICY_DIR, else a fresh export)
 
     Returns:
-        tuple: (passed: bool, evidence: dict, issues: list)
+        tuple: (status, finding_details, exit_code)
     """
-    # TODO: Implement check logic based on:
-    # Verify the effective setting in Local Group Policy Editor.
-    # Run "gpedit.msc".
-    # 
-    # Navigate to Local Computer Policy >> Computer Configuration >> Windows Settings >> Security Settings >> Account Policies >> Account Lockout Policy.
-    # 
-    # If the "Account lockout threshold" is "0" or more than "3" attempts, this is a finding.
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import security_policy
+    except ImportError:
+        return "ERROR", "security_policy.py not available", 3
 
-    # TODO: Implement specific check logic
-    # This is a placeholder - customize based on check requirements
-    return False, {}, ["Check not implemented"]
+    return security_policy.run_rule(VULN_ID, Path(__file__).resolve().parent.name, policy_dir,
+                                    config.get('domain_joined'))
 
 def main():
     parser = argparse.ArgumentParser(description='The number of allowed bad logon attempts must be configured to 3 or less.')
     parser.add_argument('--config', help='Configuration file path')
     parser.add_argument('--output-json', action='store_true', help='Output in JSON format')
+    parser.add_argument('--policy-dir', help='Directory with secedit.inf / audit.csv (default: $STIG_POLICY_DIR, else a fresh export)')
     args = parser.parse_args()
 
     # Load configuration
     config = load_config(args.config)
 
     # Perform check
-    try:
-        passed, evidence, issues = perform_check(config)
-    except Exception as e:
-        if args.output_json:
-            result = {
-                "vuln_id": VULN_ID,
-                "stig_id": STIG_ID,
-                "severity": SEVERITY,
-                "status": "Error",
-                "finding_details": str(e),
-                "comments": "Error during check execution",
-                "compliance_issues": []
-            }
-            print(json.dumps(result, indent=2))
-        else:
-            print(f"[{VULN_ID}] ERROR - {str(e)}")
-        return 3
+    status, details, exit_code = perform_check(config, args.policy_dir)
 
     # Output results
     if args.output_json:
@@ -82,18 +68,13 @@ def main():
         result["vuln_id"] = VULN_ID
         result["stig_id"] = STIG_ID
         result["severity"] = SEVERITY
-        result["status"] = "NotAFinding" if passed else "Open"
-        result["finding_details"] = "" if passed else "Check failed"
-        result["comments"] = "Check passed" if passed else ""
-        result["evidence"] = evidence if passed else dict()
-        result["compliance_issues"] = [] if passed else issues
+        result["status"] = status
+        result["finding_details"] = details
         print(json.dumps(result, indent=2))
     else:
-        status = "PASS" if passed else "FAIL"
-        finding_status = "NotAFinding" if passed else "Finding"
-        print(f"[{VULN_ID}] {status} - {finding_status}")
+        print(f"[{VULN_ID}] {status} - {details}")
 
-    return 0 if passed else 1
+    return exit_code
 
 if __name__ == '__main__':
     sys.exit(main())
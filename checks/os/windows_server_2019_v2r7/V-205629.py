@@ -1,2 +1,62 @@
 #!/usr/bin/env python3
-# TODO: Implement V-205629
+"""
+STIG Check: V-205629
+Severity: medium
+Rule Title: Windows Server 2019 must have the number of allowed bad logon attempts configured to three or less.
+STIG ID: WN19-AC-000020
+STIG Version: Windows Server 2019 v2r7
+
+Based on template: security policy check
+
+NOTE: Evaluated by security_policy.py against a secedit export and auditpol backup
+(--policy-dir, $STIG_POLICY_DIR), or a fresh export of the local system on Windows
+"""
+
+import json
+import sys
+import argparse
+from pathlib import Path
+
+VULN_ID = "V-205629"
+STIG_ID = "WN19-AC-000020"
+SEVERITY = "medium"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='STIG Check V-205629')
+    parser.add_argument('--config', help='Configuration file (JSON)')
+    parser.add_argument('--output-json', help='Output results to JSON file')
+    parser.add_argument('--policy-dir', help='Directory with secedit.inf / audit.csv (default: $STIG_POLICY_DIR, else a fresh export)')
+    args = parser.parse_args()
+
+    config = {}
+    if args.config and Path(args.config).exists():
+        with open(args.config) as f:
+            config = json.load(f)
+
+    # Policy requirements are read from the STIG check text by security_policy.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import security_policy
+    except ImportError:
+        print("ERROR: security_policy.py not available")
+        return 3
+
+    status, details, exit_code = security_policy.run_rule(VULN_ID, Path(__file__).resolve().parent.name,
+                                                          args.policy_dir, config.get('domain_joined'))
+    print(f"{status}: {details}")
+
+    if args.output_json:
+        with open(args.output_json, 'w') as f:
+            json.dump({
+                'vuln_id': VULN_ID,
+                'stig_id': STIG_ID,
+                'severity': SEVERITY,
+                'status': status,
+                'finding_details': details,
+            }, f, indent=2)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,56 +9,50 @@ STIG Version: Windows Server 2019 v2r7
 AUTO-GENERATED: 2025-11-22 04:41:54
 Based on template: registry check
 
-NOTE: This script requires the winreg module (Windows only)
+NOTE: Evaluated by windows_registry.py against the live registry on Windows, or
+against collected hives (--hives, $STIG_HIVE_DIR) or .reg exports (--reg, $STIG_REG_EXPORT)
 """
 
+import json
 import sys
 import argparse
+from pathlib import Path
 
-try:
-    import winreg
-except ImportError:
-    print("ERROR: This script requires Windows (winreg module)")
-    sys.exit(3)
-
-
-def check_registry_value(hive, key_path, value_name):
-    """Check if a registry value exists and return its value"""
-    try:
-        key = winreg.OpenKey(hive, key_path, 0, winreg.KEY_READ)
-        value, value_type = winreg.QueryValueEx(key, value_name)
-        winreg.CloseKey(key)
-        return {'exists': True, 'value': value, 'type': value_type}
-    except FileNotFoundError:
-        return {'exists': False, 'value': None, 'type': None}
-    except Exception as e:
-        return {'exists': False, 'value': None, 'type': None, 'error': str(e)}
+VULN_ID = "V-205632"
+STIG_ID = "WN19-SO-000140"
+SEVERITY = "low"
 
 
 def main():
     parser = argparse.ArgumentParser(description='STIG Check V-205632')
     parser.add_argument('--config', help='Configuration file (JSON)')
     parser.add_argument('--output-json', help='Output results to JSON file')
+    parser.add_argument('--hives', help='Directory of collected hives (default: $STIG_HIVE_DIR, else the live registry)')
+    parser.add_argument('--reg', action='append', help='.reg export file (may be repeated; default: $STIG_REG_EXPORT)')
     args = parser.parse_args()
 
-    # TODO: Extract actual registry path and value
-    hive = winreg.HKEY_LOCAL_MACHINE
-    key_path = r"SOFTWARE\Policies"
-    value_name = "ValueName"
-    expected_value = 1
-
-    result = check_registry_value(hive, key_path, value_name)
-
-    if result['exists']:
-        if result['value'] == expected_value:
-            print(f"PASS: Registry value matches expected ({expected_value})")
-            return 0
-        else:
-            print(f"FAIL: Registry value is {{result['value']}}, expected {expected_value}")
-            return 1
-    else:
-        print(f"FAIL: Registry value does not exist")
-        return 1
+    # Registry requirements are read from the STIG check text by windows_registry.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import windows_registry
+    except ImportError:
+        print("ERROR: windows_registry.py not available")
+        return 3
+
+    status, details, exit_code = windows_registry.run_rule(VULN_ID, Path(__file__).resolve().parent.name, args.hives,
+                                                           args.reg)
+    print(f"{status}: {details}")
+
+    if args.output_json:
+        with open(args.output_json, 'w') as f:
+            json.dump({
+                'vuln_id': VULN_ID,
+                'stig_id': STIG_ID,
+                'severity': SEVERITY,
+                'status': status,
+                'finding_details': details,
+            }, f, indent=2)
+    return exit_code
 
 
 if __name__ == '__main__':
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Streaming DNSSEC / zone-file validator for BIND 9.x
+Reads each zone file once, record by record, and validates the DNSSEC rules
+in the same pass: DNSKEY algorithms and key sizes, RRSIG coverage and expiry,
+RRSIG validity periods for the DNSKEY and DS RRsets, DS records for delegated
+children, and NSEC3 use. Zones come from the parsed named.conf
+(bind_config.py) and are validated in parallel, one process per zone.
+
+Memory use does not grow with zone size: only the current owner name's
+RRsets, the current delegation point and bounded lists of examples are kept.
+Signature coverage relies on the records of one owner name being contiguous,
+which holds for dnssec-signzone and named-compilezone output.
+
+Usage:
+    python3 dns_zone_validator.py
+    python3 dns_zone_validator.py --zone example.com=/var/named/db.example.com.signed
+    python3 dns_zone_validator.py --rule BIND-9X-001600 --output-json result.json
+"""
+
+import argparse
+import base64
+import binascii
+import calendar
+import functools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import bind_config
+
+# DNSSEC algorithm numbers (RFC 8624); below 8 is SHA-1 or weaker
+ALGORITHM_NAMES = {
+    1: 'RSAMD5', 3: 'DSA', 5: 'RSASHA1', 6: 'DSA-NSEC3-SHA1', 7: 'RSASHA1-NSEC3-SHA1',
+    8: 'RSASHA256', 10: 'RSASHA512', 13: 'ECDSAP256SHA256', 14: 'ECDSAP384SHA384',
+    15: 'ED25519', 16: 'ED448',
+}
+MIN_ALGORITHM = 8
+MIN_RSA_BITS = 2048
+RSA_ALGORITHMS = (1, 5, 7, 8, 10)
+FIXED_KEY_BITS = {13: 256, 14: 384, 15: 256, 16: 456}
+
+# TSIG algorithms at least as strong as hmac-sha256
+APPROVED_TSIG_ALGORITHMS = ('hmac-sha256', 'hmac-sha384', 'hmac-sha512')
+
+MIN_VALIDITY = 2 * 86400
+MAX_VALIDITY = 7 * 86400
+
+MAX_EXAMPLES = 10
+
+CLASSES = ('IN', 'CH', 'HS', 'CS')
+
+# Types that are never signed by the zone's own keys at a delegation point
+UNSIGNED_AT_CUT = ('NS',)
+
+EXIT_CODES = bind_config.EXIT_CODES
+STATUS_PRIORITY = bind_config.STATUS_PRIORITY
+
+
+################################################################################
+# ZONE FILE READER
+################################################################################
+
+def strip_comment(line):
+    """Remove a ';' comment that is not inside quotes"""
+    if ';' not in line:
+        return line
+    quoted = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            quoted = not quoted
+        elif ch == ';' and not quoted:
+            return line[:i]
+    return line
+
+
+def logical_lines(path):
+    """Yield (line number, text, starts_with_blank) with ( ) continuations joined"""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        buffer = None
+        start = 0
+        blank = False
+        depth = 0
+        for number, raw in enumerate(f, 1):
+            text = strip_comment(raw.rstrip('\r\n'))
+            if buffer is None:
+                if not text.strip():
+                    continue
+                buffer = text
+                start = number
+                blank = text[0] in ' \t'
+            else:
+                buffer += ' ' + text
+            if '(' in text or ')' in text:
+                depth += text.count('(') - text.count(')')
+                buffer = buffer.replace('(', ' ').replace(')', ' ')
+            if depth <= 0:
+                yield start, buffer, blank
+                buffer = None
+                depth = 0
+        if buffer is not None:
+            yield start, buffer, blank
+
+
+def absolute_name(name, origin):
+    if name == '@':
+        return origin
+    if name.endswith('.'):
+        return name.lower()
+    return f"{name}.{origin}".lower() if origin != '.' else f"{name}.".lower()
+
+
+def is_ttl(token):
+    return token[0].isdigit() and all(c.isdigit() or c in 'smhdwSMHDW' for c in token)
+
+
+def iter_records(path, origin, default_ttl=None, depth=0):
+    """
+    Stream resource records from a master-format zone file.
+
+    Yields (owner, ttl, rtype, rdata_tokens). $ORIGIN, $TTL and $INCLUDE are
+    honoured; owner, TTL and class are inherited from the previous record.
+    """
+    origin = origin.lower().rstrip('.') + '.' if origin != '.' else '.'
+    owner = origin
+    ttl = default_ttl
+    for _, text, blank in logical_lines(path):
+        tokens = text.split()
+        if not tokens:
+            continue
+        keyword = tokens[0].upper()
+        if keyword == '$ORIGIN' and len(tokens) > 1:
+            origin = absolute_name(tokens[1], origin)
+            continue
+        if keyword == '$TTL' and len(tokens) > 1:
+            ttl = tokens[1]
+            continue
+        if keyword == '$INCLUDE' and len(tokens) > 1 and depth < 10:
+            included = tokens[1]
+            if not os.path.isabs(included):
+                included = os.path.join(os.path.dirname(path), included)
+            include_origin = absolute_name(tokens[2], origin) if len(tokens) > 2 else origin
+            yield from iter_records(included, include_origin, ttl, depth + 1)
+            continue
+        if keyword.startswith('$'):
+            continue
+
+        if not blank:
+            owner = absolute_name(tokens[0], origin)
+            tokens = tokens[1:]
+        record_ttl = ttl
+        while tokens and (is_ttl(tokens[0]) or tokens[0].upper() in CLASSES):
+            if is_ttl(tokens[0]):
+                record_ttl = tokens[0]
+            tokens = tokens[1:]
+        if not tokens:
+            continue
+        yield owner, record_ttl, tokens[0].upper(), tokens[1:]
+
+
+################################################################################
+# RECORD-LEVEL HELPERS
+################################################################################
+
+@functools.lru_cache(maxsize=4096)
+def parse_sig_time(value):
+    """RRSIG time: YYYYMMDDHHMMSS (UTC) or seconds since the epoch"""
+    if len(value) == 14 and value.isdigit():
+        return calendar.timegm((int(value[0:4]), int(value[4:6]), int(value[6:8]),
+                                int(value[8:10]), int(value[10:12]), int(value[12:14]), 0, 0, 0))
+    return int(value)
+
+
+def key_bits(algorithm, public_key):
+    """Key size in bits from a DNSKEY public key field"""
+    if algorithm in FIXED_KEY_BITS:
+        return FIXED_KEY_BITS[algorithm]
+    try:
+        data = base64.b64decode(public_key)
+    except (binascii.Error, ValueError):
+        return None
+    if algorithm in RSA_ALGORITHMS and data:
+        if data[0] == 0:
+            exponent_length = int.from_bytes(data[1:3], 'big')
+            modulus = data[3 + exponent_length:]
+        else:
+            modulus = data[1 + data[0]:]
+        return int.from_bytes(modulus, 'big').bit_length()
+    if algorithm in (3, 6) and data:
+        return 512 + 64 * data[0]
+    return None
+
+
+def days(seconds):
+    return f"{seconds / 86400:.1f}d"
+
+
+def name_under(name, parent):
+    return name != parent and name.endswith('.' + parent)
+
+
+class ZoneStats:
+    """Bounded per-zone accumulator filled during the streaming pass"""
+
+    def __init__(self, zone, path, now):
+        self.zone = zone
+        self.path = path
+        self.now = now
+        self.records = 0
+        self.dnskeys = []
+        self.signatures = 0
+        self.expired = 0
+        self.not_yet_valid = 0
+        self.unsigned = 0
+        self.delegations = 0
+        self.delegations_without_ds = 0
+        self.nsec = 0
+        self.nsec3 = 0
+        self.nsec3param = 0
+        # RRSIG validity periods by covered type: signatures checked, periods outside 2-7 days
+        self.validity = {'DNSKEY': {'checked': 0, 'out_of_range': 0, 'examples': []},
+                         'DS': {'checked': 0, 'out_of_range': 0, 'examples': []}}
+        self.examples = {'expired': [], 'unsigned': [], 'no_ds': [], 'weak_keys': []}
+        self.errors = []
+
+    def record_validity(self, type_covered, owner, period):
+        entry = self.validity[type_covered]
+        entry['checked'] += 1
+        if period < MIN_VALIDITY or period > MAX_VALIDITY:
+            entry['out_of_range'] += 1
+            if len(entry['examples']) < MAX_EXAMPLES:
+                entry['examples'].append(f"{owner} {days(period)}")
+
+    def example(self, kind, text):
+        if len(self.examples[kind]) < MAX_EXAMPLES:
+            self.examples[kind].append(text)
+
+    @property
+    def signed(self):
+        return bool(self.dnskeys)
+
+    def to_dict(self):
+        return {
+            'zone': self.zone,
+            'file': self.path,
+            'records': self.records,
+            'dnskeys': self.dnskeys,
+            'signatures': self.signatures,
+            'expired': self.expired,
+            'not_yet_valid': self.not_yet_valid,
+            'unsigned_rrsets': self.unsigned,
+            'delegations': self.delegations,
+            'delegations_without_ds': self.delegations_without_ds,
+            'nsec': self.nsec,
+            'nsec3': self.nsec3,
+            'nsec3param': self.nsec3param,
+            'validity': self.validity,
+            'examples': self.examples,
+            'errors': self.errors,
+        }
+
+
+def close_owner(stats, owner, types, covered, cut):
+    """Check one owner's RRsets once all its records have been read"""
+    if owner is None:
+        return
+    if cut is not None and name_under(owner, cut):
+        return  # glue below a delegation point is not signed
+    at_cut = owner == cut
+    if at_cut:
+        stats.delegations += 1
+        if 'DS' not in types:
+            stats.delegations_without_ds += 1
+            stats.example('no_ds', owner)
+    if not stats.signed:
+        return
+    for rtype in types:
+        if rtype == 'RRSIG' or (at_cut and rtype in UNSIGNED_AT_CUT) or rtype in covered:
+            continue
+        stats.unsigned += 1
+        stats.example('unsigned', f"{owner} {rtype}")
+
+
+def validate_zone_file(zone, path, now=None):
+    """Validate one zone file in a single streaming pass; returns ZoneStats.to_dict()"""
+    now = now or time.time()
+    apex = zone.lower().rstrip('.') + '.'
+    stats = ZoneStats(apex, path, now)
+    owner = None
+    types = set()
+    covered = set()
+    cut = None
+    try:
+        for name, _, rtype, rdata in iter_records(path, apex):
+            stats.records += 1
+            if name != owner:
+                close_owner(stats, owner, types, covered, cut)
+                owner = name
+                types = set()
+                covered = set()
+            types.add(rtype)
+
+            if rtype == 'NS' and name != apex and not (cut and name_under(name, cut)):
+                cut = name
+            elif cut is not None and name != cut and not name_under(name, cut):
+                cut = None
+
+            if rtype == 'DNSKEY' and len(rdata) >= 4:
+                flags, algorithm = int(rdata[0]), int(rdata[2])
+                bits = key_bits(algorithm, ''.join(rdata[3:]))
+                role = 'KSK' if flags & 1 else 'ZSK'
+                stats.dnskeys.append({'role': role, 'flags': flags, 'algorithm': algorithm,
+                                      'algorithm_name': ALGORITHM_NAMES.get(algorithm, str(algorithm)),
+                                      'bits': bits})
+                if algorithm < MIN_ALGORITHM or (algorithm in RSA_ALGORITHMS and bits and bits < MIN_RSA_BITS):
+                    stats.example('weak_keys', f"{role} alg {algorithm} {bits or '?'} bits")
+            elif rtype == 'RRSIG' and len(rdata) >= 6:
+                stats.signatures += 1
+                type_covered = rdata[0].upper()
+                covered.add(type_covered)
+                expiration, inception = parse_sig_time(rdata[4]), parse_sig_time(rdata[5])
+                if expiration < now:
+                    stats.expired += 1
+                    stats.example('expired', f"{name} RRSIG {type_covered} expired {rdata[4]}")
+                elif inception > now:
+                    stats.not_yet_valid += 1
+                if type_covered in stats.validity:
+                    stats.record_validity(type_covered, name, expiration - inception)
+            elif rtype == 'NSEC':
+                stats.nsec += 1
+            elif rtype == 'NSEC3':
+                stats.nsec3 += 1
+            elif rtype == 'NSEC3PARAM':
+                stats.nsec3param += 1
+        close_owner(stats, owner, types, covered, cut)
+    except (OSError, ValueError) as e:
+        stats.errors.append(f"{path}: {e}")
+    return stats.to_dict()
+
+
+################################################################################
+# ZONE DISCOVERY AND RULES
+################################################################################
+
+def discover_zones(config):
+    """(zone name, file) for master/slave zones whose files exist"""
+    zones = []
+    seen = set()
+    for zone in config.zones_of_type('master', 'slave'):
+        path = zone.file
+        signed = path + '.signed' if path else None
+        if signed and os.path.isfile(signed):
+            path = signed
+        if path and os.path.isfile(path) and (zone.name, path) not in seen:
+            seen.add((zone.name, path))
+            zones.append((zone.name, path))
+    return zones
+
+
+def validate_zones(zones, workers=None, now=None):
+    """Validate zones in parallel; returns a list of per-zone result dicts"""
+    if not zones:
+        return []
+    with ProcessPoolExecutor(max_workers=max(1, min(len(zones), workers or os.cpu_count() or 1))) as executor:
+        futures = [executor.submit(validate_zone_file, name, path, now) for name, path in zones]
+        return [f.result() for f in futures]
+
+
+def rule_algorithms(results, config):
+    problems = []
+    for zone in results:
+        for key in zone['dnskeys']:
+            if key['algorithm'] < MIN_ALGORITHM:
+                problems.append(f"{zone['zone']} {key['role']} algorithm {key['algorithm_name']}")
+            elif key['algorithm'] in RSA_ALGORITHMS and key['bits'] and key['bits'] < MIN_RSA_BITS:
+                problems.append(f"{zone['zone']} {key['role']} RSA {key['bits']} bits")
+    if config is not None:
+        for name, info in config.keys.items():
+            algorithm = (info['algorithm'] or '').lower()
+            if algorithm not in APPROVED_TSIG_ALGORITHMS:
+                problems.append(f"TSIG key {name} uses {info['algorithm'] or 'no algorithm'}")
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', 'DNSKEY algorithms >= 8 (SHA-256) and TSIG keys use hmac-sha256 or stronger'
+
+
+def rule_signed(results, config):
+    problems = []
+    if config is not None:
+        enable = config.option('dnssec-enable')
+        if enable is not None and enable.value.lower() != 'yes':
+            problems.append(f"dnssec-enable {enable.value}")
+    for zone in results:
+        roles = {k['role'] for k in zone['dnskeys']}
+        if not roles:
+            problems.append(f"{zone['zone']} is not signed")
+            continue
+        if roles != {'KSK', 'ZSK'}:
+            problems.append(f"{zone['zone']} lacks separate KSK and ZSK")
+        if zone['expired']:
+            problems.append(f"{zone['zone']} has {zone['expired']} expired signature(s): "
+                            f"{', '.join(zone['examples']['expired'][:3])}")
+        if zone['unsigned_rrsets']:
+            problems.append(f"{zone['zone']} has {zone['unsigned_rrsets']} unsigned RRset(s): "
+                            f"{', '.join(zone['examples']['unsigned'][:3])}")
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', f"{len(results)} zone(s) signed with KSK and ZSK; all RRsets covered by valid RRSIGs"
+
+
+def has_rrset(zone, rtype):
+    """True if a zone holds records of rtype that must carry RRSIGs (DNSKEY, or DS at delegations)"""
+    if rtype == 'DNSKEY':
+        return bool(zone['dnskeys'])
+    return zone['delegations'] > zone['delegations_without_ds']
+
+
+def validity_rule(covered):
+    def check(results, config):
+        checked = sum(z['validity'][covered]['checked'] for z in results)
+        problems = [f"{z['zone']} {z['validity'][covered]['out_of_range']} RRSIG({covered}) outside range: "
+                    f"{', '.join(z['validity'][covered]['examples'])}"
+                    for z in results if z['validity'][covered]['out_of_range']]
+        if problems:
+            problems = ['; '.join(problems) + ' (required: 2 to 7 days)']
+        problems += [f"{z['zone']} {covered} RRset has no covering RRSIG"
+                     for z in results if has_rrset(z, covered) and not z['validity'][covered]['checked']]
+        if problems:
+            return 'Open', '; '.join(problems)
+        if not checked:
+            if covered == 'DNSKEY':
+                return 'Not_Applicable', 'No signed zones (no DNSKEY records)'
+            return 'Not_Applicable', 'No DS records at delegation points'
+        return 'NotAFinding', f"{checked} RRSIG({covered}) validity period(s) between 2 and 7 days"
+    return check
+
+
+def rule_child_ds(results, config):
+    delegations = sum(z['delegations'] for z in results)
+    if not delegations:
+        return 'Not_Applicable', 'No delegated child zones'
+    missing = [f"{z['zone']}: {', '.join(z['examples']['no_ds'])}" for z in results if z['delegations_without_ds']]
+    if missing:
+        return 'Open', 'Delegations without a DS record set: ' + '; '.join(missing)
+    return 'NotAFinding', f"All {delegations} delegation(s) have DS records"
+
+
+def rule_nsec3(results, config):
+    problems = [z['zone'] for z in results if not (z['nsec3'] or z['nsec3param'])]
+    if problems:
+        return 'Open', 'Zones not using NSEC3: ' + ', '.join(problems)
+    return 'NotAFinding', f"{len(results)} zone(s) use NSEC3"
+
+
+ZONE_RULES = {
+    'BIND-9X-001120': rule_algorithms,
+    'BIND-9X-001200': rule_signed,
+    'BIND-9X-001310': rule_child_ds,
+    'BIND-9X-001311': validity_rule('DS'),
+    'BIND-9X-001600': validity_rule('DNSKEY'),
+    'BIND-9X-001610': rule_nsec3,
+}
+
+
+def evaluate_rule(stig_id, results, config):
+    if stig_id not in ZONE_RULES:
+        return 'Not_Reviewed', 'Manual review required - consult STIG documentation'
+    errors = [e for z in results for e in z['errors']]
+    if errors:
+        return 'ERROR', '; '.join(errors)
+    if not results and stig_id != 'BIND-9X-001120':
+        return 'Not_Applicable', 'No master or slave zone files found'
+    return ZONE_RULES[stig_id](results, config)
+
+
+def run_rule(stig_id, config_file=None, chroot=None):
+    """Entry point for the per-rule check scripts: (status, finding_details, exit_code)"""
+    config = bind_config.load_bind_config(config_file, chroot)
+    if config is None:
+        return 'ERROR', 'named.conf not found', 3
+    results = validate_zones(discover_zones(config))
+    status, details = evaluate_rule(stig_id, results, config)
+    return status, details, EXIT_CODES[status]
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Validate DNSSEC zone files (streaming) and evaluate BIND zone rules',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--config', help='named.conf path (default: from running named or standard locations)')
+    parser.add_argument('--chroot', help='Chroot prefix (default: -t of the running named)')
+    parser.add_argument('--zone', action='append', default=[],
+                        help='name=zonefile to validate instead of the zones in named.conf (may be repeated)')
+    parser.add_argument('--rule', action='append', default=[],
+                        help='STIG ID to evaluate (may be repeated; default: all zone rules)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-json', help='Write the result of a single --rule to this file')
+    parser.add_argument('--output-dir', help='Write per-rule results and per-zone statistics to this directory')
+    args = parser.parse_args()
+
+    config = bind_config.load_bind_config(args.config, args.chroot)
+    if args.zone:
+        zones = [tuple(z.split('=', 1)) for z in args.zone if '=' in z]
+    elif config is not None:
+        zones = discover_zones(config)
+    else:
+        print("ERROR: named.conf not found (use --config or --zone)")
+        return 3
+
+    started = time.time()
+    results = validate_zones(zones, args.workers)
+    elapsed = time.time() - started
+
+    metadata = bind_config.load_rule_metadata()
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    rule_results = []
+    for stig_id in args.rule or sorted(ZONE_RULES):
+        check = metadata.get(stig_id, {})
+        status, details = evaluate_rule(stig_id, results, config)
+        rule_results.append({
+            'vuln_id': check.get('Group ID', 'UNKNOWN'),
+            'stig_id': stig_id,
+            'severity': check.get('Severity', 'medium'),
+            'status': status,
+            'finding_details': details,
+            'timestamp': timestamp,
+        })
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for result in rule_results:
+            (output_dir / f"{result['stig_id']}.json").write_text(json.dumps(result, indent=2))
+        (output_dir / 'zones.json').write_text(json.dumps(results, indent=2))
+
+    if args.output_json and len(rule_results) == 1:
+        Path(args.output_json).write_text(json.dumps(rule_results[0], indent=2))
+
+    for zone in results:
+        print(f"{zone['zone']:<40} records={zone['records']:<10} keys={len(zone['dnskeys'])} "
+              f"sigs={zone['signatures']} expired={zone['expired']} unsigned={zone['unsigned_rrsets']}")
+    print(f"\n{len(results)} zone(s) validated in {elapsed:.1f}s\n")
+    for result in rule_results:
+        print(f"[{result['vuln_id']}] {result['stig_id']}: {result['status']}")
+        print(f"    {result['finding_details']}")
+
+    worst = min((r['status'] for r in rule_results), key=STATUS_PRIORITY.index)
+    return EXIT_CODES[worst]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
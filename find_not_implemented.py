@@ -3,52 +3,13 @@
 Find all STIG checks that are not yet implemented.
 """
 
-import os
-import re
 from pathlib import Path
 from collections import defaultdict
 
-def is_not_implemented(file_path):
-    """Check if a script is not implemented"""
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-
-        # Check for various "not implemented" patterns
-        not_impl_patterns = [
-            r'STATUS="Not Implemented"',
-            r'status="Not Implemented"',
-            r'\$Status = "Not Implemented"',
-            r'TODO: Implement',
-            r'echo "TODO:',
-            r'# TODO: Implement the actual check logic',
-            r'Check logic not yet implemented',
-        ]
-
-        # Exclude manual review (those are intentionally not automated)
-        if 'Manual review required' in content or 'Manual Review Required' in content:
-            return False
-
-        # Check if any not-implemented pattern exists
-        for pattern in not_impl_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return True
-
-        return False
-    except Exception as e:
-        return False
+import script_index
 
 def main():
-    base_dir = Path('/home/user/STIGcheckScripts')
-
-    # Categories to scan
-    categories = [
-        'OS_STIGs',
-        'Application_STIGs',
-        'Database_STIGs',
-        'Network_Device_STIGs',
-        'Container_Platform_STIGs'
-    ]
+    base_dir = script_index.REPO_ROOT
 
     not_implemented = defaultdict(list)
     total_not_impl = 0
@@ -58,28 +19,11 @@ def main():
     print("=" * 80)
     print()
 
-    for category in categories:
-        cat_dir = base_dir / category
-        if not cat_dir.exists():
-            continue
-
-        # Find all check directories
-        for platform_dir in sorted(cat_dir.iterdir()):
-            if not platform_dir.is_dir():
-                continue
-
-            platform_name = platform_dir.name
-            checks_dir = platform_dir / 'checks'
-
-            if not checks_dir.exists():
-                continue
-
-            # Find all script files
-            for check_file in sorted(checks_dir.iterdir()):
-                if check_file.is_file() and (check_file.suffix in ['.sh', '.ps1', '.bat']):
-                    if is_not_implemented(check_file):
-                        not_implemented[platform_name].append(str(check_file))
-                        total_not_impl += 1
+    # Not-implemented markers (excluding manual review checks) are recorded by the script index
+    with script_index.open_index() as index:
+        for script in index.scripts(suffixes=('.sh', '.ps1', '.bat'), not_implemented=True):
+            not_implemented[script['platform']].append(str(base_dir / script['path']))
+            total_not_impl += 1
 
     # Display results
     print(f"Found {total_not_impl} not-implemented checks across {len(not_implemented)} platforms:\n")
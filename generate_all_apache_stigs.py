@@ -21,7 +21,9 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
-import stat
+
+import generation_manifest
+import stig_diff
 
 # Apache STIG products configuration
 APACHE_STIGS = [
@@ -169,21 +171,27 @@ fi
 
 # Get Apache configuration root and main config file
 get_apache_config() {{
-    # Try apachectl first
-    if command -v apachectl &> /dev/null; then
-        HTTPD_ROOT=$(apachectl -V 2>/dev/null | grep -i "HTTPD_ROOT" | cut -d'"' -f2)
-        SERVER_CONFIG=$(apachectl -V 2>/dev/null | grep -i "SERVER_CONFIG_FILE" | cut -d'"' -f2)
-    # Try apache2ctl
-    elif command -v apache2ctl &> /dev/null; then
-        HTTPD_ROOT=$(apache2ctl -V 2>/dev/null | grep -i "HTTPD_ROOT" | cut -d'"' -f2)
-        SERVER_CONFIG=$(apache2ctl -V 2>/dev/null | grep -i "SERVER_CONFIG_FILE" | cut -d'"' -f2)
-    # Try httpd directly
-    elif command -v httpd &> /dev/null; then
-        HTTPD_ROOT=$(httpd -V 2>/dev/null | grep -i "HTTPD_ROOT" | cut -d'"' -f2)
-        SERVER_CONFIG=$(httpd -V 2>/dev/null | grep -i "SERVER_CONFIG_FILE" | cut -d'"' -f2)
-    else
-        echo "ERROR: Apache not found (apachectl, apache2ctl, or httpd)"
-        return 1
+    # Prefer the shared facts cache so -V runs once per scan (apache_facts.py)
+    local facts_tool
+    facts_tool="$(cd "$(dirname "${{BASH_SOURCE[0]}}")/../../.." && pwd)/apache_facts.py"
+    if [[ -f "$facts_tool" ]] && command -v python3 &> /dev/null; then
+        eval "$(python3 "$facts_tool" --shell 2>/dev/null)"
+    fi
+
+    if [[ -z "$HTTPD_ROOT" || -z "$SERVER_CONFIG" ]]; then
+        local ctl
+        for ctl in apachectl apache2ctl httpd; do
+            command -v "$ctl" &> /dev/null && break
+            ctl=""
+        done
+        if [[ -z "$ctl" ]]; then
+            echo "ERROR: Apache not found (apachectl, apache2ctl, or httpd)"
+            return 1
+        fi
+        local settings
+        settings=$("$ctl" -V 2>/dev/null)
+        HTTPD_ROOT=$(echo "$settings" | grep -i "HTTPD_ROOT" | cut -d'"' -f2)
+        SERVER_CONFIG=$(echo "$settings" | grep -i "SERVER_CONFIG_FILE" | cut -d'"' -f2)
     fi
 
     # Construct full config path
@@ -198,9 +206,35 @@ get_apache_config() {{
         return 1
     fi
 
+    # Every file pulled in through Include/IncludeOptional (apache_config.py)
+    APACHE_CONFIG_FILES=("$HTTPD_CONF")
+    local config_tool
+    config_tool="$(cd "$(dirname "${{BASH_SOURCE[0]}}")/../../.." && pwd)/apache_config.py"
+    if [[ -f "$config_tool" ]] && command -v python3 &> /dev/null; then
+        mapfile -t APACHE_CONFIG_FILES < <(python3 "$config_tool" --config "$HTTPD_CONF" \\
+            --server-root "$HTTPD_ROOT" --files 2>/dev/null)
+        [[ ${{#APACHE_CONFIG_FILES[@]}} -eq 0 ]] && APACHE_CONFIG_FILES=("$HTTPD_CONF")
+    fi
+
     return 0
 }}
 
+# Effective server-level value of a directive (last one wins) from the parsed
+# configuration tree; falls back to grep over APACHE_CONFIG_FILES
+get_apache_directive() {{
+    local config_tool
+    config_tool="$(cd "$(dirname "${{BASH_SOURCE[0]}}")/../../.." && pwd)/apache_config.py"
+    if [[ -f "$config_tool" ]] && command -v python3 &> /dev/null; then
+        python3 "$config_tool" --config "$HTTPD_CONF" --server-root "$HTTPD_ROOT" --value "$1" 2>/dev/null
+        return
+    fi
+
+    local value
+    value=$(grep -ih "^[[:space:]]*$1[[:space:]]" "${{APACHE_CONFIG_FILES[@]}}" 2>/dev/null | tail -1 |
+        sed -E 's/^[[:space:]]*[^[:space:]]+[[:space:]]+//')
+    [[ -n "$value" ]] && echo "$value"
+}}
+
 ################################################################################
 # CHECK IMPLEMENTATION
 ################################################################################
@@ -317,36 +351,22 @@ def load_config(config_file):
 
 
 def get_apache_config():
-    """Get Apache configuration paths."""
-    commands = ['apachectl', 'apache2ctl', 'httpd']
-
-    for cmd in commands:
-        try:
-            result = subprocess.run(
-                [cmd, '-V'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                httpd_root = None
-                server_config = None
-
-                for line in result.stdout.split('\\n'):
-                    if 'HTTPD_ROOT' in line:
-                        httpd_root = line.split('"')[1]
-                    if 'SERVER_CONFIG_FILE' in line:
-                        server_config = line.split('"')[1]
-
-                if httpd_root and server_config:
-                    if server_config.startswith('/'):
-                        return server_config
-                    else:
-                        return f"{{httpd_root}}/{{server_config}}"
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            continue
-
-    return None
+    """Get the parsed Apache configuration tree (Include/IncludeOptional resolved)."""
+    # Shared parser and cache (apache_config.py) so directives in conf.d/,
+    # sites-enabled/ and other included files are seen; -V runs once per scan
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    try:
+        import apache_config
+    except ImportError:
+        return None
+    return apache_config.load_apache_config()
+
+
+def get_directive(config, name, default=None):
+    """Effective server-level value of a directive (last one wins)."""
+    if config is None:
+        return default
+    return config.value(name, default)
 
 
 def run_check(config=None):
@@ -741,7 +761,25 @@ The scripts automatically detect Apache installation using:
 2. `apache2ctl -V` (Debian/Ubuntu)
 3. `httpd -V` (direct binary)
 
-## Check Structure
+Compiled settings (`-V`) and loaded modules (`-M`) are collected once per scan
+per Apache instance by `apache_facts.py` (repository root) and shared by all
+checks. Run `python3 apache_facts.py --all-instances` to see every running
+instance (one per `ServerRoot`/config file on multi-instance hosts).
+
+## Configuration Parsing
+
+`apache_config.py` (repository root) parses the main configuration file and
+every file pulled in by `Include`/`IncludeOptional` (`conf.d/`,
+`sites-enabled/`, ...) into a section-aware tree of `<VirtualHost>`,
+`<Directory>`, `<IfModule>` and other blocks. The tree is cached on disk
+(`$STIG_CACHE_DIR`, default `~/.cache/stig-checks`) and reused by every check
+until one of the parsed files or include directories changes.
+
+```bash
+python3 apache_config.py --directive KeepAlive --directive MaxKeepAliveRequests
+```
+
+{site_section}## Check Structure
 
 Each check script includes:
 - STIG metadata (Vuln ID, STIG ID, Severity)
@@ -924,7 +962,7 @@ The scripts automatically detect Apache installation in common locations:
 - `C:\\Program Files\\Apache Software Foundation\\Apache2.4\\bin\\httpd.exe`
 - `C:\\xampp\\apache\\bin\\httpd.exe`
 
-## Check Structure
+{site_section}## Check Structure
 
 Each check script includes:
 - STIG metadata (Vuln ID, STIG ID, Severity)
@@ -990,6 +1028,29 @@ To implement a check:
 **Tool Priority**: PowerShell (primary) > Python (fallback)
 '''
 
+SITE_README_SECTION = '''## Per-Site Evaluation
+
+Site rules apply to every `<VirtualHost>`. `apache_site_scan.py` (repository
+root) indexes the virtual hosts once from the parsed configuration and
+evaluates each rule per site in parallel. Every site inherits the server-level
+configuration and its own directives override it; `<IfModule>` blocks are
+resolved against the loaded modules.
+
+```bash
+python3 apache_site_scan.py --stig {stig_key} --workers 8 --output-dir results/apache_site
+```
+
+Results land in `<output-dir>/<site>/<Vuln ID>.json` with a `summary.json` per
+site and an overall `summary.json`. Rules without an automated evaluator are
+reported as `Not_Reviewed` for each site.
+
+'''
+
+TEMPLATE_VERSION = generation_manifest.fingerprint(
+    BASH_TEMPLATE, PYTHON_TEMPLATE, POWERSHELL_TEMPLATE, README_UNIX_TEMPLATE, README_WINDOWS_TEMPLATE,
+    SITE_README_SECTION
+)
+
 
 def truncate_text(text, max_len=300):
     """Truncate text to specified length."""
@@ -1008,14 +1069,8 @@ def escape_bash(text):
     return text.replace('\\', '\\\\').replace('"', '\\"').replace('$', '\\$')
 
 
-def make_executable(file_path):
-    """Make file executable."""
-    current = file_path.stat().st_mode
-    file_path.chmod(current | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-
-
-def generate_unix_scripts(check, output_dir):
-    """Generate bash and python scripts for UNIX Apache checks."""
+def generate_unix_scripts(check, output_dir, manifest):
+    """Generate bash and python scripts for UNIX Apache checks (unless current in the manifest)."""
     vuln_id = check.get('Group ID', 'UNKNOWN')
     stig_id = check.get('STIG ID', 'UNKNOWN')
     severity = check.get('Severity', 'medium')
@@ -1040,8 +1095,7 @@ def generate_unix_scripts(check, output_dir):
     )
 
     bash_path = output_dir / f"{vuln_id}.sh"
-    bash_path.write_text(bash_content)
-    make_executable(bash_path)
+    manifest.write(bash_path, bash_content, check, executable=True)
 
     # Generate python script
     python_content = PYTHON_TEMPLATE.format(
@@ -1057,14 +1111,13 @@ def generate_unix_scripts(check, output_dir):
     )
 
     python_path = output_dir / f"{vuln_id}.py"
-    python_path.write_text(python_content)
-    make_executable(python_path)
+    manifest.write(python_path, python_content, check, executable=True)
 
     return bash_path, python_path
 
 
-def generate_windows_scripts(check, output_dir):
-    """Generate PowerShell and python scripts for Windows Apache checks."""
+def generate_windows_scripts(check, output_dir, manifest):
+    """Generate PowerShell and python scripts for Windows Apache checks (unless current in the manifest)."""
     vuln_id = check.get('Group ID', 'UNKNOWN')
     stig_id = check.get('STIG ID', 'UNKNOWN')
     severity = check.get('Severity', 'medium')
@@ -1089,7 +1142,7 @@ def generate_windows_scripts(check, output_dir):
     )
 
     ps_path = output_dir / f"{vuln_id}.ps1"
-    ps_path.write_text(ps_content, newline='\n')
+    manifest.write(ps_path, ps_content, check)
 
     # Generate python script (same as UNIX version)
     python_content = PYTHON_TEMPLATE.format(
@@ -1105,7 +1158,7 @@ def generate_windows_scripts(check, output_dir):
     )
 
     python_path = output_dir / f"{vuln_id}.py"
-    python_path.write_text(python_content)
+    manifest.write(python_path, python_content, check)
 
     return ps_path, python_path
 
@@ -1133,21 +1186,23 @@ def process_stig(stig, base_dir):
     output_dir.mkdir(parents=True, exist_ok=True)
     print(f"Output directory: {output_dir}")
 
-    # Generate scripts based on platform
+    # Generate scripts based on platform (changed rules with $STIG_CHANGES, one shard with $STIG_SHARD)
+    manifest = generation_manifest.Manifest(output_dir, 'generate_all_apache_stigs', TEMPLATE_VERSION)
+    selected = generation_manifest.shard(stig_diff.select_checks(checks))
     print(f"Generating check scripts...")
 
     if stig['platform'] == 'unix':
         print(f"Tool Priority: Bash (primary) > Python (fallback)")
-        for i, check in enumerate(checks, 1):
-            bash_path, python_path = generate_unix_scripts(check, output_dir)
-            if i % 10 == 0 or i == len(checks):
-                print(f"  Progress: {i}/{len(checks)} checks generated")
+        for i, check in enumerate(selected, 1):
+            bash_path, python_path = generate_unix_scripts(check, output_dir, manifest)
+            if i % 10 == 0 or i == len(selected):
+                print(f"  Progress: {i}/{len(selected)} checks generated")
     else:  # windows
         print(f"Tool Priority: PowerShell (primary) > Python (fallback)")
-        for i, check in enumerate(checks, 1):
-            ps_path, python_path = generate_windows_scripts(check, output_dir)
-            if i % 10 == 0 or i == len(checks):
-                print(f"  Progress: {i}/{len(checks)} checks generated")
+        for i, check in enumerate(selected, 1):
+            ps_path, python_path = generate_windows_scripts(check, output_dir, manifest)
+            if i % 10 == 0 or i == len(selected):
+                print(f"  Progress: {i}/{len(selected)} checks generated")
 
     # Generate README
     example_vuln = checks[0].get('Group ID', 'V-000000') if checks else 'V-000000'
@@ -1157,6 +1212,10 @@ def process_stig(stig, base_dir):
     else:
         readme_template = README_WINDOWS_TEMPLATE
 
+    site_section = ''
+    if '_site_' in stig['dir_name']:
+        site_section = SITE_README_SECTION.format(stig_key=stig['dir_name'].rsplit('_', 1)[0])
+
     readme_content = readme_template.format(
         stig_name=stig['name'],
         version=stig['version'],
@@ -1164,12 +1223,16 @@ def process_stig(stig, base_dir):
         total_checks=len(checks),
         generated_date=datetime.now().strftime('%Y-%m-%d'),
         example_vuln=example_vuln,
-        dir_name=stig['dir_name']
+        dir_name=stig['dir_name'],
+        site_section=site_section
     )
 
     readme_path = output_dir / 'README.md'
-    readme_path.write_text(readme_content)
-    print(f"Generated README.md")
+    readme_inputs = {'stig': stig, 'total_checks': len(checks), 'example_vuln': example_vuln}
+    if manifest.write(readme_path, readme_content, readme_inputs):
+        print(f"Generated README.md")
+    manifest.save()
+    print(f"Scripts: {manifest.summary()}")
 
     print(f"\nCompleted: {stig['name']}")
     print(f"  Location: {output_dir}")
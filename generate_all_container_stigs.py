@@ -16,9 +16,11 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
-import stat
 import re
 
+import generation_manifest
+import stig_diff
+
 # Container STIG products configuration
 CONTAINER_STIGS = [
     {
@@ -748,11 +750,13 @@ For issues or questions:
 **Note**: This is an automation framework. All scripts require domain expertise to complete implementation with actual check logic.
 '''
 
+TEMPLATE_VERSION = generation_manifest.fingerprint(BASH_TEMPLATE, PYTHON_TEMPLATE, README_TEMPLATE)
+
 # ============================================================================
 # REPORT GENERATION
 # ============================================================================
 
-def generate_automation_report(container_config, checks, output_file):
+def generate_automation_report(container_config, checks, output_file, manifest):
     """Generate automation analysis report for a container STIG"""
 
     # Analyze automation feasibility
@@ -880,9 +884,8 @@ SEVERITY BREAKDOWN
     report += "END OF REPORT\n"
     report += f"{'='*80}\n"
 
-    # Write report
-    with open(output_file, 'w') as f:
-        f.write(report)
+    # Write report (the generation time alone does not make it stale)
+    manifest.write(output_file, report, {'config': container_config, 'checks': checks})
 
     return fully_automatable, partially_automatable, manual_only
 
@@ -935,11 +938,12 @@ def generate_container_framework(container_config, base_dir):
     output_dir.mkdir(parents=True, exist_ok=True)
     print(f"Output directory: {output_dir}")
 
-    # Generate scripts for each check
+    # Generate scripts for each check (changed rules with $STIG_CHANGES, one shard with $STIG_SHARD)
+    manifest = generation_manifest.Manifest(output_dir, 'generate_all_container_stigs', TEMPLATE_VERSION)
     bash_count = 0
     python_count = 0
 
-    for check in checks:
+    for check in generation_manifest.shard(stig_diff.select_checks(checks)):
         vuln_id = check.get('Group ID', 'Unknown')
         stig_id = check.get('STIG ID', 'Unknown')
         severity = check.get('Severity', 'unknown')
@@ -968,11 +972,7 @@ def generate_container_framework(container_config, base_dir):
         )
 
         bash_file = output_dir / f"{safe_stig_id}.sh"
-        with open(bash_file, 'w') as f:
-            f.write(bash_content)
-
-        # Make executable
-        bash_file.chmod(bash_file.stat().st_mode | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
+        manifest.write(bash_file, bash_content, check, executable=True)
         bash_count += 1
 
         # Generate Python script
@@ -988,11 +988,7 @@ def generate_container_framework(container_config, base_dir):
         )
 
         python_file = output_dir / f"{safe_stig_id}.py"
-        with open(python_file, 'w') as f:
-            f.write(python_content)
-
-        # Make executable
-        python_file.chmod(python_file.stat().st_mode | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
+        manifest.write(python_file, python_content, check, executable=True)
         python_count += 1
 
     print(f"Generated {bash_count} bash scripts")
@@ -1009,9 +1005,8 @@ def generate_container_framework(container_config, base_dir):
     )
 
     readme_file = output_dir / "README.md"
-    with open(readme_file, 'w') as f:
-        f.write(readme_content)
-    print(f"Generated README: {readme_file}")
+    if manifest.write(readme_file, readme_content, {'config': container_config, 'total_checks': len(checks)}):
+        print(f"Generated README: {readme_file}")
 
     # Generate example configuration file
     config_example = {
@@ -1032,25 +1027,27 @@ def generate_container_framework(container_config, base_dir):
     }
 
     config_file = output_dir / "config-example.json"
-    with open(config_file, 'w') as f:
-        json.dump(config_example, f, indent=2)
-    print(f"Generated example config: {config_file}")
+    if manifest.write(config_file, json.dumps(config_example, indent=2), config_example):
+        print(f"Generated example config: {config_file}")
+    manifest.save()
+    print(f"Files: {manifest.summary()}")
 
     # Generate automation report
     reports_dir = base_dir / "reports"
     reports_dir.mkdir(exist_ok=True)
 
     report_file = reports_dir / f"{container_config['dir_name']}_automation_analysis.txt"
+    reports_manifest = generation_manifest.Manifest(reports_dir, 'generate_all_container_stigs', TEMPLATE_VERSION)
     fully_auto, partial_auto, manual = generate_automation_report(
-        container_config, checks, report_file
+        container_config, checks, report_file, reports_manifest
     )
+    reports_manifest.save()
     print(f"Generated automation report: {report_file}")
 
     # Save extracted checks to JSON for reference
     checks_json_file = base_dir / f"{container_config['dir_name']}_checks.json"
-    with open(checks_json_file, 'w') as f:
-        json.dump(checks, f, indent=2)
-    print(f"Saved extracted checks: {checks_json_file}")
+    if generation_manifest.write_if_changed(checks_json_file, json.dumps(checks, indent=2)):
+        print(f"Saved extracted checks: {checks_json_file}")
 
     return {
         'name': container_config['name'],
@@ -17,9 +17,11 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
-import stat
 import re
 
+import generation_manifest
+import stig_diff
+
 # Firewall STIG products configuration
 FIREWALL_STIGS = [
     {
@@ -802,11 +804,13 @@ For issues or questions:
 **Note**: This is an automation framework. All scripts require domain expertise to complete implementation with actual device-specific logic.
 '''
 
+TEMPLATE_VERSION = generation_manifest.fingerprint(BASH_TEMPLATE, PYTHON_TEMPLATE, README_TEMPLATE)
+
 # ============================================================================
 # REPORT GENERATION
 # ============================================================================
 
-def generate_automation_report(firewall_config, checks, output_file):
+def generate_automation_report(firewall_config, checks, output_file, manifest):
     """Generate automation analysis report for a firewall STIG"""
 
     # Analyze automation feasibility
@@ -933,9 +937,8 @@ SEVERITY BREAKDOWN
     report += "END OF REPORT\n"
     report += f"{'='*80}\n"
 
-    # Write report
-    with open(output_file, 'w') as f:
-        f.write(report)
+    # Write report (the generation time alone does not make it stale)
+    manifest.write(output_file, report, {'config': firewall_config, 'checks': checks})
 
     return fully_automatable, partially_automatable, manual_only
 
@@ -969,11 +972,12 @@ def generate_firewall_framework(firewall_config, base_dir):
     output_dir.mkdir(parents=True, exist_ok=True)
     print(f"Output directory: {output_dir}")
 
-    # Generate scripts for each check
+    # Generate scripts for each check (changed rules with $STIG_CHANGES, one shard with $STIG_SHARD)
+    manifest = generation_manifest.Manifest(output_dir, 'generate_all_firewall_stigs', TEMPLATE_VERSION)
     bash_count = 0
     python_count = 0
 
-    for check in checks:
+    for check in generation_manifest.shard(stig_diff.select_checks(checks)):
         vuln_id = check.get('Group ID', 'Unknown')
         stig_id = check.get('STIG ID', 'Unknown')
         severity = check.get('Severity', 'unknown')
@@ -1002,11 +1006,7 @@ def generate_firewall_framework(firewall_config, base_dir):
         )
 
         bash_file = output_dir / f"{safe_stig_id}.sh"
-        with open(bash_file, 'w') as f:
-            f.write(bash_content)
-
-        # Make executable
-        bash_file.chmod(bash_file.stat().st_mode | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
+        manifest.write(bash_file, bash_content, check, executable=True)
         bash_count += 1
 
         # Generate Python script
@@ -1022,11 +1022,7 @@ def generate_firewall_framework(firewall_config, base_dir):
         )
 
         python_file = output_dir / f"{safe_stig_id}.py"
-        with open(python_file, 'w') as f:
-            f.write(python_content)
-
-        # Make executable
-        python_file.chmod(python_file.stat().st_mode | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
+        manifest.write(python_file, python_content, check, executable=True)
         python_count += 1
 
     print(f"Generated {bash_count} bash scripts")
@@ -1043,9 +1039,8 @@ def generate_firewall_framework(firewall_config, base_dir):
     )
 
     readme_file = output_dir / "README.md"
-    with open(readme_file, 'w') as f:
-        f.write(readme_content)
-    print(f"Generated README: {readme_file}")
+    if manifest.write(readme_file, readme_content, {'config': firewall_config, 'total_checks': len(checks)}):
+        print(f"Generated README: {readme_file}")
 
     # Generate example configuration file
     config_example = {
@@ -1065,18 +1060,21 @@ def generate_firewall_framework(firewall_config, base_dir):
     }
 
     config_file = output_dir / "config-example.json"
-    with open(config_file, 'w') as f:
-        json.dump(config_example, f, indent=2)
-    print(f"Generated example config: {config_file}")
+    if manifest.write(config_file, json.dumps(config_example, indent=2), config_example):
+        print(f"Generated example config: {config_file}")
+    manifest.save()
+    print(f"Files: {manifest.summary()}")
 
     # Generate automation report
     reports_dir = base_dir / "reports"
     reports_dir.mkdir(exist_ok=True)
 
     report_file = reports_dir / f"{firewall_config['dir_name']}_automation_analysis_v3.txt"
+    reports_manifest = generation_manifest.Manifest(reports_dir, 'generate_all_firewall_stigs', TEMPLATE_VERSION)
     fully_auto, partial_auto, manual = generate_automation_report(
-        firewall_config, checks, report_file
+        firewall_config, checks, report_file, reports_manifest
     )
+    reports_manifest.save()
     print(f"Generated automation report: {report_file}")
 
     return {
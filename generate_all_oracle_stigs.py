@@ -8,7 +8,9 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
-import stat
+
+import generation_manifest
+import stig_diff
 
 # Define all Oracle STIG products
 ORACLE_STIGS = [
@@ -488,6 +490,9 @@ To implement a check:
 '''
 
 
+TEMPLATE_VERSION = generation_manifest.fingerprint(BASH_TEMPLATE, PYTHON_TEMPLATE, README_TEMPLATE)
+
+
 def truncate_text(text, max_len=200):
     """Truncate text to specified length."""
     if not text:
@@ -505,14 +510,8 @@ def escape_bash(text):
     return text.replace('\\', '\\\\').replace('"', '\\"').replace('$', '\\$')
 
 
-def make_executable(file_path):
-    """Make file executable."""
-    current = file_path.stat().st_mode
-    file_path.chmod(current | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-
-
-def generate_scripts(check, output_dir):
-    """Generate both bash and python scripts for a check."""
+def generate_scripts(check, output_dir, manifest):
+    """Generate both bash and python scripts for a check (unless current in the manifest)."""
     vuln_id = check.get('Group ID', 'UNKNOWN')
     stig_id = check.get('STIG ID', 'UNKNOWN')
     severity = check.get('Severity', 'medium')
@@ -533,8 +532,7 @@ def generate_scripts(check, output_dir):
     )
 
     bash_path = output_dir / f"{vuln_id}.sh"
-    bash_path.write_text(bash_content)
-    make_executable(bash_path)
+    manifest.write(bash_path, bash_content, check, executable=True)
 
     # Generate python script
     python_content = PYTHON_TEMPLATE.format(
@@ -548,8 +546,7 @@ def generate_scripts(check, output_dir):
     )
 
     python_path = output_dir / f"{vuln_id}.py"
-    python_path.write_text(python_content)
-    make_executable(python_path)
+    manifest.write(python_path, python_content, check, executable=True)
 
     return bash_path, python_path
 
@@ -576,13 +573,15 @@ def process_stig(stig, base_dir):
     output_dir.mkdir(parents=True, exist_ok=True)
     print(f"Output directory: {output_dir}")
 
-    # Generate scripts
+    # Generate scripts (changed rules with $STIG_CHANGES, one shard with $STIG_SHARD)
+    manifest = generation_manifest.Manifest(output_dir, 'generate_all_oracle_stigs', TEMPLATE_VERSION)
+    selected = generation_manifest.shard(stig_diff.select_checks(checks))
     print(f"Generating check scripts...")
-    for i, check in enumerate(checks, 1):
-        bash_path, python_path = generate_scripts(check, output_dir)
+    for i, check in enumerate(selected, 1):
+        bash_path, python_path = generate_scripts(check, output_dir, manifest)
 
-        if i % 50 == 0 or i == len(checks):
-            print(f"  Progress: {i}/{len(checks)} checks generated")
+        if i % 50 == 0 or i == len(selected):
+            print(f"  Progress: {i}/{len(selected)} checks generated")
 
     # Generate README
     example_vuln = checks[0].get('Group ID', 'V-000000') if checks else 'V-000000'
@@ -598,8 +597,11 @@ def process_stig(stig, base_dir):
     )
 
     readme_path = output_dir / 'README.md'
-    readme_path.write_text(readme_content)
-    print(f"Generated README.md")
+    readme_inputs = {'stig': stig, 'total_checks': len(checks), 'example_vuln': example_vuln}
+    if manifest.write(readme_path, readme_content, readme_inputs):
+        print(f"Generated README.md")
+    manifest.save()
+    print(f"Scripts: {manifest.summary()}")
 
     print(f"\nCompleted: {stig['name']}")
     print(f"  Location: {output_dir}")
@@ -4,11 +4,13 @@ Batch RHEL STIG Framework Generator
 Processes all 2 RHEL products from their extracted JSON files.
 """
 
-import json
 import sys
 from pathlib import Path
 from datetime import datetime
-import stat
+
+import generation_manifest
+import stig_catalog
+import stig_diff
 
 # Define all RHEL STIG products
 RHEL_STIGS = [
@@ -461,6 +463,9 @@ To implement a check:
 '''
 
 
+TEMPLATE_VERSION = generation_manifest.fingerprint(BASH_TEMPLATE, PYTHON_TEMPLATE, README_TEMPLATE)
+
+
 def truncate_text(text, max_len=200):
     """Truncate text to specified length."""
     if not text:
@@ -478,14 +483,8 @@ def escape_bash(text):
     return text.replace('\\', '\\\\').replace('"', '\\"').replace('$', '\\$')
 
 
-def make_executable(file_path):
-    """Make file executable."""
-    current = file_path.stat().st_mode
-    file_path.chmod(current | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-
-
-def generate_scripts(check, output_dir):
-    """Generate both bash and python scripts for a check."""
+def generate_scripts(check, output_dir, manifest):
+    """Generate both bash and python scripts for a check (unless current in the manifest)."""
     vuln_id = check.get('Group ID', 'UNKNOWN')
     stig_id = check.get('STIG ID', 'UNKNOWN')
     severity = check.get('Severity', 'medium')
@@ -506,8 +505,7 @@ def generate_scripts(check, output_dir):
     )
 
     bash_path = output_dir / f"{vuln_id}.sh"
-    bash_path.write_text(bash_content)
-    make_executable(bash_path)
+    manifest.write(bash_path, bash_content, check, executable=True)
 
     # Generate python script
     python_content = PYTHON_TEMPLATE.format(
@@ -521,8 +519,7 @@ def generate_scripts(check, output_dir):
     )
 
     python_path = output_dir / f"{vuln_id}.py"
-    python_path.write_text(python_content)
-    make_executable(python_path)
+    manifest.write(python_path, python_content, check, executable=True)
 
     return bash_path, python_path
 
@@ -539,8 +536,7 @@ def process_stig(stig, base_dir):
         print(f"ERROR: JSON file not found: {json_path}")
         return False
 
-    with open(json_path, 'r') as f:
-        checks = json.load(f)
+    checks = stig_catalog.load_checks(json_path)
 
     print(f"Loaded {len(checks)} checks from {stig['json_file']}")
 
@@ -549,13 +545,15 @@ def process_stig(stig, base_dir):
     output_dir.mkdir(parents=True, exist_ok=True)
     print(f"Output directory: {output_dir}")
 
-    # Generate scripts
+    # Generate scripts (changed rules with $STIG_CHANGES, one shard with $STIG_SHARD)
+    manifest = generation_manifest.Manifest(output_dir, 'generate_all_rhel_stigs', TEMPLATE_VERSION)
+    selected = generation_manifest.shard(stig_diff.select_checks(checks))
     print(f"Generating check scripts...")
-    for i, check in enumerate(checks, 1):
-        bash_path, python_path = generate_scripts(check, output_dir)
+    for i, check in enumerate(selected, 1):
+        bash_path, python_path = generate_scripts(check, output_dir, manifest)
 
-        if i % 50 == 0 or i == len(checks):
-            print(f"  Progress: {i}/{len(checks)} checks generated")
+        if i % 50 == 0 or i == len(selected):
+            print(f"  Progress: {i}/{len(selected)} checks generated")
 
     # Generate README
     example_vuln = checks[0].get('Group ID', 'V-000000') if checks else 'V-000000'
@@ -571,8 +569,11 @@ def process_stig(stig, base_dir):
     )
 
     readme_path = output_dir / 'README.md'
-    readme_path.write_text(readme_content)
-    print(f"Generated README.md")
+    readme_inputs = {'stig': stig, 'total_checks': len(checks), 'example_vuln': example_vuln}
+    if manifest.write(readme_path, readme_content, readme_inputs):
+        print(f"Generated README.md")
+    manifest.save()
+    print(f"Scripts: {manifest.summary()}")
 
     print(f"\nCompleted: {stig['name']}")
     print(f"  Location: {output_dir}")
@@ -14,10 +14,18 @@ Usage:
 import json
 import os
 import argparse
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 import re
 
+import generation_manifest
+import stig_diff
+
+
+# Scripts are built in code here, so the generator source is the template version
+TEMPLATE_VERSION = generation_manifest.source_fingerprint(__file__)
+
 
 def categorize_check(check):
     """Determine the type of Windows check based on content"""
@@ -442,6 +450,10 @@ def main():
                        help='Output directory for checks')
     parser.add_argument('--skip-existing', action='store_true',
                        help='Skip checks that already exist')
+    parser.add_argument('--force', action='store_true', default=bool(os.environ.get('STIG_FORCE_REGENERATE')),
+                       help='Rewrite every script, even when its rule and the generator are unchanged')
+    parser.add_argument('--changes', default=os.environ.get('STIG_CHANGES'),
+                       help='Only generate the added and changed rules of a stig_diff.py change list')
 
     args = parser.parse_args()
 
@@ -463,15 +475,29 @@ def main():
         checks = checks[:args.limit]
         print(f"Limiting to first {args.limit} checks")
 
+    # Restrict to the rules a release diff marked as added or changed
+    if args.changes:
+        checks = stig_diff.select_checks(checks, args.changes)
+        print(f"Limiting to {len(checks)} added or changed checks from {args.changes}")
+
+    # Mixed-release dumps repeat rules: keep the last record of each, the one that
+    # used to win by overwriting, so each script has one set of inputs and one shard
+    checks = list(OrderedDict((check.get('Vuln ID'), check) for check in checks).values())
+
+    # Take this worker's share when run_generators.py spreads the rules over processes
+    checks = generation_manifest.shard(checks)
+
     # Create output directory
     output_dir = Path(args.output_dir)
     if not args.dry_run:
         output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = generation_manifest.Manifest(output_dir, Path(__file__).stem, TEMPLATE_VERSION, force=args.force)
 
     # Statistics
     stats = {
         'total': len(checks),
         'generated': 0,
+        'unchanged': 0,
         'skipped': 0,
         'failed': 0,
         'by_type': {}
@@ -516,16 +542,13 @@ def main():
                 powershell_script = generate_powershell_generic_check(check)
                 python_script = f"#!/usr/bin/env python3\n# TODO: Implement {vuln_id}\n"
 
-            # Write PowerShell script
-            with open(ps1_file, 'w', encoding='utf-8') as f:
-                f.write(powershell_script)
+            # Write scripts whose rule or generator changed
             # Note: PowerShell scripts don't need chmod on Windows
-
-            # Write Python script
-            with open(python_file, 'w', encoding='utf-8') as f:
-                f.write(python_script)
-            if os.name != 'nt':  # Only chmod on Unix-like systems
-                os.chmod(python_file, 0o755)
+            written = manifest.write(ps1_file, powershell_script, check)
+            written = manifest.write(python_file, python_script, check, executable=os.name != 'nt') or written
+            if not written:
+                stats['unchanged'] += 1
+                continue
 
             stats['generated'] += 1
             print(f"  Generated: {vuln_id} ({check_type})")
@@ -534,12 +557,17 @@ def main():
             print(f"  ERROR generating {vuln_id}: {e}")
             stats['failed'] += 1
 
+    if not args.dry_run:
+        manifest.save()
+
     # Print summary
     print(f"\n{'='*80}")
     print(f"Generation Summary")
     print(f"{'='*80}")
     print(f"Total checks:     {stats['total']}")
     print(f"Generated:        {stats['generated']}")
+    print(f"Unchanged:        {stats['unchanged']}")
+    print(f"Files:            {manifest.summary()}")
     print(f"Skipped:          {stats['skipped']}")
     print(f"Failed:           {stats['failed']}")
     print(f"\nBy Check Type:")
@@ -10,6 +10,9 @@ import sys
 import re
 from pathlib import Path
 
+import generation_manifest
+import stig_diff
+
 # Office product configurations
 OFFICE_PRODUCTS = {
     'microsoft_office_system_2016': {
@@ -50,6 +53,9 @@ OFFICE_PRODUCTS = {
     }
 }
 
+# Templates are built in code here, so the generator source is the template version
+TEMPLATE_VERSION = generation_manifest.source_fingerprint(__file__)
+
 def sanitize_filename(name):
     """Sanitize STIG ID for use as filename"""
     return re.sub(r'[^\w\-]', '_', name)
@@ -723,34 +729,34 @@ def process_office_product(base_dir, product_key, product_config):
 
     print(f"Loaded {len(checks)} checks from {json_file}")
 
-    # Generate scripts for each check
+    # Generate scripts for each check (changed rules with $STIG_CHANGES, one shard with $STIG_SHARD)
+    manifest = generation_manifest.Manifest(output_dir, 'generate_office_stigs', TEMPLATE_VERSION)
     script_count = 0
-    for check in checks:
+    for check in generation_manifest.shard(stig_diff.select_checks(checks)):
         stig_id = check.get('STIG ID', 'UNKNOWN')
         safe_stig_id = sanitize_filename(stig_id)
 
         # Generate PowerShell script
         ps_script = generate_powershell_script(check, product_config['display_name'])
         ps_file = os.path.join(output_dir, f"{safe_stig_id}.ps1")
-        with open(ps_file, 'w', encoding='utf-8') as f:
-            f.write(ps_script)
+        manifest.write(ps_file, ps_script, check)
 
         # Generate Python script
         py_script = generate_python_script(check, product_config['display_name'])
         py_file = os.path.join(output_dir, f"{safe_stig_id}.py")
-        with open(py_file, 'w', encoding='utf-8') as f:
-            f.write(py_script)
+        manifest.write(py_file, py_script, check)
 
         script_count += 2
 
-    print(f"Generated {script_count} scripts ({len(checks)} PowerShell + {len(checks)} Python)")
+    print(f"Generated {script_count} scripts ({script_count // 2} PowerShell + {script_count // 2} Python)")
 
     # Generate README
     readme = generate_readme(product_config, len(checks))
     readme_file = os.path.join(output_dir, 'README.md')
-    with open(readme_file, 'w', encoding='utf-8') as f:
-        f.write(readme)
-    print(f"Generated README: {readme_file}")
+    if manifest.write(readme_file, readme, {'product': product_config, 'total_checks': len(checks)}):
+        print(f"Generated README: {readme_file}")
+    manifest.save()
+    print(f"Files: {manifest.summary()}")
 
     return len(checks), script_count
 
@@ -965,9 +971,8 @@ def main():
         # Generate automation analysis report
         report = generate_automation_report(base_dir, product_key, product_config, check_count)
         report_file = os.path.join(reports_dir, f"{product_config['dir_name']}_stig_automation_analysis.md")
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report)
-        print(f"Generated report: {report_file}")
+        if generation_manifest.write_if_changed(report_file, report):
+            print(f"Generated report: {report_file}")
 
     print(f"\n{'='*80}")
     print("Summary")
@@ -18,6 +18,9 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+import generation_manifest
+import stig_diff
+
 
 # Bash script template (HIGHEST PRIORITY for Linux/UNIX)
 BASH_TEMPLATE = '''#!/usr/bin/env bash
@@ -245,7 +248,11 @@ def analyze_automation(check, platform='linux'):
     return automatable, tool, method
 
 
-def generate_bash_script(check, output_dir):
+# Check logic placeholders are built in code too, so the generator source is the template version
+TEMPLATE_VERSION = generation_manifest.source_fingerprint(__file__)
+
+
+def generate_bash_script(check, output_dir, manifest):
     """Generate bash script for a check (1st PRIORITY for Linux)"""
     vuln_id = check.get('Group ID', 'UNKNOWN')
     stig_id = check.get('STIG ID', 'UNKNOWN')
@@ -272,18 +279,14 @@ def generate_bash_script(check, output_dir):
         check_logic=check_logic
     )
 
-    # Write script
+    # Write script (unless current in the manifest)
     script_path = Path(output_dir) / f"{vuln_id}.sh"
-    with open(script_path, 'w') as f:
-        f.write(script_content)
-
-    # Make executable
-    script_path.chmod(0o755)
+    manifest.write(script_path, script_content, check, executable=True)
 
     return script_path
 
 
-def generate_python_script(check, output_dir):
+def generate_python_script(check, output_dir, manifest):
     """Generate Python script for a check (2nd PRIORITY - FALLBACK)"""
     vuln_id = check.get('Group ID', 'UNKNOWN')
     stig_id = check.get('STIG ID', 'UNKNOWN')
@@ -309,13 +312,9 @@ def generate_python_script(check, output_dir):
         python_check_logic=python_check_logic
     )
 
-    # Write script
+    # Write script (unless current in the manifest)
     script_path = Path(output_dir) / f"{vuln_id}.py"
-    with open(script_path, 'w') as f:
-        f.write(script_content)
-
-    # Make executable
-    script_path.chmod(0o755)
+    manifest.write(script_path, script_content, check, executable=True)
 
     return script_path
 
@@ -326,6 +325,10 @@ def main():
     parser.add_argument('--output-dir', required=True, help='Output directory')
     parser.add_argument('--source-json', default='AllSTIGS2.json', help='Source JSON file')
     parser.add_argument('--limit', type=int, help='Limit number of checks to generate (for testing)')
+    parser.add_argument('--changes', default=os.environ.get('STIG_CHANGES'),
+                        help='Only generate the added and changed rules of a stig_diff.py change list')
+    parser.add_argument('--force', action='store_true', default=bool(os.environ.get('STIG_FORCE_REGENERATE')),
+                        help='Rewrite every script, even when its rule and the generator are unchanged')
 
     args = parser.parse_args()
 
@@ -337,12 +340,18 @@ def main():
     # Create output directory
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = generation_manifest.Manifest(output_dir, 'generate_oracle_stigs', TEMPLATE_VERSION, force=args.force)
 
     # Apply limit if specified
     if args.limit:
         checks = checks[:args.limit]
         print(f"Limiting to first {args.limit} checks for testing")
 
+    # Restrict to the rules a release diff marked as added or changed
+    if args.changes:
+        checks = stig_diff.select_checks(checks, args.changes)
+        print(f"Limiting to {len(checks)} added or changed checks from {args.changes}")
+
     # Determine platform
     platform = 'windows' if 'windows' in args.benchmark.lower() else 'linux'
 
@@ -362,21 +371,24 @@ def main():
 
         # Generate bash script (1st PRIORITY for Linux)
         if platform == 'linux':
-            bash_path = generate_bash_script(check, output_dir)
-            python_path = generate_python_script(check, output_dir)
+            bash_path = generate_bash_script(check, output_dir, manifest)
+            python_path = generate_python_script(check, output_dir, manifest)
             generated_count += 1
             if idx % 50 == 0:
                 print(f"  [{idx}/{len(checks)}] {vuln_id} - Generated (bash + python fallback)")
         else:
             # TODO: Add PowerShell generation for Windows
-            python_path = generate_python_script(check, output_dir)
+            python_path = generate_python_script(check, output_dir, manifest)
             generated_count += 1
             if idx % 50 == 0:
                 print(f"  [{idx}/{len(checks)}] {vuln_id} - Generated (python)")
 
+    manifest.save()
+
     print(f"\nGeneration complete!")
     print(f"Total checks: {len(checks)}")
     print(f"Generated: {generated_count}")
+    print(f"Scripts: {manifest.summary()}")
     print(f"Output directory: {output_dir}")
 
     return 0
@@ -6,112 +6,21 @@ Shows all scripts grouped by checklist with automation status
 
 from pathlib import Path
 from collections import defaultdict
-import re
 import json
 from datetime import datetime
 
-def parse_script_metadata(script_path):
-    """Extract metadata from a script file"""
-    try:
-        content = script_path.read_text(encoding='utf-8', errors='ignore')
-
-        metadata = {
-            'file': script_path.name,
-            'path': str(script_path),
-            'vuln_id': None,
-            'stig_id': None,
-            'severity': None,
-            'rule_title': None,
-            'automation_status': 'unknown',
-            'requires_params': False,
-            'manual_review': False,
-            'notes': []
-        }
-
-        # Extract VULN ID
-        vuln_match = re.search(r'(?:VULN_ID|vuln_id|STIG Check:|V-)[\s=:"\']*(V-\d+)', content, re.IGNORECASE)
-        if vuln_match:
-            metadata['vuln_id'] = vuln_match.group(1)
-
-        # Extract STIG ID
-        stig_match = re.search(r'(?:STIG_ID|stig_id|STIG ID:)[\s=:"\']*([\w-]+)', content, re.IGNORECASE)
-        if stig_match:
-            metadata['stig_id'] = stig_match.group(1)
-
-        # Extract severity
-        sev_match = re.search(r'(?:SEVERITY|severity|Severity:)[\s=:"\']*(high|medium|low)', content, re.IGNORECASE)
-        if sev_match:
-            metadata['severity'] = sev_match.group(1).lower()
-
-        # Extract rule title
-        title_match = re.search(r'(?:Rule Title|rule_title|RULE_TITLE)[\s=:"\']*(.*?)(?:"|\'|\n)', content, re.IGNORECASE)
-        if title_match:
-            metadata['rule_title'] = title_match.group(1).strip()[:100]
-
-        # Determine automation status
-        if 'exit 2  # Manual review required' in content or \
-           ('Manual review required' in content and 'exit 2' in content) or \
-           ('Not_Reviewed' in content and 'EXIT_CODE=2' in content):
-            metadata['automation_status'] = 'manual_review'
-            metadata['manual_review'] = True
-            metadata['notes'].append('Requires manual verification against STIG requirements')
-        elif '# TODO: Implement' in content or 'TODO: Implement' in content:
-            if 'exit 3' in content:
-                metadata['automation_status'] = 'not_implemented'
-                metadata['notes'].append('Not yet implemented - placeholder only')
-        elif 'exit 0' in content or 'exit 1' in content:
-            metadata['automation_status'] = 'automated'
-            metadata['notes'].append('Fully automated check')
-
-        # Check for parameter requirements
-        if '# TODO: Extract' in content or 'TODO: Extract' in content:
-            metadata['requires_params'] = True
-            metadata['notes'].append('Requires parameter configuration')
-
-        if '--config' in content or 'CONFIG_FILE' in content or '$ConfigFile' in content:
-            metadata['requires_params'] = True
-            if 'Requires configuration file' not in ' '.join(metadata['notes']):
-                metadata['notes'].append('Supports optional configuration file')
-
-        return metadata
-
-    except Exception as e:
-        return {
-            'file': script_path.name,
-            'path': str(script_path),
-            'vuln_id': None,
-            'stig_id': None,
-            'severity': None,
-            'rule_title': f'Error parsing: {e}',
-            'automation_status': 'error',
-            'requires_params': False,
-            'manual_review': False,
-            'notes': ['Error parsing script']
-        }
+import script_index
 
 def scan_stig_checks():
-    """Scan all STIG check directories"""
-    checks_dir = Path('checks')
+    """Scan all STIG check directories (through the script metadata index)"""
     platforms = defaultdict(lambda: defaultdict(list))
 
-    for category_dir in checks_dir.iterdir():
-        if not category_dir.is_dir() or category_dir.name.startswith('.'):
-            continue
-
-        category = category_dir.name  # os, application, database, network
-
-        for platform_dir in category_dir.iterdir():
-            if not platform_dir.is_dir() or platform_dir.name.startswith('.'):
+    with script_index.open_index() as index:
+        for metadata in index.scripts(suffixes=('.sh', '.ps1')):
+            # Only the scripts of the platform directory itself, not samples/ and the like
+            if metadata['path'].count('/') != 3:
                 continue
-
-            platform_name = platform_dir.name
-
-            # Find all scripts
-            scripts = list(platform_dir.glob('*.sh')) + list(platform_dir.glob('*.ps1'))
-
-            for script in sorted(scripts):
-                metadata = parse_script_metadata(script)
-                platforms[category][platform_name].append(metadata)
+            platforms[metadata['category']][metadata['platform']].append(metadata)
 
     return platforms
 
@@ -17,6 +17,9 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+import generation_manifest
+import stig_diff
+
 
 # PowerShell script template (HIGHEST PRIORITY for Windows)
 POWERSHELL_TEMPLATE = '''# STIG Check: {vuln_id}
@@ -390,7 +393,11 @@ def analyze_automation(check):
     return automatable, method
 
 
-def generate_powershell_script(check, output_dir):
+# Check logic placeholders are built in code too, so the generator source is the template version
+TEMPLATE_VERSION = generation_manifest.source_fingerprint(__file__)
+
+
+def generate_powershell_script(check, output_dir, manifest):
     """Generate PowerShell script for a check (1st PRIORITY for Windows)"""
     vuln_id = check.get('Group ID', 'UNKNOWN')
     stig_id = check.get('STIG ID', 'UNKNOWN')
@@ -421,15 +428,14 @@ def generate_powershell_script(check, output_dir):
         check_logic=check_logic
     )
 
-    # Write script
+    # Write script (unless current in the manifest)
     script_path = Path(output_dir) / f"{vuln_id}.ps1"
-    with open(script_path, 'w', newline='\n') as f:
-        f.write(script_content)
+    manifest.write(script_path, script_content, check)
 
     return script_path
 
 
-def generate_python_script(check, output_dir):
+def generate_python_script(check, output_dir, manifest):
     """Generate Python script for a check (2nd PRIORITY - FALLBACK)"""
     vuln_id = check.get('Group ID', 'UNKNOWN')
     stig_id = check.get('STIG ID', 'UNKNOWN')
@@ -457,18 +463,14 @@ def generate_python_script(check, output_dir):
         python_check_logic=python_check_logic
     )
 
-    # Write script
+    # Write script (unless current in the manifest)
     script_path = Path(output_dir) / f"{vuln_id}.py"
-    with open(script_path, 'w') as f:
-        f.write(script_content)
-
-    # Make executable
-    script_path.chmod(0o755)
+    manifest.write(script_path, script_content, check, executable=True)
 
     return script_path
 
 
-def generate_readme(metadata, output_dir, total_checks, generated_count):
+def generate_readme(metadata, output_dir, total_checks, generated_count, manifest):
     """Generate README.md for the framework"""
     content = README_TEMPLATE.format(
         benchmark_name=metadata['benchmark_name'],
@@ -481,8 +483,7 @@ def generate_readme(metadata, output_dir, total_checks, generated_count):
     )
 
     readme_path = output_dir / 'README.md'
-    with open(readme_path, 'w') as f:
-        f.write(content)
+    manifest.write(readme_path, content, {'metadata': metadata, 'total_checks': total_checks})
 
     return readme_path
 
@@ -492,6 +493,10 @@ def main():
     parser.add_argument('--source', required=True, help='Source JSON file (e.g., windows_10_checks.json)')
     parser.add_argument('--output-dir', required=True, help='Output directory')
     parser.add_argument('--limit', type=int, help='Limit number of checks to generate (for testing)')
+    parser.add_argument('--changes', default=os.environ.get('STIG_CHANGES'),
+                        help='Only generate the added and changed rules of a stig_diff.py change list')
+    parser.add_argument('--force', action='store_true', default=bool(os.environ.get('STIG_FORCE_REGENERATE')),
+                        help='Rewrite every script, even when its rule and the generator are unchanged')
 
     args = parser.parse_args()
 
@@ -503,6 +508,7 @@ def main():
     # Create output directory
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = generation_manifest.Manifest(output_dir, 'generate_windows_stigs', TEMPLATE_VERSION, force=args.force)
 
     # Apply limit if specified
     total_checks = len(checks)
@@ -510,6 +516,11 @@ def main():
         checks = checks[:args.limit]
         print(f"Limiting to first {args.limit} checks for testing")
 
+    # Restrict to the rules a release diff marked as added or changed
+    if args.changes:
+        checks = stig_diff.select_checks(checks, args.changes)
+        print(f"Limiting to {len(checks)} added or changed checks from {args.changes}")
+
     # Generate scripts (following priority: PowerShell > Python for Windows)
     print(f"\nGenerating {len(checks)} check scripts...")
     print(f"Tool Priority: PowerShell (primary) > Python (fallback)")
@@ -528,38 +539,43 @@ def main():
             continue
 
         # Generate PowerShell script (1st PRIORITY for Windows)
-        ps_path = generate_powershell_script(check, output_dir)
+        ps_path = generate_powershell_script(check, output_dir, manifest)
 
         # Generate Python script (FALLBACK)
-        py_path = generate_python_script(check, output_dir)
+        py_path = generate_python_script(check, output_dir, manifest)
 
         generated_count += 1
         if idx % 50 == 0 or idx == len(checks):
             print(f"  [{idx}/{len(checks)}] {vuln_id} - Generated (PowerShell + Python)")
 
     # Generate README
-    readme_path = generate_readme(metadata, output_dir, total_checks, generated_count)
+    readme_path = generate_readme(metadata, output_dir, total_checks, generated_count, manifest)
 
-    # Generate summary report
+    # Generate summary report (rewritten only when the statistics change)
     report_path = output_dir / 'generation_report.txt'
-    with open(report_path, 'w') as f:
-        f.write(f"Windows STIG Automation Framework Generation Report\n")
-        f.write(f"{'='*60}\n\n")
-        f.write(f"Benchmark: {metadata['benchmark_name']}\n")
-        f.write(f"Benchmark ID: {metadata['benchmark_id']}\n")
-        f.write(f"Version: {metadata['version']}\n")
-        f.write(f"Release: {metadata['release_info']}\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(f"Statistics:\n")
-        f.write(f"  Total checks in source: {total_checks}\n")
-        f.write(f"  Checks processed: {len(checks)}\n")
-        f.write(f"  Scripts generated: {generated_count}\n")
-        f.write(f"  Checks skipped (manual): {skipped_count}\n")
-        f.write(f"  PowerShell scripts: {generated_count}\n")
-        f.write(f"  Python scripts: {generated_count}\n")
-        f.write(f"  Total files created: {generated_count * 2 + 2}\n\n")
-        f.write(f"Output Directory: {output_dir}\n")
-        f.write(f"Tool Priority: PowerShell (primary) > Python (fallback)\n")
+    report = (
+        f"Windows STIG Automation Framework Generation Report\n"
+        f"{'='*60}\n\n"
+        f"Benchmark: {metadata['benchmark_name']}\n"
+        f"Benchmark ID: {metadata['benchmark_id']}\n"
+        f"Version: {metadata['version']}\n"
+        f"Release: {metadata['release_info']}\n"
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        f"Statistics:\n"
+        f"  Total checks in source: {total_checks}\n"
+        f"  Checks processed: {len(checks)}\n"
+        f"  Scripts generated: {generated_count}\n"
+        f"  Checks skipped (manual): {skipped_count}\n"
+        f"  PowerShell scripts: {generated_count}\n"
+        f"  Python scripts: {generated_count}\n"
+        f"  Total files created: {generated_count * 2 + 2}\n\n"
+        f"Output Directory: {output_dir}\n"
+        f"Tool Priority: PowerShell (primary) > Python (fallback)\n"
+    )
+    report_inputs = {'metadata': metadata, 'total_checks': total_checks, 'processed': len(checks),
+                     'generated': generated_count, 'skipped': skipped_count, 'output_dir': str(output_dir)}
+    manifest.write(report_path, report, report_inputs)
+    manifest.save()
 
     print(f"\nGeneration complete!")
     print(f"{'='*60}")
@@ -570,6 +586,7 @@ def main():
     print(f"PowerShell scripts (.ps1): {generated_count}")
     print(f"Python scripts (.py): {generated_count}")
     print(f"Total files created: {generated_count * 2 + 2} (scripts + README + report)")
+    print(f"Files written: {manifest.summary()}")
     print(f"{'='*60}")
     print(f"Output directory: {output_dir}")
     print(f"README: {readme_path}")
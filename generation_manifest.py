@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Generation manifest
+Makes the script generators incremental. Each output directory keeps a
+.generation_manifest.json that records, for every generated file, a hash of
+the rule record it was rendered from and of the generator's templates, and a
+hash of the content it was written with. A generator hands each rendered file
+to Manifest.write(), which rewrites it only when those inputs changed or the
+file is missing, so a run over an unchanged catalog touches no files and
+finishes in well under a second.
+
+A file whose content on disk no longer matches what the generator wrote was
+changed by hand (an implemented check) and is never overwritten: it is kept
+and reported as locally modified, whatever changed in its rule or templates.
+The same applies to existing files the manifest does not know yet (scripts
+that predate it), unless they already match the rendered content.
+
+Files are written atomically (temporary file in the same directory, then
+rename), so an interrupted run never leaves a truncated script. Set
+STIG_FORCE_REGENERATE=1 (or pass --force to generators that take arguments)
+to rewrite everything, locally modified files included.
+
+Generators shard their rule list with shard(): with STIG_SHARD=index/count in
+the environment (set by run_generators.py) a run handles only every count-th
+rule, so one generator can be spread over several worker processes.
+
+Usage:
+    python3 generation_manifest.py checks/os/rhel_9_v2r5
+    python3 generation_manifest.py checks/os/rhel_9_v2r5 --stale
+    python3 generation_manifest.py checks/database/oracle_database_19c_v1r2 --modified
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import sys
+import tempfile
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MANIFEST_FILE = '.generation_manifest.json'
+MANIFEST_VERSION = 2
+
+EXECUTABLE = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+
+def fingerprint(*parts):
+    """Hash of template strings (or any JSON-serializable values) identifying a template version"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update((part if isinstance(part, str) else json.dumps(part, sort_keys=True, default=str)).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()[:16]
+
+
+def shard(items, spec=None):
+    """
+    This worker's share of a rule list: every count-th item starting at index.
+
+    Args:
+        items: Rules (or scripts) in a stable order
+        spec: 'index/count', defaults to $STIG_SHARD; no spec keeps everything
+    """
+    spec = os.environ.get('STIG_SHARD') if spec is None else spec
+    items = list(items)
+    if not spec:
+        return items
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}' (expected index/count, e.g. 0/4)")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}' (index must be in 0..count-1)")
+    return items[index::count]
+
+
+def content_hash(data):
+    """Hash of a file's content (bytes, or text as written by atomic_write)"""
+    return hashlib.sha1(data if isinstance(data, bytes) else data.encode('utf-8')).hexdigest()
+
+
+def file_hash(path):
+    """content_hash() of a file on disk, None when it cannot be read"""
+    try:
+        with open(str(path), 'rb') as f:
+            return content_hash(f.read())
+    except OSError:
+        return None
+
+
+def source_fingerprint(*paths):
+    """Template version of generators whose templates live in code: hash of their source files"""
+    return fingerprint(*(Path(path).read_text(encoding='utf-8') for path in paths))
+
+
+def atomic_write(path, content, executable=False, encoding='utf-8'):
+    """Write a file through a temporary file and rename, keeping or setting its mode"""
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    if executable:
+        mode |= EXECUTABLE
+    fd, temp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as f:
+            f.write(content)
+        os.chmod(temp, mode)
+        os.replace(temp, str(path))
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path, content, executable=False, encoding='utf-8'):
+    """
+    Atomically write a file kept outside a manifest (reports, extracted check
+    dumps) only when its content differs from what is on disk.
+
+    Returns:
+        bool: True when the file was written
+    """
+    try:
+        with open(str(path), encoding=encoding, newline='') as f:
+            if f.read() == content:
+                return False
+    except (OSError, ValueError):
+        pass
+    atomic_write(path, content, executable, encoding)
+    return True
+
+
+class Manifest(object):
+    """
+    Generation manifest of one output directory.
+
+    Entries map a file name (relative to the directory) to the hash of the
+    template fingerprint and rule inputs it was written with ('inputs'), so
+    generators rendering identical content into the same directory agree on
+    it, and to the hash of the content written ('content', None for files
+    the generator never wrote). The generators that wrote to the directory are
+    listed with their template fingerprint and last run.
+    """
+
+    def __init__(self, directory, generator, template='', force=None):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_FILE
+        self.generator = generator
+        self.template = template
+        self.force = bool(os.environ.get('STIG_FORCE_REGENERATE')) if force is None else force
+        self.entries, self.generators = self._read()
+        self.updated = {}
+        self.written = []
+        self.modified = []
+        self.unchanged = 0
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        if data.get('version') == 1:
+            # Version 1 kept only the input hash: what was written is unknown
+            files = {name: {'inputs': entry, 'content': None} for name, entry in data.get('files', {}).items()}
+            return files, data.get('generators', {})
+        if data.get('version') != MANIFEST_VERSION:
+            return {}, {}
+        return data.get('files', {}), data.get('generators', {})
+
+    def _name(self, path):
+        path = Path(path)
+        try:
+            return path.relative_to(self.directory).as_posix()
+        except ValueError:
+            return path.name
+
+    def input_hash(self, inputs):
+        digest = hashlib.sha1()
+        digest.update(f"{self.template}\x00".encode('utf-8'))
+        digest.update(json.dumps(inputs, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_current(self, path, inputs):
+        """True when the file exists and was generated from the same inputs and templates"""
+        if self.force:
+            return False
+        entry = self.entries.get(self._name(path))
+        return entry is not None and entry['inputs'] == self.input_hash(inputs) and os.path.exists(str(path))
+
+    def is_modified(self, path, on_disk=None):
+        """True when the file exists and differs from what the generator last wrote to it"""
+        entry = self.entries.get(self._name(path))
+        on_disk = on_disk or file_hash(path)
+        return on_disk is not None and (entry is None or entry['content'] != on_disk)
+
+    def write(self, path, content, inputs, executable=False, encoding='utf-8'):
+        """
+        Write a generated file unless it is current or was modified locally.
+
+        Returns:
+            bool: True when the file was written
+        """
+        if self.is_current(path, inputs):
+            self.unchanged += 1
+            return False
+        name = self._name(path)
+        rendered = content_hash(content.encode(encoding))
+        entry = OrderedDict([('inputs', self.input_hash(inputs)), ('content', rendered)])
+        on_disk = file_hash(path)
+        if on_disk == rendered:
+            # Already holds this content (e.g. predates the manifest): nothing to write
+            self.updated[name] = entry
+            self.unchanged += 1
+            return False
+        if not self.force and self.is_modified(path, on_disk):
+            # Implemented by hand: keep it, and its old entry, so it is reported on every run
+            self.updated[name] = self.entries.get(name) or OrderedDict([('inputs', None), ('content', None)])
+            self.modified.append(Path(path))
+            return False
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, content, executable, encoding)
+        self.updated[name] = entry
+        self.written.append(Path(path))
+        return True
+
+    def save(self):
+        """Merge this run's entries into the manifest on disk (safe against concurrent generators)"""
+        if not self.updated:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Lock the directory itself: the manifest file is replaced on every save
+        lock = os.open(str(self.directory), os.O_RDONLY) if fcntl is not None else None
+        try:
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            entries, generators = self._read()
+            entries.update(self.updated)
+            generators[self.generator] = OrderedDict([
+                ('template', self.template),
+                ('generated', datetime.now().strftime('%Y-%m-%dT%H:%M:%S')),
+            ])
+            data = OrderedDict([('version', MANIFEST_VERSION),
+                                ('generators', OrderedDict(sorted(generators.items()))),
+                                ('files', OrderedDict(sorted(entries.items())))])
+            atomic_write(self.path, json.dumps(data, indent=1) + '\n')
+            self.entries, self.generators = entries, generators
+            self.updated = {}
+        finally:
+            if lock is not None:
+                os.close(lock)
+
+    def summary(self):
+        summary = f"{len(self.written)} written, {self.unchanged + len(self.modified)} unchanged"
+        if self.modified:
+            summary += f" ({len(self.modified)} locally modified files kept, --force to overwrite)"
+        return summary
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Show the generation manifest of a check directory',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('directory', help='Check directory')
+    parser.add_argument('--stale', action='store_true', help='List the generated files that are missing')
+    parser.add_argument('--modified', action='store_true',
+                        help='List the files that differ from what the generators wrote')
+    args = parser.parse_args()
+
+    manifest = Manifest(args.directory, generator='')
+    if not manifest.entries:
+        print(f"No generation manifest in {args.directory}")
+        return 1
+    missing = [name for name in sorted(manifest.entries) if not (manifest.directory / name).exists()]
+    if args.stale:
+        for name in missing:
+            print(name)
+        return 1 if missing else 0
+    modified = [name for name in sorted(manifest.entries) if manifest.is_modified(manifest.directory / name)]
+    if args.modified:
+        for name in modified:
+            print(name)
+        return 1 if modified else 0
+    for generator, info in manifest.generators.items():
+        print(f"{generator:<36} template {info.get('template', '')}  last run {info.get('generated', '')}")
+    print(f"{len(manifest.entries)} generated files, {len(missing)} missing, {len(modified)} locally modified")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
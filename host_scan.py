@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Local host STIG scan with change-driven rescans
+Runs a platform's check scripts on this host and records the results in the
+scan result database (scan_results.py), each with a fingerprint of the host
+state its rule reads (rule_inputs.py) and of the check script itself.
+
+With --rescan, the host's most recent earlier scan of the platform is the
+baseline. A rule whose fingerprint matches its baseline result is not run:
+that result is copied into the new scan with carried_from naming the scan
+that evaluated it (and that scan's checked_at), so a nightly rescan costs
+the rules whose inputs changed plus the volatile ones rather than the whole
+benchmark. A rule is always run when it is volatile (rule_inputs.py --volatile),
+has no baseline result, its baseline result is an ERROR, or that result was
+evaluated more than --max-age days ago, which bounds any drift the
+fingerprints miss.
+
+Without --rescan every rule is run, and the fingerprints are recorded for
+the next rescan.
+
+Usage:
+    sudo python3 host_scan.py --platform rhel_9_v2r5 --results-db /var/lib/stig/scan_results.db
+    sudo python3 host_scan.py --platform rhel_9_v2r5 --results-db /var/lib/stig/scan_results.db --rescan
+    sudo python3 host_scan.py --platform rhel_9_v2r5 --rescan --dry-run --verbose
+    python3 host_scan.py --platform rhel_9_v2r5 --rescan --inputs rhel9_inputs.json --max-age 3
+"""
+
+import argparse
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import checklist_export
+import rule_inputs
+import scan_results
+import stig_catalog
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+DEFAULT_TIMEOUT = 300
+DEFAULT_MAX_AGE = 7
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+################################################################################
+# RULES
+################################################################################
+
+def platform_dir(platform):
+    """checks/<category>/<platform> directory of a platform"""
+    return next((path for path in sorted(REPO_ROOT.glob(f"checks/*/{platform}")) if path.is_dir()), None)
+
+
+def load_rules(platform, checks_dir, benchmark=None, overrides=None):
+    """
+    Benchmark rules that have a check script, with their inputs.
+
+    The script is <Vuln ID>.sh, else <Vuln ID>.py, else the STIG ID variants.
+
+    Returns:
+        tuple: (list of rule dicts, list of Vuln IDs without a script)
+    """
+    rules = []
+    missing = []
+    for record in checklist_export.load_benchmark(platform, benchmark):
+        vuln_id = stig_catalog.field(record, stig_catalog.FIELD_KEYS['group_id'])
+        stig_id = stig_catalog.field(record, stig_catalog.FIELD_KEYS['stig_id'])
+        script = next((checks_dir / f"{name}{ext}" for name in (vuln_id, stig_id) if name
+                       for ext in ('.sh', '.py') if (checks_dir / f"{name}{ext}").is_file()), None)
+        if script is None:
+            missing.append(vuln_id)
+            continue
+        rules.append({
+            'rule': vuln_id,
+            'stig_id': stig_id,
+            'severity': stig_catalog.field(record, stig_catalog.FIELD_KEYS['severity']),
+            'script': script,
+            'script_digest': hashlib.sha256(script.read_bytes()).hexdigest()[:16],
+            'inputs': rule_inputs.rule_inputs(record, overrides),
+        })
+    return rules, missing
+
+
+def run_rule(rule, timeout, config=None):
+    """Run one check script and return its result record"""
+    handle, result_file = tempfile.mkstemp(prefix=f".{rule['rule']}.", suffix='.json')
+    os.close(handle)
+    command = ['bash' if rule['script'].suffix == '.sh' else sys.executable, str(rule['script']),
+               '--output-json', result_file]
+    if config:
+        command += ['--config', config]
+    try:
+        proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              stdin=subprocess.DEVNULL, timeout=timeout)
+        exit_code = proc.returncode
+        output = proc.stdout.decode('utf-8', errors='replace')
+    except subprocess.TimeoutExpired:
+        exit_code = 3
+        output = f"Check timed out after {timeout} seconds"
+
+    record = None
+    try:
+        if os.path.getsize(result_file) > 0:
+            record = scan_results.load_result_file(result_file)[0]
+    except (OSError, ValueError, IndexError):
+        pass
+    finally:
+        os.unlink(result_file)
+
+    # Scripts that exit before writing their JSON still get a result record
+    if record is None:
+        record = OrderedDict([
+            ('vuln_id', rule['rule']),
+            ('stig_id', rule['stig_id']),
+            ('severity', rule['severity']),
+            ('status', scan_results.STATUS_BY_EXIT_CODE.get(exit_code, scan_results.ERROR)),
+            ('finding_details', output.strip()[-2000:]),
+        ])
+    record['exit_code'] = exit_code
+    record.setdefault('timestamp', datetime.utcnow().strftime(TIMESTAMP_FORMAT))
+    return record
+
+
+################################################################################
+# RESCAN PLAN
+################################################################################
+
+def evaluated_at(result):
+    try:
+        return datetime.strptime(result['checked_at'][:19], TIMESTAMP_FORMAT[:-1])
+    except (TypeError, ValueError):
+        return None
+
+
+def rerun_reason(rule, fingerprint, digests, previous, max_age, now):
+    """Why a rule must be run again, or None when its previous result can be carried forward"""
+    if previous is None:
+        return 'no baseline result'
+    if fingerprint is None:
+        return 'volatile' if rule['inputs'] == [rule_inputs.VOLATILE] else 'input not readable'
+    if previous['status'] == scan_results.ERROR:
+        return 'baseline error'
+    if not previous.get('fingerprint'):
+        return 'no baseline fingerprint'
+    checked = evaluated_at(previous)
+    if checked is None or now - checked > max_age:
+        return 'expired'
+    if previous['fingerprint'] != fingerprint:
+        before = previous['data'].get('inputs') or {}
+        changed = [spec for spec, digest in digests.items() if before.get(spec) != digest]
+        if previous['data'].get('script_digest') != rule['script_digest']:
+            changed.insert(0, 'check script')
+        return 'changed: ' + ', '.join(changed or ['inputs'])
+    return None
+
+
+def plan_scan(rules, probe, baseline, max_age):
+    """
+    Fingerprint every rule and decide which to run.
+
+    Args:
+        baseline: {rule: result} of the baseline scan, None for a full scan
+
+    Returns:
+        list of (rule, fingerprint, digests, previous result, reason) with a
+        reason of None for the rules whose previous result is carried forward
+    """
+    now = datetime.utcnow()
+    plan = []
+    for rule in rules:
+        fingerprint, digests = probe.fingerprint(rule['inputs'], extra=[rule['script_digest']])
+        if baseline is None:
+            plan.append((rule, fingerprint, digests, None, 'full scan'))
+            continue
+        previous = baseline.get(rule['rule'])
+        plan.append((rule, fingerprint, digests, previous,
+                     rerun_reason(rule, fingerprint, digests, previous, max_age, now)))
+    return plan
+
+
+def carried_record(previous, fingerprint):
+    """A baseline result as a record of the new scan, with its provenance"""
+    record = OrderedDict(previous['data'])
+    for column in ('vuln_id', 'stig_id', 'severity', 'status', 'finding_details', 'comments', 'exit_code'):
+        record[column] = previous[column]
+    record['timestamp'] = previous['checked_at']
+    record['fingerprint'] = fingerprint
+    record['carried_from'] = previous.get('carried_from') or previous['scan_id']
+    return record
+
+
+################################################################################
+# CLI
+################################################################################
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Run a platform\'s STIG checks on this host, rescanning only what changed',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--platform', required=True, help='Platform (checks/ directory name, e.g. rhel_9_v2r5)')
+    parser.add_argument('--checks-dir', help='Check script directory (default: checks/*/<platform>)')
+    parser.add_argument('--benchmark', help='Benchmark JSON (default: the platform\'s *_checks.json)')
+    parser.add_argument('--host', default=socket.getfqdn(), help='Host name recorded with the results (default: FQDN)')
+    parser.add_argument('--results-db', help=f'Result database (default: $STIG_RESULTS_DB or {scan_results.RESULTS_FILE})')
+    parser.add_argument('--scan-id', help='Scan ID in the result database (default: a new scan)')
+    parser.add_argument('--rescan', action='store_true',
+                        help='Only run the rules whose inputs changed since the host\'s last scan')
+    parser.add_argument('--max-age', type=float, default=DEFAULT_MAX_AGE,
+                        help=f'Rerun results evaluated more than this many days ago (default: {DEFAULT_MAX_AGE})')
+    parser.add_argument('--inputs', help='Per-rule input overrides (JSON, see rule_inputs.py)')
+    parser.add_argument('--rule', action='append', help='Only this Vuln ID or STIG ID (may be repeated)')
+    parser.add_argument('--config', help='Configuration file passed to the check scripts')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Check scripts run at once (default: CPU count)')
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT,
+                        help=f'Seconds before a check script is abandoned (default: {DEFAULT_TIMEOUT})')
+    parser.add_argument('--dry-run', action='store_true', help='Show which rules would run and why, without running them')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print every rule and why it runs')
+    args = parser.parse_args()
+
+    checks_dir = Path(args.checks_dir) if args.checks_dir else platform_dir(args.platform)
+    if checks_dir is None or not checks_dir.is_dir():
+        print(f"ERROR: no check scripts found for {args.platform}")
+        return 3
+    try:
+        overrides = rule_inputs.load_overrides(args.inputs) if args.inputs else None
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    rules, missing = load_rules(args.platform, checks_dir, args.benchmark, overrides)
+    if args.rule:
+        rules = [r for r in rules if r['rule'] in args.rule or r['stig_id'] in args.rule]
+    if not rules:
+        print(f"ERROR: no rules with check scripts for {args.platform}")
+        return 3
+
+    started = time.monotonic()
+    store = writer = None
+    scan_id = None
+    try:
+        if args.dry_run:
+            db_path = Path(args.results_db) if args.results_db else scan_results.default_path()
+            store = scan_results.ResultStore(db_path, readonly=True) if db_path.is_file() else None
+        else:
+            store, writer = scan_results.open_writer(args.results_db, 'host', args.scan_id, OrderedDict([
+                ('host', args.host), ('platform', args.platform), ('rescan', args.rescan)]))
+            scan_id = writer.scan_id
+        baseline_id, baseline = None, None
+        if args.rescan:
+            baseline_id, baseline = store.baseline(args.host, args.platform, scan_id) if store else (None, {})
+    except scan_results.ResultStoreError as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    probe = rule_inputs.InputProbe()
+    plan = plan_scan(rules, probe, baseline, timedelta(days=args.max_age))
+    fingerprinted = time.monotonic() - started
+    to_run = [entry for entry in plan if entry[4] is not None]
+
+    print("=" * 80)
+    print(f"Host STIG Scan: {args.platform} on {args.host}")
+    print("=" * 80)
+    print(f"Check scripts: {checks_dir} ({len(rules)} rules, {len(missing)} without a script)")
+    print(f"Baseline: {baseline_id or 'none'}")
+    print(f"Fingerprinted {len(probe.cache)} inputs in {fingerprinted:.2f}s")
+    print(f"Rules to run: {len(to_run)} of {len(plan)}")
+    reasons = defaultdict(int)
+    for rule, fingerprint, digests, previous, reason in plan:
+        reasons[reason.partition(':')[0] if reason else 'carried forward'] += 1
+        if args.verbose:
+            print(f"  {rule['rule']:<12} {rule['stig_id'] or '':<18} {reason or 'carried forward'}")
+    for reason, count in sorted(reasons.items(), key=lambda item: -item[1]):
+        print(f"  {reason:<28} {count:>5}")
+    print()
+
+    if args.dry_run:
+        if store is not None:
+            store.close()
+        return 0
+
+    totals = defaultdict(int)
+    try:
+        for rule, fingerprint, digests, previous, reason in plan:
+            if reason is None:
+                record = carried_record(previous, fingerprint)
+                writer.add(args.host, args.platform, record, rule=rule['rule'])
+                totals[scan_results.normalize_status(record['status'])] += 1
+
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            futures = {executor.submit(run_rule, entry[0], args.timeout, args.config): entry for entry in to_run}
+            for done, future in enumerate(as_completed(futures), 1):
+                rule, fingerprint, digests, previous, reason = futures[future]
+                record = future.result()
+                record['fingerprint'] = fingerprint
+                record['script_digest'] = rule['script_digest']
+                record['inputs'] = digests
+                writer.add(args.host, args.platform, record, rule=rule['rule'])
+                totals[scan_results.normalize_status(record.get('status'), record.get('exit_code'))] += 1
+                if done % 100 == 0:
+                    print(f"  {done}/{len(to_run)} rules run")
+    finally:
+        scan_results.close_writer(store, writer)
+
+    elapsed = time.monotonic() - started
+    print(f"Ran {len(to_run)} rules, carried forward {len(plan) - len(to_run)} in {elapsed:.1f}s")
+    print("  " + '  '.join(f"{status}={totals[status]}" for status in scan_results.STATUSES))
+    print(f"{writer.count} results recorded as scan {scan_id} in {store.path}")
+    return 1 if totals[scan_results.OPEN] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
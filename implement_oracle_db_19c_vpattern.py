@@ -6,6 +6,8 @@ Implement Oracle Database 19c V-* pattern STIG checks with manual review framewo
 import re
 from pathlib import Path
 
+import generation_manifest
+
 def implement_db_vpattern_check(file_path):
     """Implement an Oracle Database 19c V-* check with manual review"""
 
@@ -75,7 +77,8 @@ def main():
     implemented = 0
     skipped = 0
 
-    for check_file in sorted(base_dir.glob('V-*.sh')):
+    # One shard of the scripts when run_generators.py spreads them over processes
+    for check_file in generation_manifest.shard(sorted(base_dir.glob('V-*.sh'))):
         if implement_db_vpattern_check(check_file):
             implemented += 1
             if implemented <= 5 or implemented % 20 == 0:
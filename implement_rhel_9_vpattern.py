@@ -7,6 +7,8 @@ Implements V-* pattern files with manual review framework
 from pathlib import Path
 import re
 
+import generation_manifest
+
 def generate_v_pattern_implementation():
     """Generate implementation for V-* template pattern"""
     return '''# STIG Check Implementation - Manual Review Required
@@ -48,7 +50,8 @@ print(f"Found {len(v_scripts)} V-* scripts")
 total = 0
 implemented = 0
 
-for script_path in sorted(v_scripts):
+# One shard of the scripts when run_generators.py spreads them over processes
+for script_path in generation_manifest.shard(sorted(v_scripts)):
 
     try:
         content = script_path.read_text(encoding='utf-8')
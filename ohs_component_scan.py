@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Oracle HTTP Server component index
+Discovers every OHS component in a WebLogic domain
+($DOMAIN_HOME/config/fmwconfig/components/OHS/<componentName>/), parses each
+component's configuration tree once (httpd.conf with its includes, ssl.conf,
+admin.conf, mod_wl_ohs.conf and ohs.plugins.nodemanager.properties) and
+evaluates the OHS 12.1.3 rules against every component in parallel.
+
+Rules are compiled from the Check Content in
+oracle_http_server_12.1.3_v2r3_checks.json: the file, directive/property,
+scope, and "omitted" / "not set to" criteria. Rules with criteria that cannot
+be decided from the configuration are reported as Not_Reviewed with the
+directives found in each component. With --results-db the merged results are
+recorded in the scan result database (scan_results.py), keyed by domain name.
+
+Usage:
+    python3 ohs_component_scan.py --domain-home /u01/domains/base_domain
+    python3 ohs_component_scan.py --rule OH12-1X-000008 --output-json result.json
+    python3 ohs_component_scan.py --list-components
+    python3 ohs_component_scan.py --results-db scan_results.db
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import apache_config
+import scan_results
+
+BASE_DIR = Path(__file__).parent
+
+CHECKS_JSON = BASE_DIR / 'oracle_http_server_12.1.3_v2r3_checks.json'
+
+# Platform (checks/ directory) the results are recorded under in the scan result database
+PLATFORM = 'oracle_http_server_12.1.3_v2r3'
+
+COMPONENTS_SUBDIR = Path('config') / 'fmwconfig' / 'components' / 'OHS'
+
+# Files indexed for every component (parsed on their own if httpd.conf does not include them)
+COMPONENT_CONF_FILES = ('httpd.conf', 'ssl.conf', 'admin.conf', 'mod_wl_ohs.conf')
+
+PROPERTIES_FILE = 'ohs.plugins.nodemanager.properties'
+
+EXIT_CODES = {
+    'NotAFinding': 0,
+    'Open': 1,
+    'Not_Applicable': 2,
+    'Not_Reviewed': 2,
+    'ERROR': 3,
+}
+
+# Worst status wins when a rule is evaluated across several components
+STATUS_PRIORITY = ('ERROR', 'Open', 'Not_Reviewed', 'NotAFinding', 'Not_Applicable')
+
+FINDING_RE = re.compile(r'If ([^\n]*?)this is a finding', re.IGNORECASE)
+NOT_SET_TO_RE = re.compile(r'not set to (?:a value of )?"([^"]+)"', re.IGNORECASE)
+BOUND_RE = re.compile(r'(greater|less) than "(\d+)"', re.IGNORECASE)
+PRESENT_RE = re.compile(r'\b(?:exists?|found)\b.*\bnot commented out', re.IGNORECASE)
+QUOTED_NAME_RE = re.compile(r'"([A-Za-z][\w.]*)((?:\s+[^"\s][^"]*)?)"')
+STEP_RE = re.compile(r'(?:^|\n)\s*\d+\.\s+')
+
+
+################################################################################
+# COMPONENT INDEX
+################################################################################
+
+class OHSComponent:
+    """One OHS component and its parsed configuration"""
+
+    def __init__(self, name, path, configs, properties, errors):
+        self.name = name
+        self.path = path
+        self.configs = configs
+        self.properties = properties
+        self.errors = errors
+
+    @property
+    def files(self):
+        files = []
+        for config in self.configs:
+            files.extend(f for f in config.files if f not in files)
+        return files
+
+    def directives(self, name, files=None, server_scope=False):
+        """Directives named name, optionally limited to file basenames and server scope"""
+        found = []
+        for config in self.configs:
+            if server_scope:
+                nodes = config.server_directives(name)
+            else:
+                nodes = config.directives(name)
+            found.extend(d for d in nodes if not files or os.path.basename(d.file) in files)
+        return found
+
+    def ssl_virtual_hosts(self):
+        """<VirtualHost> sections with SSLEngine on (admin.conf excluded, as the SSL rules note)"""
+        hosts = []
+        for config in self.configs:
+            for section in config.sections('VirtualHost'):
+                if os.path.basename(section.file) == 'admin.conf':
+                    continue
+                if any(d.name.lower() == 'sslengine' and d.value.lower() == 'on' for d, _ in config.walk(section)):
+                    hosts.append(section)
+        return hosts
+
+
+def discover_components(domain_home):
+    """Return component directories under DOMAIN_HOME, sorted by name"""
+    root = Path(domain_home) / COMPONENTS_SUBDIR
+    if not root.is_dir():
+        return []
+    return sorted(str(p) for p in root.iterdir() if p.is_dir() and (p / 'httpd.conf').is_file())
+
+
+def component_defines(domain_home, name):
+    """Variables OHS defines for a component's configuration files"""
+    defines = {
+        'ORACLE_INSTANCE': str(domain_home),
+        'COMPONENT_TYPE': 'OHS',
+        'COMPONENT_NAME': name,
+    }
+    oracle_home = os.environ.get('ORACLE_HOME')
+    if oracle_home:
+        defines['PRODUCT_HOME'] = os.path.join(oracle_home, 'ohs')
+    return defines
+
+
+def load_properties(path):
+    """Parse a Java properties file into a lower-cased key dict"""
+    values = {}
+    for raw in Path(path).read_text(encoding='utf-8', errors='ignore').splitlines():
+        line = raw.strip()
+        if not line or line.startswith(('#', '!')):
+            continue
+        match = re.match(r'([^=:\s]+)\s*[=:\s]\s*(.*)', line)
+        if match:
+            values[match.group(1).lower()] = match.group(2).strip()
+    return values
+
+
+def load_component(path, domain_home, cache_dir=apache_config.DEFAULT_CACHE_DIR):
+    """Parse a component's httpd.conf tree plus any standard file it does not include"""
+    name = os.path.basename(path)
+    defines = component_defines(domain_home, name)
+    configs = []
+    errors = []
+
+    main = apache_config.load_apache_config(os.path.join(path, 'httpd.conf'), path, cache_dir, defines=defines)
+    if main is not None:
+        configs.append(main)
+        errors.extend(main.errors)
+
+    parsed = {os.path.basename(f) for f in main.files} if main is not None else set()
+    for filename in COMPONENT_CONF_FILES[1:]:
+        conf = os.path.join(path, filename)
+        if filename in parsed or not os.path.isfile(conf):
+            continue
+        config = apache_config.load_apache_config(conf, path, cache_dir, defines=defines)
+        if config is not None:
+            configs.append(config)
+            errors.extend(config.errors)
+
+    properties = {}
+    props_file = os.path.join(path, PROPERTIES_FILE)
+    if os.path.isfile(props_file):
+        try:
+            properties = load_properties(props_file)
+        except OSError as e:
+            errors.append(f"{props_file}: {e}")
+
+    return OHSComponent(name, path, configs, properties, errors)
+
+
+################################################################################
+# RULE COMPILATION AND EVALUATION
+################################################################################
+
+def compile_rule(check):
+    """Derive an evaluation spec from a rule's Check Content"""
+    text = check.get('Check Content', '') or ''
+    lowered = text.lower()
+    rule = {
+        'vuln_id': check.get('Group ID', 'UNKNOWN'),
+        'stig_id': check.get('STIG ID', 'UNKNOWN'),
+        'severity': check.get('Severity', 'medium'),
+        'rule_title': check.get('Rule Title', ''),
+        'kind': 'manual',
+        'files': [],
+        'names': [],
+        'server_scope': 'at the ohs server configuration scope' in lowered,
+        'ssl_only': 'ssl-enabled "<virtualhost>"' in lowered,
+        'omitted_is_finding': False,
+        'present_is_finding': False,
+        'expected': {},
+        'maximum': {},
+        'minimum': {},
+        'unhandled': 0,
+    }
+
+    if '.properties' in text and '.conf' not in text:
+        rule['kind'] = 'properties'
+    elif '.conf' in text:
+        rule['kind'] = 'config'
+    else:
+        return rule
+
+    if 'every .conf file' not in lowered:
+        rule['files'] = sorted(set(re.findall(r'/([\w.]+\.conf)\b', text)))
+
+    # Directive/property names come from the "Search for" steps
+    for step in STEP_RE.split(text):
+        if not step.lower().startswith('search for'):
+            continue
+        for name, arg in QUOTED_NAME_RE.findall(step):
+            entry = [name, arg.strip()]
+            if entry not in rule['names']:
+                rule['names'].append(entry)
+
+    if not rule['names']:
+        rule['kind'] = 'manual'
+        return rule
+
+    # Each "If ..., this is a finding" sentence is split into its "or" conditions
+    for sentence in FINDING_RE.findall(text):
+        for condition in re.split(r',?\s+or\s+', sentence):
+            lowered = condition.lower()
+            # "exists and is not commented out" is a finding when present;
+            # "omitted" / "commented out" alone when absent
+            if PRESENT_RE.search(condition):
+                rule['present_is_finding'] = True
+                continue
+            if 'omitted' in lowered or 'commented out' in lowered:
+                rule['omitted_is_finding'] = True
+                continue
+            names = ([n for n, _ in rule['names'] if f'"{n}"' in condition]
+                     or [n for n, _ in rule['names'] if f'"{n}"' in sentence])
+            if not names and len(rule['names']) == 1:
+                names = [rule['names'][0][0]]
+            match = NOT_SET_TO_RE.search(condition)
+            bound = BOUND_RE.search(condition)
+            if match and names:
+                for name in names:
+                    rule['expected'][name] = match.group(1)
+            elif bound and names:
+                limits = rule['maximum'] if bound.group(1).lower() == 'greater' else rule['minimum']
+                for name in names:
+                    limits[name] = int(bound.group(2))
+            else:
+                rule['unhandled'] += 1
+    return rule
+
+
+def load_rules(stig_ids=None):
+    with open(CHECKS_JSON) as f:
+        checks = json.load(f)
+    rules = [compile_rule(check) for check in checks]
+    if stig_ids:
+        wanted = set(stig_ids)
+        rules = [r for r in rules if r['stig_id'] in wanted or r['vuln_id'] in wanted]
+    return rules
+
+
+def normalize(value):
+    return ' '.join(value.split()).strip('"').lower()
+
+
+def evaluate_rule(rule, component):
+    """Evaluate one compiled rule against one component"""
+    if rule['ssl_only'] and not component.ssl_virtual_hosts():
+        return 'Not_Applicable', 'No SSL-enabled <VirtualHost> (SSLEngine On) outside admin.conf'
+    if rule['kind'] == 'manual':
+        return 'Not_Reviewed', 'Manual review required - consult STIG documentation'
+
+    found = []
+    problems = []
+    for name, arg in rule['names']:
+        if rule['kind'] == 'properties':
+            value = component.properties.get(name.lower())
+            occurrences = [(f"{PROPERTIES_FILE}", value)] if value is not None else []
+        else:
+            nodes = component.directives(name, rule['files'], rule['server_scope'])
+            if arg:
+                nodes = [d for d in nodes if normalize(d.value).startswith(normalize(arg))]
+            occurrences = [(f"{os.path.basename(d.file)}:{d.line}", d.value) for d in nodes]
+
+        label = f"{name} {arg}".strip()
+        if not occurrences:
+            if rule['omitted_is_finding']:
+                problems.append(f"{label} is omitted")
+            else:
+                found.append(f"{label} not present")
+            continue
+
+        expected = rule['expected'].get(name)
+        maximum = rule['maximum'].get(name)
+        minimum = rule['minimum'].get(name)
+        for location, value in occurrences:
+            found.append(f"{label} = {value} ({location})")
+            if rule['present_is_finding']:
+                problems.append(f"{label} is present at {location}")
+            if expected is not None and normalize(value) != normalize(expected):
+                problems.append(f"{label} is {value} at {location} (required: {expected})")
+            if maximum is None and minimum is None:
+                continue
+            if not value.isdigit():
+                problems.append(f"{label} is {value} at {location} (required: a number)")
+            elif maximum is not None and int(value) > maximum:
+                problems.append(f"{label} is {value} at {location} (required: <= {maximum})")
+            elif minimum is not None and int(value) < minimum:
+                problems.append(f"{label} is {value} at {location} (required: >= {minimum})")
+
+    if problems:
+        return 'Open', '; '.join(problems)
+    if rule['unhandled'] or not (rule['omitted_is_finding'] or rule['present_is_finding'] or rule['expected']
+                                 or rule['maximum'] or rule['minimum']):
+        return 'Not_Reviewed', 'Verify remaining criteria: ' + '; '.join(found)
+    return 'NotAFinding', '; '.join(found)
+
+
+def scan_component(path, domain_home, rules, cache_dir):
+    """Worker task: index one component and evaluate every rule against it"""
+    component = load_component(path, domain_home, cache_dir)
+    results = {}
+    for rule in rules:
+        if not component.configs and rule['kind'] == 'config':
+            status, details = 'ERROR', f"httpd.conf could not be parsed in {path}"
+        else:
+            try:
+                status, details = evaluate_rule(rule, component)
+            except Exception as e:
+                status, details = 'ERROR', f"Evaluation failed: {e}"
+        results[rule['stig_id']] = (status, details)
+    return component.name, component.files, component.errors, results
+
+
+def scan_domain(domain_home, rules, workers=None, cache_dir=apache_config.DEFAULT_CACHE_DIR):
+    """Evaluate rules for every component; returns {component: (files, errors, results)}"""
+    components = discover_components(domain_home)
+    scanned = {}
+    with ProcessPoolExecutor(max_workers=max(1, workers or os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(scan_component, path, str(domain_home), rules, str(cache_dir))
+                   for path in components]
+        for future in futures:
+            name, files, errors, results = future.result()
+            scanned[name] = (files, errors, results)
+    return scanned
+
+
+def merge_results(rules, scanned):
+    """Combine per-component results into one result per rule (worst status wins)"""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    merged = {}
+    for rule in rules:
+        per_component = {name: data[2][rule['stig_id']] for name, data in scanned.items()}
+        if per_component:
+            status = min((s for s, _ in per_component.values()), key=STATUS_PRIORITY.index)
+        else:
+            status = 'Not_Applicable'
+        merged[rule['stig_id']] = {
+            'vuln_id': rule['vuln_id'],
+            'stig_id': rule['stig_id'],
+            'severity': rule['severity'],
+            'status': status,
+            'finding_details': '\n'.join(f"[{name}] {status}: {details}"
+                                         for name, (status, details) in sorted(per_component.items()))
+                               or 'No OHS components found',
+            'components': {name: s for name, (s, _) in per_component.items()},
+            'timestamp': timestamp,
+        }
+    return merged
+
+
+def resolve_domain_home(value, config_file=None):
+    if value:
+        return value
+    if config_file and os.path.isfile(config_file):
+        with open(config_file) as f:
+            for line in f:
+                if 'domain_home' in line.lower() and ('=' in line or ':' in line):
+                    return re.split(r'[=:]', line, maxsplit=1)[1].strip().strip('",')
+    return os.environ.get('DOMAIN_HOME')
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Index OHS components in a domain and evaluate OHS STIG rules per component',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--domain-home', help='WebLogic domain home (default: $DOMAIN_HOME)')
+    parser.add_argument('--config', help='stig-config file providing domain_home')
+    parser.add_argument('--rule', action='append', default=[],
+                        help='STIG ID or Vuln ID to evaluate (may be repeated; default: all)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-json', help='Write the merged result of a single --rule to this file')
+    parser.add_argument('--output-dir', help='Write per-rule results and a summary to this directory')
+    parser.add_argument('--list-components', action='store_true', help='List discovered components and exit')
+    parser.add_argument('--cache-dir', default=str(apache_config.DEFAULT_CACHE_DIR), help='Cache directory')
+    parser.add_argument('--results-db', help='Record the merged results in this scan result database')
+    parser.add_argument('--scan-id', help='Scan ID in the result database (default: a new scan)')
+    args = parser.parse_args()
+
+    domain_home = resolve_domain_home(args.domain_home, args.config)
+    if not domain_home:
+        print("ERROR: DOMAIN_HOME not set (use --domain-home, --config or $DOMAIN_HOME)")
+        return 3
+
+    if args.list_components:
+        for path in discover_components(domain_home):
+            component = load_component(path, domain_home, args.cache_dir)
+            print(f"{component.name}: {path}")
+            for filename in component.files:
+                print(f"    {filename}")
+            for error in component.errors:
+                print(f"    ERROR: {error}")
+        return 0
+
+    rules = load_rules(args.rule)
+    if not rules:
+        print(f"ERROR: No OHS rules match {', '.join(args.rule)}")
+        return 3
+
+    scanned = scan_domain(domain_home, rules, args.workers, args.cache_dir)
+    results = merge_results(rules, scanned)
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for result in results.values():
+            (output_dir / f"{result['vuln_id']}.json").write_text(json.dumps(result, indent=2))
+        (output_dir / 'summary.json').write_text(json.dumps({
+            'domain_home': str(domain_home),
+            'components': {name: {'files': files, 'errors': errors}
+                           for name, (files, errors, _) in scanned.items()},
+            'results': {r['stig_id']: r['status'] for r in results.values()},
+        }, indent=2))
+
+    if args.results_db:
+        try:
+            store, writer = scan_results.open_writer(args.results_db, 'ohs', args.scan_id,
+                                                     {'domain_home': str(domain_home)})
+        except scan_results.ResultStoreError as e:
+            print(f"ERROR: {e}")
+            return 3
+        for result in results.values():
+            writer.add(Path(domain_home).name, PLATFORM, result)
+        scan_results.close_writer(store, writer)
+        print(f"{writer.count} results recorded as scan {writer.scan_id} in {args.results_db}")
+
+    if args.output_json and len(results) == 1:
+        Path(args.output_json).write_text(json.dumps(next(iter(results.values())), indent=2))
+
+    for result in results.values():
+        print(f"[{result['vuln_id']}] {result['stig_id']}: {result['status']}")
+        if len(results) == 1:
+            print(result['finding_details'])
+
+    print(f"\nComponents: {len(scanned)} in {domain_home}")
+    worst = min((r['status'] for r in results.values()), key=STATUS_PRIORITY.index)
+    return EXIT_CODES[worst]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""
+Oracle Net configuration parser and network rule evaluator
+Parses listener.ora, sqlnet.ora and tnsnames.ora into nested parameter trees
+once per ORACLE_HOME and evaluates the Oracle Database 19c network rules
+against those trees instead of grepping the raw files.
+
+Homes are discovered from --oracle-home, ORACLE_HOME and oratab. The network
+admin directory of a home is $ORACLE_HOME/network/admin unless TNS_ADMIN
+(or --tns-admin) points elsewhere.
+
+Exit Codes:
+    0 = Check Passed (Compliant)
+    1 = Check Failed (Finding)
+    2 = Check Not Applicable / Manual Review
+    3 = Check Error
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import stig_catalog
+
+BENCHMARK_FILE = Path(__file__).resolve().parent / 'oracle_database_19c_v1r2_checks.json'
+DEFAULT_SEVERITY = 'medium'
+
+NET_FILES = ('listener.ora', 'sqlnet.ora', 'tnsnames.ora')
+
+ORATAB_PATHS = ('/etc/oratab', '/var/opt/oracle/oratab')
+
+TOKEN_RE = re.compile(r'''
+    (?P<comment>\#[^\n]*)
+  | (?P<newline>\n)
+  | (?P<space>[ \t\r]+)
+  | (?P<punct>[()=,])
+  | (?P<quoted>"[^"]*"|'[^']*')
+  | (?P<word>[^\s()=,#"']+)
+''', re.VERBOSE)
+
+# Top-level listener.ora parameters that carry ADDRESS entries but are not listeners
+NON_LISTENER_PREFIXES = ('SID_LIST_', 'LOCAL_REGISTRATION_ADDRESS_')
+
+
+class NetParameter:
+    """A NAME=value node of an Oracle Net parameter tree"""
+
+    def __init__(self, name, value=None, children=None, items=None, line=0):
+        self.name = name.upper()
+        self.value = value
+        self.children = children or []
+        self.items = items or []
+        self.line = line
+
+    def get(self, name):
+        """Return the first direct child with the given name"""
+        name = name.upper()
+        for child in self.children:
+            if child.name == name:
+                return child
+        return None
+
+    def find_all(self, name):
+        """Return all descendants (depth first) with the given name"""
+        name = name.upper()
+        found = []
+        for child in self.children:
+            if child.name == name:
+                found.append(child)
+            found.extend(child.find_all(name))
+        return found
+
+    def text(self):
+        """Scalar value, or the comma list joined, or None"""
+        if self.value is not None:
+            return self.value
+        if self.items:
+            return ', '.join(self.items)
+        return None
+
+    def __repr__(self):
+        return f"NetParameter({self.name!r}, value={self.value!r}, children={len(self.children)})"
+
+
+def tokenize(text):
+    """Split Oracle Net syntax into (kind, value, line) tokens"""
+    tokens = []
+    line = 1
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'newline':
+            tokens.append(('newline', value, line))
+            line += 1
+        elif kind == 'quoted':
+            tokens.append(('word', value[1:-1], line))
+        elif kind in ('punct', 'word'):
+            tokens.append((kind if kind == 'word' else value, value, line))
+    return tokens
+
+
+class NetParser:
+    """Recursive descent parser for the parenthesised Oracle Net syntax"""
+
+    def __init__(self, text, source='<string>'):
+        self.tokens = tokenize(text)
+        self.pos = 0
+        self.source = source
+
+    def error(self, message):
+        line = self.tokens[self.pos][2] if self.pos < len(self.tokens) else 'EOF'
+        raise ValueError(f"{self.source}:{line}: {message}")
+
+    def peek(self, skip_newlines=True):
+        pos = self.pos
+        while pos < len(self.tokens):
+            if not (skip_newlines and self.tokens[pos][0] == 'newline'):
+                return self.tokens[pos]
+            pos += 1
+        return None
+
+    def next(self, skip_newlines=True):
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            self.pos += 1
+            if not (skip_newlines and token[0] == 'newline'):
+                return token
+        return None
+
+    def expect(self, kind):
+        token = self.next()
+        if token is None or token[0] != kind:
+            self.error(f"expected '{kind}', got {token[1] if token else 'end of file'!r}")
+        return token
+
+    def parse(self):
+        """Parse a whole file into a dict of top-level parameters"""
+        params = {}
+        while self.peek() is not None:
+            _, name, line = self.expect('word')
+            self.expect('=')
+            param = NetParameter(name, line=line)
+            self.parse_value(param, top_level=True)
+            # Later definitions override earlier ones, as in Oracle Net
+            params[param.name] = param
+        return params
+
+    def parse_value(self, param, top_level=False):
+        """Parse the value after NAME= into scalar, comma list or child groups"""
+        token = self.peek()
+        if token is None or token[0] == ')':
+            return
+
+        if token[0] == 'word':
+            # A top-level scalar must start on the same line as NAME=
+            if top_level and token[2] != param.line:
+                return
+            words = []
+            while True:
+                token = self.peek(skip_newlines=not top_level)
+                if token is None or token[0] != 'word':
+                    break
+                words.append(self.next(skip_newlines=not top_level)[1])
+            param.value = ' '.join(words)
+            return
+
+        if token[0] != '(':
+            self.error(f"unexpected {token[1]!r} in value of {param.name}")
+
+        while True:
+            # A top-level value ends where the next NAME= begins
+            token = self.peek()
+            if token is None or token[0] != '(':
+                break
+            self.parse_group(param)
+
+    def parse_group(self, parent):
+        """Parse '(NAME=value)' or a comma list '(a, b, c)'"""
+        self.expect('(')
+        first = self.expect('word')
+        token = self.peek()
+
+        if token is not None and token[0] == '=':
+            self.next()
+            child = NetParameter(first[1], line=first[2])
+            self.parse_value(child)
+            self.expect(')')
+            parent.children.append(child)
+            return
+
+        items = [first[1]]
+        while True:
+            token = self.next()
+            if token is None:
+                self.error("unterminated list")
+            if token[0] == ')':
+                break
+            if token[0] == ',':
+                continue
+            if token[0] == 'word':
+                # Words separated by spaces only belong to the same item
+                if items and self.tokens[self.pos - 2][0] == 'word':
+                    items[-1] = f"{items[-1]} {token[1]}"
+                else:
+                    items.append(token[1])
+                continue
+            self.error(f"unexpected {token[1]!r} in list")
+        parent.items.extend(items)
+
+
+def parse_net_text(text, source='<string>'):
+    """Parse Oracle Net syntax text into {NAME: NetParameter}"""
+    return NetParser(text, source).parse()
+
+
+def parse_net_file(path):
+    """Parse an Oracle Net configuration file into {NAME: NetParameter}"""
+    path = Path(path)
+    return parse_net_text(path.read_text(encoding='utf-8', errors='ignore'), str(path))
+
+
+def parse_key_value_file(path):
+    """Parse simple KEY=value files (extproc.ora, externaljob.ora, fips.ora)"""
+    values = {}
+    for raw in Path(path).read_text(encoding='utf-8', errors='ignore').splitlines():
+        line = raw.split('#', 1)[0].strip()
+        if not line or '=' not in line:
+            continue
+        if line.upper().startswith('SET '):
+            line = line[4:].strip()
+        key, value = line.split('=', 1)
+        values[key.strip().upper()] = value.strip()
+    return values
+
+
+class NetConfig:
+    """Parsed Oracle Net configuration of a single ORACLE_HOME"""
+
+    def __init__(self, oracle_home, admin_dir):
+        self.oracle_home = Path(oracle_home) if oracle_home else None
+        self.admin_dir = Path(admin_dir)
+        self.paths = {}
+        self.files = {}
+        self.errors = []
+
+        for name in NET_FILES:
+            path = self.admin_dir / name
+            if not path.is_file():
+                continue
+            self.paths[name] = path
+            try:
+                self.files[name] = parse_net_file(path)
+            except (OSError, ValueError) as e:
+                self.errors.append(str(e))
+
+    @property
+    def listener(self):
+        return self.files.get('listener.ora', {})
+
+    @property
+    def sqlnet(self):
+        return self.files.get('sqlnet.ora', {})
+
+    @property
+    def tnsnames(self):
+        return self.files.get('tnsnames.ora', {})
+
+    def sqlnet_value(self, name):
+        param = self.sqlnet.get(name.upper())
+        return param.text() if param else None
+
+    def listeners(self):
+        """Return {listener name: NetParameter} for listener definitions"""
+        found = {}
+        for name, param in self.listener.items():
+            if name.startswith(NON_LISTENER_PREFIXES):
+                continue
+            if param.find_all('ADDRESS'):
+                found[name] = param
+        return found
+
+    def endpoints(self, param):
+        """List protocol/host/port/key dicts for every ADDRESS under param"""
+        endpoints = []
+        for address in param.find_all('ADDRESS'):
+            endpoint = {}
+            for child in address.children:
+                endpoint[child.name.lower()] = child.text() or ''
+            endpoints.append(endpoint)
+        return endpoints
+
+
+_config_cache = {}
+
+
+def load_net_config(oracle_home, tns_admin=None):
+    """Parse the network configuration of a home once per process"""
+    admin_dir = Path(tns_admin) if tns_admin else Path(oracle_home) / 'network' / 'admin'
+    key = (str(oracle_home), str(admin_dir))
+    if key not in _config_cache:
+        _config_cache[key] = NetConfig(oracle_home, admin_dir)
+    return _config_cache[key]
+
+
+def discover_oracle_homes(extra_homes=None):
+    """Find ORACLE_HOMEs from arguments, environment and oratab"""
+    homes = []
+
+    def add(home):
+        if home and home not in homes and Path(home).is_dir():
+            homes.append(home)
+
+    for home in extra_homes or []:
+        add(home)
+    add(os.environ.get('ORACLE_HOME'))
+
+    for oratab in ORATAB_PATHS:
+        try:
+            lines = Path(oratab).read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            line = line.split('#', 1)[0].strip()
+            fields = line.split(':')
+            if len(fields) >= 2 and fields[1]:
+                add(fields[1])
+
+    return homes
+
+
+################################################################################
+# NETWORK RULES
+################################################################################
+
+def check_rate_limit(config):
+    """V-270496: every listener must rate limit connections"""
+    listeners = config.listeners()
+    if not listeners:
+        return 'Not_Applicable', 'No listeners defined in listener.ora'
+
+    findings = []
+    passed = []
+    for name, param in sorted(listeners.items()):
+        limited = []
+        for endpoint in config.endpoints(param):
+            rate = (endpoint.get('rate_limit') or '').lower()
+            if rate and rate not in ('no', 'off', 'false', '0'):
+                limited.append(f"PORT={endpoint.get('port', '?')} RATE_LIMIT={rate}")
+
+        if not limited:
+            findings.append(f"{name}: no ADDRESS has RATE_LIMIT set")
+            continue
+
+        needs_global = any(entry.endswith('=yes') for entry in limited)
+        if needs_global and f'CONNECTION_RATE_{name}' not in config.listener:
+            findings.append(f"{name}: RATE_LIMIT=yes without CONNECTION_RATE_{name}")
+            continue
+        passed.append(f"{name}: {'; '.join(limited)}")
+
+    if findings:
+        return 'Open', '; '.join(findings)
+    return 'NotAFinding', '; '.join(passed)
+
+
+def check_listener_admin(config):
+    """V-270531: listener administration must require authentication"""
+    listeners = config.listeners()
+    if not listeners:
+        return 'Not_Applicable', 'No listeners defined in listener.ora'
+
+    details = []
+    for name in sorted(listeners):
+        restrictions = config.listener.get(f'ADMIN_RESTRICTIONS_{name}')
+        value = restrictions.text() if restrictions else 'not set'
+        details.append(f"{name} (ADMIN_RESTRICTIONS={value})")
+    return ('Not_Reviewed',
+            f"Verify 'lsnrctl status' reports Security = ON: Local OS Authentication for: "
+            f"{', '.join(details)}")
+
+
+def check_valid_node(config):
+    """V-270539: listener must restrict access by IP address"""
+    if 'sqlnet.ora' not in config.files:
+        return 'Open', f"sqlnet.ora not found in {config.admin_dir}; verify Connection Manager or network device restriction"
+
+    checking = (config.sqlnet_value('TCP.VALIDNODE_CHECKING') or '').upper()
+    invited = config.sqlnet.get('TCP.INVITED_NODES')
+    invited_nodes = []
+    if invited:
+        invited_nodes = invited.items or ([invited.value] if invited.value else [])
+
+    if checking == 'YES' and invited_nodes:
+        return 'NotAFinding', f"TCP.VALIDNODE_CHECKING=YES, TCP.INVITED_NODES=({', '.join(invited_nodes)})"
+
+    problems = []
+    if checking != 'YES':
+        problems.append(f"TCP.VALIDNODE_CHECKING={checking or 'not set'}")
+    if not invited_nodes:
+        problems.append("TCP.INVITED_NODES not set")
+    return 'Open', '; '.join(problems) + ' (verify Connection Manager or network device restriction if used)'
+
+
+def check_logon_version(config):
+    """V-270543: client connections restricted to supported versions"""
+    problems = []
+    values = []
+    for name in ('SQLNET.ALLOWED_LOGON_VERSION_SERVER', 'SQLNET.ALLOWED_LOGON_VERSION_CLIENT'):
+        value = config.sqlnet_value(name)
+        if value is None:
+            problems.append(f"{name} not set")
+        elif value.lower() not in ('12', '12a'):
+            problems.append(f"{name}={value}")
+        else:
+            values.append(f"{name}={value}")
+
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', '; '.join(values)
+
+
+def check_extproc(config):
+    """V-270557: external procedure agent must be restricted"""
+    if not config.oracle_home:
+        return 'Not_Applicable', 'ORACLE_HOME unknown'
+
+    problems = []
+    details = []
+
+    extproc_ora = config.oracle_home / 'hs' / 'admin' / 'extproc.ora'
+    if not extproc_ora.is_file():
+        problems.append(f"{extproc_ora} not found")
+    else:
+        dlls = parse_key_value_file(extproc_ora).get('EXTPROC_DLLS')
+        if not dlls or not dlls.upper().startswith('ONLY:'):
+            problems.append(f"EXTPROC_DLLS={dlls or 'not set'} (must be ONLY:<dll list>)")
+        else:
+            details.append(f"EXTPROC_DLLS={dlls}")
+
+    externaljob_ora = config.oracle_home / 'rdbms' / 'admin' / 'externaljob.ora'
+    if externaljob_ora.is_file():
+        values = parse_key_value_file(externaljob_ora)
+        for key in ('RUN_USER', 'RUN_GROUP'):
+            value = values.get(key)
+            if value != 'nobody':
+                problems.append(f"externaljob.ora {key.lower()}={value or 'not set'}")
+            else:
+                details.append(f"{key.lower()}=nobody")
+
+    for name, param in sorted(config.listener.items()):
+        for sid_desc in param.find_all('SID_DESC'):
+            program = sid_desc.get('PROGRAM')
+            if program and 'extproc' in (program.text() or '').lower():
+                details.append(f"{name} defines extproc SID_DESC (verify authorization)")
+
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', '; '.join(details)
+
+
+def check_ports_protocols(config):
+    """V-270558: listener ports and protocols must be PPSM approved"""
+    inventory = []
+    for name, param in sorted(config.listeners().items()):
+        for endpoint in config.endpoints(param):
+            inventory.append(
+                f"listener {name}: {endpoint.get('protocol', '?').upper()} "
+                f"{endpoint.get('host', '')}:{endpoint.get('port', endpoint.get('key', ''))}"
+            )
+    for name, param in sorted(config.tnsnames.items()):
+        for endpoint in config.endpoints(param):
+            inventory.append(
+                f"tnsnames {name}: {endpoint.get('protocol', '?').upper()} "
+                f"{endpoint.get('host', '')}:{endpoint.get('port', '')}"
+            )
+
+    if not inventory:
+        return 'Not_Applicable', 'No listener or tnsnames endpoints defined'
+    return 'Not_Reviewed', 'Verify against PPSM CAL: ' + '; '.join(inventory)
+
+
+def check_tls_wallet(config):
+    """V-270565/V-270566: sqlnet.ora must configure a TLS wallet"""
+    problems = []
+    if 'WALLET_LOCATION' not in config.sqlnet:
+        problems.append("WALLET_LOCATION not set")
+    client_auth = (config.sqlnet_value('SSL_CLIENT_AUTHENTICATION') or '').upper()
+    if client_auth != 'TRUE':
+        problems.append(f"SSL_CLIENT_AUTHENTICATION={client_auth or 'not set'}")
+
+    if problems:
+        return 'Open', '; '.join(problems)
+
+    wallet = config.sqlnet['WALLET_LOCATION'].find_all('DIRECTORY')
+    directory = wallet[0].text() if wallet else 'unknown'
+    return 'NotAFinding', f"WALLET_LOCATION DIRECTORY={directory}; SSL_CLIENT_AUTHENTICATION=TRUE"
+
+
+def check_network_encryption(config):
+    """
+    V-270579: network traffic must be encrypted
+
+    Only SQLNET.ENCRYPTION_SERVER=REQUIRED forces native encryption (the server
+    default is ACCEPTED, and REQUESTED or an encryption type list still let
+    clients connect in clear text); otherwise every network listener endpoint
+    must be TCPS.
+    """
+    encryption = (config.sqlnet_value('SQLNET.ENCRYPTION_SERVER') or '').lower()
+    types = config.sqlnet_value('SQLNET.ENCRYPTION_TYPES_SERVER')
+    protocols = set(
+        (endpoint.get('protocol') or 'tcp').lower()
+        for param in config.listeners().values()
+        for endpoint in config.endpoints(param)
+    )
+
+    if encryption == 'required':
+        return 'NotAFinding', (f"SQLNET.ENCRYPTION_SERVER=REQUIRED; "
+                               f"SQLNET.ENCRYPTION_TYPES_SERVER={types or 'default'}")
+    if 'tcps' in protocols and 'tcp' not in protocols:
+        return 'NotAFinding', 'Listeners accept TCPS (TLS) connections only'
+    problems = [f"SQLNET.ENCRYPTION_SERVER={encryption.upper() or 'not set (ACCEPTED)'}"]
+    if 'tcp' in protocols:
+        problems.append('listener accepts unencrypted TCP connections')
+    return 'Open', '; '.join(problems) + ' (verify alternative physical measures if used)'
+
+
+def rule_severity(vuln_id):
+    """Severity of a network rule in the Oracle Database 19c benchmark"""
+    if not _severities:
+        try:
+            for record in stig_catalog.load_checks(BENCHMARK_FILE):
+                group_id = stig_catalog.field(record, stig_catalog.FIELD_KEYS['group_id'])
+                severity = stig_catalog.field(record, stig_catalog.FIELD_KEYS['severity'])
+                if group_id in NETWORK_RULES and severity:
+                    _severities[group_id] = severity.lower()
+        except (OSError, ValueError, stig_catalog.CatalogError):
+            pass
+    return _severities.get(vuln_id, DEFAULT_SEVERITY)
+
+
+# Vuln ID -> (STIG ID, evaluator); severities come from the benchmark (rule_severity)
+NETWORK_RULES = {
+    'V-270496': ('O19C-00-000200', check_rate_limit),
+    'V-270531': ('O19C-00-009900', check_listener_admin),
+    'V-270539': ('O19C-00-011200', check_valid_node),
+    'V-270543': ('O19C-00-011700', check_logon_version),
+    'V-270557': ('O19C-00-013400', check_extproc),
+    'V-270558': ('O19C-00-013500', check_ports_protocols),
+    'V-270565': ('O19C-00-014900', check_tls_wallet),
+    'V-270566': ('O19C-00-015200', check_tls_wallet),
+    'V-270579': ('O19C-00-017700', check_network_encryption),
+}
+
+_severities = {}
+
+EXIT_CODES = {
+    'NotAFinding': 0,
+    'Open': 1,
+    'Not_Applicable': 2,
+    'Not_Reviewed': 2,
+    'ERROR': 3,
+}
+
+# Worst status wins when a rule is evaluated across several homes
+STATUS_PRIORITY = ('ERROR', 'Open', 'Not_Reviewed', 'NotAFinding', 'Not_Applicable')
+
+
+def evaluate_rule(vuln_id, config):
+    """Evaluate one network rule against one home's parsed configuration"""
+    if config.errors:
+        return 'ERROR', 'Parse error: ' + '; '.join(config.errors)
+    if not config.files and vuln_id != 'V-270557':
+        return 'Not_Applicable', f"No Oracle Net configuration files in {config.admin_dir}"
+    return NETWORK_RULES[vuln_id][1](config)
+
+
+def evaluate_homes(configs, vuln_ids):
+    """Evaluate rules across homes; returns {vuln_id: result dict}"""
+    results = {}
+    for vuln_id in vuln_ids:
+        stig_id = NETWORK_RULES[vuln_id][0]
+        severity = rule_severity(vuln_id)
+        per_home = []
+        for config in configs:
+            status, details = evaluate_rule(vuln_id, config)
+            per_home.append((status, f"[{config.admin_dir}] {details}"))
+
+        status = min((s for s, _ in per_home), key=STATUS_PRIORITY.index)
+        results[vuln_id] = {
+            'vuln_id': vuln_id,
+            'stig_id': stig_id,
+            'severity': severity,
+            'status': status,
+            'finding_details': '\n'.join(d for _, d in per_home),
+            'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }
+    return results
+
+
+def load_configs(homes, tns_admin=None):
+    """Parsed configuration per home; TNS_ADMIN overrides the admin directory of the active home only"""
+    configs = []
+    active_home = os.environ.get('ORACLE_HOME')
+    for home in homes or [None]:
+        home_tns_admin = tns_admin if (home is None or home == active_home or len(homes) == 1) else None
+        configs.append(load_net_config(home, home_tns_admin))
+    return configs
+
+
+def run_rule(vuln_id, oracle_homes=None, tns_admin=None):
+    """Entry point for the per-rule check scripts: (status, finding_details, exit_code)"""
+    if tns_admin is None:
+        tns_admin = os.environ.get('TNS_ADMIN')
+    homes = discover_oracle_homes(oracle_homes)
+    if not homes and not tns_admin:
+        return 'Not_Applicable', 'Oracle not configured (no ORACLE_HOME found)', EXIT_CODES['Not_Applicable']
+    result = evaluate_homes(load_configs(homes, tns_admin), [vuln_id])[vuln_id]
+    return result['status'], result['finding_details'], EXIT_CODES[result['status']]
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Parse Oracle Net configuration and evaluate network STIG rules',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--oracle-home', action='append', default=[],
+                        help='ORACLE_HOME to evaluate (may be repeated; default: discovered)')
+    parser.add_argument('--tns-admin', default=os.environ.get('TNS_ADMIN'),
+                        help='Network admin directory override (default: $TNS_ADMIN)')
+    parser.add_argument('--rule', action='append', default=[],
+                        help='Vuln ID to evaluate (may be repeated; default: all network rules)')
+    parser.add_argument('--output-json', help='Write results for --rule to this file')
+    parser.add_argument('--output-dir', help='Write one <vuln_id>.json per rule to this directory')
+    parser.add_argument('--dump', action='store_true',
+                        help='Print the parsed parameter trees as JSON and exit')
+    args = parser.parse_args()
+
+    unknown = [r for r in args.rule if r not in NETWORK_RULES]
+    if unknown:
+        print(f"ERROR: Not a network rule: {', '.join(unknown)}")
+        return 3
+
+    homes = discover_oracle_homes(args.oracle_home)
+    if not homes and not args.tns_admin:
+        print("N/A - No ORACLE_HOME found (set ORACLE_HOME or use --oracle-home)")
+        if args.output_json and len(args.rule) == 1:
+            Path(args.output_json).write_text(json.dumps({
+                'vuln_id': args.rule[0], 'stig_id': NETWORK_RULES[args.rule[0]][0],
+                'severity': rule_severity(args.rule[0]),
+                'status': 'Not_Applicable', 'finding_details': 'Oracle not configured',
+                'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')}, indent=2))
+        return 2
+
+    configs = load_configs(homes, args.tns_admin)
+
+    if args.dump:
+        def to_dict(param):
+            node = {'name': param.name}
+            if param.value is not None:
+                node['value'] = param.value
+            if param.items:
+                node['items'] = param.items
+            if param.children:
+                node['children'] = [to_dict(c) for c in param.children]
+            return node
+
+        print(json.dumps([{
+            'oracle_home': str(c.oracle_home) if c.oracle_home else None,
+            'admin_dir': str(c.admin_dir),
+            'errors': c.errors,
+            'files': {name: [to_dict(p) for p in params.values()] for name, params in c.files.items()},
+        } for c in configs], indent=2))
+        return 0
+
+    vuln_ids = args.rule or sorted(NETWORK_RULES)
+    results = evaluate_homes(configs, vuln_ids)
+
+    for vuln_id in vuln_ids:
+        result = results[vuln_id]
+        print(f"[{vuln_id}] {result['status']}")
+        for line in result['finding_details'].splitlines():
+            print(f"    {line}")
+
+    if args.output_json:
+        payload = results[vuln_ids[0]] if len(vuln_ids) == 1 else list(results.values())
+        Path(args.output_json).write_text(json.dumps(payload, indent=2))
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for vuln_id, result in results.items():
+            (output_dir / f"{vuln_id}.json").write_text(json.dumps(result, indent=2))
+
+    worst = min((r['status'] for r in results.values()), key=STATUS_PRIORITY.index)
+    return EXIT_CODES[worst]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
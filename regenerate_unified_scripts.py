@@ -7,12 +7,13 @@ Then implements actual check logic for all 4,719 checks
 This creates a clean, testable implementation for the entire project.
 """
 
-import json
 import re
 import sys
 from pathlib import Path
 from datetime import datetime
 
+import stig_catalog
+
 # Unified Bash Template (based on successful container format)
 UNIFIED_BASH_TEMPLATE = '''#!/usr/bin/env bash
 ################################################################################
@@ -282,7 +283,7 @@ def process_stig_json(json_file, base_dir):
     print(f"\nProcessing: {json_file.name}")
 
     try:
-        checks = json.load(json_file.open())
+        checks = stig_catalog.load_checks(json_file)
     except Exception as e:
         print(f"  ERROR loading JSON: {e}")
         return 0, 0
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Windows .reg export parser
+Streams registry export files written by "reg export" or regedit (UTF-16 with
+BOM, "Windows Registry Editor Version 5.00", or ANSI "REGEDIT4") and builds a
+key/value index. String, dword, hex, hex(2) expandable string, hex(7)
+multi-string and hex(b) qword values are decoded like hive values, and
+continuation lines, escaped quotes and deletions ([-key], "name"=-) are
+handled.
+
+The file is read line by line. When a set of wanted keys is given, only the
+values of those keys are kept, so a full "reg export HKLM" can be indexed for
+the few hundred keys the STIG rules read without holding the whole export.
+
+Usage:
+    python3 registry_export.py policies.reg --key "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\System"
+    python3 registry_export.py policies.reg --key "HKCU\\Software\\Policies\\Microsoft\\Office\\16.0\\word\\security" --value vbawarnings
+"""
+
+import argparse
+import codecs
+import re
+import struct
+import sys
+
+from registry_hive import REG_BINARY, REG_DWORD, REG_SZ, REG_TYPE_NAMES, RegistryValue
+
+ROOT_NAMES = {
+    'HKEY_LOCAL_MACHINE': 'HKLM',
+    'HKEY_CURRENT_USER': 'HKCU',
+    'HKEY_USERS': 'HKU',
+    'HKEY_CLASSES_ROOT': 'HKCR',
+    'HKEY_CURRENT_CONFIG': 'HKCC',
+}
+ROOT_NAMES.update({short: short for short in ROOT_NAMES.values()})
+
+HEADERS = ('Windows Registry Editor Version 5.00', 'REGEDIT4')
+HEX_RE = re.compile(r'^hex(?:\(([0-9a-fA-F]+)\))?:(.*)$', re.S)
+
+
+class ExportError(Exception):
+    """Raised when a file is not a registry export"""
+
+
+def normalize_key(path):
+    """'HKEY_LOCAL_MACHINE\\Software\\X' -> 'HKLM\\Software\\X' (None for unknown roots)"""
+    parts = [p for p in path.strip().split('\\') if p]
+    if not parts or parts[0].upper() not in ROOT_NAMES:
+        return None
+    parts[0] = ROOT_NAMES[parts[0].upper()]
+    return '\\'.join(parts)
+
+
+def open_export(path):
+    """Open an export as text, detecting UTF-16 (with BOM) or 8-bit encoding"""
+    with open(path, 'rb') as f:
+        start = f.read(4)
+    if start[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        encoding = 'utf-16'
+    elif len(start) >= 4 and start[1:2] == b'\x00' and start[3:4] == b'\x00':
+        encoding = 'utf-16-le'
+    else:
+        encoding = 'utf-8-sig'
+    return open(path, encoding=encoding, errors='replace', newline=None)
+
+
+def read_quoted(text, start):
+    """Parse a quoted .reg string at text[start] == '"'; returns (value, index after closing quote)"""
+    chars = []
+    index = start + 1
+    while index < len(text):
+        char = text[index]
+        if char == '\\' and index + 1 < len(text):
+            chars.append(text[index + 1])
+            index += 2
+            continue
+        if char == '"':
+            return ''.join(chars), index + 1
+        chars.append(char)
+        index += 1
+    raise ValueError('unterminated string')
+
+
+def parse_data(text):
+    """
+    Decode the data part of a value line.
+
+    Returns:
+        (type, raw bytes) or None for a deletion ("-")
+    """
+    text = text.strip()
+    if text == '-':
+        return None
+    if text.startswith('"'):
+        value, _ = read_quoted(text, 0)
+        return REG_SZ, (value + '\x00').encode('utf-16-le')
+    lowered = text.lower()
+    if lowered.startswith('dword:'):
+        return REG_DWORD, struct.pack('<I', int(text[6:].strip() or '0', 16) & 0xFFFFFFFF)
+    match = HEX_RE.match(text)
+    if match:
+        value_type = int(match.group(1), 16) if match.group(1) else REG_BINARY
+        digits = [b for b in re.split(r'[,\s\\]+', match.group(2)) if b]
+        return value_type, bytes(int(b, 16) for b in digits)
+    raise ValueError(f"unsupported value data: {text[:40]}")
+
+
+def iter_export(path):
+    """
+    Stream the records of an export file.
+
+    Yields:
+        ('key', key path, deleted) and ('value', key path, name, type, raw) tuples;
+        raw is None for deleted values
+    """
+    with open_export(path) as f:
+        header = f.readline().strip().lstrip('﻿')
+        if header not in HEADERS:
+            raise ExportError(f"{path}: not a registry export (header {header[:40]!r})")
+        key = None
+        pending = ''
+        for line in f:
+            line = line.rstrip('\r\n')
+            if pending:
+                line = pending + line.lstrip()
+                pending = ''
+            if line.endswith('\\') and not line.startswith('['):
+                pending = line[:-1]
+                continue
+            stripped = line.strip()
+            if not stripped or stripped.startswith(';'):
+                continue
+            if stripped.startswith('[') and stripped.endswith(']'):
+                deleted = stripped.startswith('[-')
+                key = normalize_key(stripped[2:-1] if deleted else stripped[1:-1])
+                if key:
+                    yield ('key', key, deleted)
+                continue
+            if key is None:
+                continue
+            try:
+                if stripped.startswith('@='):
+                    name, rest = '', stripped[2:]
+                elif stripped.startswith('"'):
+                    name, end = read_quoted(stripped, 0)
+                    if stripped[end:end + 1] != '=':
+                        continue
+                    rest = stripped[end + 1:]
+                else:
+                    continue
+                data = parse_data(rest)
+            except ValueError:
+                continue
+            if data is None:
+                yield ('value', key, name, None, None)
+            else:
+                yield ('value', key, name, data[0], data[1])
+
+
+class RegistryExport(object):
+    """
+    Key/value index built from one or more .reg exports.
+
+    Keys are addressed with their root abbreviated (HKLM, HKCU, HKU, HKCR) and
+    looked up case-insensitively. Later files override earlier ones, as they
+    would when imported in order.
+
+    The first key of each file is the key it was exported from ("reg export
+    HKLM\\SOFTWARE\\Policies" starts with that key), so exported holds the
+    subtrees the files cover; keys outside them are unknown, not missing.
+    """
+
+    def __init__(self, paths, wanted_keys=None):
+        self.paths = [str(p) for p in ([paths] if isinstance(paths, str) else paths)]
+        self.wanted = {k.lower() for k in wanted_keys} if wanted_keys is not None else None
+        self.keys = {}
+        self.errors = []
+        self.roots = set()
+        self.exported = {}
+        self.records = 0
+        for path in self.paths:
+            try:
+                self._load(path)
+            except (OSError, ExportError) as e:
+                self.errors.append(str(e))
+
+    def _load(self, path):
+        keys = self.keys
+        wanted = self.wanted
+        first = True
+        for record in iter_export(path):
+            self.records += 1
+            lowered = record[1].lower()
+            if record[0] == 'key':
+                self.roots.add(record[1].split('\\', 1)[0])
+                # Bare roots start each hive of a full regedit export
+                if first or '\\' not in record[1]:
+                    self.exported.setdefault(lowered, record[1])
+                    first = False
+            if record[0] == 'key' and record[2]:
+                # [-key] deletes the key and every subkey, wanted or not
+                prefix = lowered + '\\'
+                for existing in [k for k in keys if k == lowered or k.startswith(prefix)]:
+                    del keys[existing]
+                continue
+            if wanted is not None and lowered not in wanted:
+                continue
+            if record[0] == 'key':
+                keys.setdefault(lowered, {})
+                continue
+            values = keys.setdefault(lowered, {})
+            if record[3] is None:
+                values.pop(record[2].lower(), None)
+            else:
+                values[record[2].lower()] = RegistryValue(record[2], record[3], record[4])
+
+    def has_key(self, path):
+        return path.lower() in self.keys
+
+    def covers(self, path):
+        """True if a key path lies within a subtree one of the files was exported from"""
+        lowered = path.lower()
+        return any(lowered == prefix or lowered.startswith(prefix + '\\') for prefix in self.exported)
+
+    def get_value(self, path, name):
+        """RegistryValue for a key path (with root) and value name, or None"""
+        values = self.keys.get(path.lower())
+        return values.get(name.lower()) if values else None
+
+    def values(self, path):
+        return list((self.keys.get(path.lower()) or {}).values())
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Read keys and values from Windows .reg export files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('export', nargs='+', help='.reg export file(s)')
+    parser.add_argument('--key', help='Key path including the root (HKLM\\..., HKCU\\...)')
+    parser.add_argument('--value', help='Print only this value')
+    args = parser.parse_args()
+
+    export = RegistryExport(args.export)
+    for error in export.errors:
+        print(f"ERROR: {error}")
+    if export.errors and not export.keys:
+        return 3
+
+    if not args.key:
+        print(f"{len(export.keys)} keys, {export.records} records")
+        return 0
+    key = normalize_key(args.key)
+    if not key or not export.has_key(key):
+        print(f"ERROR: Key not found: {args.key}")
+        return 1
+    values = export.values(key)
+    if args.value is not None:
+        values = [v for v in values if v.name.lower() == args.value.lower()]
+        if not values:
+            print(f"ERROR: Value not found: {args.value}")
+            return 1
+    for value in values:
+        print(f"{value.name or '(Default)'} = {REG_TYPE_NAMES.get(value.type, value.type)} {value.data!r}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Offline Windows registry hive reader
+Reads REGF hive files (SYSTEM, SOFTWARE, SECURITY, SAM, NTUSER.DAT) without
+Windows or winreg, so hives collected from endpoints can be evaluated on any
+host.
+
+The file is memory-mapped and cells are decoded on demand: opening a key walks
+only the subkey lists on its path, and every key reached is remembered in a
+key-path index so later lookups under the same branch are dictionary hits.
+Large values stored in big-data (db) cells are reassembled from their segments.
+Transaction logs (.LOG1/.LOG2) are not replayed; hives saved with "reg save"
+or copied from a volume shadow copy are consistent on their own.
+
+Usage:
+    python3 registry_hive.py SOFTWARE --key "Microsoft\\Windows NT\\CurrentVersion"
+    python3 registry_hive.py SYSTEM --key "ControlSet001\\Control\\Lsa" --value RestrictRemoteSAM
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+from datetime import datetime, timedelta
+
+# Offsets in the hive file are relative to the first hive bin
+HBIN_START = 4096
+BIG_DATA_SEGMENT = 16344
+KEY_COMP_NAME = 0x0020
+VALUE_COMP_NAME = 0x0001
+DATA_INLINE = 0x80000000
+NO_OFFSET = 0xFFFFFFFF
+
+REG_NONE = 0
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD = 4
+REG_DWORD_BIG_ENDIAN = 5
+REG_LINK = 6
+REG_MULTI_SZ = 7
+REG_QWORD = 11
+
+REG_TYPE_NAMES = {
+    REG_NONE: 'REG_NONE',
+    REG_SZ: 'REG_SZ',
+    REG_EXPAND_SZ: 'REG_EXPAND_SZ',
+    REG_BINARY: 'REG_BINARY',
+    REG_DWORD: 'REG_DWORD',
+    REG_DWORD_BIG_ENDIAN: 'REG_DWORD_BIG_ENDIAN',
+    REG_LINK: 'REG_LINK',
+    REG_MULTI_SZ: 'REG_MULTI_SZ',
+    8: 'REG_RESOURCE_LIST',
+    9: 'REG_FULL_RESOURCE_DESCRIPTOR',
+    10: 'REG_RESOURCE_REQUIREMENTS_LIST',
+    REG_QWORD: 'REG_QWORD',
+}
+REG_TYPES = {name: number for number, name in REG_TYPE_NAMES.items()}
+
+
+class HiveError(Exception):
+    """Raised when a file is not a readable registry hive"""
+
+
+def filetime(value):
+    """Convert a Windows FILETIME to a datetime (None when unset)"""
+    if not value:
+        return None
+    try:
+        return datetime(1601, 1, 1) + timedelta(microseconds=value // 10)
+    except OverflowError:
+        return None
+
+
+def decode_string(raw):
+    """Decode UTF-16LE string data, dropping the terminator"""
+    if len(raw) % 2:
+        raw = raw[:-1]
+    text = raw.decode('utf-16-le', errors='replace')
+    end = text.find('\x00')
+    return text if end < 0 else text[:end]
+
+
+def decode_value(value_type, raw):
+    """
+    Decode raw value data the way winreg.QueryValueEx presents it.
+
+    REG_DWORD/REG_QWORD become ints, string types become str, REG_MULTI_SZ a
+    list of str and everything else bytes.
+    """
+    if value_type in (REG_SZ, REG_EXPAND_SZ, REG_LINK):
+        return decode_string(raw)
+    if value_type == REG_MULTI_SZ:
+        if len(raw) % 2:
+            raw = raw[:-1]
+        items = raw.decode('utf-16-le', errors='replace').split('\x00')
+        while items and items[-1] == '':
+            items.pop()
+        return items
+    if value_type == REG_DWORD and len(raw) >= 4:
+        return struct.unpack_from('<I', raw)[0]
+    if value_type == REG_DWORD_BIG_ENDIAN and len(raw) >= 4:
+        return struct.unpack_from('>I', raw)[0]
+    if value_type == REG_QWORD and len(raw) >= 8:
+        return struct.unpack_from('<Q', raw)[0]
+    return bytes(raw)
+
+
+class RegistryValue(object):
+    """A value of a registry key"""
+
+    __slots__ = ('name', 'type', 'raw')
+
+    def __init__(self, name, value_type, raw):
+        self.name = name
+        self.type = value_type
+        self.raw = raw
+
+    @property
+    def type_name(self):
+        return REG_TYPE_NAMES.get(self.type, f"REG_{self.type}")
+
+    @property
+    def data(self):
+        return decode_value(self.type, self.raw)
+
+    def __repr__(self):
+        return f"RegistryValue({self.name!r}, {self.type_name}, {self.data!r})"
+
+
+class RegistryKey(object):
+    """A key (nk cell) of a hive"""
+
+    __slots__ = ('hive', 'offset', 'path', 'name', 'flags', 'timestamp', 'subkey_count',
+                 'subkey_list', 'value_count', 'value_list')
+
+    def __init__(self, hive, offset, path):
+        self.hive = hive
+        self.offset = offset
+        self.path = path
+        data = hive.cell(offset)
+        if data[:2] != b'nk':
+            raise HiveError(f"{hive.path}: cell {offset:#x} is not a key")
+        (self.flags, stamp) = struct.unpack_from('<HQ', data, 2)
+        self.timestamp = filetime(stamp)
+        self.subkey_count, = struct.unpack_from('<I', data, 20)
+        self.subkey_list, = struct.unpack_from('<I', data, 28)
+        self.value_count, self.value_list = struct.unpack_from('<II', data, 36)
+        name_length, = struct.unpack_from('<H', data, 72)
+        raw = bytes(data[76:76 + name_length])
+        self.name = raw.decode('latin-1') if self.flags & KEY_COMP_NAME else raw.decode('utf-16-le', 'replace')
+
+    def subkeys(self):
+        """Child keys in hive order"""
+        for offset in self.hive.subkey_offsets(self):
+            child = RegistryKey(self.hive, offset, '')
+            child.path = f"{self.path}\\{child.name}" if self.path else child.name
+            yield child
+
+    def subkey(self, name):
+        """Child key by case-insensitive name, or None"""
+        return self.hive.open_key(f"{self.path}\\{name}" if self.path else name)
+
+    def values(self):
+        """Values of this key in hive order"""
+        for offset in self.hive.value_offsets(self):
+            yield self.hive.read_value(offset)
+
+    def value(self, name):
+        """Value by case-insensitive name ('' for the default value), or None"""
+        return self.hive.value_index(self).get(name.lower())
+
+    def __repr__(self):
+        return f"RegistryKey({self.path or '<root>'!r})"
+
+
+class RegistryHive(object):
+    """
+    A memory-mapped REGF hive.
+
+    Keys are addressed by paths relative to the hive root, e.g.
+    "Microsoft\\Windows NT\\CurrentVersion" in a SOFTWARE hive. Lookups are
+    case-insensitive.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise HiveError(f"{self.path}: empty file")
+        if len(self._map) < HBIN_START or self._map[:4] != b'regf':
+            self.close()
+            raise HiveError(f"{self.path}: not a registry hive (missing regf signature)")
+        (sequence1, sequence2) = struct.unpack_from('<II', self._map, 4)
+        (self.major_version, self.minor_version) = struct.unpack_from('<II', self._map, 20)
+        root_offset, = struct.unpack_from('<I', self._map, 36)
+        self.embedded_name = decode_string(bytes(self._map[48:112]))
+        self.dirty = sequence1 != sequence2
+        # Key-path index: lowercase path -> (nk offset, path), filled as keys are reached
+        self._index = {'': (root_offset, '')}
+        self._children = {}
+        self._values = {}
+        self.root = RegistryKey(self, root_offset, '')
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    ############################################################################
+    # Cells
+    ############################################################################
+
+    def cell(self, offset):
+        """Data of the cell at a hive offset (without the size header)"""
+        start = HBIN_START + offset
+        if offset == NO_OFFSET or start + 4 > len(self._map):
+            raise HiveError(f"{self.path}: cell offset {offset:#x} outside the hive")
+        size, = struct.unpack_from('<i', self._map, start)
+        size = abs(size)
+        if size < 4 or start + size > len(self._map):
+            raise HiveError(f"{self.path}: corrupt cell at {offset:#x}")
+        return memoryview(self._map)[start + 4:start + size]
+
+    def _list_offsets(self, offset, depth=0):
+        data = self.cell(offset)
+        signature = bytes(data[:2])
+        count, = struct.unpack_from('<H', data, 2)
+        if signature in (b'lf', b'lh'):
+            return [struct.unpack_from('<I', data, 4 + 8 * i)[0] for i in range(count)]
+        if signature == b'li':
+            return list(struct.unpack_from(f'<{count}I', data, 4))
+        if signature == b'ri' and depth < 8:
+            offsets = []
+            for sub in struct.unpack_from(f'<{count}I', data, 4):
+                offsets.extend(self._list_offsets(sub, depth + 1))
+            return offsets
+        raise HiveError(f"{self.path}: unknown subkey list {signature!r} at {offset:#x}")
+
+    def subkey_offsets(self, key):
+        if not key.subkey_count or key.subkey_list == NO_OFFSET:
+            return []
+        return self._list_offsets(key.subkey_list)
+
+    def value_offsets(self, key):
+        if not key.value_count or key.value_list == NO_OFFSET:
+            return []
+        return list(struct.unpack_from(f'<{key.value_count}I', self.cell(key.value_list)))
+
+    def read_value(self, offset):
+        data = self.cell(offset)
+        if data[:2] != b'vk':
+            raise HiveError(f"{self.path}: cell {offset:#x} is not a value")
+        (name_length, size, data_offset, value_type, flags) = struct.unpack_from('<HIIIH', data, 2)
+        raw_name = bytes(data[20:20 + name_length])
+        name = raw_name.decode('latin-1') if flags & VALUE_COMP_NAME else raw_name.decode('utf-16-le', 'replace')
+        if size & DATA_INLINE:
+            raw = bytes(data[8:8 + min(size & ~DATA_INLINE, 4)])
+        elif size == 0:
+            raw = b''
+        else:
+            raw = self._value_data(data_offset, size)
+        return RegistryValue(name, value_type, raw)
+
+    def _value_data(self, offset, size):
+        data = self.cell(offset)
+        if size > BIG_DATA_SEGMENT and data[:2] == b'db' and self.minor_version > 3:
+            count, segment_list = struct.unpack_from('<HI', data, 2)
+            chunks = []
+            remaining = size
+            for segment in struct.unpack_from(f'<{count}I', self.cell(segment_list)):
+                chunk = self.cell(segment)[:min(remaining, BIG_DATA_SEGMENT)]
+                chunks.append(bytes(chunk))
+                remaining -= len(chunk)
+            return b''.join(chunks)
+        return bytes(data[:size])
+
+    ############################################################################
+    # Index
+    ############################################################################
+
+    def children(self, key):
+        """Lowercase child name -> nk offset for a key (cached)"""
+        names = self._children.get(key.offset)
+        if names is None:
+            names = {}
+            for offset in self.subkey_offsets(key):
+                data = self.cell(offset)
+                flags, = struct.unpack_from('<H', data, 2)
+                name_length, = struct.unpack_from('<H', data, 72)
+                raw = bytes(data[76:76 + name_length])
+                name = raw.decode('latin-1') if flags & KEY_COMP_NAME else raw.decode('utf-16-le', 'replace')
+                names[name.lower()] = offset
+            self._children[key.offset] = names
+        return names
+
+    def value_index(self, key):
+        """Lowercase value name -> RegistryValue for a key (cached)"""
+        values = self._values.get(key.offset)
+        if values is None:
+            values = {value.name.lower(): value for value in key.values()}
+            self._values[key.offset] = values
+        return values
+
+    def open_key(self, path):
+        """Key at a path relative to the hive root, or None"""
+        parts = [p for p in path.replace('/', '\\').split('\\') if p]
+        entry = self._index.get('\\'.join(parts).lower())
+        if entry is not None:
+            return RegistryKey(self, entry[0], entry[1])
+
+        # Walk from the deepest indexed ancestor
+        depth = len(parts)
+        while depth and '\\'.join(parts[:depth]).lower() not in self._index:
+            depth -= 1
+        offset, key_path = self._index['\\'.join(parts[:depth]).lower()]
+        key = RegistryKey(self, offset, key_path)
+        for position in range(depth, len(parts)):
+            offset = self.children(key).get(parts[position].lower())
+            if offset is None:
+                return None
+            key = RegistryKey(self, offset, '')
+            key.path = f"{key_path}\\{key.name}" if key_path else key.name
+            key_path = key.path
+            self._index['\\'.join(parts[:position + 1]).lower()] = (offset, key_path)
+        return key
+
+    def get_value(self, path, name):
+        """RegistryValue at key path and value name, or None"""
+        key = self.open_key(path)
+        return key.value(name) if key else None
+
+    def walk(self, key=None):
+        """Yield every key below (and including) a key, depth first"""
+        stack = [key or self.root]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(list(current.subkeys())))
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Read keys and values from an offline Windows registry hive',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('hive', help='Hive file (SYSTEM, SOFTWARE, SECURITY, SAM, NTUSER.DAT)')
+    parser.add_argument('--key', default='', help='Key path relative to the hive root')
+    parser.add_argument('--value', help='Print only this value')
+    parser.add_argument('--recurse', action='store_true', help='List every key below --key')
+    args = parser.parse_args()
+
+    try:
+        hive = RegistryHive(args.hive)
+    except (OSError, HiveError) as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    with hive:
+        key = hive.open_key(args.key)
+        if key is None:
+            print(f"ERROR: Key not found: {args.key}")
+            return 1
+        if args.value is not None:
+            value = key.value(args.value)
+            if value is None:
+                print(f"ERROR: Value not found: {args.value}")
+                return 1
+            print(f"{value.type_name}\t{value.data!r}")
+            return 0
+        keys = hive.walk(key) if args.recurse else [key]
+        for current in keys:
+            print(f"[{current.path or '<root>'}]")
+            for value in current.values():
+                print(f"  {value.name or '(Default)'} = {value.type_name} {value.data!r}")
+            if not args.recurse:
+                for child in current.subkeys():
+                    print(f"  {child.name}\\")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
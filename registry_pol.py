@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Group Policy registry evaluation
+Reads Registry.pol (PReg) files and SYSVOL GPO folders, computes the registry
+state a set of GPOs produces, and evaluates the Windows and Office registry
+rules of windows_registry.py against it. The compliance of a GPO estate can be
+assessed once from a copy of SYSVOL instead of sampling endpoints.
+
+A GPO folder ({GUID}) contributes Machine\\Registry.pol (HKLM),
+User\\Registry.pol (HKCU) and the [Registry Values] section of
+Machine\\Microsoft\\Windows NT\\SecEdit\\GptTmpl.inf (security options). GPOs of
+a set are applied in precedence order, lowest first, so later GPOs win, and the
+PReg deletion markers (**del., **delvals., **DeleteValues, **DeleteKeys,
+**soft.) are honoured. Values no GPO of the set configures are reported as not
+existing.
+
+Usage:
+    python3 registry_pol.py --gpo Policies/{31B2F340-016D-11D2-945F-00C04FB984F9} --gpo Policies/{6AC1786C-...}
+    python3 registry_pol.py --sysvol /mnt/sysvol/example.com/Policies --list
+    python3 registry_pol.py --sysvol /mnt/sysvol/example.com/Policies --sets gpo_sets.json --output-dir results/gpo
+    python3 registry_pol.py --dump Policies/{GUID}/Machine/Registry.pol
+"""
+
+import argparse
+import codecs
+import json
+import os
+import re
+import struct
+import sys
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import registry_hive
+import windows_registry
+
+PREG_SIGNATURE = b'PReg'
+PREG_VERSION = 1
+
+# Registry.pol locations inside a GPO folder and the root they apply to
+POLICY_FILES = (('Machine', 'HKLM'), ('User', 'HKCU'))
+SECURITY_TEMPLATE = os.path.join('Machine', 'Microsoft', 'Windows NT', 'SecEdit', 'GptTmpl.inf')
+GUID_RE = re.compile(r'^\{[0-9A-Fa-f-]{36}\}$')
+
+# Roots used by the [Registry Values] section of security templates
+INF_ROOTS = {'MACHINE': 'HKLM', 'USER': 'HKCU'}
+
+
+class PolicyError(Exception):
+    """Raised for unreadable policy files"""
+
+
+################################################################################
+# FILE FORMATS
+################################################################################
+
+def read_wstring(data, offset):
+    """Null-terminated UTF-16LE string at offset; returns (text, offset after the terminator)"""
+    end = offset
+    while end + 1 < len(data) and data[end:end + 2] != b'\x00\x00':
+        end += 2
+    return data[offset:end].decode('utf-16-le', errors='replace'), end + 2
+
+
+def read_pol(path):
+    """
+    Parse a Registry.pol file.
+
+    Returns:
+        list of (key, value name, type, raw data) in file order
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        raise PolicyError(f"{path}: {e.strerror}")
+    if data[:4] != PREG_SIGNATURE or struct.unpack_from('<I', data, 4)[0] != PREG_VERSION:
+        raise PolicyError(f"{path}: not a Registry.pol file")
+    entries = []
+    offset = 8
+    while offset + 2 <= len(data):
+        if data[offset:offset + 2] != b'[\x00':
+            raise PolicyError(f"{path}: malformed entry at offset {offset}")
+        key, offset = read_wstring(data, offset + 2)
+        name, offset = read_wstring(data, offset + 2)
+        value_type, = struct.unpack_from('<I', data, offset + 2)
+        size, = struct.unpack_from('<I', data, offset + 8)
+        raw = data[offset + 14:offset + 14 + size]
+        offset += 14 + size
+        if data[offset:offset + 2] != b']\x00':
+            raise PolicyError(f"{path}: malformed entry for {key}\\{name}")
+        offset += 2
+        entries.append((key, name, value_type, raw))
+    return entries
+
+
+def read_inf(path):
+    """
+    Parse a security template (GptTmpl.inf / secedit export).
+
+    Returns:
+        OrderedDict of section -> OrderedDict of key -> value text
+    """
+    try:
+        with open(path, 'rb') as f:
+            start = f.read(2)
+        encoding = 'utf-16' if start in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE) else 'utf-8-sig'
+        with open(path, encoding=encoding, errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        raise PolicyError(f"{path}: {e.strerror}")
+    sections = OrderedDict()
+    section = None
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(';'):
+            continue
+        if line.startswith('[') and line.endswith(']'):
+            section = sections.setdefault(line[1:-1].strip(), OrderedDict())
+            continue
+        if section is not None and '=' in line:
+            key, value = line.split('=', 1)
+            section[key.strip()] = value.strip()
+    return sections
+
+
+def inf_registry_value(text):
+    """'4,1' / '1,"text"' / '7,a,b' from [Registry Values] -> (type, raw)"""
+    value_type, _, data = text.partition(',')
+    value_type = int(value_type)
+    if value_type in (registry_hive.REG_DWORD, registry_hive.REG_DWORD_BIG_ENDIAN):
+        return registry_hive.REG_DWORD, struct.pack('<I', int(data or '0', 0) & 0xFFFFFFFF)
+    if value_type == registry_hive.REG_MULTI_SZ:
+        items = [item for item in data.split(',') if item]
+        return value_type, ''.join(item + '\x00' for item in items).encode('utf-16-le') + b'\x00\x00'
+    if value_type == registry_hive.REG_BINARY:
+        return value_type, bytes(int(b, 16) for b in re.findall(r'[0-9a-fA-F]{2}', data))
+    return value_type, (data.strip('"') + '\x00').encode('utf-16-le')
+
+
+################################################################################
+# POLICY STATE
+################################################################################
+
+class PolicyState(object):
+    """Registry keys and values produced by applying policy entries in order"""
+
+    def __init__(self):
+        self.keys = {}
+
+    def _key(self, path):
+        return self.keys.setdefault(path.lower(), {})
+
+    def apply(self, root, key, name, value_type, raw):
+        """Apply one Registry.pol entry under root (HKLM/HKCU)"""
+        path = f"{root}\\{key.strip(chr(92))}"
+        lowered = name.lower()
+        if lowered.startswith('**del.'):
+            self._key(path).pop(lowered[6:], None)
+        elif lowered.startswith('**delvals'):
+            self._key(path).clear()
+        elif lowered == '**deletevalues':
+            values = self._key(path)
+            for item in registry_hive.decode_string(raw).split(';'):
+                values.pop(item.strip().lower(), None)
+        elif lowered == '**deletekeys':
+            for item in registry_hive.decode_string(raw).split(';'):
+                if item.strip():
+                    prefix = f"{path}\\{item.strip()}".lower()
+                    for existing in [k for k in self.keys if k == prefix or k.startswith(prefix + '\\')]:
+                        del self.keys[existing]
+        elif lowered.startswith('**soft.'):
+            values = self._key(path)
+            values.setdefault(lowered[7:], registry_hive.RegistryValue(name[7:], value_type, raw))
+        elif lowered.startswith('**'):
+            self._key(path)
+        elif name:
+            self._key(path)[lowered] = registry_hive.RegistryValue(name, value_type, raw)
+        else:
+            self._key(path)
+
+    def get(self, path, name):
+        return self.keys.get(path.lower(), {}).get(name.lower())
+
+
+class GroupPolicyObject(object):
+    """The registry settings of one GPO folder"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.guid = os.path.basename(os.path.normpath(self.path))
+        self.name = self.guid
+        self.version = 0
+        self.entries = []
+        self.files = []
+        self.errors = []
+        gpt = self._find('GPT.INI')
+        if gpt:
+            for key, value in read_inf(gpt).get('General', {}).items():
+                if key.lower() == 'displayname':
+                    self.name = value
+                elif key.lower() == 'version':
+                    self.version = int(value) if value.isdigit() else 0
+        for folder, root in POLICY_FILES:
+            pol = self._find(os.path.join(folder, 'Registry.pol'))
+            if pol:
+                try:
+                    self.entries.extend((root,) + entry for entry in read_pol(pol))
+                    self.files.append(pol)
+                except PolicyError as e:
+                    self.errors.append(str(e))
+        template = self._find(SECURITY_TEMPLATE)
+        if template:
+            try:
+                values = read_inf(template).get('Registry Values', {})
+                self.files.append(template)
+            except PolicyError as e:
+                self.errors.append(str(e))
+                values = {}
+            for full, text in values.items():
+                root, _, rest = full.partition('\\')
+                key, _, name = rest.rpartition('\\')
+                try:
+                    value_type, raw = inf_registry_value(text)
+                except ValueError:
+                    self.errors.append(f"{template}: unreadable value {full}")
+                    continue
+                if root.upper() in INF_ROOTS:
+                    self.entries.append((INF_ROOTS[root.upper()], key, name, value_type, raw))
+
+    def _find(self, relative):
+        """Case-insensitive lookup of a file below the GPO folder (SYSVOL copies vary in case)"""
+        current = self.path
+        for part in relative.split(os.sep):
+            try:
+                match = next((e for e in os.listdir(current) if e.lower() == part.lower()), None)
+            except OSError:
+                return None
+            if match is None:
+                return None
+            current = os.path.join(current, match)
+        return current if os.path.isfile(current) else None
+
+
+class PolicyView(object):
+    """Registry view (windows_registry interface) of the resultant state of a GPO set"""
+
+    def __init__(self, gpos):
+        self.gpos = list(gpos)
+        self.directory = ', '.join(g.name for g in self.gpos)
+        self.files = {f: f for g in self.gpos for f in g.files}
+        self.errors = [e for g in self.gpos for e in g.errors]
+        self.state = PolicyState()
+        for gpo in self.gpos:
+            for entry in gpo.entries:
+                self.state.apply(*entry)
+
+    def get_value(self, root, path, name):
+        value = self.state.get(f"{root}\\{path}", name)
+        if value is None:
+            return None, None
+        return windows_registry.Value(value.name, value.type_name, value.data), None
+
+    def key_exists(self, root, path):
+        return f"{root}\\{path}".lower() in self.state.keys
+
+    def close(self):
+        pass
+
+
+################################################################################
+# EVALUATION
+################################################################################
+
+def list_gpos(policies_dir):
+    """GPO folders ({GUID}) below a SYSVOL Policies directory"""
+    return sorted(os.path.join(policies_dir, entry) for entry in os.listdir(policies_dir)
+                  if GUID_RE.match(entry) and os.path.isdir(os.path.join(policies_dir, entry)))
+
+
+def evaluate_set(name, gpo_paths, platforms, rule_ids=None):
+    """
+    Evaluate the rules of the given platforms against the resultant policy of a GPO set.
+
+    Returns:
+        tuple: (info dict, list of result dicts)
+    """
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    gpos = [GroupPolicyObject(path) for path in gpo_paths]
+    view = PolicyView(gpos)
+    info = {'host': name, 'gpos': [{'guid': g.guid, 'name': g.name, 'version': g.version} for g in gpos],
+            'platforms': list(platforms), 'platform': None, 'errors': list(view.errors)}
+    results = []
+    for platform in platforms:
+        for check_id, rule in windows_registry.load_platform_rules(platform).items():
+            if rule_ids and check_id not in rule_ids:
+                continue
+            status, details = windows_registry.evaluate_rule(rule, view)
+            results.append({
+                'vuln_id': rule['vuln_id'],
+                'stig_id': rule['stig_id'],
+                'check_id': check_id,
+                'platform': platform,
+                'severity': rule['severity'],
+                'host': name,
+                'status': status,
+                'finding_details': details.replace(' does not exist', ' is not configured by the GPO set'),
+                'timestamp': timestamp,
+            })
+    return info, results
+
+
+def resolve_gpo(reference, policies_dir, names):
+    """GPO folder for a path, {GUID} or display name"""
+    if os.path.isdir(reference):
+        return reference
+    if policies_dir:
+        candidate = os.path.join(policies_dir, reference if reference.startswith('{') else f"{{{reference}}}")
+        if os.path.isdir(candidate):
+            return candidate
+        if reference.lower() in names:
+            return names[reference.lower()]
+    raise PolicyError(f"GPO not found: {reference}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Evaluate Windows and Office registry STIG rules against Group Policy objects',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--gpo', action='append', default=[],
+                        help='GPO folder, {GUID} or display name of one set, lowest precedence first (may be repeated)')
+    parser.add_argument('--sysvol', help='SYSVOL Policies directory holding the {GUID} folders')
+    parser.add_argument('--sets', help='JSON file mapping set names (e.g. OUs) to GPO lists in precedence order')
+    parser.add_argument('--each', action='store_true', help='Evaluate every GPO under --sysvol on its own')
+    parser.add_argument('--platform', action='append', choices=list(windows_registry.PLATFORMS),
+                        help='STIG platform (may be repeated; default: all Windows and Office platforms)')
+    parser.add_argument('--rule', action='append', default=[], help='Check ID to evaluate (may be repeated)')
+    parser.add_argument('--output-dir', help='Directory for per-set results')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for --sets/--each (default: CPU count)')
+    parser.add_argument('--list', action='store_true', help='List the GPOs under --sysvol and exit')
+    parser.add_argument('--dump', help='Print the entries of a Registry.pol file and exit')
+    args = parser.parse_args()
+
+    if args.dump:
+        try:
+            entries = read_pol(args.dump)
+        except PolicyError as e:
+            print(f"ERROR: {e}")
+            return 3
+        for key, name, value_type, raw in entries:
+            value = registry_hive.RegistryValue(name, value_type, raw)
+            print(f"{key}\\{name or '(key)'} = {value.type_name} {value.data!r}")
+        return 0
+
+    gpo_dirs = list_gpos(args.sysvol) if args.sysvol else []
+    gpos = [GroupPolicyObject(path) for path in gpo_dirs] if (args.list or args.sets or args.gpo) else []
+    names = {g.name.lower(): g.path for g in gpos}
+    if args.list:
+        for gpo in gpos:
+            print(f"{gpo.guid}  {gpo.name}  version={gpo.version}  files={len(gpo.files)}")
+        return 0
+
+    try:
+        if args.sets:
+            with open(args.sets) as f:
+                sets = OrderedDict((name, [resolve_gpo(r, args.sysvol, names) for r in refs])
+                                   for name, refs in json.load(f, object_pairs_hook=OrderedDict).items())
+        elif args.each:
+            sets = OrderedDict((os.path.basename(path), [path]) for path in gpo_dirs)
+        elif args.gpo:
+            sets = OrderedDict([('gpo_set', [resolve_gpo(r, args.sysvol, names) for r in args.gpo])])
+        else:
+            print("ERROR: Use --gpo, --sets or --each (with --sysvol)")
+            return 3
+    except (OSError, ValueError, PolicyError) as e:
+        print(f"ERROR: {e}")
+        return 3
+    if not sets:
+        print(f"ERROR: No GPOs found under {args.sysvol}")
+        return 3
+
+    platforms = args.platform or list(windows_registry.PLATFORMS)
+    rule_ids = set(args.rule) or None
+    totals = defaultdict(int)
+    summary = []
+    print("=" * 80)
+    print("Group Policy Registry STIG Evaluation")
+    print("=" * 80)
+    print(f"GPO sets: {len(sets)}")
+    print(f"Platforms: {', '.join(platforms)}")
+    print()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(sets)))) as executor:
+        jobs = executor.map(evaluate_set, list(sets), list(sets.values()), [platforms] * len(sets),
+                            [rule_ids] * len(sets))
+        for info, results in jobs:
+            if args.output_dir:
+                info = windows_registry.write_host(args.output_dir, info['host'], info, results)
+            counts = defaultdict(int)
+            for result in results:
+                counts[result['status']] += 1
+                totals[result['status']] += 1
+            summary.append(dict(info, status_counts=dict(counts)))
+            print(f"  {info['host'][:40]:<40} gpos={len(info['gpos']):<3} open={counts['Open']:<4} "
+                  f"pass={counts['NotAFinding']:<4} review={counts['Not_Reviewed']}"
+                  + (f"  ({'; '.join(info['errors'])})" if info['errors'] else ''))
+            if not args.output_dir and len(sets) == 1:
+                for result in results:
+                    print(f"    {result['platform']:<26} {result['check_id']:<16} {result['status']:<15} "
+                          f"{result['finding_details']}")
+
+    if args.output_dir:
+        (Path(args.output_dir) / 'summary.json').write_text(json.dumps({
+            'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'status_counts': dict(totals),
+            'sets': summary,
+        }, indent=2))
+        print()
+        print(f"Results written to {args.output_dir}/<set>/")
+    if totals['ERROR'] or any(s['errors'] for s in summary):
+        return 3
+    return 1 if totals['Open'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Per-user registry STIG evaluation
+Evaluates the HKCU rules of the Office and Windows STIGs for every user profile
+of a host instead of only the user running the check. Each profile's
+NTUSER.DAT is opened read-only through the offline hive reader
+(registry_hive.py), and profiles are evaluated concurrently in a pool of
+worker processes, so terminal servers with hundreds of profiles are covered in
+one run.
+
+Profiles are taken from the ProfileList of the SOFTWARE hive (--hives) or the
+live registry, and from the subdirectories of --users-dir that hold an
+NTUSER.DAT. The hives of users who are logged on are locked by Windows; save
+them with "reg save HKU\\<SID>" or read a copy of the profile directory.
+
+Usage:
+    python3 registry_profiles.py --users-dir /mnt/host01/Users --hives /srv/hives/host01
+    python3 registry_profiles.py --users-dir C:\\Users --platform ms_office_365_proplus --output-dir results/registry_profiles
+    python3 registry_profiles.py --users-dir /mnt/host01/Users --list-profiles
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import registry_hive
+import windows_registry
+
+PROFILE_LIST_KEY = 'SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\ProfileList'
+
+# Profile directories that are templates or shared, not users
+SKIPPED_PROFILES = ('default', 'default user', 'public', 'all users', 'defaultapppool')
+
+# Well-known service account SIDs (LocalSystem, LocalService, NetworkService)
+SERVICE_SIDS = ('S-1-5-18', 'S-1-5-19', 'S-1-5-20')
+
+
+################################################################################
+# PROFILE DISCOVERY
+################################################################################
+
+def profile_list(view):
+    """SID -> profile directory name from the ProfileList key of a registry view"""
+    profiles = OrderedDict()
+    if isinstance(view, windows_registry.HiveSet):
+        software = view.hive('SOFTWARE')
+        key = software.open_key(PROFILE_LIST_KEY.split('\\', 1)[1]) if software else None
+        for subkey in key.subkeys() if key else []:
+            value = subkey.value('ProfileImagePath')
+            if value is not None and subkey.name not in SERVICE_SIDS:
+                profiles[subkey.name] = str(value.data)
+    elif isinstance(view, windows_registry.LiveRegistry):
+        winreg = view.winreg
+        try:
+            with view._open('HKLM', PROFILE_LIST_KEY) as key:
+                index = 0
+                while True:
+                    try:
+                        sid = winreg.EnumKey(key, index)
+                    except OSError:
+                        break
+                    index += 1
+                    if sid in SERVICE_SIDS:
+                        continue
+                    try:
+                        with winreg.OpenKey(key, sid) as subkey:
+                            path, _ = winreg.QueryValueEx(subkey, 'ProfileImagePath')
+                        profiles[sid] = os.path.expandvars(path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+    return profiles
+
+
+def find_ntuser(directory):
+    """NTUSER.DAT of a profile directory (case-insensitive), or None"""
+    try:
+        for entry in os.listdir(directory):
+            if entry.lower() == 'ntuser.dat' and os.path.isfile(os.path.join(directory, entry)):
+                return os.path.join(directory, entry)
+    except OSError:
+        pass
+    return None
+
+
+def discover_profiles(users_dir=None, view=None):
+    """
+    Find user profiles with an NTUSER.DAT.
+
+    Returns:
+        list of dicts: user, sid, profile (directory), ntuser (path or None)
+    """
+    profiles = OrderedDict()
+    registered = profile_list(view) if view is not None else {}
+    for sid, image_path in registered.items():
+        name = image_path.replace('\\', '/').rstrip('/').rsplit('/', 1)[-1]
+        directory = os.path.join(users_dir, name) if users_dir else image_path
+        profiles[name.lower()] = {'user': name, 'sid': sid, 'profile': directory, 'ntuser': find_ntuser(directory)}
+    if users_dir:
+        try:
+            entries = sorted(os.listdir(users_dir))
+        except OSError:
+            entries = []
+        for entry in entries:
+            directory = os.path.join(users_dir, entry)
+            if entry.lower() in SKIPPED_PROFILES or entry.lower() in profiles or not os.path.isdir(directory):
+                continue
+            ntuser = find_ntuser(directory)
+            if ntuser:
+                profiles[entry.lower()] = {'user': entry, 'sid': '', 'profile': directory, 'ntuser': ntuser}
+    return list(profiles.values())
+
+
+################################################################################
+# EVALUATION
+################################################################################
+
+def user_rules(platforms, rule_ids=None):
+    """(platform, check ID, rule) for rules whose requirements are all HKCU values"""
+    selected = []
+    for platform in platforms:
+        for check_id, rule in windows_registry.load_platform_rules(platform).items():
+            if rule_ids and check_id not in rule_ids:
+                continue
+            hives = {r['hive'] for g in rule['groups'] for r in g['values']}
+            if hives == {'HKCU'}:
+                selected.append((platform, check_id, rule))
+    return selected
+
+
+def evaluate_profile(profile, platforms, rule_ids=None):
+    """
+    Worker: evaluate the HKCU rules against one profile's NTUSER.DAT.
+
+    Returns:
+        tuple: (info dict, list of result dicts)
+    """
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    info = dict(profile, errors=[])
+    if not profile['ntuser']:
+        info['errors'].append(f"NTUSER.DAT not found in {profile['profile']}")
+        return info, []
+    view = windows_registry.HiveSet(os.path.dirname(profile['ntuser']))
+    try:
+        if view.hive('NTUSER.DAT') is None:
+            info['errors'].extend(view.errors or [f"{profile['ntuser']}: not readable"])
+            return info, []
+        results = []
+        for platform, check_id, rule in user_rules(platforms, rule_ids):
+            try:
+                status, details = windows_registry.evaluate_rule(rule, view)
+            except (registry_hive.HiveError, ValueError, OSError) as e:
+                status, details = 'ERROR', str(e)
+            results.append({
+                'vuln_id': rule['vuln_id'],
+                'stig_id': rule['stig_id'],
+                'check_id': check_id,
+                'platform': platform,
+                'severity': rule['severity'],
+                'user': profile['user'],
+                'sid': profile['sid'],
+                'status': status,
+                'finding_details': details,
+                'timestamp': timestamp,
+            })
+        info['errors'].extend(view.errors)
+        return info, results
+    finally:
+        view.close()
+
+
+def host_platforms(view):
+    """Platforms with HKCU rules for the host: detected Windows and Office, else all Office platforms"""
+    if view is None:
+        return list(windows_registry.OFFICE_PLATFORMS)
+    facts = windows_registry.host_facts(view)
+    windows = windows_registry.detect_platform(facts)
+    office = windows_registry.detect_office_platforms(facts) or list(windows_registry.OFFICE_PLATFORMS)
+    return ([windows] if windows else []) + office
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Evaluate HKCU registry STIG rules for every user profile of a host',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--users-dir', help='Directory holding the profile directories (e.g. C:\\Users)')
+    parser.add_argument('--hives', help='Host hive directory with SOFTWARE for the ProfileList and Office detection')
+    parser.add_argument('--host', help='Host name for the results (default: name of --hives or this system)')
+    parser.add_argument('--platform', action='append', choices=list(windows_registry.PLATFORMS),
+                        help='STIG platform (may be repeated; default: detected, else all Office platforms)')
+    parser.add_argument('--rule', action='append', default=[], help='Check ID to evaluate (may be repeated)')
+    parser.add_argument('--output-dir', default='results/registry_profiles', help='Directory for per-user results')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: CPU count)')
+    parser.add_argument('--list-profiles', action='store_true', help='List the discovered profiles and exit')
+    args = parser.parse_args()
+
+    view = None
+    try:
+        if args.hives:
+            view = windows_registry.HiveSet(args.hives)
+        elif not args.users_dir:
+            view = windows_registry.LiveRegistry()
+    except (registry_hive.HiveError, ImportError) as e:
+        print(f"ERROR: {e}")
+        return 3
+    try:
+        profiles = discover_profiles(args.users_dir, view)
+        platforms = args.platform or host_platforms(view)
+    finally:
+        if view is not None:
+            view.close()
+
+    if args.list_profiles:
+        for profile in profiles:
+            print(f"{profile['user']:<24} {profile['sid'] or '-':<48} {profile['ntuser'] or '(no NTUSER.DAT)'}")
+        return 0
+    if not profiles:
+        print("ERROR: No user profiles found (use --users-dir)")
+        return 3
+
+    host = args.host or (os.path.basename(os.path.normpath(args.hives)) if args.hives else
+                         socket.gethostname())
+    rule_ids = set(args.rule) or None
+    output_root = Path(args.output_dir) / windows_registry.host_dir_name(host)
+    rule_count = len(user_rules(platforms, rule_ids))
+    print("=" * 80)
+    print("Per-User Registry STIG Evaluation")
+    print("=" * 80)
+    print(f"Host: {host}")
+    print(f"Profiles: {len(profiles)}")
+    print(f"HKCU rules: {rule_count} ({', '.join(platforms)})")
+    print(f"Workers: {args.workers}")
+    print()
+
+    totals = defaultdict(int)
+    summary = []
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(profiles)))) as executor:
+        jobs = executor.map(evaluate_profile, profiles, [platforms] * len(profiles), [rule_ids] * len(profiles),
+                            chunksize=max(1, len(profiles) // (args.workers * 8) or 1))
+        for info, results in jobs:
+            user_summary = windows_registry.write_host(output_root, info['user'], dict(info, host=host), results)
+            summary.append(user_summary)
+            counts = user_summary['status_counts']
+            for status, count in counts.items():
+                totals[status] += count
+            print(f"  {info['user'][:32]:<32} open={counts.get('Open', 0):<4} pass={counts.get('NotAFinding', 0):<4} "
+                  f"review={counts.get('Not_Reviewed', 0)}" + (f"  ({'; '.join(info['errors'])})" if info['errors'] else ''))
+
+    (output_root / 'summary.json').write_text(json.dumps({
+        'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'host': host,
+        'platforms': platforms,
+        'status_counts': dict(totals),
+        'users': summary,
+    }, indent=2))
+    print()
+    print(f"Results written to {output_root}/<user>/")
+    if totals['ERROR'] or any(u['errors'] for u in summary):
+        return 3
+    return 1 if totals['Open'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
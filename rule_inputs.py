@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Rule input fingerprints
+Derives the host state each STIG rule reads from the commands in its Check
+Content, and fingerprints that state, so a rescan can tell which rules need
+evaluating again (host_scan.py --rescan).
+
+Input specs:
+    file:/etc/ssh/sshd_config       owner, mode and content of a file (a directory:
+                                    the metadata of its entries); glob patterns allowed
+    stat:/var/log                   owner, mode and type of the path itself
+    tree:/usr/bin                   owner, mode and type of every entry below a directory
+    sysctl:kernel.dmesg_restrict    the running kernel parameter (/proc/sys)
+    command:auditctl -l             output of a read-only query command
+    fact:kernel                     host fact (kernel, hostname, boot)
+    volatile                        not fingerprintable; the rule runs on every scan
+
+Every '$ command' line of the Check Content is split into its pipeline
+stages and each stage is mapped to inputs by its command (COMMAND_INPUTS),
+e.g. 'grep -i banner /etc/issue' reads file:/etc/issue and 'auditctl -l'
+becomes command:auditctl -l. A rule is volatile when it has no commands, a
+stage runs a command not in the table, or it walks the whole filesystem,
+home directories or shell substitutions. Derived inputs can be replaced per
+rule (Vuln ID or STIG ID) with an overrides file: {"V-257777": ["file:..."]}.
+
+Usage:
+    python3 rule_inputs.py --platform rhel_9_v2r5
+    python3 rule_inputs.py --platform rhel_9_v2r5 --rule V-258036 --digest
+    python3 rule_inputs.py --platform rhel_9_v2r5 --volatile
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform as host_platform
+import re
+import shlex
+import socket
+import stat
+import subprocess
+import sys
+from collections import OrderedDict
+
+import checklist_export
+import stig_catalog
+
+VOLATILE = 'volatile'
+KINDS = ('file', 'stat', 'tree', 'sysctl', 'command', 'fact')
+
+COMMAND_TIMEOUT = 60
+
+# Larger regular files are fingerprinted by size and modification time
+MAX_FILE_SIZE = 64 * 1024 * 1024
+
+# Tokens separating the stages of a shell command line
+SEPARATORS = ('|', '||', '&&', ';', '&')
+REDIRECTIONS = ('>', '>>', '<', '>&', '&>', '2>', '2>&1')
+
+# Paths whose fingerprint says nothing about the rule (example users, the whole tree)
+UNFINGERPRINTABLE_PATHS = re.compile(r'^/(?:home|root|proc/\d+)(?:/|$)|^/$')
+
+SYSCTL_CONFIG = ('file:/etc/sysctl.conf', 'file:/etc/sysctl.d/*', 'file:/run/sysctl.d/*',
+                 'file:/usr/local/lib/sysctl.d/*', 'file:/usr/lib/sysctl.d/*', 'file:/lib/sysctl.d/*')
+SSHD_CONFIG = ('file:/etc/ssh/sshd_config', 'file:/etc/ssh/sshd_config.d/*',
+               'file:/etc/crypto-policies/back-ends/opensshserver.config')
+DCONF = ('file:/etc/dconf/profile/*', 'file:/etc/dconf/db/*', 'file:/etc/dconf/db/*.d/*',
+         'file:/etc/dconf/db/*.d/locks/*')
+BOOTLOADER = ('file:/etc/default/grub', 'file:/boot/loader/entries/*', 'file:/boot/grub2/grubenv',
+              'file:/boot/grub2/grub.cfg')
+SELINUX = ('file:/etc/selinux/config', 'file:/sys/fs/selinux/enforce')
+CRYPTO_POLICY = ('file:/etc/crypto-policies/config', 'file:/etc/crypto-policies/state/*',
+                 'sysctl:crypto.fips_enabled')
+ACCOUNTS = ('file:/etc/passwd', 'file:/etc/shadow', 'file:/etc/group', 'file:/etc/gshadow',
+            'file:/etc/login.defs')
+UNIT_PROPERTIES = 'systemctl show --property=Id,LoadState,ActiveState,UnitFileState'
+
+
+################################################################################
+# DERIVATION
+################################################################################
+
+def command_stages(line):
+    """Argument lists of each stage of a shell command line (sudo and redirections removed)"""
+    lexer = shlex.shlex(line, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        tokens = line.split()
+    stages = [[]]
+    skip = False
+    for token in tokens:
+        if skip:
+            skip = False
+        elif token in SEPARATORS:
+            stages.append([])
+        elif token in REDIRECTIONS or token.endswith('>'):
+            skip = True
+        else:
+            stages[-1].append(token)
+    result = []
+    for args in stages:
+        while args and (args[0] in ('sudo', 'xargs', 'time', 'command') or args[0].startswith('-')
+                        or re.match(r'^[A-Z_]+=', args[0])):
+            args = args[1:]
+        if args:
+            result.append(args)
+    return result
+
+
+def path_args(args):
+    """Absolute paths among a command's arguments"""
+    return [arg for arg in args if arg.startswith('/') and arg != '/dev/null']
+
+
+def read_paths(kind, pattern_first=False):
+    """
+    Inputs of a command that reads the paths it is given (pipeline filters read none).
+
+    pattern_first: the first operand is a pattern or program (grep, awk, sed), not a file
+    """
+    def inputs(args):
+        operands = args[1:]
+        if pattern_first and not any(arg in ('-e', '-f') or arg.startswith('--regexp') for arg in operands):
+            for i, arg in enumerate(operands):
+                if not arg.startswith('-'):
+                    operands = operands[:i] + operands[i + 1:]
+                    break
+        return [f"{kind}:{path}" for path in path_args(operands)]
+    return inputs
+
+
+def constant(*specs):
+    def inputs(args):
+        return list(specs)
+    return inputs
+
+
+def find_inputs(args):
+    """find reads the metadata of everything below its start paths"""
+    paths = []
+    for arg in args[1:]:
+        if arg in ('-L', '-H', '-P'):
+            continue
+        if arg.startswith(('-', '!', '(')):
+            break
+        paths.append(arg)
+    if not paths or not all(path.startswith('/') for path in paths):
+        return [VOLATILE]
+    return [f"tree:{path}" for path in paths]
+
+
+def sysctl_inputs(args):
+    keys = [arg for arg in args[1:] if not arg.startswith('-') and '.' in arg and '=' not in arg]
+    return [f"sysctl:{key}" for key in keys] or list(SYSCTL_CONFIG)
+
+
+def systemctl_inputs(args):
+    subcommand = next((arg for arg in args[1:] if not arg.startswith('-')), None)
+    if subcommand == 'get-default':
+        return ['command:systemctl get-default']
+    if subcommand in ('is-active', 'is-enabled', 'is-failed', 'status', 'show', 'cat', 'list-unit-files'):
+        units = [arg for arg in args[args.index(subcommand) + 1:] if not arg.startswith('-')]
+        if units:
+            return [f"command:{UNIT_PROPERTIES} {shlex.quote(unit)}" for unit in units]
+    return [VOLATILE]
+
+
+# Command (basename) -> function(args) returning its input specs
+COMMAND_INPUTS = {
+    'auditctl': constant('command:auditctl -l'),
+    'sysctl': sysctl_inputs,
+    'systemd-sysctl': constant(*SYSCTL_CONFIG),
+    'systemctl': systemctl_inputs,
+    'find': find_inputs,
+    'stat': read_paths('stat'),
+    'ls': read_paths('file'),
+    'dnf': constant('file:/var/lib/rpm'),
+    'yum': constant('file:/var/lib/rpm'),
+    'rpm': constant('file:/var/lib/rpm'),
+    'mount': constant('file:/proc/self/mountinfo'),
+    'findmnt': constant('file:/proc/self/mountinfo'),
+    'df': constant('file:/proc/self/mountinfo'),
+    'lsblk': constant('file:/proc/self/mountinfo'),
+    'sshd': constant(*SSHD_CONFIG),
+    'gsettings': constant(*DCONF),
+    'grubby': constant(*BOOTLOADER),
+    'getenforce': constant(*SELINUX),
+    'sestatus': constant(*SELINUX),
+    'update-crypto-policies': constant(*CRYPTO_POLICY),
+    'fips-mode-setup': constant(*CRYPTO_POLICY),
+    'firewall-cmd': constant('file:/etc/firewalld/*', 'file:/etc/firewalld/zones/*',
+                             'command:firewall-cmd --list-all-zones'),
+    'postconf': constant('file:/etc/postfix/main.cf', 'file:/etc/postfix/master.cf'),
+    'usbguard': constant('file:/etc/usbguard/*', 'command:usbguard list-rules'),
+    'pwck': constant(*ACCOUNTS),
+    'chage': constant(*ACCOUNTS),
+    'uname': constant('fact:kernel'),
+    'hostname': constant('fact:hostname'),
+    'hostnamectl': constant('fact:hostname'),
+    'echo': constant(),
+}
+
+for _reader in ('cat', 'more', 'less', 'head', 'tail', 'cut', 'sort', 'uniq', 'wc', 'tr'):
+    COMMAND_INPUTS[_reader] = read_paths('file')
+for _reader in ('grep', 'egrep', 'fgrep', 'awk', 'sed'):
+    COMMAND_INPUTS[_reader] = read_paths('file', pattern_first=True)
+
+
+def derive_inputs(check_content):
+    """
+    Input specs of a rule from the '$ command' lines of its Check Content.
+
+    Returns:
+        list of specs in first-use order; [VOLATILE] when the rule cannot be fingerprinted
+    """
+    specs = OrderedDict()
+    commands = [line.strip()[2:] for line in (check_content or '').splitlines() if line.strip().startswith('$ ')]
+    if not commands:
+        return [VOLATILE]
+    for line in commands:
+        if '$(' in line or '`' in line:
+            return [VOLATILE]
+        for args in command_stages(line):
+            handler = COMMAND_INPUTS.get(os.path.basename(args[0]))
+            if handler is None:
+                return [VOLATILE]
+            for spec in handler(args):
+                kind, _, path = spec.partition(':')
+                if spec == VOLATILE or (kind in ('file', 'stat', 'tree') and UNFINGERPRINTABLE_PATHS.match(path)):
+                    return [VOLATILE]
+                specs[spec] = True
+    return list(specs)
+
+
+def load_overrides(path):
+    """Per-rule input overrides: {rule: [spec, ...]}"""
+    with open(path) as f:
+        overrides = json.load(f)
+    for rule, specs in overrides.items():
+        for spec in specs:
+            if spec != VOLATILE and spec.partition(':')[0] not in KINDS:
+                raise ValueError(f"{path}: {rule}: unknown input '{spec}'")
+    return overrides
+
+
+def rule_inputs(record, overrides=None):
+    """Input specs of a benchmark record, from the overrides first"""
+    for key in ('group_id', 'stig_id'):
+        rule = stig_catalog.field(record, stig_catalog.FIELD_KEYS[key])
+        if overrides and rule in overrides:
+            return list(overrides[rule])
+    return derive_inputs(stig_catalog.field(record, stig_catalog.LONG_FIELDS['check_content']))
+
+
+################################################################################
+# FINGERPRINTS
+################################################################################
+
+def _metadata(st, times=False):
+    fields = [stat.S_IFMT(st.st_mode), stat.S_IMODE(st.st_mode), st.st_uid, st.st_gid]
+    if times:
+        fields += [st.st_size, st.st_mtime_ns]
+    return ' '.join(str(f) for f in fields)
+
+
+def _expand(pattern):
+    return sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+
+
+class InputProbe(object):
+    """
+    Digests of input specs on this host.
+
+    Each spec is digested once per probe, so inputs shared by many rules
+    (auditctl -l, the rpm database, /proc/self/mountinfo) are read once per
+    scan. A digest of None means the input could not be read reliably (a
+    command timed out); rules reading it are evaluated again.
+    """
+
+    def __init__(self, timeout=COMMAND_TIMEOUT):
+        self.timeout = timeout
+        self.cache = {}
+
+    def digest(self, spec):
+        if spec not in self.cache:
+            kind, _, value = spec.partition(':')
+            reader = getattr(self, f"_{kind}", None) if kind in KINDS else None
+            data = reader(value) if reader else None
+            self.cache[spec] = hashlib.sha256(data).hexdigest()[:16] if data is not None else None
+        return self.cache[spec]
+
+    def fingerprint(self, specs, extra=()):
+        """
+        Fingerprint of a rule's inputs.
+
+        Args:
+            extra: further strings it depends on (the check script digest)
+
+        Returns:
+            tuple: (fingerprint or None when volatile/unreadable, OrderedDict of spec -> digest)
+        """
+        digests = OrderedDict((spec, self.digest(spec)) for spec in specs)
+        if not specs or any(d is None for d in digests.values()):
+            return None, digests
+        h = hashlib.sha256()
+        for item in list(extra) + [f"{spec}={digest}" for spec, digest in sorted(digests.items())]:
+            h.update(item.encode('utf-8') + b'\n')
+        return h.hexdigest()[:32], digests
+
+    def _file(self, pattern):
+        parts = []
+        for path in _expand(pattern):
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                parts.append(f"{path} {e.errno}")
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                entries = []
+                try:
+                    for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                        entries.append(f"{entry.name} {_metadata(entry.stat(follow_symlinks=False), times=True)}")
+                except OSError as e:
+                    entries.append(str(e.errno))
+                parts.append(f"{path} {_metadata(st)}\n" + '\n'.join(entries))
+            elif stat.S_ISREG(st.st_mode) and st.st_size <= MAX_FILE_SIZE:
+                try:
+                    with open(path, 'rb') as f:
+                        content = hashlib.sha256(f.read()).hexdigest()
+                except OSError as e:
+                    content = f"unreadable {e.errno}"
+                parts.append(f"{path} {_metadata(st)} {content}")
+            else:
+                parts.append(f"{path} {_metadata(st, times=True)}")
+        return '\n'.join(parts).encode('utf-8')
+
+    def _stat(self, pattern):
+        parts = []
+        for path in _expand(pattern):
+            try:
+                st = os.lstat(path)
+                link = os.readlink(path) if stat.S_ISLNK(st.st_mode) else ''
+                parts.append(f"{path} {_metadata(st)} {link}")
+            except OSError as e:
+                parts.append(f"{path} {e.errno}")
+        return '\n'.join(parts).encode('utf-8')
+
+    def _tree(self, pattern):
+        h = hashlib.sha256()
+        for root in _expand(pattern):
+            try:
+                h.update(f"{root} {_metadata(os.lstat(root))}\n".encode('utf-8'))
+            except OSError as e:
+                h.update(f"{root} {e.errno}\n".encode('utf-8'))
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                for name in dirnames + sorted(filenames):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        h.update(f"{path} {_metadata(os.lstat(path))}\n".encode('utf-8', 'surrogateescape'))
+                    except OSError:
+                        h.update(f"{path} gone\n".encode('utf-8', 'surrogateescape'))
+        return h.digest()
+
+    def _sysctl(self, key):
+        try:
+            with open('/proc/sys/' + key.replace('.', '/'), 'rb') as f:
+                return f.read()
+        except OSError as e:
+            return f"unavailable {e.errno}".encode('utf-8')
+
+    def _command(self, command):
+        try:
+            proc = subprocess.run(shlex.split(command), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                  stdin=subprocess.DEVNULL, timeout=self.timeout)
+        except FileNotFoundError:
+            return b'not installed'
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return f"{proc.returncode}\n".encode('utf-8') + proc.stdout
+
+    def _fact(self, name):
+        if name == 'kernel':
+            return host_platform.release().encode('utf-8')
+        if name == 'hostname':
+            return socket.getfqdn().encode('utf-8')
+        if name == 'boot':
+            return self._sysctl('kernel.random.boot_id')
+        return None
+
+
+################################################################################
+# CLI
+################################################################################
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Show the inputs fingerprinted for each rule of a platform',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--platform', required=True, help='Platform (checks/ directory name, e.g. rhel_9_v2r5)')
+    parser.add_argument('--benchmark', help='Benchmark JSON (default: the platform\'s *_checks.json)')
+    parser.add_argument('--inputs', help='Per-rule input overrides (JSON)')
+    parser.add_argument('--rule', action='append', help='Only this Vuln ID or STIG ID (may be repeated)')
+    parser.add_argument('--volatile', action='store_true', help='Only list the rules that run on every scan')
+    parser.add_argument('--digest', action='store_true', help='Digest each input on this host')
+    args = parser.parse_args()
+
+    records = checklist_export.load_benchmark(args.platform, args.benchmark)
+    if not records:
+        print(f"ERROR: no benchmark found for {args.platform}")
+        return 3
+    try:
+        overrides = load_overrides(args.inputs) if args.inputs else None
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    probe = InputProbe()
+    volatile = shown = 0
+    for record in records:
+        group_id = stig_catalog.field(record, stig_catalog.FIELD_KEYS['group_id'])
+        stig_id = stig_catalog.field(record, stig_catalog.FIELD_KEYS['stig_id'])
+        if args.rule and group_id not in args.rule and stig_id not in args.rule:
+            continue
+        specs = rule_inputs(record, overrides)
+        shown += 1
+        volatile += specs == [VOLATILE]
+        if args.volatile and specs != [VOLATILE]:
+            continue
+        print(f"{group_id} {stig_id}")
+        for spec in specs:
+            digest = f"  {probe.digest(spec) or '-':<16}" if args.digest else ''
+            print(f"   {digest} {spec}")
+    print(f"\n{volatile} of {shown} rules volatile")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Parallel generation driver
+Regenerates every platform's check scripts at once instead of running the
+generators one after another.
+
+Generators are discovered from the repository: every generate_*.py and
+implement_*.py that takes its rule list through generation_manifest.shard().
+Each one is split into shards (STIG_SHARD=index/count), and every shard runs
+as its own interpreter on a pool of CPU-count workers, so a full regeneration
+is bound by CPU count rather than by the slowest serial chain. The implement_*
+passes patch scripts the generators write, so they start once every generator
+has finished. Generators whose source is identical (the same script saved
+under two names) run once.
+
+Writes go through the generation manifest, so shards never touch files whose
+rule and template are unchanged; --force and --changes are passed on as
+STIG_FORCE_REGENERATE and STIG_CHANGES.
+
+Usage:
+    python3 run_generators.py
+    python3 run_generators.py --list
+    python3 run_generators.py rhel ws2019 --workers 8 --shards 4
+    python3 run_generators.py --changes ol8_v2r2_to_v2r5.json
+    python3 run_generators.py --force --json generation_timings.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+PHASES = (
+    ('generate', 'generate_*.py'),
+    ('implement', 'implement_*.py'),
+)
+
+SHARD_MARKER = 'generation_manifest.shard('
+
+SUMMARY_PATTERN = re.compile(r'(\d+) written, (\d+) unchanged')
+
+
+def platform_name(script):
+    """Short platform label of a generator (generate_all_ws2019_checks.py -> ws2019)"""
+    name = Path(script).stem
+    for prefix in ('generate_all_', 'generate_', 'implement_'):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    for suffix in ('_checks', '_stigs'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+
+def discover_generators(root=REPO_ROOT):
+    """
+    Find the shard-aware generators, in phase order.
+
+    Returns:
+        tuple: (list of (phase, script path), list of (script path, original path) duplicates)
+    """
+    generators = []
+    duplicates = []
+    seen = {}
+    for phase, pattern in PHASES:
+        for script in sorted(Path(root).glob(pattern)):
+            source = script.read_bytes()
+            if SHARD_MARKER.encode('utf-8') not in source:
+                continue
+            digest = hashlib.sha1(source).hexdigest()
+            if digest in seen:
+                duplicates.append((script, seen[digest]))
+                continue
+            seen[digest] = script
+            generators.append((phase, script))
+    return generators, duplicates
+
+
+def run_shard(script, index, count, env, timeout=None):
+    """Run one shard of a generator and capture its output"""
+    shard_env = dict(env)
+    shard_env['STIG_SHARD'] = f"{index}/{count}"
+    start = time.monotonic()
+    try:
+        proc = subprocess.run(
+            [sys.executable, str(script)],
+            cwd=str(REPO_ROOT),
+            env=shard_env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            timeout=timeout
+        )
+        returncode, output = proc.returncode, proc.stdout.decode('utf-8', 'replace')
+    except subprocess.TimeoutExpired as e:
+        returncode = None
+        output = (e.stdout or b'').decode('utf-8', 'replace') + f"\nTimed out after {timeout}s\n"
+    written = unchanged = 0
+    for match in SUMMARY_PATTERN.finditer(output):
+        written += int(match.group(1))
+        unchanged += int(match.group(2))
+    return {
+        'index': index,
+        'start': start,
+        'end': time.monotonic(),
+        'returncode': returncode,
+        'written': written,
+        'unchanged': unchanged,
+        'output': output,
+    }
+
+
+def run_phase(generators, shards, workers, env, timeout=None, verbose=False):
+    """Run every shard of a phase's generators on the worker pool"""
+    results = OrderedDict((script, []) for script in generators)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for index in range(shards):
+            for script in generators:
+                futures[executor.submit(run_shard, script, index, shards, env, timeout)] = script
+        for future in as_completed(futures):
+            script = futures[future]
+            result = future.result()
+            results[script].append(result)
+            if verbose:
+                print(f"--- {script.name} [{result['index']}/{shards}] ---")
+                print(result['output'].rstrip())
+            if len(results[script]) == shards:
+                print(f"  {format_timing(script, results[script])}")
+    return results
+
+
+def summarize(script, phase, shard_results):
+    """Per-platform timing of a generator's shards"""
+    failed = [r for r in shard_results if r['returncode'] != 0]
+    return OrderedDict([
+        ('platform', platform_name(script)),
+        ('script', script.name),
+        ('phase', phase),
+        ('shards', len(shard_results)),
+        ('wall_seconds', round(max(r['end'] for r in shard_results) - min(r['start'] for r in shard_results), 3)),
+        ('busy_seconds', round(sum(r['end'] - r['start'] for r in shard_results), 3)),
+        ('written', sum(r['written'] for r in shard_results)),
+        ('unchanged', sum(r['unchanged'] for r in shard_results)),
+        ('failed_shards', len(failed)),
+    ])
+
+
+def format_timing(script, shard_results):
+    summary = summarize(script, '', shard_results)
+    status = f"FAILED ({summary['failed_shards']} shards)" if summary['failed_shards'] else 'ok'
+    return (f"{summary['platform']:<30} {summary['wall_seconds']:7.2f}s wall {summary['busy_seconds']:7.2f}s busy  "
+            f"{summary['written']:5d} written {summary['unchanged']:5d} unchanged  {status}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Run all platform generators in parallel',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('platforms', nargs='*', help='Only generators whose platform or script name contains one of these')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: CPU count)')
+    parser.add_argument('--shards', type=int, help='Shards per generator (default: worker count)')
+    parser.add_argument('--force', action='store_true', help='Rewrite every script (STIG_FORCE_REGENERATE)')
+    parser.add_argument('--changes', help='Only regenerate the added and changed rules of a stig_diff.py change list')
+    parser.add_argument('--timeout', type=int, help='Seconds before a shard is abandoned')
+    parser.add_argument('--list', action='store_true', help='List the discovered generators and exit')
+    parser.add_argument('--json', metavar='FILE', help='Write the per-platform timings as JSON')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print every shard\'s output')
+    args = parser.parse_args()
+
+    generators, duplicates = discover_generators()
+    if args.platforms:
+        generators = [(phase, script) for phase, script in generators
+                      if any(p in script.stem for p in args.platforms)]
+
+    if args.list:
+        for phase, script in generators:
+            print(f"{phase:<10} {platform_name(script):<30} {script.name}")
+        for script, original in duplicates:
+            print(f"{'skipped':<10} {platform_name(script):<30} {script.name} (identical to {original.name})")
+        return 0
+
+    if not generators:
+        print("No generators matched")
+        return 1
+
+    workers = max(1, args.workers)
+    shards = max(1, args.shards or workers)
+    env = dict(os.environ)
+    if args.force:
+        env['STIG_FORCE_REGENERATE'] = '1'
+    if args.changes:
+        env['STIG_CHANGES'] = str(Path(args.changes).resolve())
+
+    for script, original in duplicates:
+        print(f"Skipping {script.name}: identical to {original.name}")
+
+    started = time.monotonic()
+    summaries = []
+    failures = []
+    for phase, _ in PHASES:
+        scripts = [script for p, script in generators if p == phase]
+        if not scripts:
+            continue
+        print(f"\n{phase.upper()}: {len(scripts)} generators x {shards} shards on {workers} workers")
+        results = run_phase(scripts, shards, workers, env, args.timeout, args.verbose)
+        for script, shard_results in results.items():
+            summaries.append(summarize(script, phase, shard_results))
+            for result in shard_results:
+                if result['returncode'] != 0:
+                    failures.append((script, result))
+    elapsed = time.monotonic() - started
+
+    if failures:
+        print(f"\n{'='*80}")
+        print("FAILED SHARDS")
+        print(f"{'='*80}")
+        for script, result in failures:
+            print(f"--- {script.name} [{result['index']}/{shards}] exit {result['returncode']} ---")
+            print('\n'.join(result['output'].rstrip().splitlines()[-20:]))
+
+    busy = sum(s['busy_seconds'] for s in summaries)
+    print(f"\n{'='*86}")
+    print(f"{'Platform':<30} {'Phase':<10} {'Wall':>8} {'Busy':>8} {'Written':>8} {'Unchanged':>10}")
+    print(f"{'-'*86}")
+    for s in sorted(summaries, key=lambda s: -s['wall_seconds']):
+        flag = '  FAILED' if s['failed_shards'] else ''
+        print(f"{s['platform']:<30} {s['phase']:<10} {s['wall_seconds']:7.2f}s {s['busy_seconds']:7.2f}s "
+              f"{s['written']:8d} {s['unchanged']:10d}{flag}")
+    print(f"{'-'*86}")
+    print(f"Total: {elapsed:.2f}s wall, {busy:.2f}s busy across {workers} workers "
+          f"({sum(s['written'] for s in summaries)} written, {sum(s['unchanged'] for s in summaries)} unchanged)")
+
+    if args.json:
+        report = OrderedDict([
+            ('generated', datetime.now().strftime('%Y-%m-%dT%H:%M:%S')),
+            ('workers', workers),
+            ('shards', shards),
+            ('wall_seconds', round(elapsed, 3)),
+            ('platforms', summaries),
+        ])
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Timings written to {args.json}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
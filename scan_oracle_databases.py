@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Multi-target Oracle Database 19c STIG scanner
+Runs the full Oracle Database 19c rule set against many databases concurrently.
+
+Each rule script is executed with ORACLE_CONNECT set to the target's connect
+descriptor. Every SQL*Plus session counts against a bounded connection pool,
+and new sessions are rate limited per listener so large estates never exceed
+listener connection rate limits. Results are written per database, or with
+--results-db recorded in the scan result database (scan_results.py) in
+batches instead of one JSON file per rule.
+
+Targets file format (one target per line, '#' starts a comment):
+    PRODDB1                                   # TNS alias
+    PRODDB2=dbhost2:1521/PRODDB2.example.com  # name=EZConnect descriptor
+    PRODDB3=(DESCRIPTION=(ADDRESS=(PROTOCOL=TCP)(HOST=db3)(PORT=1521))
+            (CONNECT_DATA=(SERVICE_NAME=PRODDB3)))
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import scan_results
+
+DEFAULT_CHECKS_DIR = Path(__file__).parent / 'checks' / 'database' / 'oracle_database_19c_v1r2'
+
+# O19C-*.sh scripts honour ORACLE_CONNECT; the V-*.sh variants only use ORACLE_SID
+DEFAULT_PATTERN = 'O19C-*.sh'
+
+STATUS_BY_EXIT_CODE = {
+    0: 'NotAFinding',
+    1: 'Open',
+    2: 'Not_Reviewed',
+    3: 'ERROR',
+}
+
+
+class ConnectionPool:
+    """Bounded pool of database sessions with per-listener connect rate limiting"""
+
+    def __init__(self, max_connections, connect_rate=0.0):
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.min_interval = 1.0 / connect_rate if connect_rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_connect = defaultdict(float)
+
+    def _wait_for_rate_limit(self, listener):
+        """Block until a new session may be opened against the listener"""
+        if not self.min_interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_connect[listener])
+            self.next_connect[listener] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def acquire(self, listener):
+        self.slots.acquire()
+        self._wait_for_rate_limit(listener)
+
+    def release(self):
+        self.slots.release()
+
+
+def parse_targets(lines):
+    """Parse target lines into a list of {'name', 'connect'} dicts"""
+    targets = []
+    buffer = ''
+
+    for raw in lines:
+        line = raw.split('#', 1)[0].strip()
+        if not line:
+            continue
+        buffer = f"{buffer} {line}".strip() if buffer else line
+        # Parenthesised descriptors may span several lines
+        if buffer.count('(') > buffer.count(')'):
+            continue
+
+        if '=' in buffer and not buffer.startswith('('):
+            name, connect = buffer.split('=', 1)
+            name, connect = name.strip(), connect.strip()
+        else:
+            name, connect = buffer, buffer
+        targets.append({'name': name, 'connect': connect})
+        buffer = ''
+
+    if buffer:
+        raise ValueError(f"Unterminated connect descriptor: {buffer}")
+
+    return targets
+
+
+def target_dir_name(name):
+    """Make a filesystem-safe directory name for a target"""
+    safe = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_')
+    return safe or 'target'
+
+
+def listener_key(connect):
+    """Identify the listener a connect descriptor resolves to"""
+    host = re.search(r'HOST\s*=\s*([^)\s]+)', connect, re.IGNORECASE)
+    if host:
+        port = re.search(r'PORT\s*=\s*(\d+)', connect, re.IGNORECASE)
+        return f"{host.group(1).lower()}:{port.group(1) if port else '1521'}"
+
+    # EZConnect: [//]host[:port][/service]
+    ez = re.match(r'^(?://)?([^:/\s]+)(?::(\d+))?/', connect)
+    if ez:
+        return f"{ez.group(1).lower()}:{ez.group(2) or '1521'}"
+
+    # TNS alias - resolved by the client, rate limit per alias
+    return connect.lower()
+
+
+def discover_rules(checks_dir, pattern):
+    """Find rule scripts and note which of them open a database session"""
+    rules = []
+    for script in sorted(Path(checks_dir).glob(pattern)):
+        content = script.read_text(encoding='utf-8', errors='ignore')
+        rules.append({
+            'script': script,
+            'rule': script.stem,
+            'uses_connection': 'sqlplus' in content,
+        })
+    return rules
+
+
+def run_rule(rule, target, pool, output_dir, timeout, keep_json=True):
+    """Run one rule script against one target database (keep_json=False: return its record instead)"""
+    result_file = output_dir / (f"{rule['rule']}.json" if keep_json else f".{rule['rule']}.json")
+    env = dict(os.environ)
+    env['ORACLE_CONNECT'] = target['connect']
+    env.pop('ORACLE_SID', None)
+
+    if rule['uses_connection']:
+        pool.acquire(target['listener'])
+
+    try:
+        proc = subprocess.run(
+            ['bash', str(rule['script']), '--output-json', str(result_file)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            env=env,
+            timeout=timeout
+        )
+        exit_code = proc.returncode
+        output = proc.stdout.decode('utf-8', errors='replace')
+    except subprocess.TimeoutExpired:
+        exit_code = 3
+        output = f"Check timed out after {timeout} seconds"
+    finally:
+        if rule['uses_connection']:
+            pool.release()
+
+    status = STATUS_BY_EXIT_CODE.get(exit_code, 'ERROR')
+
+    outcome = {'target': target['name'], 'rule': rule['rule'], 'status': status, 'exit_code': exit_code}
+    written = result_file.exists() and result_file.stat().st_size > 0
+
+    record = None
+    if written and not keep_json:
+        try:
+            record = scan_results.load_result_file(result_file)[0]
+        except (OSError, ValueError, IndexError):
+            pass
+        result_file.unlink()
+
+    # Scripts that exit before writing their JSON still get a result record
+    if record is None and not (written and keep_json):
+        record = {
+            'rule': rule['rule'],
+            'status': status,
+            'finding_details': output.strip()[-2000:],
+            'exit_code': exit_code,
+            'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+        }
+    if keep_json:
+        if not written:
+            result_file.write_text(json.dumps(record, indent=2))
+    else:
+        outcome['record'] = dict(record, exit_code=exit_code)
+
+    return outcome
+
+
+def scan_targets(targets, rules, output_root, max_connections, connect_rate, timeout, writer=None, platform=None):
+    """Scan every target with every rule through a shared connection pool (writer: scan result batches)"""
+    pool = ConnectionPool(max_connections, connect_rate)
+    results = defaultdict(list)
+
+    for target in targets:
+        target['listener'] = listener_key(target['connect'])
+        target['output_dir'] = output_root / target_dir_name(target['name'])
+        target['output_dir'].mkdir(parents=True, exist_ok=True)
+
+    # Workers beyond the pool size only run local (non-SQL) rules
+    with ThreadPoolExecutor(max_workers=max_connections * 2) as executor:
+        futures = [
+            executor.submit(run_rule, rule, target, pool, target['output_dir'], timeout, writer is None)
+            for target in targets
+            for rule in rules
+        ]
+        for i, future in enumerate(as_completed(futures), 1):
+            outcome = future.result()
+            if writer is not None:
+                writer.add(outcome['target'], platform, outcome.pop('record'), rule=outcome['rule'])
+            results[outcome['target']].append(outcome)
+            if i % 100 == 0 or i == len(futures):
+                print(f"  Progress: {i}/{len(futures)} rule executions complete")
+
+    for target in targets:
+        outcomes = sorted(results[target['name']], key=lambda r: r['rule'])
+        counts = defaultdict(int)
+        for outcome in outcomes:
+            counts[outcome['status']] += 1
+        summary = {
+            'target': target['name'],
+            'connect': target['connect'],
+            'listener': target['listener'],
+            'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'total_rules': len(outcomes),
+            'status_counts': dict(counts),
+            'results': outcomes,
+        }
+        (target['output_dir'] / 'summary.json').write_text(json.dumps(summary, indent=2))
+
+    return results
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Scan many Oracle Database 19c instances with the full STIG rule set',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--targets', help='File with one connect descriptor per line')
+    parser.add_argument('--target', action='append', default=[],
+                        help='Connect descriptor (name=descriptor allowed); may be repeated')
+    parser.add_argument('--checks-dir', default=str(DEFAULT_CHECKS_DIR),
+                        help='Directory containing the rule scripts')
+    parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                        help=f'Glob selecting rule scripts (default: {DEFAULT_PATTERN})')
+    parser.add_argument('--output-dir', default='results/oracle_database_19c',
+                        help='Directory for per-database results')
+    parser.add_argument('--max-connections', type=int, default=4,
+                        help='Maximum concurrent database sessions (default: 4)')
+    parser.add_argument('--connect-rate', type=float, default=0.0,
+                        help='Maximum new sessions per second per listener (default: unlimited)')
+    parser.add_argument('--timeout', type=int, default=300,
+                        help='Per-rule timeout in seconds (default: 300)')
+    parser.add_argument('--results-db', help='Record results in this scan result database instead of per-rule JSON')
+    parser.add_argument('--scan-id', help='Scan ID in the result database (default: a new scan)')
+    parser.add_argument('--platform', help='Platform recorded in the result database (default: checks directory name)')
+    args = parser.parse_args()
+
+    if args.max_connections < 1:
+        parser.error('--max-connections must be at least 1')
+
+    lines = list(args.target)
+    if args.targets:
+        try:
+            lines.extend(Path(args.targets).read_text().splitlines())
+        except OSError as e:
+            print(f"ERROR: Cannot read targets file: {e}")
+            return 3
+
+    try:
+        targets = parse_targets(lines)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    if not targets:
+        print("ERROR: No targets given (use --targets or --target)")
+        return 3
+
+    names = [t['name'] for t in targets]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        print(f"ERROR: Duplicate target names: {', '.join(duplicates)}")
+        return 3
+
+    rules = discover_rules(args.checks_dir, args.pattern)
+    if not rules:
+        print(f"ERROR: No rule scripts matching {args.pattern} in {args.checks_dir}")
+        return 3
+
+    output_root = Path(args.output_dir)
+
+    print("=" * 80)
+    print("Oracle Database 19c Multi-Target STIG Scan")
+    print("=" * 80)
+    print(f"Targets: {len(targets)}")
+    print(f"Rules per target: {len(rules)} ({sum(r['uses_connection'] for r in rules)} open a session)")
+    print(f"Connection pool: {args.max_connections} sessions, "
+          f"{args.connect_rate or 'unlimited'} connects/sec per listener")
+    print()
+
+    store = writer = None
+    if args.results_db:
+        try:
+            store, writer = scan_results.open_writer(args.results_db, 'oracle_database', args.scan_id,
+                                                     {'targets': names, 'pattern': args.pattern})
+        except scan_results.ResultStoreError as e:
+            print(f"ERROR: {e}")
+            return 3
+
+    started = time.monotonic()
+    try:
+        results = scan_targets(targets, rules, output_root, args.max_connections, args.connect_rate,
+                               args.timeout, writer, args.platform or Path(args.checks_dir).resolve().name)
+    finally:
+        if writer is not None:
+            scan_results.close_writer(store, writer)
+    elapsed = time.monotonic() - started
+
+    print()
+    print(f"{'Target':<30} {'Pass':>6} {'Fail':>6} {'Review':>8} {'Error':>6}")
+    print("-" * 60)
+    for target in targets:
+        counts = defaultdict(int)
+        for outcome in results[target['name']]:
+            counts[outcome['status']] += 1
+        print(f"{target['name'][:30]:<30} {counts['NotAFinding']:>6} {counts['Open']:>6} "
+              f"{counts['Not_Reviewed']:>8} {counts['ERROR']:>6}")
+    print("-" * 60)
+    print(f"Completed in {elapsed:.1f}s - results in {output_root}/<target>/")
+    if writer is not None:
+        print(f"{writer.count} results recorded as scan {writer.scan_id} in {args.results_db}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
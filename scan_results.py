@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Scan result store
+Keeps check results in one SQLite database instead of one small JSON file per
+rule and target, so aggregating a fleet run is a query rather than a walk over
+hundreds of thousands of files.
+
+Results are keyed by scan, host, platform and rule. The host is the assessed
+target (a machine, or the database, site or domain a multi-target runner
+scans); the platform is the STIG the rule belongs to (the checks/ directory
+name, e.g. rhel_9_v2r5). Status is normalized to the checklist values
+(NotAFinding, Open, Not_Reviewed, Not_Applicable, ERROR) and indexed together
+with severity; fields of a result without a column of their own are kept as
+JSON.
+
+The database runs in WAL mode, so reports can read while a runner writes, and
+runners write through ResultWriter, which inserts in batches of BATCH_SIZE
+results per transaction. Per-check JSON written by --output-json (and the
+per-target directories of the runners) can be imported with --import.
+
+Results may carry a fingerprint of the rule's inputs (host_scan.py); a result
+copied forward from an earlier scan because its fingerprint did not change
+records the scan that evaluated it in carried_from, and keeps that scan's
+checked_at.
+
+Usage:
+    python3 scan_results.py --import results/oracle_database_19c --platform oracle_database_19c_v1r2
+    python3 scan_results.py --import /tmp/V-257777.json --host web01 --platform rhel_9_v2r5
+    python3 scan_results.py --scans
+    python3 scan_results.py --summary --scan oracle-20250101T020000Z-3f2a1c
+    python3 scan_results.py --status Open --severity high --json
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+RESULTS_FILE = 'scan_results.db'
+SCHEMA_VERSION = 2
+
+BATCH_SIZE = 1000
+
+NOT_A_FINDING = 'NotAFinding'
+OPEN = 'Open'
+NOT_REVIEWED = 'Not_Reviewed'
+NOT_APPLICABLE = 'Not_Applicable'
+ERROR = 'ERROR'
+
+STATUSES = (NOT_A_FINDING, OPEN, NOT_REVIEWED, NOT_APPLICABLE, ERROR)
+
+# Status spellings used by the check scripts and runners (lowercased, without spaces/underscores)
+STATUS_ALIASES = {
+    'notafinding': NOT_A_FINDING,
+    'pass': NOT_A_FINDING,
+    'passed': NOT_A_FINDING,
+    'compliant': NOT_A_FINDING,
+    'open': OPEN,
+    'fail': OPEN,
+    'failed': OPEN,
+    'finding': OPEN,
+    'noncompliant': OPEN,
+    'notreviewed': NOT_REVIEWED,
+    'notchecked': NOT_REVIEWED,
+    'manualreview': NOT_REVIEWED,
+    'notimplemented': NOT_REVIEWED,
+    'notapplicable': NOT_APPLICABLE,
+    'na': NOT_APPLICABLE,
+    'n/a': NOT_APPLICABLE,
+    'error': ERROR,
+}
+
+# Exit code convention of the runners (scan_oracle_databases.py)
+STATUS_BY_EXIT_CODE = {
+    0: NOT_A_FINDING,
+    1: OPEN,
+    2: NOT_REVIEWED,
+    3: ERROR,
+}
+
+# Result fields -> keys used by the check scripts' JSON
+FIELD_KEYS = OrderedDict([
+    ('vuln_id', ('vuln_id', 'Vuln ID', 'Group ID')),
+    ('stig_id', ('stig_id', 'STIG ID')),
+    ('severity', ('severity', 'Severity')),
+    ('status', ('status', 'Status')),
+    ('finding_details', ('finding_details', 'Finding Details', 'details', 'message')),
+    ('comments', ('comments', 'Comments')),
+    ('exit_code', ('exit_code',)),
+    ('checked_at', ('timestamp', 'checked_at')),
+    ('fingerprint', ('fingerprint',)),
+    ('carried_from', ('carried_from',)),
+])
+
+# Shapes of a bare rule name (script stem or fallback 'rule' field)
+VULN_ID_RE = re.compile(r'^V-\d+$')
+STIG_ID_RE = re.compile(r'^[A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*-\d{5,6}$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id TEXT PRIMARY KEY,
+    source TEXT,
+    started TEXT,
+    finished TEXT,
+    info TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    scan_id TEXT NOT NULL REFERENCES scans(scan_id),
+    host TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    vuln_id TEXT,
+    stig_id TEXT,
+    severity TEXT,
+    status TEXT,
+    finding_details TEXT,
+    comments TEXT,
+    exit_code INTEGER,
+    checked_at TEXT,
+    fingerprint TEXT,
+    carried_from TEXT,
+    data TEXT,
+    PRIMARY KEY (scan_id, host, platform, rule)
+);
+CREATE INDEX IF NOT EXISTS results_status ON results(status, severity);
+CREATE INDEX IF NOT EXISTS results_severity ON results(severity, status);
+CREATE INDEX IF NOT EXISTS results_host ON results(host, platform);
+CREATE INDEX IF NOT EXISTS results_vuln_id ON results(vuln_id);
+CREATE INDEX IF NOT EXISTS results_stig_id ON results(stig_id);
+"""
+
+COLUMNS = ('scan_id', 'host', 'platform', 'rule', 'vuln_id', 'stig_id', 'severity', 'status',
+           'finding_details', 'comments', 'exit_code', 'checked_at', 'fingerprint', 'carried_from', 'data')
+
+# Columns added after schema version 1
+MIGRATIONS = OrderedDict([
+    (2, ("ALTER TABLE results ADD COLUMN fingerprint TEXT",
+         "ALTER TABLE results ADD COLUMN carried_from TEXT")),
+])
+
+
+class ResultStoreError(Exception):
+    """Result database cannot be opened or read"""
+
+
+def default_path():
+    """Result database path: $STIG_RESULTS_DB, else scan_results.db in the repository root"""
+    return Path(os.environ.get('STIG_RESULTS_DB') or REPO_ROOT / RESULTS_FILE)
+
+
+def new_scan_id(source='scan'):
+    """Unique, sortable scan ID (source-YYYYmmddTHHMMSSZ-xxxxxx)"""
+    return f"{source}-{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:6]}"
+
+
+def normalize_status(status, exit_code=None):
+    """Checklist status of a script's status string, falling back to its exit code"""
+    if status:
+        key = str(status).strip().lower().replace(' ', '').replace('_', '').replace('-', '')
+        if key in STATUS_ALIASES:
+            return STATUS_ALIASES[key]
+    try:
+        return STATUS_BY_EXIT_CODE.get(int(exit_code), ERROR)
+    except (TypeError, ValueError):
+        return NOT_REVIEWED if status else ERROR
+
+
+def normalize_result(record, rule=None):
+    """
+    Split a result record into its columns and the remaining data.
+
+    The rule is the record's Vuln ID, else its STIG ID, else its 'rule' field,
+    else the given fallback (e.g. the script or file name).
+
+    Returns:
+        OrderedDict: rule, vuln_id, stig_id, severity, status, finding_details,
+        comments, exit_code, checked_at and data (dict of the other fields)
+    """
+    fields = OrderedDict()
+    used = set()
+    for name, keys in FIELD_KEYS.items():
+        fields[name] = None
+        for key in keys:
+            if record.get(key) not in (None, ''):
+                fields[name] = record[key]
+                used.add(key)
+                break
+    raw_status = fields['status']
+    try:
+        fields['exit_code'] = int(fields['exit_code']) if fields['exit_code'] is not None else None
+    except (TypeError, ValueError):
+        fields['exit_code'] = None
+    fields['status'] = normalize_status(raw_status, fields['exit_code'])
+    if fields['severity']:
+        fields['severity'] = str(fields['severity']).lower()
+    for name in ('finding_details', 'comments'):
+        if isinstance(fields[name], (list, dict)):
+            fields[name] = json.dumps(fields[name], indent=2)
+    data = OrderedDict((k, v) for k, v in record.items() if k not in used)
+    if raw_status and raw_status != fields['status']:
+        data['raw_status'] = raw_status
+    rule = fields['vuln_id'] or fields['stig_id'] or record.get('rule') or rule
+    if rule and not (fields['vuln_id'] or fields['stig_id']):
+        # Runner fallbacks (script died before writing JSON) carry only the rule name
+        if VULN_ID_RE.match(str(rule)):
+            fields['vuln_id'] = str(rule)
+        elif STIG_ID_RE.match(str(rule)):
+            fields['stig_id'] = str(rule)
+    fields = OrderedDict([('rule', str(rule) if rule else None)] + list(fields.items()))
+    data.pop('rule', None)
+    fields['data'] = data
+    return fields
+
+
+def load_result_file(path):
+    """
+    Result records of a per-check JSON file.
+
+    Bash checks build their JSON with heredocs, so control characters inside
+    strings are accepted. A file holding a list yields each of its records.
+    """
+    with open(path, encoding='utf-8', errors='replace') as f:
+        data = json.loads(f.read(), strict=False, object_pairs_hook=OrderedDict)
+    if isinstance(data, dict):
+        return [data]
+    if isinstance(data, list):
+        return [record for record in data if isinstance(record, dict)]
+    return []
+
+
+def walk_result_files(root):
+    """Per-check JSON files under a directory (runner summary.json files excluded), in sorted order"""
+    root = Path(root)
+    if root.is_file():
+        yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(str(root)):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith('.json') and name != 'summary.json' and not name.startswith('.'):
+                yield Path(dirpath) / name
+
+
+class ResultStore(object):
+    """
+    Scan result database (SQLite, WAL).
+
+    Query methods return dicts of the result columns, with data decoded; they
+    iterate over the cursor, so large result sets are not held in memory.
+    """
+
+    def __init__(self, path=None, readonly=False):
+        self.path = Path(path) if path else default_path()
+        self.readonly = readonly
+        try:
+            if readonly:
+                if not self.path.is_file():
+                    raise ResultStoreError(f"{self.path}: result database not found")
+                self.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.db = sqlite3.connect(str(self.path), timeout=30)
+                self.db.execute("PRAGMA journal_mode=WAL")
+                self.db.execute("PRAGMA synchronous=NORMAL")
+                self.db.executescript(SCHEMA)
+                self._check_schema()
+        except sqlite3.Error as e:
+            raise ResultStoreError(f"{self.path}: {e}")
+        self.db.row_factory = sqlite3.Row
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check_schema(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row and int(row[0]) > SCHEMA_VERSION:
+            raise ResultStoreError(f"{self.path}: written by a newer schema (version {row[0]})")
+        if not row:
+            self.db.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+            self.db.commit()
+        elif int(row[0]) < SCHEMA_VERSION:
+            with self.db:
+                for version, statements in MIGRATIONS.items():
+                    if version > int(row[0]):
+                        for statement in statements:
+                            self.db.execute(statement)
+                self.db.execute("UPDATE meta SET value = ? WHERE key = 'schema_version'", (str(SCHEMA_VERSION),))
+
+    # ------------------------------------------------------------------ write
+
+    def begin_scan(self, source, scan_id=None, info=None):
+        """Register a scan (or reopen an existing one) and return its ID"""
+        scan_id = scan_id or new_scan_id(source)
+        with self.db:
+            self.db.execute(
+                "INSERT OR IGNORE INTO scans (scan_id, source, started, info) VALUES (?, ?, ?, ?)",
+                (scan_id, source, datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'), json.dumps(info or {})))
+        return scan_id
+
+    def finish_scan(self, scan_id):
+        with self.db:
+            self.db.execute("UPDATE scans SET finished = ? WHERE scan_id = ?",
+                            (datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'), scan_id))
+
+    def add_results(self, scan_id, rows):
+        """
+        Insert (or replace) normalized results in one transaction.
+
+        Args:
+            rows: (host, platform, normalize_result() dict) tuples
+        """
+        params = []
+        for host, platform, fields in rows:
+            if not fields['rule']:
+                continue
+            params.append((scan_id, host, platform) + tuple(
+                json.dumps(fields[c], default=str) if c == 'data' else fields[c] for c in COLUMNS[3:]))
+        with self.db:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO results ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                params)
+        return len(params)
+
+    def writer(self, scan_id, batch_size=BATCH_SIZE):
+        return ResultWriter(self, scan_id, batch_size)
+
+    def import_files(self, paths, scan_id, host=None, platform=None, batch_size=BATCH_SIZE):
+        """
+        Import per-check JSON files.
+
+        Without host/platform, a file's host is its directory name and its
+        platform the directory above (the <output-dir>/<target>/<rule>.json
+        layout of the runners).
+
+        Returns:
+            dict: {'files', 'results', 'errors': [message]}
+        """
+        report = {'files': 0, 'results': 0, 'errors': []}
+        with self.writer(scan_id, batch_size) as writer:
+            for path in paths:
+                path = Path(path)
+                try:
+                    records = load_result_file(path)
+                except (OSError, ValueError) as e:
+                    report['errors'].append(f"{path}: {e}")
+                    continue
+                report['files'] += 1
+                for record in records:
+                    writer.add(host or path.parent.name, platform or path.parent.parent.name, record,
+                               rule=path.stem if len(records) == 1 else None)
+            writer.flush()
+            report['results'] = writer.count
+        return report
+
+    # ------------------------------------------------------------------ query
+
+    def _row(self, row):
+        result = OrderedDict((key, row[key]) for key in row.keys())
+        if 'data' in result:
+            result['data'] = json.loads(result['data'] or '{}', object_pairs_hook=OrderedDict)
+        return result
+
+    def _where(self, scan_id=None, host=None, platform=None, rule=None, status=None, severity=None):
+        where, params = [], []
+        for column, value in (('scan_id', scan_id), ('host', host), ('platform', platform), ('status', status),
+                              ('severity', severity)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if rule is not None:
+            where.append("(rule = ? OR vuln_id = ? OR stig_id = ?)")
+            params.extend([rule] * 3)
+        return (" WHERE " + " AND ".join(where)) if where else '', params
+
+    def scans(self, source=None):
+        """Scans, newest first, with their result and host counts"""
+        sql = """
+            SELECT s.scan_id, s.source, s.started, s.finished, s.info,
+                   (SELECT COUNT(*) FROM results r WHERE r.scan_id = s.scan_id) AS results,
+                   (SELECT COUNT(DISTINCT host) FROM results r WHERE r.scan_id = s.scan_id) AS hosts
+            FROM scans s"""
+        params = []
+        if source:
+            sql += " WHERE s.source = ?"
+            params.append(source)
+        scans = []
+        for row in self.db.execute(sql + " ORDER BY s.started DESC, s.scan_id DESC", params):
+            scan = OrderedDict((key, row[key]) for key in row.keys())
+            scan['info'] = json.loads(scan['info'] or '{}')
+            scans.append(scan)
+        return scans
+
+    def latest_scan(self, source=None):
+        scans = self.scans(source)
+        return scans[0]['scan_id'] if scans else None
+
+    def targets(self, scan_id, host=None, platform=None):
+        """(host, platform) pairs of a scan, in order"""
+        where, params = self._where(scan_id, host, platform)
+        return [tuple(row) for row in self.db.execute(
+            f"SELECT DISTINCT host, platform FROM results{where} ORDER BY host, platform", params)]
+
+    def baseline(self, host, platform, exclude=None):
+        """
+        Most recent earlier results of a host and platform, for rescans.
+
+        Args:
+            exclude: scan ID to skip (the scan being written)
+
+        Returns:
+            tuple: (scan ID or None, {rule: result})
+        """
+        row = self.db.execute("""
+            SELECT s.scan_id FROM scans s
+            WHERE s.scan_id != ? AND EXISTS (
+                SELECT 1 FROM results r WHERE r.scan_id = s.scan_id AND r.host = ? AND r.platform = ?)
+            ORDER BY s.started DESC, s.scan_id DESC LIMIT 1""",
+            (exclude or '', host, platform)).fetchone()
+        if row is None:
+            return None, {}
+        return row[0], OrderedDict((result['rule'], result) for result in self.results(row[0], host, platform))
+
+    def results(self, scan_id=None, host=None, platform=None, rule=None, status=None, severity=None):
+        """Results matching every given criterion, ordered by scan, host, platform and rule"""
+        where, params = self._where(scan_id, host, platform, rule, status, severity)
+        cursor = self.db.execute(f"SELECT * FROM results{where} ORDER BY scan_id, host, platform, rule", params)
+        for row in cursor:
+            yield self._row(row)
+
+    def counts(self, scan_id=None, by=('host', 'platform'), **criteria):
+        """Result counts per status, grouped by the given columns"""
+        for column in by:
+            if column not in COLUMNS[:8]:
+                raise ValueError(f"cannot group by {column}")
+        where, params = self._where(scan_id, **criteria)
+        group = ', '.join(by)
+        select = f"{group}, " if by else ''
+        rows = self.db.execute(f"""
+            SELECT {select}COUNT(*) AS total,
+                   {', '.join(f"SUM(status = '{s}') AS {s}" for s in STATUSES)}
+            FROM results{where}{f' GROUP BY {group} ORDER BY {group}' if by else ''}""", params).fetchall()
+        return [OrderedDict((key, (row[key] or 0) if key in STATUSES else row[key]) for key in row.keys())
+                for row in rows]
+
+
+class ResultWriter(object):
+    """
+    Buffers results and inserts them BATCH_SIZE at a time.
+
+    Use as a context manager (the rest is flushed on exit) or call flush().
+    """
+
+    def __init__(self, store, scan_id, batch_size=BATCH_SIZE):
+        self.store = store
+        self.scan_id = scan_id
+        self.batch_size = max(1, batch_size)
+        self.pending = []
+        self.count = 0
+
+    def add(self, host, platform, record, rule=None):
+        """Queue a result record as written by a check script or runner (rule: fallback rule name)"""
+        self.pending.append((host, platform, normalize_result(record, rule)))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.count += self.store.add_results(self.scan_id, self.pending)
+            self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.flush()
+
+
+def open_writer(path, source, scan_id=None, info=None):
+    """
+    Store and batch writer for a runner's --results-db option.
+
+    Returns:
+        tuple: (ResultStore, ResultWriter); close with close_writer()
+    """
+    store = ResultStore(path)
+    scan_id = store.begin_scan(source, scan_id, info)
+    return store, store.writer(scan_id)
+
+
+def close_writer(store, writer):
+    """Flush the writer, mark its scan finished and close the store"""
+    try:
+        writer.flush()
+        store.finish_scan(writer.scan_id)
+    finally:
+        store.close()
+
+
+################################################################################
+# CLI
+################################################################################
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Store and query STIG scan results',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--db', help=f'Result database (default: $STIG_RESULTS_DB or {RESULTS_FILE})')
+    parser.add_argument('--import', dest='import_paths', action='append', default=[], metavar='PATH',
+                        help='Per-check JSON file or result directory to import (may be repeated)')
+    parser.add_argument('--scan', help='Scan ID (import: default a new scan; queries: default the latest scan)')
+    parser.add_argument('--host', help='Host (import: default each file\'s directory name)')
+    parser.add_argument('--platform', help='Platform (import: default the directory above the host directory)')
+    parser.add_argument('--rule', help='Rule, Vuln ID or STIG ID')
+    parser.add_argument('--status', choices=STATUSES, help='Result status')
+    parser.add_argument('--severity', choices=('high', 'medium', 'low'), help='Severity')
+    parser.add_argument('--scans', action='store_true', help='List the scans')
+    parser.add_argument('--summary', action='store_true', help='Status counts per host and platform')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    try:
+        store = ResultStore(args.db, readonly=not args.import_paths)
+    except ResultStoreError as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    with store:
+        if args.import_paths:
+            scan_id = store.begin_scan('import', args.scan, {'paths': args.import_paths})
+            files = (path for root in args.import_paths for path in walk_result_files(root))
+            report = store.import_files(files, scan_id, args.host, args.platform)
+            store.finish_scan(scan_id)
+            for error in report['errors']:
+                print(f"ERROR: {error}")
+            print(f"{report['results']} results from {report['files']} files -> scan {scan_id} in {store.path}")
+            return 3 if report['errors'] else 0
+
+        if args.scans:
+            scans = store.scans()
+            if args.json:
+                print(json.dumps(scans, indent=2))
+                return 0
+            for scan in scans:
+                print(f"{scan['scan_id']:<40} {scan['source']:<12} {scan['started']}  "
+                      f"{scan['hosts']:>5} hosts {scan['results']:>8} results")
+            return 0
+
+        scan_id = args.scan or store.latest_scan()
+        if scan_id is None:
+            print("No scans recorded")
+            return 1
+
+        if args.summary:
+            counts = store.counts(scan_id, host=args.host, platform=args.platform, rule=args.rule,
+                                  severity=args.severity)
+            if args.json:
+                print(json.dumps(counts, indent=2))
+                return 0
+            print(f"Scan {scan_id}")
+            print(f"{'Host':<30} {'Platform':<34} {'Total':>6} {'Pass':>6} {'Open':>6} {'Review':>7} "
+                  f"{'N/A':>5} {'Error':>6}")
+            print("-" * 106)
+            for row in counts:
+                print(f"{row['host'][:30]:<30} {row['platform'][:34]:<34} {row['total']:>6} {row[NOT_A_FINDING]:>6} "
+                      f"{row[OPEN]:>6} {row[NOT_REVIEWED]:>7} {row[NOT_APPLICABLE]:>5} {row[ERROR]:>6}")
+            return 0
+
+        results = store.results(scan_id, args.host, args.platform, args.rule, args.status, args.severity)
+        count = 0
+        if args.json:
+            print('[')
+        for result in results:
+            if args.json:
+                print((',\n' if count else '') + json.dumps(result, indent=2), end='')
+            else:
+                carried = f" (carried from {result['carried_from']})" if result.get('carried_from') else ''
+                print(f"{result['host'][:24]:<24} {result['platform'][:28]:<28} {result['rule']:<22} "
+                      f"{result['severity'] or '':<7} {result['status']}{carried}")
+            count += 1
+        if args.json:
+            print('\n]')
+        else:
+            print(f"{count} result(s) in scan {scan_id}")
+        return 0 if count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Check script metadata index
+Keeps the metadata of every check script under checks/ in one SQLite database,
+so the report and status tools query it instead of each re-reading and
+re-parsing the whole tree with its own heuristics.
+
+For every script the index holds the VULN ID, STIG ID, severity and rule title
+found in its header, its automation status (automated, manual_review,
+not_implemented, unknown), whether it needs parameters or a configuration
+file, the external tools it calls, and the implementation verdicts the status
+tools use (implemented, placeholder, not_implemented).
+
+The index is refreshed incrementally: a script whose size and modification
+time match its row is not read again, so a refresh after regenerating one
+platform only parses that platform's scripts. Bump ANALYZER_VERSION when the
+heuristics change to reparse everything.
+
+Usage:
+    python3 script_index.py
+    python3 script_index.py --platform rhel_9_v2r5 --status not_implemented
+    python3 script_index.py --tool sqlplus --json
+    python3 script_index.py --vuln-id V-257777
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+INDEX_FILE = 'script_index.db'
+CHECKS_DIR = 'checks'
+SCHEMA_VERSION = 1
+ANALYZER_VERSION = 1
+
+SCRIPT_SUFFIXES = ('.sh', '.ps1', '.py', '.bat')
+
+# Automation status values
+AUTOMATED = 'automated'
+MANUAL_REVIEW = 'manual_review'
+NOT_IMPLEMENTED = 'not_implemented'
+UNKNOWN = 'unknown'
+ERROR = 'error'
+
+# External tooling a script depends on -> (keywords one of which must occur in
+# the lowercased source, pattern confirming it); the keyword test skips the
+# regex for the many scripts that never mention the tool
+TOOL_PATTERNS = OrderedDict([
+    ('sqlplus', (('sqlplus',), re.compile(r'\bsqlplus\b', re.IGNORECASE))),
+    ('wlst', (('wlst',), re.compile(r'\bwlst(?:\.sh)?\b', re.IGNORECASE))),
+    ('kubectl', (('kubectl',), re.compile(r'\bkubectl\b'))),
+    ('docker', (('docker',), re.compile(r'\bdocker\s+(?:exec|inspect|info|ps|version|container|image|network)\b'))),
+    ('ssh', (('ssh',), re.compile(r'\bssh\s+-|\bparamiko\b'))),
+    ('openssl', (('openssl',), re.compile(r'\bopenssl\b'))),
+    ('apachectl', (('ctl', 'httpd -'), re.compile(r'\b(?:apachectl|apache2ctl|httpd\s+-[MSVt])\b'))),
+    ('named-checkconf', (('named-check',), re.compile(r'\bnamed-check(?:conf|zone)\b'))),
+    ('ldapsearch', (('ldapsearch',), re.compile(r'\bldapsearch\b'))),
+    ('auditctl', (('auditctl',), re.compile(r'\bauditctl\b'))),
+    ('rpm', (('rpm',), re.compile(r'\brpm\s+-q'))),
+    ('dpkg', (('dpkg',), re.compile(r'\bdpkg(?:-query)?\s+-[lsW]'))),
+    ('systemctl', (('systemctl',), re.compile(r'\bsystemctl\b'))),
+    ('sysctl', (('sysctl',), re.compile(r'\bsysctl\b'))),
+    ('jq', (('jq',), re.compile(r'\bjq\s'))),
+    ('registry', (('reg', 'get-itemproperty'), re.compile(r'Get-ItemProperty|\bwinreg\b|\breg\s+query\b', re.IGNORECASE))),
+    ('auditpol', (('auditpol',), re.compile(r'\bauditpol\b', re.IGNORECASE))),
+    ('secedit', (('secedit',), re.compile(r'\bsecedit\b', re.IGNORECASE))),
+    ('gpresult', (('gpresult',), re.compile(r'\bgpresult\b', re.IGNORECASE))),
+])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS scripts (
+    path TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    file TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    vuln_id TEXT,
+    stig_id TEXT,
+    severity TEXT,
+    rule_title TEXT,
+    automation_status TEXT NOT NULL,
+    requires_params INTEGER NOT NULL,
+    manual_review INTEGER NOT NULL,
+    implemented INTEGER NOT NULL,
+    placeholder INTEGER NOT NULL,
+    not_implemented INTEGER NOT NULL,
+    notes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scripts_platform ON scripts (category, platform);
+CREATE INDEX IF NOT EXISTS scripts_vuln ON scripts (vuln_id);
+CREATE INDEX IF NOT EXISTS scripts_stig ON scripts (stig_id);
+CREATE INDEX IF NOT EXISTS scripts_status ON scripts (automation_status);
+CREATE INDEX IF NOT EXISTS scripts_severity ON scripts (severity);
+CREATE TABLE IF NOT EXISTS script_tools (
+    path TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    PRIMARY KEY (path, tool)
+);
+CREATE INDEX IF NOT EXISTS script_tools_tool ON script_tools (tool);
+"""
+
+COLUMNS = ('path', 'category', 'platform', 'file', 'suffix', 'size', 'mtime_ns', 'vuln_id', 'stig_id',
+           'severity', 'rule_title', 'automation_status', 'requires_params', 'manual_review',
+           'implemented', 'placeholder', 'not_implemented', 'notes')
+
+
+class ScriptIndexError(Exception):
+    """Raised when the script index cannot be opened"""
+
+
+def default_path():
+    """Index path: $STIG_SCRIPT_INDEX, else script_index.db in the repository root"""
+    return Path(os.environ.get('STIG_SCRIPT_INDEX') or REPO_ROOT / INDEX_FILE)
+
+
+################################################################################
+# SCRIPT ANALYSIS
+################################################################################
+
+# Not-implemented markers, matched case-insensitively against the lowercased source
+NOT_IMPLEMENTED_MARKERS = (
+    'status="not implemented"',
+    '$status = "not implemented"',
+    'todo: implement',
+    'echo "todo:',
+    'check logic not yet implemented',
+)
+
+
+def is_manual_review(content):
+    return ('exit 2  # Manual review required' in content or
+            ('Manual review required' in content and 'exit 2' in content) or
+            ('Not_Reviewed' in content and 'EXIT_CODE=2' in content))
+
+
+def is_implemented(content):
+    """Manual review framework (exit 2) or real check logic (exit 0/1) without a TODO"""
+    if is_manual_review(content):
+        return True
+    return ('exit 0' in content or 'exit 1' in content) and 'TODO: Implement' not in content
+
+
+def is_placeholder(content):
+    """Placeholder scripts: a not-implemented exit 3, or no exit 0/1/2 at all"""
+    if 'exit 3  # Not implemented' in content or \
+       'exit 3  # ERROR - Not yet implemented' in content or \
+       'echo "ERROR: Not yet implemented"' in content or \
+       ('Write-Host "TODO:' in content and 'exit 3' in content):
+        return True
+    return not re.search(r'exit [012]', content)
+
+
+def is_not_implemented(content, lowered=None):
+    """Carries a not-implemented marker and is not a manual review check"""
+    if 'Manual review required' in content or 'Manual Review Required' in content:
+        return False
+    lowered = content.lower() if lowered is None else lowered
+    return any(marker in lowered for marker in NOT_IMPLEMENTED_MARKERS)
+
+
+def find_tools(content, lowered=None):
+    lowered = content.lower() if lowered is None else lowered
+    return [tool for tool, (keywords, pattern) in TOOL_PATTERNS.items()
+            if any(keyword in lowered for keyword in keywords) and pattern.search(content)]
+
+
+def analyze_script(content):
+    """Metadata of a check script from its source"""
+    metadata = {
+        'vuln_id': None,
+        'stig_id': None,
+        'severity': None,
+        'rule_title': None,
+        'automation_status': UNKNOWN,
+        'requires_params': False,
+        'manual_review': False,
+        'notes': [],
+    }
+
+    # Extract VULN ID
+    vuln_match = re.search(r'(?:VULN_ID|vuln_id|STIG Check:|V-)[\s=:"\']*(V-\d+)', content, re.IGNORECASE)
+    if vuln_match:
+        metadata['vuln_id'] = vuln_match.group(1)
+
+    # Extract STIG ID
+    stig_match = re.search(r'(?:STIG_ID|stig_id|STIG ID:)[\s=:"\']*([\w-]+)', content, re.IGNORECASE)
+    if stig_match:
+        metadata['stig_id'] = stig_match.group(1)
+
+    # Extract severity
+    sev_match = re.search(r'(?:SEVERITY|severity|Severity:)[\s=:"\']*(high|medium|low)', content, re.IGNORECASE)
+    if sev_match:
+        metadata['severity'] = sev_match.group(1).lower()
+
+    # Extract rule title
+    title_match = re.search(r'(?:Rule Title|rule_title|RULE_TITLE)[\s=:"\']*(.*?)(?:"|\'|\n)', content, re.IGNORECASE)
+    if title_match:
+        metadata['rule_title'] = title_match.group(1).strip()[:100]
+
+    # Determine automation status
+    if is_manual_review(content):
+        metadata['automation_status'] = MANUAL_REVIEW
+        metadata['manual_review'] = True
+        metadata['notes'].append('Requires manual verification against STIG requirements')
+    elif 'TODO: Implement' in content:
+        if 'exit 3' in content:
+            metadata['automation_status'] = NOT_IMPLEMENTED
+            metadata['notes'].append('Not yet implemented - placeholder only')
+    elif 'exit 0' in content or 'exit 1' in content:
+        metadata['automation_status'] = AUTOMATED
+        metadata['notes'].append('Fully automated check')
+
+    # Check for parameter requirements
+    if 'TODO: Extract' in content:
+        metadata['requires_params'] = True
+        metadata['notes'].append('Requires parameter configuration')
+
+    if '--config' in content or 'CONFIG_FILE' in content or '$ConfigFile' in content:
+        metadata['requires_params'] = True
+        metadata['notes'].append('Supports optional configuration file')
+
+    metadata['implemented'] = is_implemented(content)
+    metadata['placeholder'] = is_placeholder(content)
+    lowered = content.lower()
+    metadata['not_implemented'] = is_not_implemented(content, lowered)
+    metadata['tools'] = find_tools(content, lowered)
+    return metadata
+
+
+def analyze_file(path):
+    """analyze_script() of a file; unreadable files get automation status 'error'"""
+    try:
+        content = Path(path).read_text(encoding='utf-8', errors='ignore')
+    except OSError as e:
+        metadata = analyze_script('')
+        metadata.update(rule_title=f'Error parsing: {e}', automation_status=ERROR,
+                        notes=['Error parsing script'], placeholder=False)
+        return metadata
+    return analyze_script(content)
+
+
+################################################################################
+# INDEX
+################################################################################
+
+def walk_scripts(checks_dir):
+    """(relative path, category, platform, os.stat_result) of every script under checks_dir"""
+    checks_dir = Path(checks_dir)
+    for dirpath, dirnames, filenames in os.walk(str(checks_dir)):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        parts = Path(dirpath).relative_to(checks_dir).parts
+        if len(parts) < 2:
+            continue
+        for name in filenames:
+            if not name.endswith(SCRIPT_SUFFIXES) or name.startswith('.'):
+                continue
+            full = os.path.join(dirpath, name)
+            try:
+                stat = os.stat(full)
+            except OSError:
+                continue
+            yield full, parts[0], parts[1], stat
+
+
+class ScriptIndex(object):
+    """
+    Script metadata index (SQLite).
+
+    Rows are dicts with the keys of COLUMNS; notes is a list and tools the list
+    of external tools the script calls.
+    """
+
+    def __init__(self, path=None, readonly=False, root=None):
+        self.path = Path(path) if path else default_path()
+        self.root = Path(root) if root else REPO_ROOT
+        self._prefix = str(self.root.resolve()) + os.sep
+        try:
+            if readonly:
+                if not self.path.is_file():
+                    raise ScriptIndexError(f"{self.path}: index not found (run script_index.py)")
+                self.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.db = sqlite3.connect(str(self.path), timeout=30)
+                self.db.executescript(SCHEMA)
+                self._check_schema()
+        except sqlite3.Error as e:
+            raise ScriptIndexError(f"{self.path}: {e}")
+        self.db.row_factory = sqlite3.Row
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check_schema(self):
+        version = f"{SCHEMA_VERSION}.{ANALYZER_VERSION}"
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row and row[0] == version:
+            return
+        # Built by another layout or other heuristics: reparse everything
+        self.db.execute("DELETE FROM script_tools")
+        self.db.execute("DELETE FROM scripts")
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+        self.db.commit()
+
+    def _key(self, full):
+        """Path of a script as stored in the index (relative to the root when inside it)"""
+        full = os.path.abspath(full)
+        if full.startswith(self._prefix):
+            full = full[len(self._prefix):]
+        return full.replace(os.sep, '/')
+
+    def refresh(self, checks_dir=None):
+        """
+        Parse new and changed scripts and drop deleted ones.
+
+        Returns:
+            dict: counts of 'parsed', 'current' and 'removed' scripts
+        """
+        checks_dir = Path(checks_dir).resolve() if checks_dir else self.root.resolve() / CHECKS_DIR
+        known = {row[0]: (row[1], row[2]) for row in
+                 self.db.execute("SELECT path, size, mtime_ns FROM scripts")}
+        seen = set()
+        rows = []
+        tools = []
+        current = 0
+        for full, category, platform, stat in walk_scripts(checks_dir):
+            key = self._key(full)
+            seen.add(key)
+            if known.get(key) == (stat.st_size, stat.st_mtime_ns):
+                current += 1
+                continue
+            metadata = analyze_file(full)
+            rows.append((key, category, platform, os.path.basename(full), os.path.splitext(full)[1],
+                         stat.st_size, stat.st_mtime_ns, metadata['vuln_id'], metadata['stig_id'],
+                         metadata['severity'], metadata['rule_title'], metadata['automation_status'],
+                         int(metadata['requires_params']), int(metadata['manual_review']),
+                         int(metadata['implemented']), int(metadata['placeholder']),
+                         int(metadata['not_implemented']), json.dumps(metadata['notes'])))
+            tools.extend((key, tool) for tool in metadata['tools'])
+
+        prefix = self._key(checks_dir) + '/'
+        removed = [key for key in known if key.startswith(prefix) and key not in seen]
+        with self.db:
+            for i in range(0, len(removed), 500):
+                chunk = removed[i:i + 500]
+                marks = ','.join('?' * len(chunk))
+                self.db.execute(f"DELETE FROM script_tools WHERE path IN ({marks})", chunk)
+                self.db.execute(f"DELETE FROM scripts WHERE path IN ({marks})", chunk)
+            if rows:
+                changed = [(row[0],) for row in rows]
+                self.db.executemany("DELETE FROM script_tools WHERE path = ?", changed)
+                self.db.executemany(f"INSERT OR REPLACE INTO scripts ({', '.join(COLUMNS)}) "
+                                    f"VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+                self.db.executemany("INSERT INTO script_tools VALUES (?, ?)", tools)
+        return {'parsed': len(rows), 'current': current, 'removed': len(removed)}
+
+    # ------------------------------------------------------------------ query
+
+    def _row(self, row, tools):
+        script = OrderedDict((key, row[key]) for key in COLUMNS)
+        for key in ('requires_params', 'manual_review', 'implemented', 'placeholder', 'not_implemented'):
+            script[key] = bool(script[key])
+        script['notes'] = json.loads(script['notes'])
+        script['tools'] = tools.get(row['path'], [])
+        return script
+
+    def scripts(self, category=None, platform=None, suffixes=None, status=None, severity=None,
+                vuln_id=None, stig_id=None, tool=None, **flags):
+        """
+        Indexed scripts matching every given criterion, ordered by path.
+
+        Args:
+            suffixes: File suffixes to include (e.g. ('.sh', '.ps1'))
+            status: Automation status
+            tool: External tool the script calls
+            flags: implemented/placeholder/not_implemented/manual_review/requires_params=True|False
+        """
+        where, params = [], []
+        for column, value in (('category', category), ('platform', platform), ('automation_status', status),
+                              ('severity', severity), ('vuln_id', vuln_id), ('stig_id', stig_id)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if suffixes:
+            where.append(f"suffix IN ({','.join('?' * len(suffixes))})")
+            params.extend(suffixes)
+        if tool:
+            where.append("path IN (SELECT path FROM script_tools WHERE tool = ?)")
+            params.append(tool)
+        for flag, value in flags.items():
+            if flag not in ('requires_params', 'manual_review', 'implemented', 'placeholder', 'not_implemented'):
+                raise TypeError(f"unknown flag {flag}")
+            where.append(f"{flag} = ?")
+            params.append(int(bool(value)))
+        sql = "SELECT * FROM scripts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self.db.execute(sql + " ORDER BY path", params).fetchall()
+        tools = {}
+        for path, name in self.db.execute("SELECT path, tool FROM script_tools ORDER BY tool"):
+            tools.setdefault(path, []).append(name)
+        return [self._row(row, tools) for row in rows]
+
+    def summary(self, suffixes=('.sh', '.ps1'), category=None, platform=None):
+        """Per-platform counts: total, automated, manual_review, not_implemented, implemented, placeholder"""
+        where, params = [f"suffix IN ({','.join('?' * len(suffixes))})"], list(suffixes)
+        if category:
+            where.append("category = ?")
+            params.append(category)
+        if platform:
+            where.append("platform = ?")
+            params.append(platform)
+        rows = self.db.execute(f"""
+            SELECT category, platform, COUNT(*) AS total,
+                   SUM(automation_status = 'automated') AS automated,
+                   SUM(automation_status = 'manual_review') AS manual_review,
+                   SUM(automation_status = 'not_implemented') AS not_implemented,
+                   SUM(implemented) AS implemented,
+                   SUM(placeholder) AS placeholder,
+                   SUM(requires_params) AS requires_params
+            FROM scripts WHERE {' AND '.join(where)}
+            GROUP BY category, platform ORDER BY category, platform""", params).fetchall()
+        return [OrderedDict((key, row[key]) for key in row.keys()) for row in rows]
+
+
+def open_index(path=None, refresh=True):
+    """Open the index for a status tool, refreshing it from checks/ first"""
+    index = ScriptIndex(path)
+    if refresh:
+        index.refresh()
+    return index
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Refresh and query the check script metadata index',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--index', help=f'Index database (default: $STIG_SCRIPT_INDEX or {INDEX_FILE})')
+    parser.add_argument('--no-refresh', action='store_true', help='Query without rescanning checks/')
+    parser.add_argument('--category', help='Category (os, application, database, network, container)')
+    parser.add_argument('--platform', help='Platform directory name (e.g. rhel_9_v2r5)')
+    parser.add_argument('--status', choices=[AUTOMATED, MANUAL_REVIEW, NOT_IMPLEMENTED, UNKNOWN, ERROR],
+                        help='Automation status')
+    parser.add_argument('--severity', choices=['high', 'medium', 'low'], help='Severity')
+    parser.add_argument('--vuln-id', help='VULN ID (V-xxxxxx)')
+    parser.add_argument('--stig-id', help='STIG ID')
+    parser.add_argument('--tool', choices=list(TOOL_PATTERNS), help='External tool the script calls')
+    parser.add_argument('--all-suffixes', action='store_true', help='Include .py and .bat scripts (default: .sh and .ps1)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    try:
+        index = ScriptIndex(args.index, readonly=args.no_refresh)
+    except ScriptIndexError as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    with index:
+        if not args.no_refresh:
+            report = index.refresh()
+            if not args.json:
+                print(f"{report['parsed']} parsed, {report['current']} current, {report['removed']} removed -> {index.path}")
+
+        suffixes = None if args.all_suffixes else ('.sh', '.ps1')
+        criteria = dict(status=args.status, severity=args.severity, vuln_id=args.vuln_id,
+                        stig_id=args.stig_id, tool=args.tool)
+        if not any(criteria.values()):
+            summary = index.summary(suffixes or SCRIPT_SUFFIXES, args.category, args.platform)
+            if args.json:
+                print(json.dumps(summary, indent=2))
+                return 0
+            print(f"{'Platform':<48} {'Total':>6} {'Auto':>6} {'Manual':>6} {'Todo':>6} {'Impl':>6}")
+            for row in summary:
+                print(f"{row['category'] + '/' + row['platform']:<48} {row['total']:>6} {row['automated']:>6} "
+                      f"{row['manual_review']:>6} {row['not_implemented']:>6} {row['implemented']:>6}")
+            return 0
+
+        scripts = index.scripts(category=args.category, platform=args.platform, suffixes=suffixes, **criteria)
+        if args.json:
+            print(json.dumps(scripts, indent=2))
+        else:
+            for s in scripts:
+                print(f"{s['path']:<72} {s['vuln_id'] or '-':<10} {s['severity'] or '-':<7} "
+                      f"{s['automation_status']:<16} {','.join(s['tools'])}")
+            print(f"{len(scripts)} scripts")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1037 @@
+#!/usr/bin/env python3
+"""
+Windows account and audit policy STIG evaluation
+Evaluates the password, account lockout, Kerberos, user rights assignment,
+account Security Options and advanced audit policy rules of the Windows 10,
+Windows 11, Windows Server 2019 and Windows Server 2022 STIGs against one
+"secedit /export" security template and one "auditpol /backup" CSV per host,
+instead of querying each setting from a separate check.
+
+Rule requirements (policy key and limits, accounts allowed or required for a
+user right, audited subcategory and inclusion) are extracted once from the
+check text of the same checks JSON files windows_registry.py reads. Each
+host's export is parsed into indexed policy tables and every rule is answered
+from them in one pass, so exports collected from thousands of hosts can be
+scored from one Linux system.
+
+On Windows, --collect runs secedit and auditpol once and writes secedit.inf,
+audit.csv and facts.json (product, build, role and domain membership) to a
+directory. A host directory holds those files (any *.inf / *.csv is accepted);
+without facts.json, the host's platform and role are read from hives or .reg
+exports in the same directory, else --platform is required.
+
+Usage:
+    python3 security_policy.py --collect C:\\stig\\policy\\%COMPUTERNAME%
+    python3 security_policy.py --policy-dir /srv/policy/host01
+    python3 security_policy.py --policy-dir /srv/policy/host01 --rule V-220748 --output-json result.json
+    python3 security_policy.py --hosts-dir /srv/policy --output-dir results/security_policy
+    python3 security_policy.py --platform windows_server_2019_v2r7 --list-rules
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import registry_export
+import registry_hive
+import registry_pol
+import stig_catalog
+import windows_registry
+
+SECEDIT_FILE = 'secedit.inf'
+AUDIT_FILE = 'audit.csv'
+FACTS_FILE = 'facts.json'
+
+# Policy display name (check text) -> secedit section and key
+POLICY_SETTINGS = OrderedDict([
+    ('account lockout duration', ('System Access', 'LockoutDuration')),
+    ('account lockout threshold', ('System Access', 'LockoutBadCount')),
+    ('reset account lockout counter after', ('System Access', 'ResetLockoutCount')),
+    ('enforce password history', ('System Access', 'PasswordHistorySize')),
+    ('maximum password age', ('System Access', 'MaximumPasswordAge')),
+    ('minimum password age', ('System Access', 'MinimumPasswordAge')),
+    ('minimum password length', ('System Access', 'MinimumPasswordLength')),
+    ('password must meet complexity requirements', ('System Access', 'PasswordComplexity')),
+    ('store password using reversible encryption', ('System Access', 'ClearTextPassword')),
+    ('store passwords using reversible encryption', ('System Access', 'ClearTextPassword')),
+    ('accounts: administrator account status', ('System Access', 'EnableAdminAccount')),
+    ('accounts: guest account status', ('System Access', 'EnableGuestAccount')),
+    ('accounts: rename administrator account', ('System Access', 'NewAdministratorName')),
+    ('accounts: rename guest account', ('System Access', 'NewGuestName')),
+    ('network access: allow anonymous sid/name translation', ('System Access', 'LSAAnonymousNameLookup')),
+    ('enforce user logon restrictions', ('Kerberos Policy', 'TicketValidateClient')),
+    ('maximum lifetime for service ticket', ('Kerberos Policy', 'MaxServiceAge')),
+    ('maximum lifetime for user ticket renewal', ('Kerberos Policy', 'MaxRenewAge')),
+    ('maximum lifetime for user ticket', ('Kerberos Policy', 'MaxTicketAge')),
+    ('maximum tolerance for computer clock synchronization', ('Kerberos Policy', 'MaxClockSkew')),
+])
+
+# secedit writes -1 where the policy editor shows 0 (never / until unlocked)
+NEVER_SETTINGS = ('LockoutDuration', 'MaximumPasswordAge')
+
+# User right display name -> secedit constant
+USER_RIGHTS = {
+    'access credential manager as a trusted caller': 'SeTrustedCredManAccessPrivilege',
+    'access this computer from the network': 'SeNetworkLogonRight',
+    'act as part of the operating system': 'SeTcbPrivilege',
+    'add workstations to domain': 'SeMachineAccountPrivilege',
+    'adjust memory quotas for a process': 'SeIncreaseQuotaPrivilege',
+    'allow log on locally': 'SeInteractiveLogonRight',
+    'allow log on through remote desktop services': 'SeRemoteInteractiveLogonRight',
+    'back up files and directories': 'SeBackupPrivilege',
+    'bypass traverse checking': 'SeChangeNotifyPrivilege',
+    'change the system time': 'SeSystemtimePrivilege',
+    'change the time zone': 'SeTimeZonePrivilege',
+    'create a pagefile': 'SeCreatePagefilePrivilege',
+    'create a token object': 'SeCreateTokenPrivilege',
+    'create global objects': 'SeCreateGlobalPrivilege',
+    'create permanent shared objects': 'SeCreatePermanentPrivilege',
+    'create symbolic links': 'SeCreateSymbolicLinkPrivilege',
+    'debug programs': 'SeDebugPrivilege',
+    'deny access to this computer from the network': 'SeDenyNetworkLogonRight',
+    'deny log on as a batch job': 'SeDenyBatchLogonRight',
+    'deny log on as a service': 'SeDenyServiceLogonRight',
+    'deny log on locally': 'SeDenyInteractiveLogonRight',
+    'deny log on through remote desktop services': 'SeDenyRemoteInteractiveLogonRight',
+    'enable computer and user accounts to be trusted for delegation': 'SeEnableDelegationPrivilege',
+    'force shutdown from a remote system': 'SeRemoteShutdownPrivilege',
+    'generate security audits': 'SeAuditPrivilege',
+    'impersonate a client after authentication': 'SeImpersonatePrivilege',
+    'increase a process working set': 'SeIncreaseWorkingSetPrivilege',
+    'increase scheduling priority': 'SeIncreaseBasePriorityPrivilege',
+    'load and unload device drivers': 'SeLoadDriverPrivilege',
+    'lock pages in memory': 'SeLockMemoryPrivilege',
+    'log on as a batch job': 'SeBatchLogonRight',
+    'log on as a service': 'SeServiceLogonRight',
+    'manage auditing and security log': 'SeSecurityPrivilege',
+    'modify an object label': 'SeRelabelPrivilege',
+    'modify firmware environment values': 'SeSystemEnvironmentPrivilege',
+    'perform volume maintenance tasks': 'SeManageVolumePrivilege',
+    'profile single process': 'SeProfileSingleProcessPrivilege',
+    'profile system performance': 'SeSystemProfilePrivilege',
+    'remove computer from docking station': 'SeUndockPrivilege',
+    'replace a process level token': 'SeAssignPrimaryTokenPrivilege',
+    'restore files and directories': 'SeRestorePrivilege',
+    'shut down the system': 'SeShutdownPrivilege',
+    'synchronize directory service data': 'SeSyncAgentPrivilege',
+    'take ownership of files or other objects': 'SeTakeOwnershipPrivilege',
+}
+
+# Well-known SIDs; DOMAIN-<rid> stands for S-1-5-21-<domain>-<rid>
+WELL_KNOWN_SIDS = OrderedDict([
+    ('S-1-1-0', 'Everyone'),
+    ('S-1-5-2', 'Network'),
+    ('S-1-5-3', 'Batch'),
+    ('S-1-5-4', 'Interactive'),
+    ('S-1-5-6', 'Service'),
+    ('S-1-5-9', 'Enterprise Domain Controllers'),
+    ('S-1-5-11', 'Authenticated Users'),
+    ('S-1-5-18', 'Local System'),
+    ('S-1-5-19', 'Local Service'),
+    ('S-1-5-20', 'Network Service'),
+    ('S-1-5-32-544', 'Administrators'),
+    ('S-1-5-32-545', 'Users'),
+    ('S-1-5-32-546', 'Guests'),
+    ('S-1-5-32-551', 'Backup Operators'),
+    ('S-1-5-32-555', 'Remote Desktop Users'),
+    ('S-1-5-32-559', 'Performance Log Users'),
+    ('S-1-5-32-568', 'IIS_IUSRS'),
+    ('S-1-5-83-0', 'Virtual Machines'),
+    ('S-1-5-90-0', 'Window Manager Group'),
+    ('S-1-5-113', 'Local account'),
+    ('S-1-5-114', 'Local account and member of Administrators group'),
+    ('S-1-5-80-3139157870-2983391045-3678747466-658725712-1809340420', 'NT Service\\WdiServiceHost'),
+    ('DOMAIN-512', 'Domain Admins'),
+    ('DOMAIN-519', 'Enterprise Admins'),
+])
+ACCOUNT_SIDS = {name.lower(): sid for sid, name in WELL_KNOWN_SIDS.items()}
+ACCOUNT_SIDS.update({
+    'local system': 'S-1-5-18',
+    'system': 'S-1-5-18',
+    'local service': 'S-1-5-19',
+    'network service': 'S-1-5-20',
+    'nt virtual machine\\virtual machines': 'S-1-5-83-0',
+    'window manager\\window manager group': 'S-1-5-90-0',
+    'domain admin': 'DOMAIN-512',
+    'enterprise admin': 'DOMAIN-519',
+})
+
+# Advanced audit policy subcategory -> GUID (auditpol CSVs are matched by GUID, then name)
+AUDIT_SUBCATEGORIES = {
+    'credential validation': '{0CCE923F-69AE-11D9-BED3-505054503030}',
+    'kerberos authentication service': '{0CCE9242-69AE-11D9-BED3-505054503030}',
+    'kerberos service ticket operations': '{0CCE9240-69AE-11D9-BED3-505054503030}',
+    'other account logon events': '{0CCE9241-69AE-11D9-BED3-505054503030}',
+    'application group management': '{0CCE9239-69AE-11D9-BED3-505054503030}',
+    'computer account management': '{0CCE9236-69AE-11D9-BED3-505054503030}',
+    'distribution group management': '{0CCE9238-69AE-11D9-BED3-505054503030}',
+    'other account management events': '{0CCE923A-69AE-11D9-BED3-505054503030}',
+    'security group management': '{0CCE9237-69AE-11D9-BED3-505054503030}',
+    'user account management': '{0CCE9235-69AE-11D9-BED3-505054503030}',
+    'dpapi activity': '{0CCE922D-69AE-11D9-BED3-505054503030}',
+    'plug and play events': '{0CCE9248-69AE-11D9-BED3-505054503030}',
+    'process creation': '{0CCE922B-69AE-11D9-BED3-505054503030}',
+    'process termination': '{0CCE922C-69AE-11D9-BED3-505054503030}',
+    'rpc events': '{0CCE922E-69AE-11D9-BED3-505054503030}',
+    'token right adjusted events': '{0CCE924A-69AE-11D9-BED3-505054503030}',
+    'detailed directory service replication': '{0CCE923E-69AE-11D9-BED3-505054503030}',
+    'directory service access': '{0CCE923B-69AE-11D9-BED3-505054503030}',
+    'directory service changes': '{0CCE923C-69AE-11D9-BED3-505054503030}',
+    'directory service replication': '{0CCE923D-69AE-11D9-BED3-505054503030}',
+    'account lockout': '{0CCE9217-69AE-11D9-BED3-505054503030}',
+    'user / device claims': '{0CCE9247-69AE-11D9-BED3-505054503030}',
+    'group membership': '{0CCE9249-69AE-11D9-BED3-505054503030}',
+    'ipsec extended mode': '{0CCE921A-69AE-11D9-BED3-505054503030}',
+    'ipsec main mode': '{0CCE9218-69AE-11D9-BED3-505054503030}',
+    'ipsec quick mode': '{0CCE9219-69AE-11D9-BED3-505054503030}',
+    'logoff': '{0CCE9216-69AE-11D9-BED3-505054503030}',
+    'logon': '{0CCE9215-69AE-11D9-BED3-505054503030}',
+    'network policy server': '{0CCE9243-69AE-11D9-BED3-505054503030}',
+    'other logon/logoff events': '{0CCE921C-69AE-11D9-BED3-505054503030}',
+    'special logon': '{0CCE921B-69AE-11D9-BED3-505054503030}',
+    'application generated': '{0CCE9222-69AE-11D9-BED3-505054503030}',
+    'certification services': '{0CCE9221-69AE-11D9-BED3-505054503030}',
+    'detailed file share': '{0CCE9244-69AE-11D9-BED3-505054503030}',
+    'file share': '{0CCE9224-69AE-11D9-BED3-505054503030}',
+    'file system': '{0CCE921D-69AE-11D9-BED3-505054503030}',
+    'filtering platform connection': '{0CCE9226-69AE-11D9-BED3-505054503030}',
+    'filtering platform packet drop': '{0CCE9225-69AE-11D9-BED3-505054503030}',
+    'handle manipulation': '{0CCE9223-69AE-11D9-BED3-505054503030}',
+    'kernel object': '{0CCE921F-69AE-11D9-BED3-505054503030}',
+    'other object access events': '{0CCE9227-69AE-11D9-BED3-505054503030}',
+    'registry': '{0CCE921E-69AE-11D9-BED3-505054503030}',
+    'removable storage': '{0CCE9245-69AE-11D9-BED3-505054503030}',
+    'sam': '{0CCE9220-69AE-11D9-BED3-505054503030}',
+    'central policy staging': '{0CCE9246-69AE-11D9-BED3-505054503030}',
+    'audit policy change': '{0CCE922F-69AE-11D9-BED3-505054503030}',
+    'authentication policy change': '{0CCE9230-69AE-11D9-BED3-505054503030}',
+    'authorization policy change': '{0CCE9231-69AE-11D9-BED3-505054503030}',
+    'filtering platform policy change': '{0CCE9233-69AE-11D9-BED3-505054503030}',
+    'mpssvc rule-level policy change': '{0CCE9232-69AE-11D9-BED3-505054503030}',
+    'other policy change events': '{0CCE9234-69AE-11D9-BED3-505054503030}',
+    'non sensitive privilege use': '{0CCE9229-69AE-11D9-BED3-505054503030}',
+    'other privilege use events': '{0CCE922A-69AE-11D9-BED3-505054503030}',
+    'sensitive privilege use': '{0CCE9228-69AE-11D9-BED3-505054503030}',
+    'ipsec driver': '{0CCE9213-69AE-11D9-BED3-505054503030}',
+    'other system events': '{0CCE9214-69AE-11D9-BED3-505054503030}',
+    'security state change': '{0CCE9210-69AE-11D9-BED3-505054503030}',
+    'security system extension': '{0CCE9211-69AE-11D9-BED3-505054503030}',
+    'system integrity': '{0CCE9212-69AE-11D9-BED3-505054503030}',
+}
+
+# auditpol "Setting Value" bits and "Inclusion Setting" text
+AUDIT_SUCCESS = 1
+AUDIT_FAILURE = 2
+AUDIT_SETTINGS = {0: 'No Auditing', 1: 'Success', 2: 'Failure', 3: 'Success and Failure'}
+AUDIT_TEXT = {text.lower(): value for value, text in AUDIT_SETTINGS.items()}
+
+AUDIT_LINE_RE = re.compile(r'^\s*([A-Za-z/ ]+?)\s*>>\s*(.+?)\s+-\s+(Success|Failure)\s*$', re.M)
+FINDING_RE = re.compile(r'\bIf\b([^\n]*?)this is a finding', re.I)
+NONE_RE = re.compile(r'If any (?:groups or accounts|accounts or groups)\b[^"\n]*? are (?:granted|defined for) the "([^"]+)" '
+                     r'(?:user )?right', re.I)
+ONLY_RE = re.compile(r'If any (?:groups or accounts|accounts or groups) other than the following are granted the '
+                     r'"([^"]+)" (?:user )?right[^\n]*', re.I)
+REQUIRED_RE = re.compile(r'If the following (?:groups or accounts|accounts or groups) are not defined for the '
+                         r'"([^"]+)" (?:user )?right([^\n]*)', re.I)
+NONDOMAIN_EMPTY_RE = re.compile(r'are defined for the "[^"]+" user right on nondomain-joined systems', re.I)
+ADDED_ACCOUNT_RE = re.compile(r'^(\w[\w ]*\\\S+) is added in\b')
+EXCEPTION_SID_RE = re.compile(r'SID (S-1-[0-9-]+)\)?\.? This is not a finding', re.I)
+SERVER_CORE_RE = re.compile(r'For server core installations|Secedit /Export', re.I)
+
+
+class PolicyExportError(Exception):
+    """Raised when a host has neither a secedit export nor an auditpol backup"""
+
+
+################################################################################
+# RULE EXTRACTION
+################################################################################
+
+def policy_value(text):
+    """Quoted check-text value -> int for numbers and Enabled/Disabled, else the text"""
+    lowered = text.strip().lower()
+    if lowered in ('enabled', 'disabled'):
+        return 1 if lowered == 'enabled' else 0
+    try:
+        return int(lowered)
+    except ValueError:
+        return text.strip()
+
+
+def parse_conditions(sentence):
+    """
+    Finding conditions of one "If ..., this is a finding" sentence.
+
+    Returns:
+        tuple: (list of (operator, value), list of excepted values)
+    """
+    conditions = []
+    exceptions = [policy_value(v) for v in re.findall(r'\(excluding "([^"]+)"\)', sentence)]
+    sentence = re.sub(r'\(excluding "[^"]+"\)', '', sentence)
+    patterns = (
+        (r'not (?:set to|something) (?:a value )?other than "([^"]+)"', 'eq'),
+        (r'\bnot set to "([^"]+)"', 'ne'),
+        (r'\bless than "(-?\d+)"', 'lt'),
+        (r'\b(?:greater|more) than "(-?\d+)"', 'gt'),
+        (r'\b(?:is|equals?|equal to|set to) "([^"]+)"', 'eq'),
+    )
+    for pattern, operator in patterns:
+        for match in re.finditer(pattern, sentence, re.I):
+            conditions.append((operator, policy_value(match.group(1))))
+        sentence = re.sub(pattern, '', sentence, flags=re.I)
+    return conditions, exceptions
+
+
+def gpedit_part(text):
+    """Check text before the server core / secedit alternative"""
+    match = SERVER_CORE_RE.search(text)
+    return text[:match.start()] if match else text
+
+
+def parse_policy_setting(text):
+    """Account policy / Security Option requirement from check text, or None"""
+    part = gpedit_part(text)
+    lowered = part.lower()
+    name = next((n for n in sorted(POLICY_SETTINGS, key=len, reverse=True) if f'"{n}' in lowered), None)
+    if name is None:
+        return None
+    start = lowered.index(f'"{name}') + 1
+    conditions, exceptions = [], []
+    for match in FINDING_RE.finditer(part):
+        found, excepted = parse_conditions(match.group(1))
+        conditions.extend(found)
+        exceptions.extend(excepted)
+    if not conditions:
+        return None
+    return {
+        'kind': 'setting',
+        'name': part[start:start + len(name)],
+        'section': POLICY_SETTINGS[name][0],
+        'key': POLICY_SETTINGS[name][1],
+        'conditions': conditions,
+        'exceptions': exceptions,
+    }
+
+
+def service_sid(name):
+    """SID of the virtual account NT SERVICE\\<name> (S-1-5-80- and the SHA-1 of the upper-case name)"""
+    digest = hashlib.sha1(name.upper().encode('utf-16-le')).digest()
+    return 'S-1-5-80-' + '-'.join(str(part) for part in struct.unpack('<5I', digest))
+
+
+def account_entry(text, scope):
+    """List line of a user right rule -> {'name', 'sids', 'scope'}"""
+    alternatives = re.findall(r'"([^"]+)"', text) if text.startswith('"') else [text]
+    names, sids = [], []
+    for alternative in alternatives:
+        name = re.sub(r'\s*\(see note below\)\s*$', '', alternative.strip(), flags=re.I)
+        name = re.sub(r'\s+group$', '', name, flags=re.I) if name.lower() not in ACCOUNT_SIDS else name
+        names.append(name)
+        if name.lower() in ACCOUNT_SIDS:
+            sids.append(ACCOUNT_SIDS[name.lower()])
+        elif name.lower().startswith('nt service\\'):
+            sids.append(service_sid(name[11:]))
+    return {'name': ' or '.join(names), 'names': [n.lower() for n in names], 'sids': sids, 'scope': scope}
+
+
+def parse_account_list(text, start):
+    """Accounts listed after a user right sentence, up to the server core alternative"""
+    entries = []
+    scope = 'all'
+    end = SERVER_CORE_RE.search(text, start)
+    for line in text[start:end.start() if end else len(text)].splitlines():
+        line = line.strip()
+        if line.startswith('- '):
+            line = line[2:].strip()
+        added = ADDED_ACCOUNT_RE.match(line)
+        if added:
+            line = added.group(1)
+        lowered = line.lower()
+        if lowered == 'domain systems only:':
+            scope = 'domain'
+            continue
+        if lowered == 'all systems:':
+            scope = 'all'
+            continue
+        if not line or len(line) > 90 or line.endswith(('.', ':')) or lowered.startswith(('if ', 'note')):
+            continue
+        entries.append(account_entry(line, scope))
+    return entries
+
+
+def parse_user_right(text):
+    """User rights assignment requirement from check text, or None"""
+    part = gpedit_part(text)
+    for regex, mode in ((ONLY_RE, 'only'), (REQUIRED_RE, 'required'), (NONE_RE, 'none')):
+        match = regex.search(part)
+        if not match:
+            continue
+        right = USER_RIGHTS.get(match.group(1).lower())
+        if right is None:
+            return None
+        requirement = {
+            'kind': 'right',
+            'name': match.group(1),
+            'right': right,
+            'mode': mode,
+            'accounts': parse_account_list(text, match.end()) if mode != 'none' else [],
+            'nondomain_empty': bool(NONDOMAIN_EMPTY_RE.search(text)),
+        }
+        if mode == 'required' and 'domain-joined' in match.group(2):
+            for entry in requirement['accounts']:
+                entry['scope'] = 'domain'
+        for sid in EXCEPTION_SID_RE.findall(text):
+            requirement['accounts'].append({'name': WELL_KNOWN_SIDS.get(sid, sid), 'names': [], 'sids': [sid],
+                                            'scope': 'all'})
+        if mode != 'none' and not requirement['accounts']:
+            return None
+        return requirement
+    return None
+
+
+def audit_guid(name):
+    """Subcategory GUID for a check-text subcategory name ("Audit Policy Change", "Audit Audit Policy Change")"""
+    lowered = re.sub(r'\s+', ' ', name.strip().lower())
+    if lowered in AUDIT_SUBCATEGORIES:
+        return AUDIT_SUBCATEGORIES[lowered]
+    if lowered.startswith('audit ') and lowered[6:] in AUDIT_SUBCATEGORIES:
+        return AUDIT_SUBCATEGORIES[lowered[6:]]
+    return None
+
+
+def parse_audit(text):
+    """Advanced audit policy requirement from check text, or None"""
+    if 'auditpol' not in text.lower():
+        return None
+    subcategories = []
+    for category, subcategory, inclusion in AUDIT_LINE_RE.findall(text):
+        subcategory = re.sub(r'\s+', ' ', subcategory.strip())
+        if subcategory.lower().startswith('audit ') and subcategory.lower() not in AUDIT_SUBCATEGORIES:
+            subcategory = subcategory[6:]
+        subcategories.append({
+            'category': re.sub(r'\s+', ' ', category.strip()),
+            'subcategory': subcategory,
+            'guid': audit_guid(subcategory),
+            'inclusion': inclusion,
+        })
+    if not subcategories:
+        return None
+    return {'kind': 'audit', 'subcategories': subcategories}
+
+
+def rule_from_check(check):
+    """Policy rule record from a checks JSON entry (None when not a secedit/auditpol rule)"""
+    text = check.get('Check Content', '').replace('_x000D_', '')
+    if 'Registry Path' in text and 'auditpol' not in text.lower():
+        return None
+    requirement = None
+    if 'Account Policies >>' in text or 'Security Options' in text:
+        requirement = parse_policy_setting(text)
+    elif 'User Rights Assignment' in text:
+        requirement = parse_user_right(text)
+    else:
+        requirement = parse_audit(text)
+    if requirement is None:
+        return None
+    vuln_id = check.get('Vuln ID') or check.get('Group ID')
+    return {
+        'check_id': vuln_id,
+        'vuln_id': vuln_id,
+        'stig_id': check.get('STIG ID', ''),
+        'severity': check.get('Severity', 'medium'),
+        'title': check.get('Rule Title', ''),
+        'requirement': requirement,
+        'domain_only': bool(re.search(r'applicable to domain-joined systems', text, re.I)),
+        'notes': windows_registry.applicability_notes(text),
+    }
+
+
+_rules = {}
+
+
+def load_platform_rules(platform):
+    """Policy rules of a Windows platform keyed by Vuln ID (parsed once per process)"""
+    if platform in _rules:
+        return _rules[platform]
+    if platform not in windows_registry.WINDOWS_PLATFORMS:
+        raise ValueError(f"Unknown platform: {platform}")
+    try:
+        checks = stig_catalog.load_checks(windows_registry.REPO_ROOT / windows_registry.PLATFORMS[platform]['checks'])
+    except (OSError, ValueError):
+        checks = []
+    rules = OrderedDict()
+    for check in checks:
+        rule = rule_from_check(check)
+        if rule:
+            rules[rule['check_id']] = rule
+    _rules[platform] = rules
+    return rules
+
+
+################################################################################
+# POLICY TABLES
+################################################################################
+
+def read_audit_csv(path):
+    """
+    Parse an "auditpol /backup" file or "auditpol /get /category:* /r" report.
+
+    Returns:
+        tuple: (GUID -> setting bits, subcategory name -> setting bits)
+    """
+    by_guid, by_name = {}, {}
+    with registry_export.open_export(path) as f:
+        for row in csv.DictReader(f):
+            row = {(k or '').strip(): (v or '').strip() for k, v in row.items()}
+            name = row.get('Subcategory', '')
+            guid = row.get('Subcategory GUID', '').upper()
+            if not name or not guid:
+                continue
+            setting = row.get('Setting Value', '')
+            if setting.isdigit():
+                setting = int(setting) & (AUDIT_SUCCESS | AUDIT_FAILURE)
+            else:
+                setting = AUDIT_TEXT.get(row.get('Inclusion Setting', '').lower(), 0)
+            by_guid[guid] = setting
+            lowered = name.lower()
+            by_name[lowered[6:] if lowered.startswith('audit ') else lowered] = setting
+    return by_guid, by_name
+
+
+def parse_principals(text):
+    """'*S-1-5-32-544,CONTOSO\\svc' -> list of (SID or None, account name)"""
+    principals = []
+    for item in text.split(','):
+        item = item.strip().strip('"')
+        if not item:
+            continue
+        if item.startswith('*'):
+            sid = item[1:].upper()
+            principals.append((sid, WELL_KNOWN_SIDS.get(domain_sid_key(sid), sid)))
+        else:
+            sid = ACCOUNT_SIDS.get(item.lower()) or ACCOUNT_SIDS.get(item.rsplit('\\', 1)[-1].lower())
+            if item.lower().startswith('nt service\\'):
+                sid = service_sid(item[11:])
+            principals.append((sid if sid and not sid.startswith('DOMAIN-') else None, item))
+    return principals
+
+
+def domain_sid_key(sid):
+    """S-1-5-21-<domain>-512 -> DOMAIN-512 (other SIDs unchanged)"""
+    if sid.startswith('S-1-5-21-') and sid.count('-') == 7:
+        return 'DOMAIN-' + sid.rsplit('-', 1)[1]
+    return sid
+
+
+class PolicyExport(object):
+    """
+    Indexed policy tables of one host.
+
+    Built from a secedit export (sections and keys looked up
+    case-insensitively, user rights as principal lists) and an auditpol backup
+    (subcategory settings by GUID and by name).
+    """
+
+    def __init__(self, secedit=None, audit=None):
+        self.secedit = secedit
+        self.audit_file = audit
+        self.sections = None
+        self.audit = None
+        self.audit_names = None
+        self.errors = []
+        if secedit:
+            try:
+                self.sections = {section.lower(): {k.lower(): v for k, v in values.items()}
+                                 for section, values in registry_pol.read_inf(secedit).items()}
+            except registry_pol.PolicyError as e:
+                self.errors.append(str(e))
+        if audit:
+            try:
+                self.audit, self.audit_names = read_audit_csv(audit)
+            except (OSError, csv.Error, UnicodeError) as e:
+                self.errors.append(f"{audit}: {e}")
+        if self.sections is None and self.audit is None:
+            raise PolicyExportError('; '.join(self.errors) or "No secedit export or auditpol backup")
+
+    def setting(self, section, key):
+        """Raw value text of a secedit setting, or None"""
+        if self.sections is None:
+            return None
+        return self.sections.get(section.lower(), {}).get(key.lower())
+
+    def has_section(self, section):
+        return self.sections is not None and section.lower() in self.sections
+
+    def principals(self, right):
+        """Principals granted a user right ([] when unassigned, None without [Privilege Rights])"""
+        if not self.has_section('Privilege Rights'):
+            return None
+        return parse_principals(self.setting('Privilege Rights', right) or '')
+
+    def audit_setting(self, subcategory, guid=None):
+        """Setting bits of an audit subcategory (None when not in the backup)"""
+        if guid and guid.upper() in self.audit:
+            return self.audit[guid.upper()]
+        return self.audit_names.get(subcategory.lower())
+
+    def domain_accounts(self):
+        """True when any user right names a domain group (Domain Admins, Enterprise Admins)"""
+        for value in (self.sections or {}).get('privilege rights', {}).values():
+            if re.search(r'\*S-1-5-21-\d+-\d+-\d+-51[29]\b', value, re.I):
+                return True
+        return False
+
+
+################################################################################
+# EVALUATION
+################################################################################
+
+def matches(entry, principal):
+    sid, name = principal
+    lowered = name.lower()
+    if sid and (sid in entry['sids'] or domain_sid_key(sid) in entry['sids']):
+        return True
+    return lowered in entry['names'] or lowered.rsplit('\\', 1)[-1] in entry['names']
+
+
+def check_setting(requirement, export):
+    """Account policy / Security Option -> (state, message)"""
+    label = f"\"{requirement['name']}\" ({requirement['key']})"
+    raw = export.setting(requirement['section'], requirement['key'])
+    if raw is None:
+        if export.sections is None:
+            return 'unavailable', f"{label}: no secedit export"
+        return 'unavailable', f"{label} is not in the secedit export"
+    text = raw.strip().strip('"')
+    try:
+        value = int(text)
+        if value == -1 and requirement['key'] in NEVER_SETTINGS:
+            value = 0
+    except ValueError:
+        value = text
+    for operator, expected in requirement['conditions']:
+        if value in requirement['exceptions']:
+            break
+        if isinstance(expected, int) != isinstance(value, int):
+            hit = operator == 'ne'
+        elif isinstance(expected, str):
+            hit = (value.lower() == expected.lower()) == (operator == 'eq')
+        elif operator == 'lt':
+            hit = value < expected
+        elif operator == 'gt':
+            hit = value > expected
+        else:
+            hit = (value == expected) == (operator == 'eq')
+        if hit:
+            return 'fail', f"{label} is {value}"
+    return 'pass', f"{label} is {value}"
+
+
+def check_right(requirement, export, domain):
+    """User rights assignment -> (state, message)"""
+    label = f"\"{requirement['name']}\" ({requirement['right']})"
+    principals = export.principals(requirement['right'])
+    if principals is None:
+        return 'unavailable', f"{label}: no [Privilege Rights] in the secedit export"
+    granted = ', '.join(name for _, name in principals) or 'no accounts'
+    accounts = requirement['accounts']
+    if not principals and requirement['mode'] != 'required':
+        return 'pass', f"{label} is not granted to any accounts"
+    if requirement['mode'] == 'none':
+        return 'fail', f"{label} is granted to {granted}"
+    if requirement['mode'] == 'only':
+        extra = [name for sid, name in principals if not any(matches(e, (sid, name)) for e in accounts)]
+        if extra:
+            return 'fail', (f"{label} is granted to {', '.join(extra)} beyond the allowed "
+                            f"{', '.join(e['name'] for e in accounts)}")
+        return 'pass', f"{label} is granted to {granted}"
+    if requirement['nondomain_empty'] and domain is False:
+        if principals:
+            return 'fail', f"{label} must not be assigned on nondomain-joined systems; granted to {granted}"
+        return 'pass', f"{label} is not assigned (nondomain-joined system)"
+    missing = [e for e in accounts if not any(matches(e, p) for p in principals)]
+    required = [e for e in missing if e['scope'] == 'all' or domain]
+    if required:
+        return 'fail', f"{label} does not include {', '.join(e['name'] for e in required)} (granted to {granted})"
+    if missing and domain is None:
+        return 'unavailable', (f"{label} does not include {', '.join(e['name'] for e in missing)}, required on "
+                               f"domain-joined systems; domain membership is unknown (granted to {granted})")
+    return 'pass', f"{label} is assigned to {granted}"
+
+
+def check_audit(requirement, export):
+    """Advanced audit policy -> (state, message)"""
+    if export.audit is None:
+        return 'unavailable', "No auditpol backup"
+    state, messages = 'pass', []
+    for item in requirement['subcategories']:
+        label = f"{item['category']} >> {item['subcategory']}"
+        setting = export.audit_setting(item['subcategory'], item['guid'])
+        bit = AUDIT_SUCCESS if item['inclusion'] == 'Success' else AUDIT_FAILURE
+        if setting is None:
+            state = 'fail'
+            messages.append(f"{label} is not configured ({item['inclusion']} required)")
+        elif not setting & bit:
+            state = 'fail'
+            messages.append(f"{label} is {AUDIT_SETTINGS[setting]} ({item['inclusion']} required)")
+        else:
+            messages.append(f"{label} is {AUDIT_SETTINGS[setting]}")
+    return state, '; '.join(messages)
+
+
+def evaluate_rule(rule, export, facts=None):
+    """
+    Evaluate one policy rule.
+
+    Returns:
+        tuple: (status, finding_details)
+    """
+    facts = facts or {}
+    role = facts.get('product_type')
+    if role and '-DC-' in rule['stig_id'] and role != 'LanmanNT':
+        return 'Not_Applicable', "Rule applies to domain controllers only"
+    if role and '-MS-' in rule['stig_id'] and role == 'LanmanNT':
+        return 'Not_Applicable', "Rule applies to member servers and standalone systems only"
+    domain = facts.get('domain')
+    if rule['domain_only'] and domain is False:
+        return 'Not_Applicable', "Rule applies to domain-joined systems only"
+
+    requirement = rule['requirement']
+    if requirement['kind'] == 'setting':
+        state, message = check_setting(requirement, export)
+    elif requirement['kind'] == 'right':
+        state, message = check_right(requirement, export, domain)
+    else:
+        state, message = check_audit(requirement, export)
+    if state == 'unavailable':
+        return 'Not_Reviewed', message
+    if state == 'fail':
+        if rule['notes']:
+            message += "; Applicability: " + ' '.join(rule['notes'][:2])
+        return 'Open', message
+    return 'NotAFinding', message
+
+
+def find_exports(directory):
+    """(secedit export, auditpol backup, facts file) of a host directory (None when absent)"""
+    try:
+        entries = sorted(os.listdir(directory))
+    except OSError:
+        return None, None, None
+    lowered = {e.lower(): os.path.join(directory, e) for e in entries}
+    secedit = lowered.get(SECEDIT_FILE) or next((lowered[e] for e in lowered if e.endswith('.inf')), None)
+    audit = lowered.get(AUDIT_FILE) or next((lowered[e] for e in lowered if e.endswith('.csv')), None)
+    return secedit, audit, lowered.get(FACTS_FILE)
+
+
+def load_facts(directory, facts_file):
+    """Host facts from facts.json, else from hives or .reg exports in the host directory"""
+    if facts_file:
+        try:
+            with open(facts_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    try:
+        view = windows_registry.open_source(directory, [])
+    except registry_hive.HiveError:
+        return {}
+    try:
+        return windows_registry.host_facts(view) if view.files else {}
+    finally:
+        view.close()
+
+
+def evaluate_host(directory, platforms=None, rule_ids=None):
+    """
+    Evaluate every policy rule of the host's platform against its exports.
+
+    Args:
+        directory: Host directory with secedit.inf / audit.csv (and optionally facts.json)
+        platforms: Platform or list of platforms (default: detected from the host facts)
+        rule_ids: Vuln IDs to evaluate
+
+    Returns:
+        tuple: (info dict, list of result dicts)
+    """
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    if isinstance(platforms, str):
+        platforms = [platforms]
+    secedit, audit, facts_file = find_exports(directory)
+    facts = load_facts(directory, facts_file)
+    info = {'host': facts.get('host') or os.path.basename(os.path.normpath(directory)), 'source': directory,
+            'platform': None, 'platforms': list(platforms or []), 'facts': facts,
+            'exports': [p for p in (secedit, audit) if p], 'errors': []}
+    try:
+        export = PolicyExport(secedit, audit)
+    except PolicyExportError as e:
+        info['errors'].append(f"{directory}: {e}")
+        return info, []
+    info['errors'].extend(export.errors)
+    if facts.get('domain') is None and (facts.get('product_type') == 'LanmanNT' or export.domain_accounts()):
+        facts['domain'] = True
+    if not platforms:
+        detected = windows_registry.detect_platform(facts) if facts else None
+        platforms = [detected] if detected else []
+    info['platforms'] = platforms
+    info['platform'] = platforms[0] if platforms else None
+    if not platforms:
+        info['errors'].append("Could not determine the Windows version (add facts.json or hives, or use --platform)")
+        return info, []
+
+    results = []
+    found = set()
+    for platform in platforms:
+        rules = load_platform_rules(platform)
+        for check_id in rule_ids or rules:
+            rule = rules.get(check_id)
+            if rule is None:
+                continue
+            found.add(check_id)
+            status, details = evaluate_rule(rule, export, facts)
+            results.append({
+                'vuln_id': rule['vuln_id'],
+                'stig_id': rule['stig_id'],
+                'check_id': rule['check_id'],
+                'platform': platform,
+                'severity': rule['severity'],
+                'host': info['host'],
+                'status': status,
+                'finding_details': details,
+                'timestamp': timestamp,
+            })
+    for check_id in rule_ids or []:
+        if check_id not in found:
+            results.append({
+                'vuln_id': check_id, 'stig_id': '', 'check_id': check_id, 'platform': None,
+                'severity': 'medium', 'host': info['host'], 'status': 'ERROR',
+                'finding_details': f"{check_id} is not a secedit/auditpol rule of {', '.join(platforms)}",
+                'timestamp': timestamp,
+            })
+    return info, results
+
+
+def discover_hosts(hosts_dir):
+    """Host directories holding a secedit export or auditpol backup"""
+    hosts = []
+    for entry in sorted(os.listdir(hosts_dir)):
+        directory = os.path.join(hosts_dir, entry)
+        if os.path.isdir(directory) and any(find_exports(directory)[:2]):
+            hosts.append(directory)
+    return hosts
+
+
+################################################################################
+# COLLECTION
+################################################################################
+
+def collect(directory):
+    """
+    Export the local security policy and audit policy once (Windows, elevated).
+
+    Writes secedit.inf, audit.csv and facts.json to the directory.
+
+    Returns:
+        list of error messages
+    """
+    os.makedirs(directory, exist_ok=True)
+    errors = []
+    commands = (
+        ['secedit', '/export', '/areas', 'SECURITYPOLICY', 'USER_RIGHTS', '/cfg',
+         os.path.join(directory, SECEDIT_FILE), '/quiet'],
+        ['auditpol', '/backup', '/file:' + os.path.join(directory, AUDIT_FILE)],
+    )
+    for command in commands:
+        try:
+            completed = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       universal_newlines=True, timeout=120)
+            if completed.returncode != 0:
+                errors.append(f"{command[0]} failed ({completed.returncode}): {completed.stdout.strip()[:200]}")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            errors.append(f"{command[0]}: {e}")
+
+    facts = {'host': socket.gethostname(), 'collected': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')}
+    try:
+        facts.update(windows_registry.host_facts(windows_registry.LiveRegistry()))
+    except (ImportError, OSError) as e:
+        errors.append(f"registry: {e}")
+    try:
+        completed = subprocess.run(['powershell', '-NoProfile', '-Command',
+                                    '(Get-CimInstance Win32_ComputerSystem).PartOfDomain'],
+                                   stdout=subprocess.PIPE, universal_newlines=True, timeout=60)
+        answer = completed.stdout.strip().lower()
+        facts['domain'] = True if answer == 'true' else False if answer == 'false' else None
+    except (OSError, subprocess.TimeoutExpired):
+        facts['domain'] = None
+    with open(os.path.join(directory, FACTS_FILE), 'w') as f:
+        json.dump(facts, f, indent=2)
+    return errors
+
+
+def run_rule(check_id, platform, policy_dir=None, domain=None):
+    """
+    Evaluate one rule for a check script.
+
+    Args:
+        check_id: Vuln ID of the check
+        platform: Check directory name (e.g. windows_server_2019_v2r7)
+        policy_dir: Directory with secedit.inf / audit.csv (default: $STIG_POLICY_DIR, else a fresh
+            export of the local system on Windows)
+        domain: Domain membership of the host (default: from facts.json or the exported user rights)
+
+    Returns:
+        tuple: (status, finding_details, exit_code)
+    """
+    rule = load_platform_rules(platform).get(check_id)
+    if rule is None:
+        return 'Not_Reviewed', f"{check_id} has no secedit/auditpol requirement to evaluate", \
+            windows_registry.EXIT_CODES['Not_Reviewed']
+    policy_dir = policy_dir or os.environ.get('STIG_POLICY_DIR')
+    temporary = None
+    if not policy_dir:
+        if os.name != 'nt':
+            return 'ERROR', "No policy export (use --policy-dir or set STIG_POLICY_DIR)", \
+                windows_registry.EXIT_CODES['ERROR']
+        temporary = tempfile.TemporaryDirectory()
+        policy_dir = temporary.name
+        errors = collect(policy_dir)
+        if errors and not any(find_exports(policy_dir)[:2]):
+            temporary.cleanup()
+            return 'ERROR', '; '.join(errors), windows_registry.EXIT_CODES['ERROR']
+    try:
+        secedit, audit, facts_file = find_exports(policy_dir)
+        try:
+            export = PolicyExport(secedit, audit)
+        except PolicyExportError as e:
+            return 'ERROR', f"{policy_dir}: {e}", windows_registry.EXIT_CODES['ERROR']
+        facts = load_facts(policy_dir, facts_file)
+        if domain is not None:
+            facts['domain'] = domain
+        if facts.get('domain') is None and (facts.get('product_type') == 'LanmanNT' or export.domain_accounts()):
+            facts['domain'] = True
+        status, details = evaluate_rule(rule, export, facts)
+    finally:
+        if temporary is not None:
+            temporary.cleanup()
+    return status, details, windows_registry.EXIT_CODES.get(status, 3)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Evaluate Windows account, user rights and audit policy STIG rules from secedit/auditpol exports',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--collect', metavar='DIR', help='Export the local policies to DIR and exit (Windows)')
+    parser.add_argument('--policy-dir', help='Directory of one host\'s exports (default: $STIG_POLICY_DIR)')
+    parser.add_argument('--hosts-dir', help='Directory with one export directory per host')
+    parser.add_argument('--platform', action='append', choices=list(windows_registry.WINDOWS_PLATFORMS),
+                        help='STIG platform (default: detected from facts.json or hives)')
+    parser.add_argument('--rule', action='append', default=[], help='Vuln ID to evaluate (may be repeated)')
+    parser.add_argument('--output-json', help='Write the result of a single --rule to this file')
+    parser.add_argument('--output-dir', help='Directory for per-host results')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for --hosts-dir (default: CPU count)')
+    parser.add_argument('--list-rules', action='store_true', help='List the extracted policy requirements and exit')
+    args = parser.parse_args()
+
+    if args.collect:
+        errors = collect(args.collect)
+        for error in errors:
+            print(f"ERROR: {error}")
+        print(f"Policy exports written to {args.collect}")
+        return 3 if errors else 0
+
+    if args.list_rules:
+        if not args.platform:
+            print("ERROR: --list-rules requires --platform")
+            return 3
+        for platform in args.platform:
+            for rule in load_platform_rules(platform).values():
+                requirement = rule['requirement']
+                if requirement['kind'] == 'setting':
+                    spec = f"[{requirement['section']}] {requirement['key']} finding if " + ' or '.join(
+                        f"{op} {value}" for op, value in requirement['conditions']) + (
+                        f" (except {requirement['exceptions']})" if requirement['exceptions'] else '')
+                elif requirement['kind'] == 'right':
+                    spec = f"{requirement['right']} {requirement['mode']}: " + ', '.join(
+                        e['name'] + (' (domain)' if e['scope'] == 'domain' else '') for e in requirement['accounts'])
+                else:
+                    spec = '; '.join(f"{s['subcategory']} {s['inclusion']}" for s in requirement['subcategories'])
+                print(f"{rule['vuln_id']:<10} {rule['stig_id']:<16} {spec}")
+        return 0
+
+    if args.hosts_dir:
+        hosts = discover_hosts(args.hosts_dir)
+        if not hosts:
+            print(f"ERROR: No host directories with secedit or auditpol exports in {args.hosts_dir}")
+            return 3
+        output_root = Path(args.output_dir or 'results/security_policy')
+        totals = defaultdict(int)
+        summary = []
+        print("=" * 80)
+        print("Windows Security Policy STIG Evaluation")
+        print("=" * 80)
+        print(f"Hosts: {len(hosts)}")
+        print(f"Workers: {args.workers}")
+        print()
+        with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(hosts)))) as executor:
+            jobs = executor.map(evaluate_host, hosts, [args.platform] * len(hosts), [args.rule] * len(hosts),
+                                chunksize=max(1, len(hosts) // (args.workers * 8) or 1))
+            for info, results in jobs:
+                host_summary = windows_registry.write_host(output_root, info['host'], info, results)
+                summary.append(host_summary)
+                counts = host_summary['status_counts']
+                for status, count in counts.items():
+                    totals[status] += count
+                print(f"  {info['host'][:32]:<32} {str(info['platform'] or '-'):<26} open={counts.get('Open', 0):<3} "
+                      f"pass={counts.get('NotAFinding', 0):<3} review={counts.get('Not_Reviewed', 0)}"
+                      + (f"  ({'; '.join(info['errors'])})" if info['errors'] else ''))
+        (output_root / 'summary.json').write_text(json.dumps({
+            'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'status_counts': dict(totals),
+            'hosts': summary,
+        }, indent=2))
+        print()
+        print(f"Results written to {output_root}/<host>/")
+        if totals['ERROR'] or any(h['errors'] for h in summary):
+            return 3
+        return 1 if totals['Open'] else 0
+
+    policy_dir = args.policy_dir or os.environ.get('STIG_POLICY_DIR')
+    if not policy_dir:
+        print("ERROR: Use --policy-dir, --hosts-dir or --collect (or set STIG_POLICY_DIR)")
+        return 3
+    info, results = evaluate_host(policy_dir, args.platform, args.rule or None)
+    for error in info['errors']:
+        print(f"ERROR: {error}")
+    if not results:
+        return 3
+
+    if args.output_dir:
+        windows_registry.write_host(args.output_dir, info['host'], info, results)
+    if args.output_json and len(results) == 1:
+        with open(args.output_json, 'w') as f:
+            json.dump(results[0], f, indent=2)
+
+    for result in results:
+        print(f"{result['vuln_id']:<10} {result['stig_id']:<16} {result['status']:<15} {result['finding_details']}")
+    worst = min((r['status'] for r in results), key=windows_registry.STATUS_PRIORITY.index)
+    return windows_registry.EXIT_CODES[worst]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""
+STIG rule catalog
+Compiles the benchmark dumps of the repository (the STIG Viewer exports
+*_checks.json, the *_stigs.json collections and the analyzed_checks.json files
+under checks/) into one SQLite database with indexes on Group ID, STIG ID,
+Rule ID, SRG ID and CCI.
+
+The rules table holds only the short, indexed fields (IDs, severity, title,
+benchmark, content hash). Check Content, Fix Text and Discussion are stored
+zlib-compressed once per distinct text (the same rule appears in several
+dumps), and the rest of the original record is compressed against a
+dictionary sampled from its source. Both are read only when asked for, so a
+lookup opens the catalog and returns in a few milliseconds instead of parsing
+megabytes of JSON.
+
+Sources are compiled incrementally: a source whose size and modification time
+match the catalog is skipped, so a rebuild after editing one dump only
+recompiles that file. load_checks() returns the records of a source from the
+catalog when it is current and falls back to reading the JSON otherwise.
+DISA STIG packages are imported directly with xccdf_import.py.
+
+Usage:
+    python3 stig_catalog.py --build
+    python3 stig_catalog.py --list
+    python3 stig_catalog.py --stig-id RHEL-09-211010 --full
+    python3 stig_catalog.py --cci CCI-000366 --benchmark "Red Hat Enterprise Linux 9"
+    python3 stig_catalog.py --group V-257777 --json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+CATALOG_FILE = 'stig_catalog.db'
+SCHEMA_VERSION = 1
+
+# Benchmark dumps compiled by default, relative to the repository root
+SOURCE_PATTERNS = ('*_checks.json', '*_stigs.json', 'checks/*/*/analyzed_checks.json')
+
+# Canonical field -> keys used by the STIG Viewer export, analyzed_checks.json
+# and the *_stigs.json collections
+FIELD_KEYS = OrderedDict([
+    ('group_id', ('Group ID', 'Vuln ID', 'vuln_id')),
+    ('rule_id', ('Rule ID', 'rule_id')),
+    ('stig_id', ('STIG ID', 'stig_id')),
+    ('srg_id', ('SRG ID', 'srg_id')),
+    ('severity', ('Severity', 'severity')),
+    ('title', ('Rule Title', 'rule_title')),
+    ('cci', ('CCIs', 'CCI', 'ccis')),
+    ('legacy', ('Legacy IDs', 'Legacy', 'legacy_ids')),
+])
+
+# Long fields stored compressed and loaded on demand
+LONG_FIELDS = OrderedDict([
+    ('check_content', ('Check Content', 'check_content')),
+    ('fix_text', ('Fix Text', 'fix_text')),
+    ('discussion', ('Discussion', 'discussion')),
+])
+
+CCI_RE = re.compile(r'\bCCI-\d{6}\b')
+SRG_RE = re.compile(r'^SRG-[A-Z0-9-]+$')
+RELEASE_RE = re.compile(r'Release:\s*(\d+)(?:\s+Benchmark Date:\s*(.+?))?\s*$')
+STIG_FIELD_RE = re.compile(r'^(.*?)(?: Security Technical Implementation Guide)?\s*::\s*Version\s+(\d+),\s*(.*)$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    records INTEGER,
+    zdict BLOB
+);
+CREATE TABLE IF NOT EXISTS benchmarks (
+    id INTEGER PRIMARY KEY,
+    source INTEGER NOT NULL REFERENCES sources(id),
+    name TEXT,
+    benchmark_id TEXT,
+    version INTEGER,
+    release INTEGER,
+    benchmark_date TEXT
+);
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    source INTEGER NOT NULL REFERENCES sources(id),
+    benchmark INTEGER NOT NULL REFERENCES benchmarks(id),
+    position INTEGER NOT NULL,
+    group_id TEXT,
+    rule_id TEXT,
+    stig_id TEXT,
+    srg_id TEXT,
+    severity TEXT,
+    title TEXT,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS rule_ccis (
+    rule INTEGER NOT NULL REFERENCES rules(id),
+    cci TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rule_text (
+    rule INTEGER PRIMARY KEY REFERENCES rules(id),
+    check_content TEXT REFERENCES texts(hash),
+    fix_text TEXT REFERENCES texts(hash),
+    discussion TEXT REFERENCES texts(hash),
+    record BLOB
+);
+CREATE TABLE IF NOT EXISTS texts (
+    hash TEXT PRIMARY KEY,
+    body BLOB
+);
+CREATE INDEX IF NOT EXISTS rules_group_id ON rules(group_id);
+CREATE INDEX IF NOT EXISTS rules_rule_id ON rules(rule_id);
+CREATE INDEX IF NOT EXISTS rules_stig_id ON rules(stig_id);
+CREATE INDEX IF NOT EXISTS rules_srg_id ON rules(srg_id);
+CREATE INDEX IF NOT EXISTS rules_source ON rules(source, position);
+CREATE INDEX IF NOT EXISTS rules_benchmark ON rules(benchmark);
+CREATE INDEX IF NOT EXISTS rule_ccis_cci ON rule_ccis(cci);
+CREATE INDEX IF NOT EXISTS rule_ccis_rule ON rule_ccis(rule);
+CREATE INDEX IF NOT EXISTS benchmarks_source ON benchmarks(source);
+"""
+
+RULE_COLUMNS = ('id', 'group_id', 'rule_id', 'stig_id', 'srg_id', 'severity', 'title', 'content_hash')
+
+
+class CatalogError(Exception):
+    """Raised when the catalog cannot be opened or a source cannot be compiled"""
+
+
+def default_path():
+    """Catalog path: $STIG_CATALOG, else stig_catalog.db in the repository root"""
+    return Path(os.environ.get('STIG_CATALOG') or REPO_ROOT / CATALOG_FILE)
+
+
+def source_key(path):
+    """Path of a source as stored in the catalog (relative to the repository root when inside it)"""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def find_sources(root=REPO_ROOT):
+    """Benchmark dump files matching SOURCE_PATTERNS under root"""
+    sources = set()
+    for pattern in SOURCE_PATTERNS:
+        sources.update(p for p in Path(root).glob(pattern) if p.is_file())
+    return sorted(sources)
+
+
+################################################################################
+# RECORD NORMALIZATION
+################################################################################
+
+def field(record, keys):
+    """First non-empty value of record among keys, as stripped text"""
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ''):
+            return str(value).strip()
+    return ''
+
+
+def field_key(record, keys):
+    """Key of record present among keys, or None"""
+    for key in keys:
+        if key in record:
+            return key
+    return None
+
+
+def normalize_rule_id(rule_id):
+    """'SV-257777r991589_rule' -> 'SV-257777r991589'"""
+    return rule_id[:-5] if rule_id.endswith('_rule') else rule_id
+
+
+def benchmark_info(record):
+    """
+    Benchmark of a record from whichever fields its dump carries.
+
+    Returns:
+        tuple: (name, benchmark ID, version, release, benchmark date)
+    """
+    name = field(record, ('Benchmark Name', 'benchmark'))
+    version = field(record, ('Version', 'version'))
+    release_text = field(record, ('Release Info', 'release'))
+    stig = field(record, ('STIG',))
+    if stig:
+        match = STIG_FIELD_RE.match(stig)
+        if match:
+            name = name or match.group(1).strip()
+            version = version or match.group(2)
+            release_text = release_text or match.group(3)
+        else:
+            name = name or stig
+    release, date = None, ''
+    match = RELEASE_RE.search(release_text)
+    if match:
+        release = int(match.group(1))
+        date = (match.group(2) or '').strip()
+    return (name, field(record, ('Benchmark ID',)), int(version) if version.isdigit() else None, release, date)
+
+
+def content_hash(title, texts):
+    """Hash of the rule content that identifies a changed rule between releases"""
+    digest = hashlib.sha1()
+    for part in (title, texts['check_content'], texts['fix_text'], texts['discussion']):
+        digest.update(' '.join(part.split()).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def normalize(record):
+    """
+    Split a dump record into its indexed fields and compressed long fields.
+
+    Returns:
+        tuple: (dict of indexed fields, list of CCIs, dict of long field texts,
+        the record with the long fields blanked, preserving key order)
+    """
+    fields = {name: field(record, keys) for name, keys in FIELD_KEYS.items()}
+    fields['rule_id'] = normalize_rule_id(fields['rule_id'])
+    if not fields['srg_id']:
+        group_title = field(record, ('Group Title',))
+        if SRG_RE.match(group_title):
+            fields['srg_id'] = group_title
+    fields['severity'] = fields['severity'].lower()
+    ccis = list(OrderedDict.fromkeys(CCI_RE.findall(fields.pop('cci'))))
+    texts = {}
+    rest = OrderedDict(record)
+    for name, keys in LONG_FIELDS.items():
+        key = field_key(record, keys)
+        texts[name] = str(record[key]) if key and record[key] is not None else ''
+        if key:
+            rest[key] = None
+    fields['content_hash'] = content_hash(fields['title'], texts)
+    return fields, ccis, texts, rest
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def pack(text, zdict=None):
+    if zdict:
+        compressor = zlib.compressobj(6, zdict=zdict)
+        return compressor.compress(text.encode('utf-8')) + compressor.flush()
+    return zlib.compress(text.encode('utf-8'), 6)
+
+
+def unpack(blob, zdict=None):
+    if blob is None:
+        return ''
+    if zdict:
+        decompressor = zlib.decompressobj(zdict=zdict)
+        return (decompressor.decompress(blob) + decompressor.flush()).decode('utf-8')
+    return zlib.decompress(blob).decode('utf-8')
+
+
+def sample_dictionary(records, size=32768):
+    """Compression dictionary for the records of one source: the tail of its first records"""
+    sample = ''.join(json.dumps(r) for r in records[:24] if isinstance(r, dict))
+    return sample.encode('utf-8')[-size:]
+
+
+################################################################################
+# CATALOG
+################################################################################
+
+class Catalog(object):
+    """
+    Compiled rule catalog (SQLite).
+
+    Lookups return dicts of the indexed fields plus the benchmark name, version
+    and release; the long fields are read with text() or full=True.
+    """
+
+    def __init__(self, path=None, readonly=False):
+        self.path = Path(path) if path else default_path()
+        self.readonly = readonly
+        try:
+            if readonly:
+                if not self.path.is_file():
+                    raise CatalogError(f"{self.path}: catalog not found (run stig_catalog.py --build)")
+                self.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.db = sqlite3.connect(str(self.path))
+                self.db.executescript(SCHEMA)
+                self._check_schema()
+        except sqlite3.Error as e:
+            raise CatalogError(f"{self.path}: {e}")
+        self.db.row_factory = sqlite3.Row
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check_schema(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row and int(row[0]) == SCHEMA_VERSION:
+            return
+        if row:
+            # Compiled by an older layout: recompile everything
+            for table in ('texts', 'rule_text', 'rule_ccis', 'rules', 'benchmarks', 'sources'):
+                self.db.execute(f"DELETE FROM {table}")
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.db.commit()
+
+    # ------------------------------------------------------------------ build
+
+    def source_row(self, path):
+        return self.db.execute("SELECT * FROM sources WHERE path = ?", (source_key(path),)).fetchone()
+
+    def is_current(self, path):
+        """True when the source is compiled and unchanged on disk"""
+        row = self.source_row(path)
+        if row is None:
+            return False
+        try:
+            stat = os.stat(str(path))
+        except OSError:
+            return False
+        return row['size'] == stat.st_size and row['mtime_ns'] == stat.st_mtime_ns
+
+    def remove_source(self, key):
+        """Delete a source and its benchmarks and rules"""
+        row = self.db.execute("SELECT id FROM sources WHERE path = ?", (key,)).fetchone()
+        if row is None:
+            return
+        source_id = row[0]
+        rule_ids = "SELECT id FROM rules WHERE source = ?"
+        self.db.execute(f"DELETE FROM rule_text WHERE rule IN ({rule_ids})", (source_id,))
+        self.db.execute(f"DELETE FROM rule_ccis WHERE rule IN ({rule_ids})", (source_id,))
+        self.db.execute("DELETE FROM rules WHERE source = ?", (source_id,))
+        self.db.execute("DELETE FROM benchmarks WHERE source = ?", (source_id,))
+        self.db.execute("DELETE FROM sources WHERE id = ?", (source_id,))
+
+    def prune_texts(self):
+        """Delete long texts no longer referenced by any rule"""
+        with self.db:
+            self.db.execute(
+                "DELETE FROM texts WHERE hash NOT IN (SELECT check_content FROM rule_text UNION "
+                "SELECT fix_text FROM rule_text UNION SELECT discussion FROM rule_text)")
+
+    def store_text(self, text):
+        """Store a long text once; returns its hash"""
+        digest = text_hash(text)
+        if self.db.execute("SELECT 1 FROM texts WHERE hash = ?", (digest,)).fetchone() is None:
+            self.db.execute("INSERT INTO texts (hash, body) VALUES (?, ?)", (digest, pack(text)))
+        return digest
+
+    def compile_source(self, path):
+        """
+        (Re)compile one JSON dump into the catalog.
+
+        Returns:
+            int: number of rules compiled
+        """
+        path = Path(path)
+        try:
+            stat = path.stat()
+            with open(path, encoding='utf-8') as f:
+                records = json.load(f, object_pairs_hook=OrderedDict)
+        except (OSError, ValueError) as e:
+            raise CatalogError(f"{path}: {e}")
+        if not isinstance(records, list):
+            raise CatalogError(f"{path}: not a list of rule records")
+        writer = SourceWriter(self, source_key(path), stat.st_size, stat.st_mtime_ns)
+        try:
+            writer.add(records)
+        except Exception:
+            writer.abort()
+            raise
+        writer.finish()
+        return len(records)
+
+    def refresh(self, sources=None, prune=True):
+        """
+        Compile changed sources and drop sources that no longer exist.
+
+        Returns:
+            dict: compiled (path -> rule count), skipped (paths), errors (messages), removed (paths)
+        """
+        sources = [Path(p) for p in sources] if sources is not None else find_sources()
+        report = {'compiled': OrderedDict(), 'skipped': [], 'errors': [], 'removed': []}
+        for path in sources:
+            if self.is_current(path):
+                report['skipped'].append(source_key(path))
+                continue
+            try:
+                report['compiled'][source_key(path)] = self.compile_source(path)
+            except CatalogError as e:
+                report['errors'].append(str(e))
+        if prune:
+            for row in self.db.execute("SELECT path FROM sources").fetchall():
+                if not (REPO_ROOT / row[0]).is_file() and not Path(row[0]).is_file():
+                    with self.db:
+                        self.remove_source(row[0])
+                    report['removed'].append(row[0])
+        if report['compiled'] or report['removed']:
+            self.prune_texts()
+        return report
+
+    # ----------------------------------------------------------------- lookup
+
+    def benchmarks(self):
+        """Compiled benchmarks with their source and rule count"""
+        rows = self.db.execute(
+            "SELECT b.id, b.name, b.benchmark_id, b.version, b.release, b.benchmark_date, s.path AS source, "
+            "(SELECT COUNT(*) FROM rules r WHERE r.benchmark = b.id) AS rules "
+            "FROM benchmarks b JOIN sources s ON s.id = b.source WHERE s.path NOT LIKE '%.partial' ORDER BY b.name, b.version, b.release, s.path")
+        return [dict(row) for row in rows]
+
+    def find(self, group_id=None, rule_id=None, stig_id=None, srg_id=None, cci=None, benchmark=None,
+             source=None, full=False):
+        """
+        Rules matching all given criteria.
+
+        A rule_id without its revision ('SV-257777') matches every revision.
+        benchmark matches the benchmark name case-insensitively; source is a
+        dump path.
+
+        Returns:
+            list of dicts: the indexed fields, the benchmark (name, version,
+            release, source) and, with full=True, the long fields
+        """
+        clauses, params = [], []
+        for column, value in (('group_id', group_id), ('stig_id', stig_id), ('srg_id', srg_id)):
+            if value:
+                clauses.append(f"r.{column} = ?")
+                params.append(value)
+        if rule_id:
+            rule_id = normalize_rule_id(rule_id)
+            if re.search(r'r\d+$', rule_id):
+                clauses.append("r.rule_id = ?")
+                params.append(rule_id)
+            else:
+                clauses.append("r.rule_id GLOB ?")
+                params.append(rule_id + 'r*')
+        if cci:
+            clauses.append("r.id IN (SELECT rule FROM rule_ccis WHERE cci = ?)")
+            params.append(cci)
+        if benchmark:
+            clauses.append("b.name = ? COLLATE NOCASE")
+            params.append(benchmark)
+        if source:
+            clauses.append("s.path = ?")
+            params.append(source_key(source) if os.path.exists(str(source)) else source)
+        query = (
+            "SELECT " + ', '.join(f"r.{c}" for c in RULE_COLUMNS) + ", "
+            "b.name AS benchmark, b.version, b.release, s.path AS source "
+            "FROM rules r JOIN benchmarks b ON b.id = r.benchmark JOIN sources s ON s.id = r.source"
+            " WHERE " + ' AND '.join(clauses + ["s.path NOT LIKE '%.partial'"]) + " ORDER BY s.path, r.position")
+        rules = [dict(row) for row in self.db.execute(query, params)]
+        for rule in rules:
+            rule['ccis'] = self.ccis(rule['id'])
+            if full:
+                rule.update(self.text(rule['id']))
+        return rules
+
+    def ccis(self, rule):
+        return [row[0] for row in self.db.execute("SELECT cci FROM rule_ccis WHERE rule = ? ORDER BY rowid", (rule,))]
+
+    def text(self, rule, fields=None):
+        """Long fields of a rule (check_content, fix_text, discussion), decompressed on demand"""
+        fields = list(fields or LONG_FIELDS)
+        unknown = set(fields) - set(LONG_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown long field(s): {', '.join(sorted(unknown))}")
+        row = self.db.execute(f"SELECT {', '.join(fields)} FROM rule_text WHERE rule = ?", (rule,)).fetchone()
+        return {name: self._text(row[name]) if row else '' for name in fields}
+
+    def _text(self, digest):
+        row = self.db.execute("SELECT body FROM texts WHERE hash = ?", (digest,)).fetchone()
+        return unpack(row[0]) if row else ''
+
+    def record(self, rule):
+        """Original dump record of a rule, with the field names and order of its source"""
+        row = self.db.execute(
+            "SELECT t.*, s.zdict FROM rule_text t JOIN rules r ON r.id = t.rule JOIN sources s ON s.id = r.source "
+            "WHERE t.rule = ?", (rule,)).fetchone()
+        return self._restore(row, row['zdict']) if row else None
+
+    def _restore(self, row, zdict):
+        record = json.loads(unpack(row['record'], zdict), object_pairs_hook=OrderedDict)
+        for name, keys in LONG_FIELDS.items():
+            key = field_key(record, keys)
+            if key:
+                record[key] = self._text(row[name])
+        return record
+
+    def records(self, source):
+        """All records of a compiled source in their original order"""
+        source = self.source_row(source)
+        if source is None:
+            return []
+        rows = self.db.execute(
+            "SELECT t.* FROM rule_text t JOIN rules r ON r.id = t.rule WHERE r.source = ? ORDER BY r.position",
+            (source['id'],))
+        return [self._restore(row, source['zdict']) for row in rows]
+
+
+class SourceWriter(object):
+    """
+    Streams the records of one source into the catalog.
+
+    Records are written under a temporary source entry and committed per
+    batch; finish() replaces the previous compile of the source in one
+    transaction, and abort() drops what was written, so readers never see a
+    half-imported source. The compression dictionary is sampled from the first
+    batch.
+    """
+
+    def __init__(self, catalog, key, size, mtime_ns):
+        self.catalog = catalog
+        self.db = catalog.db
+        self.key = key
+        self.partial = key + '.partial'
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.source_id = None
+        self.zdict = None
+        self.benchmarks = {}
+        self.position = 0
+
+    def _start(self, records):
+        self.zdict = sample_dictionary(records)
+        self.catalog.remove_source(self.partial)
+        self.source_id = self.db.execute(
+            "INSERT INTO sources (path, size, mtime_ns, records, zdict) VALUES (?, ?, ?, 0, ?)",
+            (self.partial, self.size, self.mtime_ns, self.zdict)).lastrowid
+
+    def add(self, records):
+        """Write a batch of records (committed when the batch is written)"""
+        records = list(records)
+        with self.db:
+            if self.source_id is None:
+                self._start(records)
+            for record in records:
+                position = self.position
+                self.position += 1
+                if not isinstance(record, dict):
+                    continue
+                info = benchmark_info(record)
+                if info not in self.benchmarks:
+                    self.benchmarks[info] = self.db.execute(
+                        "INSERT INTO benchmarks (source, name, benchmark_id, version, release, benchmark_date) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", (self.source_id,) + info).lastrowid
+                fields, ccis, texts, rest = normalize(record)
+                rule = self.db.execute(
+                    "INSERT INTO rules (source, benchmark, position, group_id, rule_id, stig_id, srg_id, severity, "
+                    "title, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.source_id, self.benchmarks[info], position, fields['group_id'], fields['rule_id'],
+                     fields['stig_id'], fields['srg_id'], fields['severity'], fields['title'],
+                     fields['content_hash'])).lastrowid
+                self.db.executemany("INSERT INTO rule_ccis (rule, cci) VALUES (?, ?)", [(rule, c) for c in ccis])
+                self.db.execute(
+                    "INSERT INTO rule_text (rule, check_content, fix_text, discussion, record) VALUES (?, ?, ?, ?, ?)",
+                    (rule, self.catalog.store_text(texts['check_content']),
+                     self.catalog.store_text(texts['fix_text']), self.catalog.store_text(texts['discussion']),
+                     pack(json.dumps(rest), self.zdict)))
+
+    def finish(self):
+        """Replace the previous compile of the source; returns the record count"""
+        with self.db:
+            if self.source_id is None:
+                self._start([])
+            self.catalog.remove_source(self.key)
+            self.db.execute("UPDATE sources SET path = ?, records = ? WHERE id = ?",
+                            (self.key, self.position, self.source_id))
+        return self.position
+
+    def abort(self):
+        with self.db:
+            self.catalog.remove_source(self.partial)
+
+
+def load_checks(path, catalog=None):
+    """
+    Records of a benchmark dump, like json.load(open(path)).
+
+    Read from the catalog when it holds a current compile of the file, else
+    from the JSON itself.
+    """
+    path = Path(path)
+    try:
+        owned = catalog is None
+        catalog = catalog or Catalog(readonly=True)
+        try:
+            if catalog.is_current(path):
+                return catalog.records(path)
+        finally:
+            if owned:
+                catalog.close()
+    except (CatalogError, sqlite3.Error):
+        pass
+    with open(path, encoding='utf-8') as f:
+        return json.load(f, object_pairs_hook=OrderedDict)
+
+
+################################################################################
+# CLI
+################################################################################
+
+def print_rule(rule, full=False):
+    print(f"{rule['group_id']:<10} {rule['stig_id']:<22} {rule['severity']:<7} {rule['rule_id']:<20} "
+          f"{rule['benchmark']} V{rule['version'] or '?'}R{rule['release'] or '?'}")
+    print(f"    {rule['title']}")
+    if rule['srg_id'] or rule['ccis']:
+        print(f"    {rule['srg_id']}  {' '.join(rule['ccis'])}".rstrip())
+    if full:
+        for name in LONG_FIELDS:
+            print(f"  {name.replace('_', ' ').title()}:")
+            for line in rule[name].splitlines():
+                print(f"    {line}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Compile and query the STIG rule catalog',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--catalog', help=f'Catalog database (default: $STIG_CATALOG or {CATALOG_FILE})')
+    parser.add_argument('--build', action='store_true', help='Compile new and changed benchmark dumps')
+    parser.add_argument('--source', action='append', default=[],
+                        help='Dump file to compile with --build (may be repeated; default: all dumps)')
+    parser.add_argument('--list', action='store_true', help='List the compiled benchmarks')
+    parser.add_argument('--group', help='Group ID (V-xxxxxx)')
+    parser.add_argument('--rule', help='Rule ID (SV-xxxxxx, with or without revision)')
+    parser.add_argument('--stig-id', help='STIG ID')
+    parser.add_argument('--srg', help='SRG ID')
+    parser.add_argument('--cci', help='CCI (CCI-xxxxxx)')
+    parser.add_argument('--benchmark', help='Benchmark name')
+    parser.add_argument('--full', action='store_true', help='Include check content, fix text and discussion')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    try:
+        catalog = Catalog(args.catalog, readonly=not args.build)
+    except CatalogError as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    with catalog:
+        if args.build:
+            report = catalog.refresh(args.source or None, prune=not args.source)
+            for path, count in report['compiled'].items():
+                print(f"  compiled {path} ({count} rules)")
+            for path in report['removed']:
+                print(f"  removed {path}")
+            for error in report['errors']:
+                print(f"ERROR: {error}")
+            print(f"{len(report['compiled'])} compiled, {len(report['skipped'])} current, "
+                  f"{len(report['removed'])} removed -> {catalog.path}")
+            if report['errors']:
+                return 3
+
+        if args.list:
+            benchmarks = catalog.benchmarks()
+            if args.json:
+                print(json.dumps(benchmarks, indent=2))
+            for b in [] if args.json else benchmarks:
+                print(f"{b['name'][:56]:<56} V{b['version'] or '?'}R{b['release'] or '?':<4} {b['rules']:>5}  {b['source']}")
+            return 0
+
+        criteria = dict(group_id=args.group, rule_id=args.rule, stig_id=args.stig_id, srg_id=args.srg,
+                        cci=args.cci, benchmark=args.benchmark)
+        if not any(criteria.values()):
+            if not args.build:
+                parser.print_usage()
+            return 0
+        rules = catalog.find(full=args.full, **criteria)
+        if args.json:
+            print(json.dumps(rules, indent=2))
+        else:
+            for rule in rules:
+                print_rule(rule, args.full)
+            print(f"{len(rules)} rule(s)")
+        return 0 if rules else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+STIG release diff
+Compares two releases of a STIG rule by rule and classifies every rule as
+added, removed, check_changed, fix_changed, title_only, metadata_only or
+unchanged. Rules are matched by Group ID, then by Rule ID (without revision),
+then by STIG ID, and compared on whitespace-normalized hashes of their check
+content, fix text, title and remaining metadata.
+
+A release is given as a benchmark dump (JSON, optionally ":V<v>R<r>" to select
+one release from a dump that holds several), a check directory (its
+analyzed_checks.json, else the <directory name>_checks.json dump at the
+repository root, with the release taken from the directory name), a package
+compiled into the rule catalog, or "<Benchmark Name>:V<v>R<r>" from the
+catalog.
+
+The change list written with --output feeds the generators: run them with
+STIG_CHANGES=<file> (or --changes on generators that take arguments) and they
+rewrite only the scripts of added and changed rules of that release; other
+benchmarks and unchanged rules are left alone. Rules listed under "review"
+(added, check or fix changed) need their check logic re-reviewed.
+
+Usage:
+    python3 stig_diff.py checks/os/oracle_linux_8_v1r7 checks/os/oracle_linux_8_v2r5
+    python3 stig_diff.py weblogic_checks.json oracle_weblogic_12c_v2r2_checks.json --output weblogic_changes.json
+    python3 stig_diff.py "Oracle Linux 8:V2R2" "Oracle Linux 8:V2R5" --json
+    STIG_CHANGES=weblogic_changes.json python3 generate_all_oracle_stigs.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+import stig_catalog
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHECK_CHANGED = 'check_changed'
+FIX_CHANGED = 'fix_changed'
+TITLE_ONLY = 'title_only'
+METADATA_ONLY = 'metadata_only'
+UNCHANGED = 'unchanged'
+
+CHANGE_ORDER = (ADDED, REMOVED, CHECK_CHANGED, FIX_CHANGED, TITLE_ONLY, METADATA_ONLY, UNCHANGED)
+
+# Changes whose scripts are rewritten, and whose check logic must be reviewed
+REGENERATE = (ADDED, CHECK_CHANGED, FIX_CHANGED, TITLE_ONLY, METADATA_ONLY)
+REVIEW = (ADDED, CHECK_CHANGED, FIX_CHANGED)
+
+RELEASE_SUFFIX_RE = re.compile(r'[_:@ ]v(\d+)r(\d+)$', re.I)
+
+
+class ReleaseError(Exception):
+    """Raised when a release cannot be resolved or loaded"""
+
+
+################################################################################
+# RELEASES
+################################################################################
+
+def text_hash(text):
+    return hashlib.sha1(' '.join((text or '').split()).encode('utf-8')).hexdigest()
+
+
+def rule_number(rule_id):
+    """'SV-257777r991589' -> 'SV-257777'"""
+    return re.sub(r'r\d+$', '', rule_id)
+
+
+def rule_entry(record):
+    """Comparable form of a dump record: IDs plus hashes of each part of its content"""
+    fields, ccis, texts, _ = stig_catalog.normalize(record)
+    return OrderedDict([
+        ('group_id', fields['group_id']),
+        ('rule_id', fields['rule_id']),
+        ('stig_id', fields['stig_id']),
+        ('title', ' '.join(fields['title'].split())),
+        ('check', text_hash(texts['check_content'])),
+        ('fix', text_hash(texts['fix_text'])),
+        ('title_hash', text_hash(fields['title'])),
+        ('metadata', text_hash('\x00'.join([fields['severity'], fields['srg_id'], fields['stig_id'], ' '.join(ccis),
+                                            texts['discussion']]))),
+    ])
+
+
+def benchmark_label(info):
+    name, _, version, release, _ = info
+    return f"{name} V{version if version is not None else '?'}R{release if release is not None else '?'}"
+
+
+def select_release(records, version=None, release=None):
+    """
+    Records of one benchmark release from a dump.
+
+    Without version/release the dump must hold a single release, else the
+    release with the most rules is taken.
+
+    Returns:
+        tuple: (benchmark info, records)
+    """
+    by_release = OrderedDict()
+    for record in records:
+        if isinstance(record, dict):
+            by_release.setdefault(stig_catalog.benchmark_info(record), []).append(record)
+    if not by_release:
+        raise ReleaseError('no rule records')
+    if version is not None:
+        matching = [info for info in by_release if info[2] == version and info[3] == release]
+        if not matching:
+            found = ', '.join(benchmark_label(info) for info in by_release)
+            raise ReleaseError(f"release V{version}R{release} not found (has {found})")
+        info = matching[0]
+    else:
+        info = max(by_release, key=lambda i: len(by_release[i]))
+    return info, by_release[info]
+
+
+def resolve_release(spec):
+    """
+    Locate the records of a release specification.
+
+    Returns:
+        tuple: (label of the source, records, version, release)
+    """
+    version = release = None
+    path = Path(spec)
+    if not path.exists():
+        match = RELEASE_SUFFIX_RE.search(spec)
+        if match and Path(spec[:match.start()]).exists():
+            version, release = int(match.group(1)), int(match.group(2))
+            path = Path(spec[:match.start()])
+    if path.is_dir():
+        match = RELEASE_SUFFIX_RE.search(path.name)
+        if match and version is None:
+            version, release = int(match.group(1)), int(match.group(2))
+        candidates = [path / 'analyzed_checks.json', stig_catalog.REPO_ROOT / f"{path.name}_checks.json"]
+        dump = next((c for c in candidates if c.is_file()), None)
+        if dump is None:
+            raise ReleaseError(f"{spec}: no analyzed_checks.json or {path.name}_checks.json dump")
+        path = dump
+    if path.is_file():
+        if path.suffix.lower() == '.json':
+            try:
+                return str(path), stig_catalog.load_checks(path), version, release
+            except (OSError, ValueError) as e:
+                raise ReleaseError(f"{path}: {e}")
+        try:
+            with stig_catalog.Catalog(readonly=True) as catalog:
+                records = catalog.records(path)
+        except stig_catalog.CatalogError as e:
+            raise ReleaseError(str(e))
+        if not records:
+            raise ReleaseError(f"{path}: not in the rule catalog (import it with xccdf_import.py)")
+        return str(path), records, version, release
+
+    # "<Benchmark Name>:V<v>R<r>" from the catalog
+    match = RELEASE_SUFFIX_RE.search(spec)
+    if not match:
+        raise ReleaseError(f"{spec}: not a file, directory or '<Benchmark Name>:V<v>R<r>'")
+    name = spec[:match.start()].strip()
+    version, release = int(match.group(1)), int(match.group(2))
+    try:
+        with stig_catalog.Catalog(readonly=True) as catalog:
+            for benchmark in catalog.benchmarks():
+                if (benchmark['name'].lower() == name.lower() and benchmark['version'] == version
+                        and benchmark['release'] == release):
+                    return benchmark['source'], catalog.records(benchmark['source']), version, release
+    except stig_catalog.CatalogError as e:
+        raise ReleaseError(str(e))
+    raise ReleaseError(f"{spec}: benchmark release not found in the rule catalog")
+
+
+def load_release(spec):
+    """
+    Load one release for comparison.
+
+    Returns:
+        dict: source, benchmark, version, release, rules (Group ID -> entry),
+        duplicates (number of repeated Group IDs dropped)
+    """
+    source, records, version, release = resolve_release(spec)
+    try:
+        info, records = select_release(records, version, release)
+    except ReleaseError as e:
+        raise ReleaseError(f"{spec}: {e}")
+    rules = OrderedDict()
+    duplicates = 0
+    for record in records:
+        entry = rule_entry(record)
+        if not entry['group_id'] or entry['group_id'] in rules:
+            duplicates += 1
+            continue
+        rules[entry['group_id']] = entry
+    return {
+        'source': source,
+        'benchmark': info[0],
+        'version': info[2],
+        'release': info[3],
+        'rules': rules,
+        'duplicates': duplicates,
+    }
+
+
+################################################################################
+# DIFF
+################################################################################
+
+def classify(old, new):
+    """Change class of a matched rule pair and the parts that differ"""
+    fields = [name for name in ('check', 'fix', 'title_hash', 'metadata') if old[name] != new[name]]
+    if old['rule_id'] != new['rule_id']:
+        fields.append('rule_id')
+    fields = ['title' if f == 'title_hash' else f for f in fields]
+    if 'check' in fields:
+        return CHECK_CHANGED, fields
+    if 'fix' in fields:
+        return FIX_CHANGED, fields
+    if 'title' in fields:
+        return TITLE_ONLY if fields == ['title'] else METADATA_ONLY, fields
+    if fields:
+        return METADATA_ONLY, fields
+    return UNCHANGED, fields
+
+
+def match_rules(old_rules, new_rules):
+    """Pairs (old entry or None, new entry or None): by Group ID, then rule number, then STIG ID"""
+    pairs = []
+    unmatched_old = OrderedDict(old_rules)
+    unmatched_new = OrderedDict()
+    for group_id, entry in new_rules.items():
+        if group_id in unmatched_old:
+            pairs.append((unmatched_old.pop(group_id), entry))
+        else:
+            unmatched_new[group_id] = entry
+    for key in (lambda e: rule_number(e['rule_id']), lambda e: e['stig_id']):
+        index = {}
+        for group_id, entry in unmatched_old.items():
+            if key(entry):
+                index.setdefault(key(entry), group_id)
+        for group_id, entry in list(unmatched_new.items()):
+            old_group = index.pop(key(entry), None) if key(entry) else None
+            if old_group is not None and old_group in unmatched_old:
+                pairs.append((unmatched_old.pop(old_group), entry))
+                del unmatched_new[group_id]
+    pairs.extend((None, entry) for entry in unmatched_new.values())
+    pairs.extend((entry, None) for entry in unmatched_old.values())
+    return pairs
+
+
+def diff_releases(old, new):
+    """
+    Rule-by-rule comparison of two loaded releases.
+
+    Returns:
+        dict: old and new release descriptions, summary (class -> count),
+        changes (list of dicts in the order of the new release, removed last),
+        regenerate and review (Group IDs of the new release)
+    """
+    changes = []
+    for old_entry, new_entry in match_rules(old['rules'], new['rules']):
+        if old_entry is None:
+            change, fields = ADDED, []
+        elif new_entry is None:
+            change, fields = REMOVED, []
+        else:
+            change, fields = classify(old_entry, new_entry)
+        current = new_entry or old_entry
+        item = OrderedDict([
+            ('group_id', current['group_id']),
+            ('rule_id', current['rule_id']),
+            ('stig_id', current['stig_id']),
+            ('change', change),
+            ('fields', fields),
+            ('title', current['title']),
+        ])
+        if old_entry is not None and new_entry is not None and old_entry['group_id'] != new_entry['group_id']:
+            item['old_group_id'] = old_entry['group_id']
+        if old_entry is not None and new_entry is not None and old_entry['rule_id'] != new_entry['rule_id']:
+            item['old_rule_id'] = old_entry['rule_id']
+        changes.append(item)
+    summary = OrderedDict((change, 0) for change in CHANGE_ORDER)
+    for item in changes:
+        summary[item['change']] += 1
+
+    def describe(release):
+        return OrderedDict((k, release[k]) for k in ('source', 'benchmark', 'version', 'release', 'duplicates'))
+
+    return OrderedDict([
+        ('old', describe(old)),
+        ('new', describe(new)),
+        ('summary', summary),
+        ('regenerate', [c['group_id'] for c in changes if c['change'] in REGENERATE]),
+        ('review', [c['group_id'] for c in changes if c['change'] in REVIEW]),
+        ('changes', changes),
+    ])
+
+
+################################################################################
+# GENERATOR SUPPORT
+################################################################################
+
+_change_lists = {}
+
+
+def load_changes(path):
+    """Change list written by stig_diff.py --output (read once per process)"""
+    path = str(path)
+    if path not in _change_lists:
+        with open(path, encoding='utf-8') as f:
+            _change_lists[path] = json.load(f)
+    return _change_lists[path]
+
+
+def select_checks(checks, changes=None):
+    """
+    Checks a generator should write.
+
+    Without a change list (argument or $STIG_CHANGES) every check is
+    returned. With one, only the added and changed rules are returned, and
+    only for checks of the release the list was made for; checks of other
+    benchmarks are left alone.
+    """
+    changes = changes or os.environ.get('STIG_CHANGES')
+    if not changes:
+        return checks
+    if not isinstance(changes, dict):
+        changes = load_changes(changes)
+    target = changes['new']
+    wanted = set(changes['regenerate'])
+    selected = []
+    for check in checks:
+        name, _, version, release, _ = stig_catalog.benchmark_info(check)
+        if name and name.lower() != (target['benchmark'] or '').lower():
+            continue
+        if version is not None and target['version'] is not None and version != target['version']:
+            continue
+        if release is not None and target['release'] is not None and release != target['release']:
+            continue
+        if stig_catalog.field(check, stig_catalog.FIELD_KEYS['group_id']) in wanted:
+            selected.append(check)
+    return selected
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Compare two STIG releases rule by rule',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('old', help='Old release (dump, check directory, catalog package or "Name:VxRy")')
+    parser.add_argument('new', help='New release')
+    parser.add_argument('--output', help='Write the change list (JSON) for the generators')
+    parser.add_argument('--json', action='store_true', help='Print the change list as JSON')
+    parser.add_argument('--all', action='store_true', help='Also list unchanged rules')
+    args = parser.parse_args()
+
+    try:
+        old = load_release(args.old)
+        new = load_release(args.new)
+    except ReleaseError as e:
+        print(f"ERROR: {e}")
+        return 3
+    result = diff_releases(old, new)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print("=" * 80)
+    print("STIG Release Diff")
+    print("=" * 80)
+    for label, release in (('Old', old), ('New', new)):
+        duplicates = f" ({release['duplicates']} duplicate records ignored)" if release['duplicates'] else ''
+        print(f"{label}: {release['benchmark']} V{release['version']}R{release['release']} "
+              f"- {len(release['rules'])} rules from {release['source']}{duplicates}")
+    print()
+    for change in CHANGE_ORDER:
+        items = [c for c in result['changes'] if c['change'] == change]
+        if not items or (change == UNCHANGED and not args.all):
+            continue
+        print(f"{change} ({len(items)}):")
+        for item in items:
+            extra = f" [{', '.join(item['fields'])}]" if item['fields'] else ''
+            renamed = f" (was {item['old_group_id']})" if item.get('old_group_id') else ''
+            print(f"  {item['group_id']:<10} {item['stig_id']:<22} {item['title'][:60]}{extra}{renamed}")
+        print()
+    print("Summary: " + ', '.join(f"{k}={v}" for k, v in result['summary'].items()))
+    print(f"Scripts to regenerate: {len(result['regenerate'])}, rules to review: {len(result['review'])}")
+    if args.output:
+        print(f"Change list written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
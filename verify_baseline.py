@@ -1,39 +1,17 @@
 #!/usr/bin/env python3
 """Verify the implementation count matches our tracking"""
 
-from pathlib import Path
+import script_index
 
-def is_implemented(file_path):
-    """Check if file is implemented (has exit 0, 1, or 2 with proper implementation)"""
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        
-        # Check for manual review implementation (exit 2)
-        if 'exit 2  # Manual review required' in content or \
-           ('Manual review required' in content and 'exit 2' in content) or \
-           ('Not_Reviewed' in content and 'EXIT_CODE=2' in content):
-            return True
-        
-        # Check for actual implementation (exit 0 or 1)
-        if ('exit 0' in content or 'exit 1' in content) and \
-           'TODO: Implement' not in content:
-            return True
-        
-        return False
-    except:
-        return False
-
-# Count all scripts
-all_scripts = []
-for pattern in ['**/*.sh', '**/*.ps1']:
-    scripts = list(Path('checks').glob(pattern))
-    all_scripts.extend(scripts)
+# Count all scripts (implemented: manual review framework with exit 2, or exit 0/1 without a TODO)
+with script_index.open_index() as index:
+    all_scripts = index.scripts(suffixes=('.sh', '.ps1'))
 
 print("=" * 80)
 print("IMPLEMENTATION VERIFICATION")
 print("=" * 80)
 
-implemented = sum(1 for s in all_scripts if is_implemented(s))
+implemented = sum(1 for s in all_scripts if s['implemented'])
 total = len(all_scripts)
 
 print(f"Total scripts in checks/: {total:,}")
@@ -2,29 +2,8 @@
 """Verify actual implementation status by checking exit codes"""
 
 from pathlib import Path
-import re
-
-def check_real_implementation(script_path):
-    """Check if script has real implementation or just placeholder"""
-    try:
-        content = script_path.read_text(encoding='utf-8', errors='ignore')
-        
-        # Check for placeholder/not implemented patterns
-        if 'exit 3  # Not implemented' in content:
-            return False
-        if 'exit 3  # ERROR - Not yet implemented' in content:
-            return False
-        if 'echo "ERROR: Not yet implemented"' in content:
-            return False
-        if 'Write-Host "TODO:' in content and 'exit 3' in content:
-            return False
-        
-        # Has actual implementation if it has exit 0, 1, or 2 (not just exit 3)
-        has_exit_012 = bool(re.search(r'exit [012]', content))
-        return has_exit_012
-        
-    except:
-        return False
+
+import script_index
 
 # Check specific interesting platforms
 platforms_to_check = [
@@ -45,18 +24,21 @@ print("=" * 90)
 print(f"{'Platform':<40} {'Total':>8} {'Impl':>8} {'Not':>8} {'%':>8}")
 print("-" * 90)
 
-for dir_str, name in platforms_to_check:
-    dir_path = Path(dir_str)
-    if not dir_path.exists():
-        print(f"{name:<40} {'N/A':>8} {'N/A':>8} {'N/A':>8} {'N/A':>8}")
-        continue
-    
-    scripts = list(dir_path.glob('*.sh')) + list(dir_path.glob('*.ps1'))
-    total = len(scripts)
-    implemented = sum(1 for s in scripts if check_real_implementation(s))
-    not_impl = total - implemented
-    pct = (implemented / total * 100) if total > 0 else 0
-    
-    print(f"{name:<40} {total:>8} {implemented:>8} {not_impl:>8} {pct:>7.1f}%")
+# Real implementation vs placeholder (not-implemented exit 3, or no exit 0/1/2)
+# comes from the script metadata index
+with script_index.open_index() as index:
+    for dir_str, name in platforms_to_check:
+        _, category, platform = Path(dir_str).parts
+        summary = index.summary(category=category, platform=platform)
+        if not summary:
+            print(f"{name:<40} {'N/A':>8} {'N/A':>8} {'N/A':>8} {'N/A':>8}")
+            continue
+
+        total = summary[0]['total']
+        not_impl = summary[0]['placeholder']
+        implemented = total - not_impl
+        pct = (implemented / total * 100) if total > 0 else 0
+
+        print(f"{name:<40} {total:>8} {implemented:>8} {not_impl:>8} {pct:>7.1f}%")
 
 print("=" * 90)
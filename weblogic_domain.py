@@ -0,0 +1,873 @@
+#!/usr/bin/env python3
+"""
+Oracle WebLogic domain model
+Builds one model of a WebLogic domain - servers, clusters, SSL, security
+realms, log settings, deployments, work managers, JDBC data sources and
+diagnostic (WLDF) modules - from config/config.xml and the system resource
+descriptors it references.
+
+config.xml is streamed with iterparse and each top-level element is released
+once converted, so multi-megabyte domains never live in memory as a full DOM.
+The model is built once per scan: repeated loads in the same process are
+served from memory, and separate check processes share an on-disk cache that
+is invalidated when config.xml or any referenced descriptor changes
+(mtime/size). Configuration-driven WebLogic rules (WEBLOGIC_RULES) are
+evaluated against the model.
+
+Usage:
+    python3 weblogic_domain.py --domain-home /u01/oracle/user_projects/domains/base_domain --dump
+    python3 weblogic_domain.py --domain-home /u01/.../base_domain --list-servers
+    python3 weblogic_domain.py --domain-home /u01/.../base_domain --rule WBLC-01-000009 --output-json result.json
+    python3 weblogic_domain.py --domain-home /u01/.../base_domain --output-dir results/weblogic
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+
+CHECKS_JSON = BASE_DIR / 'oracle_weblogic_12c_v2r2_checks.json'
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('STIG_CACHE_DIR', Path.home() / '.cache' / 'stig-checks'))
+
+XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
+
+# Top-level resources whose descriptor-file-name is parsed into the model
+DESCRIPTOR_RESOURCES = ('jdbc-system-resource', 'wldf-system-resource', 'jms-system-resource')
+
+# Management applications that may be targeted to the AdminServer
+ADMIN_APPLICATIONS = (
+    'em', 'dms', 'DMS Application', 'FMW Welcome Page Application', 'wsm-pm',
+    'opss-rest', 'state-management-provider-menu-items', 'owsm-pm',
+)
+
+# WebLogic defaults for attributes omitted from config.xml
+LOCKOUT_DEFAULTS = {'lockout-threshold': 5, 'lockout-duration': 30, 'lockout-reset-duration': 5}
+
+
+################################################################################
+# XML STREAMING
+################################################################################
+
+def local_name(tag):
+    """Strip the namespace ('{uri}name' or 'prefix:name') from a tag or xsi:type"""
+    if tag.startswith('{'):
+        tag = tag[tag.index('}') + 1:]
+    return tag.rsplit(':', 1)[-1]
+
+
+def element_to_dict(elem):
+    """
+    Convert an element into plain data: leaves become their text, elements
+    with children (or an xsi:type) become dicts, repeated children become lists.
+    """
+    node = {}
+    xsi_type = elem.get(XSI_TYPE)
+    if xsi_type:
+        node['@type'] = local_name(xsi_type)
+    for child in elem:
+        key = local_name(child.tag)
+        if len(child) or child.get(XSI_TYPE):
+            value = element_to_dict(child)
+        else:
+            value = (child.text or '').strip()
+        if key in node:
+            if not isinstance(node[key], list):
+                node[key] = [node[key]]
+            node[key].append(value)
+        else:
+            node[key] = value
+    return node
+
+
+def stream_document(path):
+    """
+    Parse an XML document with iterparse, converting and releasing each child
+    of the root element as soon as it is complete.
+
+    Returns:
+        (root local name, dict of the root's children)
+    """
+    root = None
+    depth = 0
+    document = {}
+    for event, elem in ET.iterparse(str(path), events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        key = local_name(elem.tag)
+        value = element_to_dict(elem) if len(elem) or elem.get(XSI_TYPE) else (elem.text or '').strip()
+        if key in document:
+            if not isinstance(document[key], list):
+                document[key] = [document[key]]
+            document[key].append(value)
+        else:
+            document[key] = value
+        root.clear()
+    return (local_name(root.tag) if root is not None else ''), document
+
+
+def as_list(value):
+    """Single values and missing keys read uniformly as lists"""
+    if value is None or value == '':
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def as_bool(value, default=False):
+    if value is None or value == '':
+        return default
+    return str(value).strip().lower() == 'true'
+
+
+def as_int(value, default=None):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return default
+
+
+def targets(node):
+    """Comma separated <target> values of a deployment or resource"""
+    names = []
+    for value in as_list(node.get('target')):
+        names.extend(t.strip() for t in str(value).split(',') if t.strip())
+    return names
+
+
+################################################################################
+# OBJECT MODEL
+################################################################################
+
+class WebLogicServer:
+    """A <server> element with WebLogic defaults applied to omitted attributes"""
+
+    def __init__(self, data, domain):
+        self.data = data
+        self.domain = domain
+
+    @property
+    def name(self):
+        return self.data.get('name', '')
+
+    @property
+    def is_admin(self):
+        return self.name == self.domain.admin_server_name
+
+    @property
+    def cluster(self):
+        return self.data.get('cluster') or None
+
+    @property
+    def listen_port(self):
+        return as_int(self.data.get('listen-port'), 7001)
+
+    @property
+    def listen_port_enabled(self):
+        return as_bool(self.data.get('listen-port-enabled'), True)
+
+    @property
+    def ssl(self):
+        ssl = self.data.get('ssl')
+        return ssl if isinstance(ssl, dict) else {}
+
+    @property
+    def ssl_enabled(self):
+        return as_bool(self.ssl.get('enabled'))
+
+    @property
+    def ssl_port(self):
+        return as_int(self.ssl.get('listen-port'), 7002 if self.ssl_enabled else None)
+
+    @property
+    def client_cert_enforced(self):
+        return as_bool(self.ssl.get('two-way-ssl-enabled')) and as_bool(self.ssl.get('client-certificate-enforced'))
+
+    @property
+    def log(self):
+        log = self.data.get('log')
+        return log if isinstance(log, dict) else {}
+
+    @property
+    def network_access_points(self):
+        return as_list(self.data.get('network-access-point'))
+
+
+class WebLogicRealm:
+    """A security realm and its providers"""
+
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def name(self):
+        return self.data.get('name', '')
+
+    def providers(self, kind):
+        """Providers of one kind ('authentication-provider', 'auditor', ...)"""
+        return [p if isinstance(p, dict) else {'name': p} for p in as_list(self.data.get(kind))]
+
+    @property
+    def authentication_providers(self):
+        return self.providers('authentication-provider')
+
+    @property
+    def auditors(self):
+        return self.providers('auditor')
+
+    @property
+    def password_validators(self):
+        return self.providers('password-validator')
+
+    @property
+    def lockout(self):
+        """Effective user lockout settings (user-lockout-manager or realm attributes)"""
+        manager = self.data.get('user-lockout-manager')
+        manager = manager if isinstance(manager, dict) else {}
+        settings = {}
+        for key, default in LOCKOUT_DEFAULTS.items():
+            settings[key] = as_int(manager.get(key, self.data.get(key)), default)
+        settings['lockout-enabled'] = as_bool(manager.get('lockout-enabled', self.data.get('lockout-enabled')), True)
+        return settings
+
+
+class WebLogicDomain:
+    """Parsed WebLogic domain configuration plus convenience accessors"""
+
+    def __init__(self, domain_home, data, descriptors=None, inputs=None, errors=None):
+        self.domain_home = str(domain_home)
+        self.data = data
+        self.descriptors = descriptors or {}
+        self.inputs = inputs or {}
+        self.errors = errors or []
+
+    @property
+    def config_file(self):
+        return os.path.join(self.domain_home, 'config', 'config.xml')
+
+    @property
+    def name(self):
+        return self.data.get('name') or os.path.basename(self.domain_home)
+
+    @property
+    def version(self):
+        return self.data.get('domain-version', '')
+
+    @property
+    def production_mode(self):
+        return as_bool(self.data.get('production-mode-enabled'))
+
+    @property
+    def admin_server_name(self):
+        return self.data.get('admin-server-name') or 'AdminServer'
+
+    @property
+    def configuration_audit_type(self):
+        return self.data.get('configuration-audit-type') or 'none'
+
+    @property
+    def servers(self):
+        return [WebLogicServer(s, self) for s in as_list(self.data.get('server'))]
+
+    def server(self, name):
+        for server in self.servers:
+            if server.name == name:
+                return server
+        return None
+
+    @property
+    def admin_server(self):
+        return self.server(self.admin_server_name)
+
+    @property
+    def clusters(self):
+        return as_list(self.data.get('cluster'))
+
+    @property
+    def security_configuration(self):
+        security = self.data.get('security-configuration')
+        return security if isinstance(security, dict) else {}
+
+    @property
+    def realms(self):
+        return [WebLogicRealm(r) for r in as_list(self.security_configuration.get('realm'))]
+
+    @property
+    def default_realm(self):
+        name = self.security_configuration.get('default-realm') or 'myrealm'
+        for realm in self.realms:
+            if realm.name == name:
+                return realm
+        realms = self.realms
+        return realms[0] if realms else None
+
+    @property
+    def deployments(self):
+        return as_list(self.data.get('app-deployment'))
+
+    @property
+    def libraries(self):
+        return as_list(self.data.get('library'))
+
+    @property
+    def work_managers(self):
+        self_tuning = self.data.get('self-tuning')
+        if not isinstance(self_tuning, dict):
+            return []
+        return as_list(self_tuning.get('work-manager'))
+
+    @property
+    def log(self):
+        log = self.data.get('log')
+        return log if isinstance(log, dict) else {}
+
+    def resources(self, kind):
+        """System resources of one kind with their parsed descriptor under 'descriptor'"""
+        found = []
+        for resource in as_list(self.data.get(kind)):
+            entry = dict(resource)
+            entry['descriptor'] = self.descriptors.get(resource.get('descriptor-file-name', ''), {})
+            found.append(entry)
+        return found
+
+    @property
+    def jdbc_data_sources(self):
+        return self.resources('jdbc-system-resource')
+
+    def jdbc_data_source(self, name):
+        for resource in self.jdbc_data_sources:
+            if resource.get('name') == name:
+                return resource
+        return None
+
+    @property
+    def diagnostic_modules(self):
+        return self.resources('wldf-system-resource')
+
+    def to_dict(self):
+        return {
+            'domain_home': self.domain_home,
+            'data': self.data,
+            'descriptors': self.descriptors,
+            'inputs': self.inputs,
+            'errors': self.errors,
+        }
+
+
+def jdbc_settings(resource):
+    """URL, JNDI names and non-secret driver properties of a JDBC resource"""
+    descriptor = resource.get('descriptor', {})
+    driver = descriptor.get('jdbc-driver-params')
+    driver = driver if isinstance(driver, dict) else {}
+    params = descriptor.get('jdbc-data-source-params')
+    params = params if isinstance(params, dict) else {}
+    properties = {}
+    container = driver.get('properties')
+    for prop in as_list(container.get('property') if isinstance(container, dict) else None):
+        if isinstance(prop, dict) and 'value' in prop:
+            properties[prop.get('name', '')] = prop['value']
+    return {
+        'url': driver.get('url', ''),
+        'jndi_names': as_list(params.get('jndi-name')),
+        'properties': properties,
+    }
+
+
+def wldf_watches(resource):
+    """
+    Watches (policies in 12.2.1.3+) and notifications (actions) of a WLDF
+    module as ({name: watch}, {name: notification}).
+    """
+    descriptor = resource.get('descriptor', {})
+    container = descriptor.get('watch-notification')
+    container = container if isinstance(container, dict) else {}
+    watches = {}
+    for watch in as_list(container.get('watch')) + as_list(container.get('policy')):
+        if isinstance(watch, dict):
+            watches[watch.get('name', '')] = watch
+    notifications = {}
+    for key, value in container.items():
+        if key.endswith('-notification') or key.endswith('-action'):
+            for notification in as_list(value):
+                if isinstance(notification, dict):
+                    notifications[notification.get('name', '')] = notification
+    return watches, notifications
+
+
+################################################################################
+# LOADING AND CACHING
+################################################################################
+
+def resolve_domain_home(domain_home=None):
+    """--domain-home, then $DOMAIN_HOME"""
+    domain_home = domain_home or os.environ.get('DOMAIN_HOME')
+    return os.path.abspath(domain_home) if domain_home else None
+
+
+def stat_input(path, kind):
+    stat = os.stat(path)
+    return {'type': kind, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def inputs_unchanged(inputs):
+    """True if every recorded file still has the same mtime/size"""
+    for path, meta in inputs.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns != meta['mtime_ns'] or stat.st_size != meta['size']:
+            return False
+    return True
+
+
+def cache_path(cache_dir, domain_home):
+    digest = hashlib.sha1(domain_home.encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"weblogic-domain-{digest}.json"
+
+
+def parse_domain(domain_home):
+    """Stream config.xml and every referenced system resource descriptor"""
+    config_dir = os.path.join(domain_home, 'config')
+    config_file = os.path.join(config_dir, 'config.xml')
+    inputs = {}
+    errors = []
+    descriptors = {}
+
+    try:
+        inputs[config_file] = stat_input(config_file, 'config')
+        _, data = stream_document(config_file)
+    except OSError as e:
+        # Unreadable or vanished: no inputs are recorded, so this result is not cached
+        return WebLogicDomain(domain_home, {}, {}, {}, [f"{config_file}: {e.strerror or e}"])
+    except ET.ParseError as e:
+        return WebLogicDomain(domain_home, {}, {}, inputs, [f"{config_file}: {e}"])
+
+    for kind in DESCRIPTOR_RESOURCES:
+        for resource in as_list(data.get(kind)):
+            relative = resource.get('descriptor-file-name') if isinstance(resource, dict) else None
+            if not relative or relative in descriptors:
+                continue
+            path = os.path.join(config_dir, relative)
+            try:
+                inputs[path] = stat_input(path, 'descriptor')
+                _, descriptors[relative] = stream_document(path)
+            except OSError:
+                errors.append(f"{path}: descriptor not found")
+            except ET.ParseError as e:
+                errors.append(f"{path}: {e}")
+
+    return WebLogicDomain(domain_home, data, descriptors, inputs, errors)
+
+
+_loaded = {}
+
+
+def load_domain(domain_home=None, cache_dir=DEFAULT_CACHE_DIR, use_cache=True):
+    """
+    Return the parsed WebLogicDomain.
+
+    Args:
+        domain_home: Domain home directory (default: $DOMAIN_HOME)
+        cache_dir: Directory for the shared on-disk cache
+        use_cache: Reuse cached models when none of the inputs changed
+
+    Returns:
+        WebLogicDomain, or None if config/config.xml could not be located
+    """
+    domain_home = resolve_domain_home(domain_home)
+    if not domain_home or not os.path.isfile(os.path.join(domain_home, 'config', 'config.xml')):
+        return None
+
+    if use_cache and domain_home in _loaded and inputs_unchanged(_loaded[domain_home].inputs):
+        return _loaded[domain_home]
+
+    path = cache_path(cache_dir, domain_home)
+    if use_cache:
+        try:
+            data = json.loads(path.read_text())
+            if data.get('version') == CACHE_VERSION and inputs_unchanged(data['inputs']):
+                domain = WebLogicDomain(data['domain_home'], data['data'], data['descriptors'],
+                                        data['inputs'], data['errors'])
+                _loaded[domain_home] = domain
+                return domain
+        except (OSError, ValueError, KeyError):
+            pass
+
+    domain = parse_domain(domain_home)
+    if not domain.inputs:
+        return domain
+    _loaded[domain_home] = domain
+
+    if use_cache:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = domain.to_dict()
+            data['version'] = CACHE_VERSION
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(data))
+            os.replace(str(tmp), str(path))
+        except OSError:
+            pass
+
+    return domain
+
+
+################################################################################
+# RULE EVALUATION
+################################################################################
+
+def describe_listen(server):
+    return (f"{server.name}: listen-port-enabled={str(server.listen_port_enabled).lower()} "
+            f"(port {server.listen_port}), ssl.enabled={str(server.ssl_enabled).lower()} "
+            f"(port {server.ssl_port if server.ssl_port else 'none'})")
+
+
+def ssl_listen(admin_only=False, mutual=False):
+    """Rule: SSL listen port enabled and plain listen port disabled (optionally two-way SSL)"""
+    def check(domain):
+        servers = [domain.admin_server] if admin_only else domain.servers
+        servers = [s for s in servers if s is not None]
+        if not servers:
+            return 'Not_Applicable', 'No servers defined in config.xml'
+        findings = []
+        compliant = []
+        for server in servers:
+            problems = []
+            if server.listen_port_enabled:
+                problems.append('non-SSL listen port enabled')
+            if not server.ssl_enabled:
+                problems.append('SSL listen port not enabled')
+            elif not server.ssl_port:
+                problems.append('no SSL listen port')
+            if mutual and not server.client_cert_enforced:
+                problems.append("Two Way Client Cert Behavior is not 'Client Certs Requested And Enforced'")
+            if problems:
+                findings.append(f"{describe_listen(server)}: {', '.join(problems)}")
+            else:
+                compliant.append(describe_listen(server))
+        if findings:
+            return 'Open', '; '.join(findings)
+        return 'NotAFinding', '; '.join(compliant)
+    return check
+
+
+def check_production_mode(domain):
+    if domain.production_mode:
+        return 'NotAFinding', f"Domain {domain.name}: production-mode-enabled=true"
+    return 'Open', f"Domain {domain.name}: Production Mode is not enabled"
+
+
+def realm_or_error(domain):
+    realm = domain.default_realm
+    if realm is None:
+        return None, ('Open', 'No security realm defined in config.xml')
+    return realm, None
+
+
+def check_audit_provider(domain):
+    realm, error = realm_or_error(domain)
+    if error:
+        return error
+    problems = []
+    if not realm.auditors:
+        problems.append(f"realm {realm.name} has no Auditing Provider")
+    if domain.configuration_audit_type != 'logaudit':
+        problems.append(f"Configuration Audit Type is '{domain.configuration_audit_type}' "
+                        "(expected 'Change Log and Audit')")
+    if problems:
+        return 'Open', '; '.join(problems)
+    names = ', '.join(a.get('name', a.get('@type', '')) for a in realm.auditors)
+    return 'NotAFinding', f"realm {realm.name} auditors: {names}; configuration-audit-type=logaudit"
+
+
+def check_lockout(domain):
+    realm, error = realm_or_error(domain)
+    if error:
+        return error
+    lockout = realm.lockout
+    expected = {'lockout-threshold': 3, 'lockout-duration': 15, 'lockout-reset-duration': 15}
+    wrong = [f"{k}={lockout[k]} (expected {v})" for k, v in expected.items() if lockout[k] != v]
+    if not lockout['lockout-enabled']:
+        wrong.insert(0, 'user lockout disabled')
+    if wrong:
+        return 'Open', f"realm {realm.name}: " + ', '.join(wrong)
+    return 'NotAFinding', f"realm {realm.name}: " + ', '.join(f"{k}={lockout[k]}" for k in expected)
+
+
+def check_authentication_provider(domain):
+    realm, error = realm_or_error(domain)
+    if error:
+        return error
+    providers = realm.authentication_providers
+    custom = [p for p in providers if p.get('@type') not in
+              ('default-authenticatorType', 'default-identity-asserterType')]
+    listed = ', '.join(f"{p.get('name', '')} ({p.get('@type', '')})" for p in providers) or 'none'
+    if not custom:
+        return 'Open', f"realm {realm.name} has only default authentication providers: {listed}"
+    return 'NotAFinding', f"realm {realm.name} authentication providers: {listed}"
+
+
+def password_validator(field, minimum):
+    """Rule: SystemPasswordValidator attribute at or above a minimum"""
+    def check(domain):
+        realm, error = realm_or_error(domain)
+        if error:
+            return error
+        validators = [v for v in realm.password_validators
+                      if v.get('@type') == 'system-password-validatorType'
+                      or v.get('name') == 'SystemPasswordValidator']
+        if not validators:
+            return 'Open', f"realm {realm.name} has no SystemPasswordValidator"
+        value = as_int(validators[0].get(field), 0)
+        if value < minimum:
+            return 'Open', f"realm {realm.name} SystemPasswordValidator {field}={value} (required {minimum})"
+        return 'NotAFinding', f"realm {realm.name} SystemPasswordValidator {field}={value}"
+    return check
+
+
+def check_work_managers(domain):
+    managers = [m.get('name', '') for m in domain.work_managers if isinstance(m, dict)]
+    if not managers:
+        return 'Open', 'No Work Managers defined in the domain'
+    return 'NotAFinding', 'Work Managers: ' + ', '.join(managers)
+
+
+def check_admin_deployments(domain):
+    admin = domain.admin_server_name
+    hosted = [d.get('name', '') for d in domain.deployments
+              if admin in targets(d) and d.get('name') not in ADMIN_APPLICATIONS]
+    if hosted:
+        return 'Open', f"Applications deployed on {admin}: " + ', '.join(hosted)
+    return 'NotAFinding', f"No applications other than management applications are deployed on {admin}"
+
+
+def check_audit_data_sources(domain):
+    findings = []
+    evidence = []
+    for name in ('opss-audit-DBDS', 'wls-wldf-storeDS'):
+        resource = domain.jdbc_data_source(name)
+        if resource is None:
+            findings.append(f"data source {name} not defined")
+            continue
+        settings = jdbc_settings(resource)
+        if not settings['url']:
+            findings.append(f"data source {name} has no URL")
+        else:
+            evidence.append(f"{name}: url={settings['url']}, jndi={','.join(settings['jndi_names'])}, "
+                            f"targets={','.join(targets(resource)) or 'none'}")
+    if findings:
+        return 'Open', '; '.join(findings + evidence)
+    return 'NotAFinding', '; '.join(evidence)
+
+
+def check_health_watch(domain):
+    modules = [m for m in domain.diagnostic_modules if m.get('name') == 'Module-HealthState']
+    if not modules:
+        return 'Open', 'Diagnostic module Module-HealthState is not defined'
+    watches, notifications = wldf_watches(modules[0])
+    problems = []
+    watch = watches.get('ServerHealthWatch')
+    if watch is None:
+        problems.append('ServerHealthWatch not defined')
+    elif not as_bool(watch.get('enabled'), True):
+        problems.append('ServerHealthWatch is disabled')
+    notification = notifications.get('ServerHealthNotification')
+    if notification is None:
+        problems.append('ServerHealthNotification not defined')
+    elif not as_bool(notification.get('enabled'), True):
+        problems.append('ServerHealthNotification is disabled')
+    if problems:
+        return 'Open', 'Module-HealthState: ' + ', '.join(problems)
+    return 'NotAFinding', 'Module-HealthState: ServerHealthWatch and ServerHealthNotification enabled'
+
+
+def check_supported_version(domain):
+    version = domain.version or 'unknown'
+    if version.startswith('12.'):
+        return 'Open', f"Domain version {version}: Oracle WebLogic 12c is no longer supported by the vendor"
+    if version == 'unknown':
+        return 'Not_Reviewed', 'domain-version not recorded in config.xml'
+    return 'NotAFinding', f"Domain version {version}"
+
+
+WEBLOGIC_RULES = {
+    'WBLC-01-000009': ssl_listen(),
+    'WBLC-01-000010': ssl_listen(),
+    'WBLC-01-000011': check_audit_data_sources,
+    'WBLC-01-000018': check_audit_provider,
+    'WBLC-01-000019': check_audit_provider,
+    'WBLC-01-000032': check_lockout,
+    'WBLC-01-000033': check_lockout,
+    'WBLC-01-000034': check_lockout,
+    'WBLC-02-000065': check_audit_data_sources,
+    'WBLC-02-000081': check_audit_data_sources,
+    'WBLC-02-000083': check_health_watch,
+    'WBLC-02-000084': check_health_watch,
+    'WBLC-02-000086': check_health_watch,
+    'WBLC-03-000129': check_production_mode,
+    'WBLC-05-000150': check_authentication_provider,
+    'WBLC-05-000153': check_authentication_provider,
+    'WBLC-05-000160': password_validator('min-password-length', 15),
+    'WBLC-05-000162': password_validator('min-uppercase-characters', 1),
+    'WBLC-05-000163': password_validator('min-lowercase-characters', 1),
+    'WBLC-05-000164': password_validator('min-numeric-characters', 1),
+    'WBLC-05-000165': password_validator('min-non-alphanumeric-characters', 1),
+    'WBLC-05-000168': check_authentication_provider,
+    'WBLC-05-000172': ssl_listen(),
+    'WBLC-05-000174': check_authentication_provider,
+    'WBLC-06-000190': ssl_listen(),
+    'WBLC-06-000191': ssl_listen(),
+    'WBLC-08-000211': ssl_listen(),
+    'WBLC-08-000222': check_admin_deployments,
+    'WBLC-08-000223': ssl_listen(mutual=True),
+    'WBLC-08-000229': check_production_mode,
+    'WBLC-08-000231': ssl_listen(admin_only=True),
+    'WBLC-08-000235': check_production_mode,
+    'WBLC-08-000237': check_work_managers,
+    'WBLC-08-000239': ssl_listen(),
+    'WBLC-09-000257': check_health_watch,
+    'WBLC-10-000999': check_supported_version,
+}
+
+EXIT_CODES = {
+    'NotAFinding': 0,
+    'Open': 1,
+    'Not_Applicable': 2,
+    'Not_Reviewed': 2,
+    'ERROR': 3,
+}
+
+STATUS_PRIORITY = ('ERROR', 'Open', 'Not_Reviewed', 'NotAFinding', 'Not_Applicable')
+
+
+def evaluate_rule(stig_id, domain):
+    """Evaluate one rule; returns (status, finding_details)"""
+    if stig_id not in WEBLOGIC_RULES:
+        return 'Not_Reviewed', 'Manual review required - consult STIG documentation'
+    if domain is None:
+        return 'ERROR', 'WebLogic domain not found (set --domain-home or DOMAIN_HOME)'
+    if domain.errors and not domain.data:
+        return 'ERROR', 'Configuration not loaded: ' + '; '.join(domain.errors)
+    return WEBLOGIC_RULES[stig_id](domain)
+
+
+def run_rule(stig_id, domain_home=None):
+    """Entry point for the per-rule check scripts: (status, finding_details, exit_code)"""
+    domain = load_domain(domain_home)
+    status, details = evaluate_rule(stig_id, domain)
+    return status, details, EXIT_CODES[status]
+
+
+def load_rule_metadata():
+    with open(CHECKS_JSON) as f:
+        return {c['STIG ID']: c for c in json.load(f)}
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Parse a WebLogic domain and evaluate configuration-driven WebLogic STIG rules',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--domain-home', help='WebLogic domain home (default: $DOMAIN_HOME)')
+    parser.add_argument('--rule', action='append', default=[],
+                        help='STIG ID to evaluate (may be repeated; default: all automated rules)')
+    parser.add_argument('--output-json', help='Write the result of a single --rule to this file')
+    parser.add_argument('--output-dir', help='Write per-rule results to this directory')
+    parser.add_argument('--dump', action='store_true', help='Print the parsed model and exit')
+    parser.add_argument('--list-servers', action='store_true',
+                        help='Print name, listen-port-enabled, SSL enabled and SSL port of each server (tab separated)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the cache')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help='Cache directory')
+    args = parser.parse_args()
+
+    domain = load_domain(args.domain_home, args.cache_dir, use_cache=not args.no_cache)
+
+    if args.list_servers:
+        if domain is None:
+            print("ERROR: WebLogic domain not found (set --domain-home or DOMAIN_HOME)", file=sys.stderr)
+            return 3
+        for server in domain.servers:
+            print('\t'.join((server.name, str(server.listen_port_enabled).lower(),
+                             str(server.ssl_enabled).lower(), str(server.ssl_port or ''))))
+        return 0
+
+    if args.dump:
+        if domain is None:
+            print("ERROR: WebLogic domain not found (set --domain-home or DOMAIN_HOME)")
+            return 3
+        realm = domain.default_realm
+        print(json.dumps({
+            'domain_home': domain.domain_home,
+            'name': domain.name,
+            'version': domain.version,
+            'production_mode': domain.production_mode,
+            'admin_server': domain.admin_server_name,
+            'errors': domain.errors,
+            'servers': [{'name': s.name, 'cluster': s.cluster, 'listen_port': s.listen_port,
+                         'listen_port_enabled': s.listen_port_enabled, 'ssl_enabled': s.ssl_enabled,
+                         'ssl_port': s.ssl_port, 'client_cert_enforced': s.client_cert_enforced,
+                         'log': s.log} for s in domain.servers],
+            'clusters': [c.get('name') if isinstance(c, dict) else c for c in domain.clusters],
+            'realm': {'name': realm.name,
+                      'authentication_providers': realm.authentication_providers,
+                      'auditors': realm.auditors,
+                      'password_validators': realm.password_validators,
+                      'lockout': realm.lockout} if realm else None,
+            'deployments': [{'name': d.get('name'), 'targets': targets(d)} for d in domain.deployments],
+            'work_managers': [m.get('name') for m in domain.work_managers if isinstance(m, dict)],
+            'jdbc': {r.get('name'): jdbc_settings(r) for r in domain.jdbc_data_sources},
+            'diagnostic_modules': [m.get('name') for m in domain.diagnostic_modules],
+        }, indent=2))
+        return 0
+
+    metadata = load_rule_metadata()
+    rule_ids = args.rule or sorted(WEBLOGIC_RULES)
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    results = []
+    for stig_id in rule_ids:
+        check = metadata.get(stig_id, {})
+        status, details = evaluate_rule(stig_id, domain)
+        results.append({
+            'vuln_id': check.get('Group ID', 'UNKNOWN'),
+            'stig_id': stig_id,
+            'severity': check.get('Severity', 'medium'),
+            'status': status,
+            'finding_details': details,
+            'timestamp': timestamp,
+        })
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for result in results:
+            (output_dir / f"{result['stig_id']}.json").write_text(json.dumps(result, indent=2))
+
+    if args.output_json and len(results) == 1:
+        Path(args.output_json).write_text(json.dumps(results[0], indent=2))
+
+    for result in results:
+        print(f"[{result['vuln_id']}] {result['stig_id']}: {result['status']}")
+        print(f"    {result['finding_details']}")
+
+    worst = min((r['status'] for r in results), key=STATUS_PRIORITY.index)
+    return EXIT_CODES[worst]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Oracle WebLogic multi-domain scan
+Discovers every WebLogic domain on the host and evaluates the WebLogic rules
+against each domain concurrently, writing per-domain results (with
+--results-db, to the scan result database instead of one JSON file per rule).
+
+Domains are found through the domain registry of each Oracle home
+(domain-registry.xml), the Node Manager domain list (nodemanager.domains) and
+a scan of user_projects/domains under the Oracle homes and common middleware
+locations. Each worker loads its domain through weblogic_domain.load_domain,
+so config.xml is parsed once per domain and reused by later single-rule checks
+through the shared cache.
+
+Usage:
+    python3 weblogic_domain_scan.py
+    python3 weblogic_domain_scan.py --list-domains
+    python3 weblogic_domain_scan.py --oracle-home /u01/oracle/middleware --output-dir results/weblogic_domains
+    python3 weblogic_domain_scan.py --domain-home /u01/domains/a --domain-home /u01/domains/b --rule WBLC-03-000129
+    python3 weblogic_domain_scan.py --results-db scan_results.db
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import scan_results
+import weblogic_domain
+
+# Locations searched for Oracle homes and domain directories
+DEFAULT_SEARCH_ROOTS = ('/u01/oracle', '/u01/app/oracle', '/u01/app/oracle/middleware', '/opt/oracle',
+                        '/oracle', '/u01/domains', '/u02/domains')
+
+# Domain directory patterns relative to an Oracle home or search root
+DOMAIN_PATTERNS = ('user_projects/domains/*', '*/user_projects/domains/*', 'domains/*', 'config/domains/*')
+
+# Platform (checks/ directory) the results are recorded under in the scan result database
+PLATFORM = 'oracle_weblogic_server_12c_v2r2'
+
+# Node Manager domain lists relative to an Oracle home
+NODEMANAGER_DOMAIN_FILES = ('oracle_common/common/nodemanager/nodemanager.domains',
+                            'wlserver/common/nodemanager/nodemanager.domains')
+
+
+################################################################################
+# DISCOVERY
+################################################################################
+
+def is_domain(path):
+    return os.path.isfile(os.path.join(path, 'config', 'config.xml'))
+
+
+def read_domain_registry(path):
+    """Domain locations from an Oracle home's domain-registry.xml"""
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return []
+    return [elem.get('location') for elem in root.iter()
+            if weblogic_domain.local_name(elem.tag) == 'domain' and elem.get('location')]
+
+
+def read_nodemanager_domains(path):
+    """Domain locations from a nodemanager.domains file (name=path lines)"""
+    locations = []
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    # Windows paths are written with escaped separators (C\:\\...)
+                    locations.append(line.split('=', 1)[1].strip().replace('\\:', ':').replace('\\\\', '\\'))
+    except OSError:
+        pass
+    return locations
+
+
+def default_oracle_homes():
+    """Oracle homes from the environment"""
+    homes = []
+    for name in ('MW_HOME', 'ORACLE_HOME', 'WL_HOME'):
+        value = os.environ.get(name)
+        if value:
+            homes.append(os.path.dirname(value) if name == 'WL_HOME' else value)
+    return homes
+
+
+def discover_domains(oracle_homes=None, search_roots=None, domain_homes=None):
+    """
+    Find WebLogic domains.
+
+    Args:
+        oracle_homes: Oracle homes whose registry and Node Manager lists are read
+        search_roots: Directories scanned for user_projects/domains
+        domain_homes: Explicit domain homes (always included)
+
+    Returns:
+        dict of real domain path -> how it was found, in discovery order
+    """
+    found = {}
+
+    def add(path, source):
+        if path and is_domain(path):
+            found.setdefault(os.path.realpath(path), source)
+
+    for path in domain_homes or []:
+        add(path, 'argument')
+    if not domain_homes and os.environ.get('DOMAIN_HOME'):
+        add(os.environ['DOMAIN_HOME'], 'DOMAIN_HOME')
+
+    homes = list(oracle_homes) if oracle_homes else default_oracle_homes()
+    roots = list(search_roots) if search_roots is not None else list(DEFAULT_SEARCH_ROOTS)
+
+    for home in homes:
+        for location in read_domain_registry(os.path.join(home, 'domain-registry.xml')):
+            add(location, 'domain-registry.xml')
+        for relative in NODEMANAGER_DOMAIN_FILES:
+            for location in read_nodemanager_domains(os.path.join(home, relative)):
+                add(location, 'nodemanager.domains')
+
+    for root in homes + roots:
+        if not os.path.isdir(root):
+            continue
+        for pattern in DOMAIN_PATTERNS:
+            for path in sorted(glob.glob(os.path.join(root, pattern))):
+                add(path, 'directory scan')
+
+    return found
+
+
+################################################################################
+# SCAN
+################################################################################
+
+def scan_domain(domain_home, rule_ids, cache_dir):
+    """Worker: load one domain and evaluate the rules against it"""
+    domain = weblogic_domain.load_domain(domain_home, cache_dir)
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    metadata = weblogic_domain.load_rule_metadata()
+    results = []
+    for stig_id in rule_ids:
+        status, details = weblogic_domain.evaluate_rule(stig_id, domain)
+        check = metadata.get(stig_id, {})
+        results.append({
+            'vuln_id': check.get('Group ID', 'UNKNOWN'),
+            'stig_id': stig_id,
+            'severity': check.get('Severity', 'medium'),
+            'domain_home': domain_home,
+            'status': status,
+            'finding_details': details,
+            'timestamp': timestamp,
+        })
+    info = {
+        'domain_home': domain_home,
+        'name': domain.name if domain else os.path.basename(domain_home),
+        'version': domain.version if domain else '',
+        'servers': [s.name for s in domain.servers] if domain else [],
+        'errors': domain.errors if domain else ['config/config.xml not readable'],
+    }
+    return info, results
+
+
+def failed_domain(domain_home, rule_ids, message):
+    """Info and ERROR results for a domain whose scan raised (e.g. unreadable config.xml)"""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    metadata = weblogic_domain.load_rule_metadata()
+    results = [{
+        'vuln_id': metadata.get(stig_id, {}).get('Group ID', 'UNKNOWN'),
+        'stig_id': stig_id,
+        'severity': metadata.get(stig_id, {}).get('Severity', 'medium'),
+        'domain_home': domain_home,
+        'status': 'ERROR',
+        'finding_details': f"Domain scan failed: {message}",
+        'timestamp': timestamp,
+    } for stig_id in rule_ids]
+    info = {
+        'domain_home': domain_home,
+        'name': os.path.basename(domain_home),
+        'version': '',
+        'servers': [],
+        'errors': [message],
+    }
+    return info, results
+
+
+def domain_dir_name(name):
+    return re.sub(r'[^A-Za-z0-9_.#-]+', '_', name).strip('_') or 'domain'
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Discover WebLogic domains and evaluate WebLogic STIG rules for each in parallel',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--domain-home', action='append', default=[],
+                        help='Domain home to scan (may be repeated; added to discovered domains)')
+    parser.add_argument('--oracle-home', action='append', default=[],
+                        help='Oracle home with domain-registry.xml (may be repeated; default: $MW_HOME/$ORACLE_HOME)')
+    parser.add_argument('--search-root', action='append',
+                        help='Directory scanned for user_projects/domains (may be repeated; default: common locations)')
+    parser.add_argument('--no-discovery', action='store_true', help='Scan only the given --domain-home values')
+    parser.add_argument('--rule', action='append', default=[],
+                        help='STIG ID to evaluate (may be repeated; default: all automated rules)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default='results/weblogic_domains', help='Directory for per-domain results')
+    parser.add_argument('--list-domains', action='store_true', help='List discovered domains and exit')
+    parser.add_argument('--cache-dir', default=str(weblogic_domain.DEFAULT_CACHE_DIR), help='Cache directory')
+    parser.add_argument('--results-db', help='Record results in this scan result database instead of per-rule JSON')
+    parser.add_argument('--scan-id', help='Scan ID in the result database (default: a new scan)')
+    args = parser.parse_args()
+
+    if args.no_discovery:
+        domains = {os.path.realpath(p): 'argument' for p in args.domain_home if is_domain(p)}
+    else:
+        domains = discover_domains(args.oracle_home, args.search_root, args.domain_home)
+
+    if args.list_domains:
+        for path, source in domains.items():
+            print(f"{path}  ({source})")
+        return 0
+
+    if not domains:
+        print("ERROR: No WebLogic domains found (use --domain-home, --oracle-home or --search-root)")
+        return 3
+
+    rule_ids = args.rule or sorted(weblogic_domain.WEBLOGIC_RULES)
+
+    print("=" * 80)
+    print("WebLogic Multi-Domain STIG Evaluation")
+    print("=" * 80)
+    print(f"Domains: {len(domains)}")
+    print(f"Rules: {len(rule_ids)}")
+    print(f"Workers: {args.workers}")
+    print()
+
+    output_root = Path(args.output_dir)
+    totals = defaultdict(int)
+    summary = []
+    used_names = defaultdict(int)
+
+    store = writer = None
+    if args.results_db:
+        try:
+            store, writer = scan_results.open_writer(args.results_db, 'weblogic', args.scan_id,
+                                                     {'domains': sorted(domains)})
+        except scan_results.ResultStoreError as e:
+            print(f"ERROR: {e}")
+            return 3
+
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(domains)))) as executor:
+            futures = [(path, executor.submit(scan_domain, path, rule_ids, args.cache_dir)) for path in domains]
+            for path, future in futures:
+                # One unreadable domain is reported as ERROR instead of aborting the scan
+                try:
+                    info, results = future.result()
+                except Exception as e:
+                    info, results = failed_domain(path, rule_ids, f"{type(e).__name__}: {e}")
+                used_names[info['name']] += 1
+                name = info['name'] if used_names[info['name']] == 1 else f"{info['name']}#{used_names[info['name']]}"
+                domain_dir = output_root / domain_dir_name(name)
+                domain_dir.mkdir(parents=True, exist_ok=True)
+                counts = defaultdict(int)
+                for result in results:
+                    counts[result['status']] += 1
+                    totals[result['status']] += 1
+                    if writer is not None:
+                        writer.add(name, PLATFORM, result)
+                    else:
+                        (domain_dir / f"{result['vuln_id']}.json").write_text(json.dumps(result, indent=2))
+                domain_summary = dict(info, domain=name, source=domains[info['domain_home']],
+                                      status_counts=dict(counts))
+                (domain_dir / 'summary.json').write_text(json.dumps(dict(domain_summary, results=[
+                    {k: r[k] for k in ('vuln_id', 'stig_id', 'status')} for r in results]), indent=2))
+                summary.append(domain_summary)
+                print(f"  {name[:40]:<40} open={counts['Open']:<3} pass={counts['NotAFinding']:<3} "
+                      f"error={counts['ERROR']}")
+    finally:
+        if writer is not None:
+            scan_results.close_writer(store, writer)
+
+    (output_root / 'summary.json').write_text(json.dumps({
+        'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'status_counts': dict(totals),
+        'domains': summary,
+    }, indent=2))
+
+    print()
+    print(f"Results written to {output_root}/<domain>/")
+    if writer is not None:
+        print(f"{writer.count} results recorded as scan {writer.scan_id} in {args.results_db}")
+    if totals['ERROR']:
+        return 3
+    return 1 if totals['Open'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+"""
+Oracle WebLogic WLST batch collector
+Starts one WLST session against the AdminServer, reads every MBean value the
+WebLogic rules need from the configuration tree (servers, SSL, network
+channels, realm providers, lockout, password validation, deployments, work
+managers, JDBC and WLDF resources) and the runtime tree (running servers,
+channels in use, data source pool tests), and returns a JSON document keyed
+by rule.
+
+Each WLST invocation starts a JVM and connects to the AdminServer, so the
+document is cached on disk and shared by every check: per-rule scripts look
+their result up instead of starting their own session. A lock ensures checks
+started in parallel wait for a single collection. A failed collection is
+cached as well, so bad credentials cost one admin login per --max-age rather
+than one per rule (--refresh retries at once).
+
+Credentials come from --username/--password (or $WLS_USERNAME/$WLS_PASSWORD)
+or from a WLST user config/key file pair (--user-config-file/--user-key-file).
+
+Usage:
+    python3 weblogic_wlst.py --admin-url t3s://admin.example.com:7002 --user-config-file ~/wls.cfg --user-key-file ~/wls.key
+    python3 weblogic_wlst.py --admin-url t3s://localhost:7002 --rule WBLC-08-000238 --output-json result.json
+    python3 weblogic_wlst.py --admin-url t3s://localhost:7002 --output-dir results/weblogic --refresh
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import weblogic_domain
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = weblogic_domain.DEFAULT_CACHE_DIR
+
+# Reuse a collected document for this many seconds
+DEFAULT_MAX_AGE = 900
+
+WLST_TIMEOUT = 600
+
+# Protocols that are encrypted although their name does not end in 's'
+SECURE_PROTOCOLS = ('admin',)
+
+# Provider type / class name fragments of LDAP-based authentication providers
+LDAP_PROVIDER_MARKERS = ('ldap', 'active-directory', 'activedirectory', 'iplanet', 'novell',
+                         'internet-directory', 'internetdirectory', 'virtual-directory', 'virtualdirectory')
+
+################################################################################
+# WLST SCRIPT
+################################################################################
+
+# Runs inside WLST (Jython 2.x): no f-strings and no json module on older
+# releases. Configuration values are emitted with config.xml element names so
+# weblogic_domain.WebLogicDomain can be built directly from the result.
+WLST_SCRIPT = r'''
+import os
+import sys
+
+errors = []
+
+PROVIDER_TYPES = {
+    'DefaultAuthenticationProviderImpl': 'default-authenticatorType',
+    'DefaultIdentityAsserterProviderImpl': 'default-identity-asserterType',
+    'DefaultAuditProviderImpl': 'default-auditorType',
+    'SystemPasswordValidatorProviderImpl': 'system-password-validatorType',
+}
+
+def b(value):
+    if value:
+        return 'true'
+    return 'false'
+
+def s(value):
+    if value is None:
+        return ''
+    try:
+        return str(value)
+    except:
+        return repr(value)
+
+def encode(value):
+    if isinstance(value, type({})):
+        return '{' + ', '.join([encode(k) + ': ' + encode(v) for k, v in value.items()]) + '}'
+    if isinstance(value, type([])):
+        return '[' + ', '.join([encode(v) for v in value]) + ']'
+    text = s(value)
+    for old, new in (('\\', '\\\\'), ('"', '\\"'), ('\n', '\\n'), ('\r', '\\r'), ('\t', '\\t')):
+        text = text.replace(old, new)
+    return '"' + text + '"'
+
+def attempt(label, function, default):
+    try:
+        return function()
+    except:
+        errors.append(label + ': ' + s(sys.exc_info()[1]))
+        return default
+
+def call(bean, names, default=None):
+    """First available getter of a bean (attribute names vary by release)"""
+    for name in names:
+        if hasattr(bean, name):
+            return getattr(bean, name)()
+    return default
+
+def target_names(bean):
+    return ','.join([s(t.getName()) for t in (bean.getTargets() or [])])
+
+def provider(bean, extra):
+    entry = {'name': s(bean.getName())}
+    class_name = s(call(bean, ['getProviderClassName'], '')).split('.')[-1]
+    entry['@type'] = PROVIDER_TYPES.get(class_name, class_name)
+    if hasattr(bean, 'getControlFlag'):
+        entry['control-flag'] = s(bean.getControlFlag())
+    if hasattr(bean, 'isSSLEnabled'):
+        entry['ssl-enabled'] = b(bean.isSSLEnabled())
+    for key, getter in extra:
+        if hasattr(bean, getter):
+            entry[key] = s(getattr(bean, getter)())
+    return entry
+
+def collect_server(server):
+    ssl = server.getSSL()
+    log = server.getLog()
+    entry = {
+        'name': s(server.getName()),
+        'listen-port': s(server.getListenPort()),
+        'listen-port-enabled': b(server.isListenPortEnabled()),
+        'ssl': {
+            'enabled': b(ssl.isEnabled()),
+            'listen-port': s(ssl.getListenPort()),
+            'two-way-ssl-enabled': b(ssl.isTwoWaySSLEnabled()),
+            'client-certificate-enforced': b(ssl.isClientCertificateEnforced()),
+        },
+        'log': {
+            'file-name': s(log.getFileName()),
+            'rotation-type': s(log.getRotationType()),
+            'number-of-files-limited': b(log.isNumberOfFilesLimited()),
+            'file-count': s(log.getFileCount()),
+            'log-file-severity': s(log.getLogFileSeverity()),
+        },
+        'network-access-point': [],
+    }
+    if server.getCluster() is not None:
+        entry['cluster'] = s(server.getCluster().getName())
+    for nap in server.getNetworkAccessPoints() or []:
+        entry['network-access-point'].append({
+            'name': s(nap.getName()),
+            'protocol': s(nap.getProtocol()),
+            'listen-port': s(nap.getListenPort()),
+            'enabled': b(nap.isEnabled()),
+        })
+    return entry
+
+def collect_realm(realm):
+    entry = {
+        'name': s(realm.getName()),
+        'authentication-provider': [provider(p, []) for p in realm.getAuthenticationProviders() or []],
+        'auditor': [provider(p, []) for p in realm.getAuditors() or []],
+        'password-validator': [provider(p, [
+            ('min-password-length', 'getMinPasswordLength'),
+            ('min-uppercase-characters', 'getMinUpperCaseCharacters'),
+            ('min-lowercase-characters', 'getMinLowerCaseCharacters'),
+            ('min-numeric-characters', 'getMinNumericCharacters'),
+            ('min-non-alphanumeric-characters', 'getMinNonAlphanumericCharacters'),
+        ]) for p in call(realm, ['getPasswordValidators'], []) or []],
+    }
+    lockout = realm.getUserLockoutManager()
+    if lockout is not None:
+        entry['user-lockout-manager'] = {
+            'lockout-enabled': b(lockout.isLockoutEnabled()),
+            'lockout-threshold': s(lockout.getLockoutThreshold()),
+            'lockout-duration': s(lockout.getLockoutDuration()),
+            'lockout-reset-duration': s(lockout.getLockoutResetDuration()),
+        }
+    return entry
+
+def collect_jdbc(resource, descriptors):
+    path = 'jdbc/' + s(resource.getName()) + '-jdbc.xml'
+    bean = resource.getJDBCResource()
+    driver = bean.getJDBCDriverParams()
+    properties = []
+    if driver.getProperties() is not None:
+        for prop in driver.getProperties().getProperties() or []:
+            properties.append({'name': s(prop.getName()), 'value': s(prop.getValue())})
+    descriptors[path] = {
+        'name': s(bean.getName()),
+        'jdbc-driver-params': {'url': s(driver.getUrl()), 'properties': {'property': properties}},
+        'jdbc-data-source-params': {
+            'jndi-name': [s(n) for n in bean.getJDBCDataSourceParams().getJNDINames() or []],
+        },
+    }
+    return {'name': s(resource.getName()), 'target': target_names(resource), 'descriptor-file-name': path}
+
+def collect_wldf(resource, descriptors):
+    path = 'diagnostics/' + s(resource.getName()) + '.xml'
+    container = resource.getWLDFResource().getWatchNotification()
+    notification = {'watch': []}
+    for watch in call(container, ['getWatches', 'getPolicies'], []) or []:
+        notification['watch'].append({'name': s(watch.getName()), 'enabled': b(watch.isEnabled())})
+    for key, getters in (('jmx-notification', ['getJMXNotifications', 'getJMXNotificationActions']),
+                         ('smtp-notification', ['getSMTPNotifications', 'getSMTPNotificationActions']),
+                         ('snmp-notification', ['getSNMPNotifications', 'getSNMPNotificationActions']),
+                         ('jms-notification', ['getJMSNotifications', 'getJMSNotificationActions'])):
+        notification[key] = [{'name': s(n.getName()), 'enabled': b(n.isEnabled())}
+                             for n in call(container, getters, []) or []]
+    descriptors[path] = {'name': s(resource.getName()), 'watch-notification': notification}
+    return {'name': s(resource.getName()), 'target': target_names(resource), 'descriptor-file-name': path}
+
+def collect_config():
+    serverConfig()
+    cd('/')
+    domain = cmo
+    descriptors = {}
+    data = {
+        'name': s(domain.getName()),
+        'domain-version': s(domain.getDomainVersion()),
+        'production-mode-enabled': b(domain.isProductionModeEnabled()),
+        'configuration-audit-type': s(domain.getConfigurationAuditType()),
+        'admin-server-name': s(domain.getAdminServerName()),
+    }
+    data['server'] = attempt('servers', lambda: [collect_server(x) for x in domain.getServers()], [])
+    data['cluster'] = [{'name': s(c.getName())} for c in domain.getClusters() or []]
+    security = domain.getSecurityConfiguration()
+    data['security-configuration'] = {
+        'default-realm': s(security.getDefaultRealm().getName()),
+        'realm': attempt('realms', lambda: [collect_realm(r) for r in security.getRealms()], []),
+    }
+    data['app-deployment'] = [{'name': s(d.getName()), 'target': target_names(d),
+                               'module-type': s(d.getModuleType())} for d in domain.getAppDeployments() or []]
+    data['self-tuning'] = {'work-manager': [{'name': s(w.getName()), 'target': target_names(w)}
+                                            for w in domain.getSelfTuning().getWorkManagers() or []]}
+    data['jdbc-system-resource'] = attempt(
+        'jdbc', lambda: [collect_jdbc(r, descriptors) for r in domain.getJDBCSystemResources()], [])
+    data['wldf-system-resource'] = attempt(
+        'wldf', lambda: [collect_wldf(r, descriptors) for r in domain.getWLDFSystemResources()], [])
+    return data, descriptors
+
+def collect_runtime():
+    domainRuntime()
+    servers = []
+    for runtime in domainRuntimeService.getServerRuntimes() or []:
+        entry = {'name': s(runtime.getName()), 'state': s(runtime.getState()), 'channels': [], 'jdbc': []}
+        for channel in call(runtime, ['getServerChannelRuntimes'], []) or []:
+            entry['channels'].append({'name': s(channel.getChannelName()), 'url': s(channel.getPublicURL())})
+        jdbc = runtime.getJDBCServiceRuntime()
+        for pool in (jdbc and jdbc.getJDBCDataSourceRuntimeMBeans()) or []:
+            result = attempt('testPool ' + s(pool.getName()), lambda: pool.testPool(), 'testPool failed')
+            entry['jdbc'].append({'name': s(pool.getName()), 'state': s(pool.getState()),
+                                  'test': s(result) or 'OK'})
+        servers.append(entry)
+    return servers
+
+document = {'domain': {}, 'descriptors': {}, 'runtime': [], 'errors': errors}
+try:
+    url = os.environ['STIG_WLST_URL']
+    if os.environ.get('STIG_WLST_USER_CONFIG'):
+        connect(userConfigFile=os.environ['STIG_WLST_USER_CONFIG'],
+                userKeyFile=os.environ['STIG_WLST_USER_KEY'], url=url)
+    else:
+        connect(os.environ['STIG_WLST_USER'], os.environ['STIG_WLST_PASSWORD'], url)
+    document['domain'], document['descriptors'] = attempt('config tree', collect_config, ({}, {}))
+    document['runtime'] = attempt('runtime tree', collect_runtime, [])
+    disconnect()
+except:
+    errors.append('connect: ' + s(sys.exc_info()[1]))
+
+out = open(os.environ['STIG_WLST_OUTPUT'], 'w')
+out.write(encode(document))
+out.close()
+exit()
+'''
+
+
+################################################################################
+# COLLECTION
+################################################################################
+
+def find_wlst(wlst=None):
+    """--wlst, $WLST_PATH, the Oracle home's wlst.sh, then PATH"""
+    candidates = [wlst, os.environ.get('WLST_PATH')]
+    for home in (os.environ.get('ORACLE_HOME'), os.environ.get('MW_HOME')):
+        if home:
+            candidates.append(os.path.join(home, 'oracle_common', 'common', 'bin', 'wlst.sh'))
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return shutil.which('wlst.sh')
+
+
+def run_wlst(credentials, wlst=None, timeout=WLST_TIMEOUT):
+    """Run the collection script in one WLST session and return its raw document"""
+    wlst = find_wlst(wlst)
+    if not wlst:
+        return {'errors': ['wlst.sh not found (set WLST_PATH or ORACLE_HOME)']}
+
+    with tempfile.TemporaryDirectory(prefix='stig-wlst-') as work:
+        script = os.path.join(work, 'collect.py')
+        output = os.path.join(work, 'document.json')
+        with open(script, 'w') as f:
+            f.write(WLST_SCRIPT)
+
+        # Credentials travel in the environment, never on the command line
+        env = dict(os.environ, STIG_WLST_URL=credentials['admin_url'], STIG_WLST_OUTPUT=output)
+        if credentials.get('user_config_file'):
+            env['STIG_WLST_USER_CONFIG'] = credentials['user_config_file']
+            env['STIG_WLST_USER_KEY'] = credentials.get('user_key_file') or ''
+        else:
+            env['STIG_WLST_USER'] = credentials.get('username') or ''
+            env['STIG_WLST_PASSWORD'] = credentials.get('password') or ''
+
+        try:
+            result = subprocess.run([wlst, script], env=env, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, universal_newlines=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {'errors': [f"WLST did not finish within {timeout}s"]}
+        except OSError as e:
+            return {'errors': [f"Failed to run {wlst}: {e}"]}
+
+        try:
+            with open(output) as f:
+                return json.load(f, strict=False)
+        except (OSError, ValueError):
+            tail = (result.stderr or result.stdout).strip().splitlines()[-5:]
+            return {'errors': [f"WLST exited with {result.returncode}: " + ' | '.join(tail)]}
+
+
+################################################################################
+# RULE EVALUATION
+################################################################################
+
+def channels_in_use(runtime):
+    """(server, channel, protocol, port) for every channel of every running server"""
+    found = []
+    for server in runtime:
+        for channel in server.get('channels', []):
+            url = channel.get('url', '')
+            protocol, _, rest = url.partition('://')
+            port = rest.rsplit(':', 1)[-1] if ':' in rest else ''
+            found.append((server.get('name', ''), channel.get('name', ''), protocol.lower(), port))
+    return found
+
+
+def describe_channels(channels):
+    return ', '.join(f"{server}/{name} {protocol}:{port}" for server, name, protocol, port in channels)
+
+
+def check_approved_ports(domain, runtime, settings):
+    channels = channels_in_use(runtime)
+    if not channels:
+        return 'ERROR', 'No running server channels returned by WLST'
+    ports = [str(p) for p in settings.get('approved_ports', [])]
+    protocols = [p.lower() for p in settings.get('approved_protocols', [])]
+    if not ports and not protocols:
+        return 'Not_Reviewed', ('Ports in use (compare with the approved list or set approved_ports/'
+                                'approved_protocols in --config): ' + describe_channels(channels))
+    unapproved = [c for c in channels if (ports and c[3] not in ports) or (protocols and c[2] not in protocols)]
+    if unapproved:
+        return 'Open', 'Unapproved ports/protocols in use: ' + describe_channels(unapproved)
+    return 'NotAFinding', 'All ports/protocols in use are approved: ' + describe_channels(channels)
+
+
+def check_secure_protocols(domain, runtime, settings):
+    channels = channels_in_use(runtime)
+    if not channels:
+        return 'ERROR', 'No running server channels returned by WLST'
+    insecure = [c for c in channels if not c[2].endswith('s') and c[2] not in SECURE_PROTOCOLS]
+    if insecure:
+        return 'Open', 'Channels using unencrypted protocols: ' + describe_channels(insecure)
+    return 'NotAFinding', 'All channels use secure protocols: ' + describe_channels(channels)
+
+
+def check_ldap_encryption(domain, runtime, settings):
+    realm = domain.default_realm
+    providers = [p for p in (realm.authentication_providers if realm else [])
+                 if 'ssl-enabled' in p or any(m in p.get('@type', '').lower() for m in LDAP_PROVIDER_MARKERS)]
+    ldap_channels = [c for c in channels_in_use(runtime) if c[2] == 'ldap']
+    if not providers and not ldap_channels:
+        return 'Not_Applicable', 'LDAP is not used for authentication'
+    plain = [p.get('name', '') for p in providers if not weblogic_domain.as_bool(p.get('ssl-enabled'))]
+    problems = []
+    if plain:
+        problems.append('LDAP authentication providers without SSL: ' + ', '.join(plain))
+    if ldap_channels:
+        problems.append('LDAP channels in use: ' + describe_channels(ldap_channels))
+    if problems:
+        return 'Open', '; '.join(problems)
+    return 'NotAFinding', 'LDAP providers use LDAPS: ' + ', '.join(p.get('name', '') for p in providers)
+
+
+def check_audit_data_source_tests(domain, runtime, settings):
+    status, details = weblogic_domain.check_audit_data_sources(domain)
+    failures = []
+    tested = []
+    for server in runtime:
+        for pool in server.get('jdbc', []):
+            if pool.get('name') not in ('opss-audit-DBDS', 'wls-wldf-storeDS'):
+                continue
+            tested.append(f"{server.get('name')}/{pool['name']}")
+            if pool.get('test') != 'OK':
+                failures.append(f"{server.get('name')}/{pool['name']}: {pool.get('test')}")
+    if failures:
+        return 'Open', details + '; Test Data Source failed: ' + '; '.join(failures)
+    if status == 'NotAFinding' and tested:
+        details += '; Test Data Source succeeded on ' + ', '.join(tested)
+    return status, details
+
+
+RUNTIME_RULES = {
+    'WBLC-01-000011': check_audit_data_source_tests,
+    'WBLC-01-000014': check_approved_ports,
+    'WBLC-02-000065': check_audit_data_source_tests,
+    'WBLC-02-000081': check_audit_data_source_tests,
+    'WBLC-03-000128': check_approved_ports,
+    'WBLC-05-000169': check_ldap_encryption,
+    'WBLC-08-000238': check_secure_protocols,
+}
+
+# Runtime rules whose outcome depends on --config settings
+SETTINGS_RULES = ('WBLC-01-000014', 'WBLC-03-000128')
+
+# Every rule the batch document evaluates; other rules never need a WLST session
+BATCH_RULES = tuple(sorted(set(weblogic_domain.WEBLOGIC_RULES) | set(RUNTIME_RULES)))
+
+EXIT_CODES = weblogic_domain.EXIT_CODES
+
+STATUS_PRIORITY = weblogic_domain.STATUS_PRIORITY
+
+
+def build_document(raw, admin_url, settings=None):
+    """Evaluate every rule against one collection; returns the document keyed by rule"""
+    settings = settings or {}
+    errors = raw.get('errors', [])
+    domain = weblogic_domain.WebLogicDomain(admin_url, raw.get('domain') or {}, raw.get('descriptors'))
+    runtime = raw.get('runtime') or []
+    rules = {}
+    for stig_id in BATCH_RULES:
+        if not domain.data:
+            status, details = 'ERROR', 'WLST collection failed: ' + '; '.join(errors)
+        elif stig_id in RUNTIME_RULES:
+            status, details = RUNTIME_RULES[stig_id](domain, runtime, settings)
+        else:
+            status, details = weblogic_domain.WEBLOGIC_RULES[stig_id](domain)
+        rules[stig_id] = {'status': status, 'finding_details': details}
+    return {
+        'version': CACHE_VERSION,
+        'admin_url': admin_url,
+        'collected': time.time(),
+        'domain': domain.name if domain.data else None,
+        'errors': errors,
+        'rules': rules,
+        'facts': raw,
+    }
+
+
+################################################################################
+# DOCUMENT CACHE
+################################################################################
+
+def resolve_credentials(admin_url=None, username=None, password=None, user_config_file=None, user_key_file=None):
+    """Arguments first, then $WLS_ADMIN_URL, $WLS_USERNAME, $WLS_PASSWORD, $WLS_USER_CONFIG_FILE, $WLS_USER_KEY_FILE"""
+    return {
+        'admin_url': admin_url or os.environ.get('WLS_ADMIN_URL'),
+        'username': username or os.environ.get('WLS_USERNAME'),
+        'password': password or os.environ.get('WLS_PASSWORD'),
+        'user_config_file': user_config_file or os.environ.get('WLS_USER_CONFIG_FILE'),
+        'user_key_file': user_key_file or os.environ.get('WLS_USER_KEY_FILE'),
+    }
+
+
+def cache_path(cache_dir, credentials):
+    identity = f"{credentials['admin_url']}\0{credentials.get('username') or credentials.get('user_config_file')}"
+    digest = hashlib.sha1(identity.encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"weblogic-wlst-{digest}.json"
+
+
+def read_document(path, max_age):
+    try:
+        document = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if document.get('version') != CACHE_VERSION or time.time() - document.get('collected', 0) > max_age:
+        return None
+    return document
+
+
+_loaded = {}
+
+
+def load_document(credentials, settings=None, cache_dir=DEFAULT_CACHE_DIR, max_age=DEFAULT_MAX_AGE,
+                  refresh=False, wlst=None):
+    """
+    Return the rule document, collecting it with one WLST session if needed.
+
+    Args:
+        credentials: resolve_credentials() result
+        settings: Environment-specific values (approved_ports, approved_protocols)
+        cache_dir: Directory for the shared on-disk document
+        max_age: Seconds a collected document stays valid
+        refresh: Collect even if a valid document exists
+        wlst: Path to wlst.sh
+
+    Returns:
+        dict with 'rules' keyed by STIG ID, or None without an admin URL
+    """
+    if not credentials.get('admin_url'):
+        return None
+    path = cache_path(cache_dir, credentials)
+    if not refresh and path in _loaded and time.time() - _loaded[path]['collected'] <= max_age:
+        return _loaded[path]
+
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    with open(str(path.with_suffix('.lock')), 'w') as lock:
+        # Checks started in parallel wait here for the first collection
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        document = None if refresh else read_document(path, max_age)
+        if document is None:
+            raw = run_wlst(credentials, wlst)
+            document = build_document(raw, credentials['admin_url'], settings)
+            # Failed collections are cached too: checks waiting on the lock then
+            # fail fast instead of each retrying the admin login (account lockout)
+            try:
+                tmp = path.with_suffix('.tmp')
+                fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(document, f)
+                os.replace(str(tmp), str(path))
+            except OSError:
+                pass
+
+    _loaded[path] = document
+    return document
+
+
+def lookup(document, stig_id, settings=None):
+    """
+    (status, finding_details) of one rule from a collected document. Rules
+    that depend on environment-specific settings are re-evaluated from the
+    collected facts when settings are given.
+    """
+    if stig_id not in BATCH_RULES:
+        return 'Not_Reviewed', 'Manual review required - consult STIG documentation'
+    if document is None:
+        return 'ERROR', 'WebLogic admin URL not configured (set --admin-url or WLS_ADMIN_URL)'
+    if settings and stig_id in SETTINGS_RULES and document['domain']:
+        raw = document['facts']
+        domain = weblogic_domain.WebLogicDomain(document['admin_url'], raw['domain'], raw.get('descriptors'))
+        return RUNTIME_RULES[stig_id](domain, raw.get('runtime') or [], settings)
+    result = document['rules'][stig_id]
+    return result['status'], result['finding_details']
+
+
+def run_rule(stig_id, settings=None, admin_url=None, username=None, password=None):
+    """Entry point for the per-rule check scripts: (status, finding_details, exit_code)"""
+    document = None
+    if stig_id in BATCH_RULES:
+        document = load_document(resolve_credentials(admin_url, username, password), settings)
+    status, details = lookup(document, stig_id, settings)
+    return status, details, EXIT_CODES[status]
+
+
+def load_settings(config_file):
+    """approved_ports/approved_protocols from a STIG configuration file ('weblogic' section)"""
+    if not config_file:
+        return {}
+    with open(config_file) as f:
+        return json.load(f).get('weblogic', {})
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Collect WebLogic MBean values in one WLST session and evaluate WebLogic STIG rules',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--admin-url', help='AdminServer URL, e.g. t3s://localhost:7002 (default: $WLS_ADMIN_URL)')
+    parser.add_argument('--username', help='Admin user (default: $WLS_USERNAME)')
+    parser.add_argument('--password', help='Admin password (default: $WLS_PASSWORD)')
+    parser.add_argument('--user-config-file', help='WLST user config file (storeUserConfig)')
+    parser.add_argument('--user-key-file', help='WLST user key file (storeUserConfig)')
+    parser.add_argument('--wlst', help='Path to wlst.sh (default: $WLST_PATH or $ORACLE_HOME/oracle_common)')
+    parser.add_argument('--config', help='STIG configuration file (JSON) with approved_ports/approved_protocols')
+    parser.add_argument('--rule', action='append', default=[],
+                        help='STIG ID to report (may be repeated; default: all automated rules)')
+    parser.add_argument('--output-json', help='Write the result of a single --rule to this file')
+    parser.add_argument('--output-dir', help='Write per-rule results to this directory')
+    parser.add_argument('--dump', action='store_true', help='Print the collected document and exit')
+    parser.add_argument('--refresh', action='store_true', help='Collect even if a cached document (or failure) is valid')
+    parser.add_argument('--max-age', type=int, default=DEFAULT_MAX_AGE,
+                        help=f'Seconds a collected document stays valid (default: {DEFAULT_MAX_AGE})')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help='Cache directory')
+    args = parser.parse_args()
+
+    credentials = resolve_credentials(args.admin_url, args.username, args.password,
+                                      args.user_config_file, args.user_key_file)
+    settings = load_settings(args.config)
+    rule_ids = args.rule or list(BATCH_RULES)
+    document = None
+    if args.dump or any(stig_id in BATCH_RULES for stig_id in rule_ids):
+        document = load_document(credentials, settings, args.cache_dir, args.max_age, args.refresh, args.wlst)
+
+    if args.dump:
+        if document is None:
+            print("ERROR: WebLogic admin URL not configured (set --admin-url or WLS_ADMIN_URL)")
+            return 3
+        print(json.dumps(document, indent=2))
+        return 0
+
+    metadata = weblogic_domain.load_rule_metadata()
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    results = []
+    for stig_id in rule_ids:
+        check = metadata.get(stig_id, {})
+        status, details = lookup(document, stig_id, settings)
+        results.append({
+            'vuln_id': check.get('Group ID', 'UNKNOWN'),
+            'stig_id': stig_id,
+            'severity': check.get('Severity', 'medium'),
+            'status': status,
+            'finding_details': details,
+            'timestamp': timestamp,
+        })
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for result in results:
+            (output_dir / f"{result['stig_id']}.json").write_text(json.dumps(result, indent=2))
+
+    if args.output_json and len(results) == 1:
+        Path(args.output_json).write_text(json.dumps(results[0], indent=2))
+
+    for result in results:
+        print(f"[{result['vuln_id']}] {result['stig_id']}: {result['status']}")
+        print(f"    {result['finding_details']}")
+
+    worst = min((r['status'] for r in results), key=STATUS_PRIORITY.index)
+    return EXIT_CODES[worst]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1177 @@
+#!/usr/bin/env python3
+"""
+Windows registry STIG evaluation
+Evaluates the registry-based rules of the Windows 10, Windows 11, Windows
+Server 2019 and Windows Server 2022 STIGs, and of the Office 2016 / Office 365
+ProPlus STIGs, against collected registry hives, .reg exports, or the live
+registry when run on Windows.
+
+Rule requirements (hive, key path, value name, type and accepted values) are
+extracted once from the check text in analyzed_checks.json /
+windows_<n>_checks.json. Keys that windows_registry_analysis.json maps to a rule
+without a value specification are reported as Not_Reviewed when the check text
+names the key. Each host is
+a directory of hive files (SYSTEM, SOFTWARE, SECURITY, SAM and optionally
+NTUSER.DAT) saved with "reg save"; its hives are memory-mapped once and every
+rule is answered from them in one pass, so thousands of hosts can be scored
+from one Linux system. A host can also be given as "reg export" files
+(registry_export.py); an export is streamed once and only the keys the rules
+read are indexed. Office rules are taken from the criteria sentences of
+microsoft_*_checks.json and identified by STIG ID.
+
+Usage:
+    python3 windows_registry.py --hives /srv/hives/host01
+    python3 windows_registry.py --hives /srv/hives/host01 --rule V-205631 --output-json result.json
+    python3 windows_registry.py --reg host01_hklm.reg --reg host01_hkcu.reg
+    python3 windows_registry.py --hosts-dir /srv/hives --output-dir results/windows_registry
+    python3 windows_registry.py --reg host01.reg --platform ms_word_2016 --rule DTOO104
+    python3 windows_registry.py --platform windows_10_v3r4 --list-rules
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import OrderedDict, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import registry_export
+import registry_hive
+import stig_catalog
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+# Check directory -> rule source and product detection
+PLATFORMS = OrderedDict([
+    ('windows_10_v3r4', {
+        'checks': 'windows_10_checks.json',
+        'benchmark': 'Microsoft Windows 10',
+        'server': False,
+    }),
+    ('windows_11_v2r4', {
+        'checks': 'windows_11_checks.json',
+        'benchmark': 'Microsoft Windows 11',
+        'server': False,
+    }),
+    ('windows_server_2019_v2r7', {
+        'checks': 'checks/os/windows_server_2019_v2r7/analyzed_checks.json',
+        'benchmark': 'Microsoft Windows Server 2019',
+        'server': True,
+    }),
+    ('windows_server_2022_v1r3', {
+        'checks': 'checks/os/windows_server_2022_v1r3/analyzed_checks.json',
+        'benchmark': 'Microsoft Windows Server 2022',
+        'server': True,
+    }),
+    # Office rules are identified by STIG ID (DTOO* IDs repeat across products)
+    ('ms_office_365_proplus', {
+        'checks': 'microsoft_office_365_proplus_checks.json',
+        'benchmark': 'Microsoft Office 365 ProPlus',
+        'server': False,
+        'office': True,
+    }),
+    ('ms_office_system_2016', {
+        'checks': 'microsoft_office_system_2016_checks.json',
+        'benchmark': 'Microsoft Office System 2016',
+        'server': False,
+        'office': True,
+    }),
+    ('ms_excel_2016', {
+        'checks': 'microsoft_excel_2016_checks.json',
+        'benchmark': 'Microsoft Excel 2016',
+        'server': False,
+        'office': True,
+    }),
+    ('ms_outlook_2016', {
+        'checks': 'microsoft_outlook_2016_checks.json',
+        'benchmark': 'Microsoft Outlook 2016',
+        'server': False,
+        'office': True,
+    }),
+    ('ms_powerpoint_2016', {
+        'checks': 'microsoft_powerpoint_2016_checks.json',
+        'benchmark': 'Microsoft PowerPoint 2016',
+        'server': False,
+        'office': True,
+    }),
+    ('ms_word_2016', {
+        'checks': 'microsoft_word_2016_checks.json',
+        'benchmark': 'Microsoft Word 2016',
+        'server': False,
+        'office': True,
+    }),
+])
+WINDOWS_PLATFORMS = tuple(p for p in PLATFORMS if not PLATFORMS[p].get('office'))
+OFFICE_PLATFORMS = tuple(p for p in PLATFORMS if PLATFORMS[p].get('office'))
+REGISTRY_ANALYSIS = 'windows_registry_analysis.json'
+
+# Hive files looked for in a host directory (case-insensitive, optional suffix)
+HIVE_NAMES = ('SYSTEM', 'SOFTWARE', 'SECURITY', 'SAM', 'NTUSER.DAT')
+HIVE_SUFFIXES = ('', '.hiv', '.dat', '.hive')
+
+ROOT_KEYS = {
+    'HKEY_LOCAL_MACHINE': 'HKLM',
+    'HKLM': 'HKLM',
+    'HKEY_CURRENT_USER': 'HKCU',
+    'HKCU': 'HKCU',
+}
+
+EXIT_CODES = {
+    'NotAFinding': 0,
+    'Open': 1,
+    'Not_Applicable': 2,
+    'Not_Reviewed': 2,
+    'ERROR': 3,
+}
+STATUS_PRIORITY = ('ERROR', 'Open', 'Not_Reviewed', 'NotAFinding', 'Not_Applicable')
+
+# Keys read for host facts (product, build, role, installed Office)
+CURRENT_VERSION_KEY = 'SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion'
+PRODUCT_OPTIONS_KEY = 'SYSTEM\\CurrentControlSet\\Control\\ProductOptions'
+OFFICE_KEYS = ('SOFTWARE\\Microsoft\\Office\\16.0', 'SOFTWARE\\Policies\\Microsoft\\Office\\16.0')
+CLICK_TO_RUN_KEY = 'SOFTWARE\\Microsoft\\Office\\ClickToRun'
+FACT_KEYS = (CURRENT_VERSION_KEY, PRODUCT_OPTIONS_KEY, CLICK_TO_RUN_KEY) + OFFICE_KEYS
+
+# Check text that means the registry values are only part of the evidence
+PARTIAL_EVIDENCE = ('registry values alone do not', 'Get-CimInstance')
+
+Value = namedtuple('Value', 'name type_name data')
+
+
+################################################################################
+# RULE EXTRACTION
+################################################################################
+
+FIELD_RE = re.compile(r'^(Registry Hive|Registry ?Paths?|Value Name|Value Type|Type|Value Data|Value)\s*:\s*(.*)$', re.I)
+TYPO_PATH_RE = re.compile(r'^Registry ?Path\s*(\\.*)$')
+INTRO_RE = re.compile(r'^If (?:(one) of )?the following registry (?:value|values|entry)\b', re.I)
+NA_INTRO_RE = re.compile(r'exists and is configured as specified.*\bNA\b', re.I)
+VERSION_HEADER_RE = re.compile(r'^v\d{4}\b')
+
+
+def split_root(path):
+    """'HKLM:\\Software\\X' or 'HKEY_LOCAL_MACHINE\\Software\\X' -> ('HKLM', 'Software\\X')"""
+    parts = [p for p in path.replace('/', '\\').split('\\') if p]
+    if parts and ROOT_KEYS.get(parts[0].rstrip(':').upper()):
+        return ROOT_KEYS[parts[0].rstrip(':').upper()], '\\'.join(parts[1:])
+    return None, '\\'.join(parts)
+
+
+def parse_expected(value_type, text, extra):
+    """
+    Turn the 'Value:' text of a check into a comparison.
+
+    Returns a dict with 'kind' in in/min/max/string/items/multi/manual and
+    'allow_missing' when the check accepts the value being absent.
+    """
+    full = ' '.join([text] + extra)
+    lowered = full.lower()
+    expected = {'allow_missing': 'does not exist' in lowered, 'text': text}
+
+    numeric = value_type in ('REG_DWORD', 'REG_QWORD') or (
+        value_type != 'REG_MULTI_SZ' and re.match(r'^(0x[0-9a-f]+|\d+)\b', text.strip(), re.I))
+    if numeric:
+        hexes = [int(h, 16) for h in re.findall(r'0x([0-9a-fA-F]+)', ' '.join([text] + extra))]
+        if hexes:
+            numbers = hexes
+        else:
+            numbers = [int(n) for n in re.findall(r'\b\d+\b', re.sub(r'\([^)]*\)', '', text))]
+        if not numbers:
+            return dict(expected, kind='manual')
+        if 'or greater' in lowered or 'or more' in lowered:
+            return dict(expected, kind='min', number=numbers[0])
+        if 'or less' in lowered:
+            return dict(expected, kind='max', number=numbers[0],
+                        nonzero='excluding' in lowered or 'but not 0' in lowered)
+        return dict(expected, kind='in', numbers=sorted(set(numbers)))
+
+    stripped = text.strip().strip('"')
+    if not stripped or re.match(r'^(see|refer)\b', stripped, re.I) or stripped.startswith('You are accessing'):
+        return dict(expected, kind='manual')
+    if value_type == 'REG_MULTI_SZ':
+        return dict(expected, kind='multi', items=stripped.split())
+    if ',' in stripped and '=' in stripped:
+        return dict(expected, kind='items', items=[i.strip() for i in stripped.split(',') if i.strip()])
+    return dict(expected, kind='string', string=stripped)
+
+
+def parse_requirements(text):
+    """
+    Extract registry requirements from check text.
+
+    Returns a list of groups: {'mode': all|any|na, 'values': [...],
+    'alternative': index of the group it is an alternative to, or None,
+    'legacy': True for groups under a version header such as "v1507 LTSB:"}.
+    """
+    groups = []
+    hive = None
+    paths = []
+    path_list = False
+    current = None
+    pending_header = None
+    legacy = False
+    intro = None
+
+    def new_group(mode):
+        alternative = None
+        if pending_header is not None and groups:
+            alternative = next((i for i in range(len(groups) - 1, -1, -1)
+                                if groups[i]['alternative'] is None and groups[i]['mode'] != 'na'), None)
+        if mode is None:
+            # An alternative without its own intro follows its base group ("one of" stays any)
+            mode = groups[alternative]['mode'] if alternative is not None else 'all'
+        groups.append({'mode': mode, 'values': [], 'alternative': alternative, 'legacy': legacy})
+        return groups[-1]
+
+    group = None
+    for raw_line in text.replace('_x000D_', '').splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        match = FIELD_RE.match(line)
+        typo = TYPO_PATH_RE.match(line) if not match else None
+        if match or typo:
+            field, data = (match.group(1).title(), match.group(2).strip()) if match else ('Registry Path', typo.group(1))
+            field = field.replace('Registrypath', 'Registry Path')
+            if field == 'Registry Hive':
+                hive = ROOT_KEYS.get(data.split()[0].upper()) if data else None
+            elif field.startswith('Registry Path'):
+                # "Registry Paths:" lists one path per following line
+                paths = [data] if data else []
+                path_list = field == 'Registry Paths'
+            elif field == 'Value Name':
+                if group is None or intro is not None or pending_header is not None:
+                    group = new_group(intro)
+                    intro = None
+                    pending_header = None
+                current = {'hive': hive, 'name': data, 'type': None, 'value': None, 'extra': [], 'paths': list(paths)}
+                group['values'].append(current)
+            elif field in ('Value Type', 'Type') and current is not None:
+                current['type'] = data.split()[0].upper() if data else None
+            elif field in ('Value', 'Value Data') and current is not None:
+                current['value'] = data
+            continue
+
+        if path_list and line.startswith('\\'):
+            paths.append(line)
+            continue
+        path_list = False
+        if current is not None and current['value'] is not None and re.match(r'^0x[0-9a-f]+', line, re.I):
+            current['extra'].append(line)
+            continue
+        if INTRO_RE.match(line):
+            intro = 'na' if NA_INTRO_RE.search(line) else ('any' if INTRO_RE.match(line).group(1) else 'all')
+            current = None
+            continue
+        if line.endswith(':') and len(line) < 100:
+            pending_header = line
+            legacy = bool(VERSION_HEADER_RE.match(line))
+            current = None
+            continue
+        if current is not None and current['value'] is not None:
+            current = None
+
+    for group in groups:
+        values = []
+        for value in group['values']:
+            if not value['hive'] or value['value'] is None:
+                continue
+            expected = parse_expected(value['type'], value['value'], value['extra'])
+            for key_path in value['paths']:
+                values.append({
+                    'hive': value['hive'],
+                    'path': '\\'.join(p for p in key_path.split('\\') if p),
+                    'name': value['name'],
+                    'type': value['type'],
+                    'expected': expected,
+                })
+        group['values'] = values
+    return [g for g in groups if g['values']]
+
+
+def applicability_notes(text):
+    """Sentences of the check text that make the rule NA or conditional"""
+    notes = []
+    for line in text.replace('_x000D_', '').splitlines():
+        line = line.strip()
+        if re.search(r'\bNA\b|not applicable', line) and not INTRO_RE.match(line):
+            notes.append(line)
+    return notes
+
+
+OFFICE_KEY_RE = re.compile(r'^\s*((?:HKLM|HKCU|HKEY_LOCAL_MACHINE|HKEY_CURRENT_USER)\\[^\r\n]+?)\s*$', re.M | re.I)
+OFFICE_NAME_RE = re.compile(r'\bvalues? (?:for |of |named )?(?:"([^"]+)"|([A-Za-z0-9_.\- ]+?))\s+'
+                            r'(?:is|are|does|exists|has|should)\b')
+OFFICE_CLAUSE_RE = re.compile(r'\s+(and|or)(?: if)?(?= the value\b)')
+OFFICE_NUMBER_RE = re.compile(r'\b(0x[0-9a-f]+|[0-9a-f]+)\s*\((hex|dec)[a-z]*\)', re.I)
+
+
+def office_clause_values(clause):
+    """(numbers, strings, at_least) stated by one criteria clause"""
+    strings = []
+    for quoted, bare in re.findall(r'REG_(?:EXPAND_)?SZ\s*=\s*(?:"([^"]*)"|([^",]+?)\s*(?:,|$))', clause):
+        strings.append('' if bare.lower() == '(blank)' else quoted or bare)
+    match = re.search(r'REG_(?:DWORD|QWORD)\b|\bset to (?=\d)', clause)
+    if not match:
+        return [], strings, False
+    tail = re.split(r',?\s*(?:then )?this is|\s+(?:is|are) also acceptable', clause[match.start():])[0]
+    annotated = OFFICE_NUMBER_RE.findall(tail)
+    if annotated:
+        numbers = [int(n, 16) if base.lower() == 'hex' else int(n) for n, base in annotated]
+        numbers = [numbers[0]]
+    else:
+        numbers = [int(n, 16) if n.lower().startswith('0x') else int(n)
+                   for n in re.findall(r'\b(0x[0-9a-fA-F]+|\d+)\b', tail.replace('REG_DWORD', '').replace('REG_QWORD', ''))]
+    return numbers, strings, bool(re.search(r'or (?:above|greater|more)', tail))
+
+
+def parse_office_requirements(text):
+    """
+    Extract the requirement of an Office rule.
+
+    Office checks name one key and state their criteria as sentences ("If the
+    value vbawarnings is REG_DWORD = 3, this is not a finding. A value of
+    REG_DWORD = 2 or REG_DWORD = 4 is also acceptable."). Returns groups in the
+    same form as parse_requirements.
+    """
+    text = text.replace('_x000D_', '')
+    key = OFFICE_KEY_RE.search(text)
+    if not key:
+        return []
+    hive, path = split_root(key.group(1).rstrip('.'))
+    criteria = re.sub(r'\bCriteria:\s*', '', ' '.join(text[key.end():].split()))
+    specs = OrderedDict()
+    key_absent = False
+    mode = 'all'
+    name = None
+    for sentence in re.split(r'(?<=\.)\s+', criteria):
+        lowered = sentence.lower()
+        if 'not a finding' in lowered or 'acceptable' in lowered:
+            accepted = True
+        elif 'is a finding' in lowered:
+            accepted = False
+        else:
+            continue
+        # "If both the value for A ... and the value for B ..." only requires B when A is set
+        parts = OFFICE_CLAUSE_RE.split(sentence)
+        first = None
+        for index in range(0, len(parts), 2):
+            clause = parts[index]
+            lowered = clause.lower()
+            match = OFFICE_NAME_RE.search(clause)
+            if match and not (match.group(1) or match.group(2)).startswith('REG_'):
+                name = (match.group(1) or match.group(2)).strip()
+            if index and accepted and parts[index - 1] == 'or' and name != first:
+                mode = 'any'
+            if 'registry key exists' in lowered and not accepted:
+                key_absent = True
+                continue
+            if name is None:
+                continue
+            spec = specs.setdefault(name, {'accept': [], 'reject': [], 'strings': [], 'min': False,
+                                           'missing': None, 'absent': False, 'manual': False, 'text': [],
+                                           'requires': None})
+            spec['text'].append(sentence)
+            if first is None:
+                first = name
+            elif name != first and sentence.lower().startswith('if both'):
+                spec['requires'] = first
+            if 'no entries' in lowered:
+                spec['manual'] = True
+            numbers, strings, at_least = office_clause_values(clause)
+            if numbers or strings:
+                spec['accept' if accepted else 'reject'].extend(numbers)
+                spec['strings'].extend(strings if accepted else [])
+                spec['min'] = spec['min'] or at_least
+            if 'does not exist' in lowered:
+                spec['missing'] = accepted
+            elif re.search(r'\bexists\b', lowered) and not accepted and not numbers:
+                spec['absent'] = True
+
+    values = []
+    for value_name, spec in specs.items():
+        expected = {'allow_missing': bool(spec['missing']),
+                    'text': ' '.join(OrderedDict.fromkeys(spec['text']))[:300]}
+        if spec['manual']:
+            expected['kind'] = 'manual'
+        elif (spec['absent'] or spec['missing']) and not (spec['accept'] or spec['strings']):
+            expected.update(kind='absent', allow_missing=True)
+        elif spec['accept'] and spec['min']:
+            expected.update(kind='min', number=min(spec['accept']))
+        elif spec['accept']:
+            expected.update(kind='in', numbers=sorted(set(spec['accept'])))
+        elif spec['strings']:
+            expected.update(kind='string', string=spec['strings'][0])
+        elif spec['reject']:
+            expected.update(kind='not_in', numbers=sorted(set(spec['reject'])))
+        else:
+            expected['kind'] = 'manual'
+        if spec['requires']:
+            expected['requires'] = spec['requires']
+        values.append({'hive': hive, 'path': path, 'name': value_name,
+                       'type': 'REG_SZ' if spec['strings'] else 'REG_DWORD', 'expected': expected})
+    if key_absent:
+        values.append({'hive': hive, 'path': path, 'name': None, 'type': None,
+                       'expected': {'kind': 'absent_key', 'allow_missing': True, 'text': 'key must not exist'}})
+    if not hive or not values:
+        return []
+    return [{'mode': mode, 'values': values, 'alternative': None, 'legacy': False}]
+
+
+def rule_from_check(check, office=False):
+    """Registry rule record from a checks JSON entry (None when not registry-based)"""
+    text = check.get('Check Content', '')
+    groups = parse_office_requirements(text) if office else parse_requirements(text)
+    if not groups:
+        return None
+    vuln_id = check.get('Vuln ID') or check.get('Group ID')
+    return {
+        'check_id': check.get('STIG ID', '') if office else vuln_id,
+        'vuln_id': vuln_id,
+        'stig_id': check.get('STIG ID', ''),
+        'severity': check.get('Severity', 'medium'),
+        'title': check.get('Rule Title', ''),
+        'groups': groups,
+        'notes': applicability_notes(text),
+        'partial': any(marker in text for marker in PARTIAL_EVIDENCE),
+    }
+
+
+_rules = {}
+
+
+def load_platform_rules(platform):
+    """Registry rules of a platform keyed by check ID (parsed once per process)"""
+    if platform in _rules:
+        return _rules[platform]
+    if platform not in PLATFORMS:
+        raise ValueError(f"Unknown platform: {platform}")
+    spec = PLATFORMS[platform]
+    rules = OrderedDict()
+    try:
+        checks = stig_catalog.load_checks(REPO_ROOT / spec['checks'])
+    except (OSError, ValueError):
+        checks = []
+    office = spec.get('office', False)
+    titles = {}
+    for check in checks:
+        vuln_id = check.get('Vuln ID') or check.get('Group ID')
+        titles[vuln_id] = check
+        rule = rule_from_check(check, office)
+        if rule:
+            rules[rule['check_id']] = rule
+    covered = {rule['vuln_id'] for rule in rules.values()}
+
+    # Rules the registry analysis maps to a key without a value specification
+    try:
+        with open(REPO_ROOT / REGISTRY_ANALYSIS, encoding='utf-8') as f:
+            analysis = json.load(f).get('by_confidence', {})
+    except (OSError, ValueError):
+        analysis = {}
+    for confidence in ('high', 'medium'):
+        for entry in analysis.get(confidence, []):
+            vuln_id = entry.get('vuln_id')
+            if entry.get('benchmark') != spec['benchmark'] or vuln_id in covered or not entry.get('registry_path'):
+                continue
+            # The analysis matches keys loosely; keep only keys the check text names
+            check = titles.get(vuln_id, {})
+            if split_root(entry['registry_path'])[1].lower() not in check.get('Check Content', '').lower():
+                continue
+            check_id = check.get('STIG ID', '') if office else vuln_id
+            if not check_id:
+                continue
+            covered.add(vuln_id)
+            rules[check_id] = {
+                'check_id': check_id,
+                'vuln_id': vuln_id,
+                'stig_id': check.get('STIG ID', ''),
+                'severity': check.get('Severity', 'medium'),
+                'title': check.get('Rule Title', entry.get('rule_title', '')),
+                'groups': [],
+                'key': entry['registry_path'],
+                'notes': [],
+                'partial': True,
+            }
+    _rules[platform] = rules
+    return rules
+
+
+################################################################################
+# REGISTRY VIEWS
+################################################################################
+
+class HiveSet(object):
+    """Registry of one host, read from a directory of collected hive files"""
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        self.files = {}
+        self.errors = []
+        self._hives = {}
+        self._control_set = None
+        try:
+            entries = os.listdir(self.directory)
+        except OSError as e:
+            raise registry_hive.HiveError(f"{self.directory}: {e.strerror}")
+        lowered = {entry.lower(): entry for entry in entries}
+        for name in HIVE_NAMES:
+            for suffix in HIVE_SUFFIXES:
+                entry = lowered.get((name + suffix).lower())
+                if entry and os.path.isfile(os.path.join(self.directory, entry)):
+                    self.files[name] = os.path.join(self.directory, entry)
+                    break
+
+    def hive(self, name):
+        """Opened hive by name, or None when it was not collected"""
+        if name not in self._hives:
+            hive = None
+            if name in self.files:
+                try:
+                    hive = registry_hive.RegistryHive(self.files[name])
+                except (OSError, registry_hive.HiveError) as e:
+                    self.errors.append(str(e))
+            self._hives[name] = hive
+        return self._hives[name]
+
+    def close(self):
+        for hive in self._hives.values():
+            if hive is not None:
+                hive.close()
+        self._hives = {}
+
+    def control_set(self):
+        """ControlSet00N that CurrentControlSet points to"""
+        if self._control_set is None:
+            self._control_set = 'ControlSet001'
+            system = self.hive('SYSTEM')
+            current = system.get_value('Select', 'Current') if system else None
+            if current is not None and isinstance(current.data, int):
+                self._control_set = f"ControlSet{current.data:03d}"
+        return self._control_set
+
+    def locate(self, root, path):
+        """(hive, path inside the hive, problem)"""
+        parts = [p for p in path.split('\\') if p]
+        if root == 'HKCU':
+            name = 'NTUSER.DAT'
+        elif parts and parts[0].upper() in ('SYSTEM', 'SOFTWARE', 'SECURITY', 'SAM'):
+            name = parts.pop(0).upper()
+        else:
+            return None, None, f"{root}\\{path} is not stored in a collected hive"
+        if name == 'SYSTEM' and parts and parts[0].lower() == 'currentcontrolset':
+            parts[0] = self.control_set()
+        hive = self.hive(name)
+        if hive is None:
+            return None, None, f"{name} hive not collected in {self.directory}"
+        return hive, '\\'.join(parts), None
+
+    def get_value(self, root, path, name):
+        """
+        Look up a value.
+
+        Returns:
+            (Value or None, problem) where problem is set when the hive holding
+            the key is not available
+        """
+        hive, inner, problem = self.locate(root, path)
+        if problem:
+            return None, problem
+        value = hive.get_value(inner, name)
+        if value is None:
+            return None, None
+        return Value(value.name, value.type_name, value.data), None
+
+    def key_exists(self, root, path):
+        hive, inner, problem = self.locate(root, path)
+        return None if problem else hive.open_key(inner) is not None
+
+
+def export_paths(root, path):
+    """Export key paths that can hold a rule key (CurrentControlSet may only be exported as ControlSet00N)"""
+    full = f"{root}\\{path}"
+    match = re.match(r'^(HKLM\\SYSTEM\\)CurrentControlSet(\\.*)?$', full, re.I)
+    if not match:
+        return [full]
+    return [full] + [f"{match.group(1)}ControlSet{n:03d}{match.group(2) or ''}" for n in (1, 2, 3)]
+
+
+def wanted_export_keys(platforms):
+    """Keys to keep when indexing an export for the given platforms"""
+    keys = set()
+    for requirement in ([{'hive': 'HKLM', 'path': path} for path in FACT_KEYS] +
+                        [{'hive': 'HKLM', 'path': 'SYSTEM\\Select'}]):
+        keys.update(export_paths(requirement['hive'], requirement['path']))
+    for platform in platforms:
+        for rule in load_platform_rules(platform).values():
+            for group in rule['groups']:
+                for requirement in group['values']:
+                    keys.update(export_paths(requirement['hive'], requirement['path']))
+    return keys
+
+
+class RegExportSet(object):
+    """Registry of one host, read from .reg export files (reg export / regedit)"""
+
+    def __init__(self, paths, wanted_keys=None):
+        paths = [paths] if isinstance(paths, str) else list(paths)
+        self.directory = os.path.dirname(os.path.abspath(str(paths[0]))) if paths else ''
+        self.export = registry_export.RegistryExport(paths, wanted_keys)
+        self.files = {os.path.basename(str(p)): str(p) for p in paths}
+        self.errors = self.export.errors
+        if self.errors and not self.export.roots:
+            raise registry_hive.HiveError('; '.join(self.errors))
+        self._control_set = None
+
+    def control_set(self):
+        if self._control_set is None:
+            self._control_set = 'ControlSet001'
+            current = self.export.get_value('HKLM\\SYSTEM\\Select', 'Current')
+            if current is not None and isinstance(current.data, int):
+                self._control_set = f"ControlSet{current.data:03d}"
+        return self._control_set
+
+    def _resolve(self, root, path):
+        """(export key path, problem)"""
+        if root not in self.export.roots:
+            return None, f"{root} is not in the registry export ({', '.join(sorted(self.files))})"
+        full = f"{root}\\{path}"
+        if not self.export.has_key(full):
+            full = re.sub(r'^(HKLM\\SYSTEM\\)CurrentControlSet\b', lambda m: m.group(1) + self.control_set(),
+                          full, flags=re.I)
+        if not self.export.covers(full):
+            exported = sorted(self.export.exported.values())
+            return None, (f"{full} is outside the exported keys ({', '.join(exported[:3])}"
+                          f"{', ...' if len(exported) > 3 else ''})")
+        return full, None
+
+    def get_value(self, root, path, name):
+        full, problem = self._resolve(root, path)
+        if problem:
+            return None, problem
+        value = self.export.get_value(full, name)
+        if value is None:
+            return None, None
+        return Value(value.name, value.type_name, value.data), None
+
+    def key_exists(self, root, path):
+        full, problem = self._resolve(root, path)
+        return None if problem else self.export.has_key(full)
+
+    def close(self):
+        pass
+
+
+class LiveRegistry(object):
+    """Registry of the local Windows system through winreg"""
+
+    def __init__(self):
+        import winreg
+        self.winreg = winreg
+        self.directory = 'live registry'
+        self.errors = []
+        self.files = {}
+
+    def _open(self, root, path):
+        winreg = self.winreg
+        handle = winreg.HKEY_LOCAL_MACHINE if root == 'HKLM' else winreg.HKEY_CURRENT_USER
+        return winreg.OpenKey(handle, path, 0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY)
+
+    def get_value(self, root, path, name):
+        try:
+            with self._open(root, path) as key:
+                data, value_type = self.winreg.QueryValueEx(key, name)
+        except FileNotFoundError:
+            return None, None
+        except OSError as e:
+            return None, f"{root}\\{path}: {e}"
+        type_name = registry_hive.REG_TYPE_NAMES.get(value_type, f"REG_{value_type}")
+        return Value(name, type_name, data), None
+
+    def key_exists(self, root, path):
+        try:
+            with self._open(root, path):
+                return True
+        except OSError:
+            return False
+
+    def close(self):
+        pass
+
+
+def open_view(hive_dir=None, reg_files=None, platforms=None):
+    """View of .reg exports or a directory of hives, else the live registry on Windows"""
+    reg_files = reg_files or [p for p in os.environ.get('STIG_REG_EXPORT', '').split(os.pathsep) if p]
+    if reg_files and not hive_dir:
+        return RegExportSet(reg_files, wanted_export_keys(platforms or list(PLATFORMS)))
+    hive_dir = hive_dir or os.environ.get('STIG_HIVE_DIR')
+    if hive_dir:
+        return HiveSet(hive_dir)
+    try:
+        return LiveRegistry()
+    except ImportError:
+        raise registry_hive.HiveError(
+            "No hive directory or registry export given (--hives/$STIG_HIVE_DIR, --reg/$STIG_REG_EXPORT) "
+            "and winreg is not available on this system")
+
+
+################################################################################
+# HOST FACTS
+################################################################################
+
+def host_facts(view):
+    """Product, build and role of the host the hives belong to"""
+    facts = {'product': '', 'build': 0, 'installation': '', 'product_type': '', 'office': '', 'click_to_run': False}
+    for field, name in (('product', 'ProductName'), ('installation', 'InstallationType'), ('build', 'CurrentBuild')):
+        value, _ = view.get_value('HKLM', CURRENT_VERSION_KEY, name)
+        if value is not None:
+            facts[field] = value.data
+    try:
+        facts['build'] = int(facts['build'])
+    except (TypeError, ValueError):
+        facts['build'] = 0
+    value, _ = view.get_value('HKLM', PRODUCT_OPTIONS_KEY, 'ProductType')
+    if value is not None:
+        facts['product_type'] = value.data
+    if any(view.key_exists('HKLM', key) for key in OFFICE_KEYS):
+        facts['office'] = '16.0'
+        facts['click_to_run'] = bool(view.key_exists('HKLM', CLICK_TO_RUN_KEY))
+    return facts
+
+
+def detect_platform(facts):
+    """Platform key for host facts, or None"""
+    product = str(facts.get('product', ''))
+    server = 'server' in product.lower() or facts.get('installation', '').lower().startswith('server') \
+        or facts.get('product_type') in ('ServerNT', 'LanmanNT')
+    build = facts.get('build', 0)
+    if server:
+        if '2022' in product or build >= 20348:
+            return 'windows_server_2022_v1r3'
+        if '2019' in product or build >= 17763:
+            return 'windows_server_2019_v2r7'
+        return None
+    if build >= 22000:
+        return 'windows_11_v2r4'
+    if build or 'windows 10' in product.lower():
+        return 'windows_10_v3r4'
+    return None
+
+
+################################################################################
+# EVALUATION
+################################################################################
+
+def describe(requirement):
+    if requirement['name'] is None:
+        return f"{requirement['hive']}\\{requirement['path']}"
+    return f"{requirement['hive']}\\{requirement['path']}\\{requirement['name']}"
+
+
+def compare(expected, value):
+    """True when a registry value satisfies an expected-value spec, None for manual review"""
+    kind = expected['kind']
+    data = value.data
+    if kind == 'manual':
+        return None
+    if kind == 'absent':
+        return False
+    if kind in ('in', 'not_in', 'min', 'max'):
+        if isinstance(data, str):
+            try:
+                data = int(data, 0)
+            except ValueError:
+                return False
+        if not isinstance(data, int):
+            return False
+        if kind == 'in':
+            return data in expected['numbers']
+        if kind == 'not_in':
+            return data not in expected['numbers']
+        if kind == 'min':
+            return data >= expected['number']
+        return data <= expected['number'] and not (expected.get('nonzero') and data == 0)
+    if kind == 'multi':
+        items = data if isinstance(data, list) else str(data).split()
+        return [i.lower() for i in items if i] == [i.lower() for i in expected['items']]
+    text = ' '.join(data) if isinstance(data, list) else str(data)
+    if kind == 'items':
+        actual = {re.sub(r'\s+', '', i).lower() for i in text.split(',')}
+        return all(re.sub(r'\s+', '', i).lower() in actual for i in expected['items'])
+    return text.strip().lower() == expected['string'].lower()
+
+
+def check_requirement(requirement, view):
+    """(state, message) with state pass/fail/manual/unavailable"""
+    expected = requirement['expected']
+    if expected['kind'] == 'absent_key':
+        exists = view.key_exists(requirement['hive'], requirement['path'])
+        if exists is None:
+            return 'unavailable', f"{describe(requirement)} is not in the collected registry data"
+        return ('fail', f"{describe(requirement)} exists") if exists else \
+            ('pass', f"{describe(requirement)} does not exist")
+    if expected.get('requires'):
+        other, problem = view.get_value(requirement['hive'], requirement['path'], expected['requires'])
+        if other is None and not problem:
+            return 'pass', f"{describe(dict(requirement, name=expected['requires']))} does not exist"
+    value, problem = view.get_value(requirement['hive'], requirement['path'], requirement['name'])
+    if problem:
+        return 'unavailable', problem
+    if value is None:
+        if expected['allow_missing']:
+            return 'pass', f"{describe(requirement)} does not exist (allowed)"
+        return 'fail', f"{describe(requirement)} does not exist (expected {expected['text']})"
+    result = compare(expected, value)
+    shown = value.data if not isinstance(value.data, bytes) else value.data.hex()
+    if result is None:
+        return 'manual', f"{describe(requirement)} = {shown!r} ({value.type_name}); expected: {expected['text']}"
+    if result:
+        return 'pass', f"{describe(requirement)} = {shown!r}"
+    return 'fail', f"{describe(requirement)} = {shown!r} ({value.type_name}); expected {expected['text']}"
+
+
+def check_group(group, view):
+    states = [check_requirement(r, view) for r in group['values']]
+    names = [s for s, _ in states]
+    messages = [m for _, m in states]
+    if 'unavailable' in names:
+        return 'unavailable', messages
+    if group['mode'] == 'any':
+        if 'pass' in names:
+            return 'pass', messages
+        return ('manual' if 'manual' in names else 'fail'), messages
+    if 'fail' in names:
+        return 'fail', messages
+    return ('manual' if 'manual' in names else 'pass'), messages
+
+
+def evaluate_rule(rule, view, facts=None):
+    """
+    Evaluate one registry rule.
+
+    Returns:
+        tuple: (status, finding_details)
+    """
+    facts = facts or {}
+    role = facts.get('product_type')
+    if role and '-DC-' in rule['stig_id'] and role != 'LanmanNT':
+        return 'Not_Applicable', "Rule applies to domain controllers only"
+    if role and '-MS-' in rule['stig_id'] and role == 'LanmanNT':
+        return 'Not_Applicable', "Rule applies to member servers and standalone systems only"
+
+    if not rule['groups']:
+        return 'Not_Reviewed', (f"Registry key {rule.get('key', '')} is referenced, but the check text does not "
+                                "specify a value to compare; manual review required")
+
+    details = []
+    groups = rule['groups']
+    for group in groups:
+        if group['mode'] == 'na' and not group['legacy']:
+            state, messages = check_group(group, view)
+            if state == 'pass':
+                return 'Not_Applicable', "Rule is NA: " + '; '.join(messages)
+
+    overall = 'pass'
+    for index, group in enumerate(groups):
+        if group['alternative'] is not None or group['legacy'] or group['mode'] == 'na':
+            continue
+        state, messages = check_group(group, view)
+        if state != 'pass':
+            for alternative in groups:
+                if alternative['alternative'] == index and not alternative['legacy']:
+                    alt_state, alt_messages = check_group(alternative, view)
+                    if alt_state == 'pass':
+                        state, messages = alt_state, alt_messages
+                        break
+        details.extend(messages)
+        if state == 'unavailable':
+            overall = 'unavailable'
+        elif state == 'fail' and overall != 'unavailable':
+            overall = 'fail'
+        elif state == 'manual' and overall == 'pass':
+            overall = 'manual'
+
+    details = list(OrderedDict.fromkeys(details))
+    if overall == 'unavailable':
+        return 'Not_Reviewed', '; '.join(details)
+    if overall == 'fail':
+        if rule['notes']:
+            details.append("Applicability: " + ' '.join(rule['notes'][:2]))
+        return 'Open', '; '.join(details)
+    if overall == 'manual' or rule['partial']:
+        return 'Not_Reviewed', '; '.join(details) + ("; remaining check steps require manual review"
+                                                     if overall == 'pass' else '')
+    return 'NotAFinding', '; '.join(details)
+
+
+def open_source(source, platforms=None):
+    """
+    Registry view for one host.
+
+    Args:
+        source: Directory of hive files, directory of .reg exports, a .reg file or a list of .reg files
+        platforms: Platforms whose keys are kept when indexing exports (default: all)
+    """
+    if isinstance(source, (list, tuple)):
+        reg_files = list(source)
+    elif os.path.isfile(source):
+        reg_files = [source]
+    else:
+        view = HiveSet(source)
+        if view.files:
+            return view
+        try:
+            reg_files = sorted(os.path.join(source, e) for e in os.listdir(source) if e.lower().endswith('.reg'))
+        except OSError:
+            reg_files = []
+        if not reg_files:
+            return view
+    return RegExportSet(reg_files, wanted_export_keys(platforms or list(PLATFORMS)))
+
+
+def source_name(source):
+    """Host name for a hive directory or export file"""
+    if isinstance(source, (list, tuple)):
+        source = source[0]
+    name = os.path.basename(os.path.normpath(source))
+    return name[:-4] if name.lower().endswith('.reg') else name
+
+
+def detect_office_platforms(facts):
+    """Office platform keys for host facts"""
+    if not facts.get('office'):
+        return []
+    if facts.get('click_to_run'):
+        return ['ms_office_365_proplus']
+    return [p for p in OFFICE_PLATFORMS if p != 'ms_office_365_proplus']
+
+
+def evaluate_host(source, platforms=None, rule_ids=None):
+    """
+    Evaluate every registry rule of the host's platforms against its hives or exports.
+
+    Args:
+        source: See open_source
+        platforms: Platform or list of platforms (default: detected Windows and Office platforms)
+        rule_ids: Check IDs to evaluate (Vuln ID for Windows, STIG ID for Office)
+
+    Returns:
+        tuple: (info dict, list of result dicts)
+    """
+    timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    if isinstance(platforms, str):
+        platforms = [platforms]
+    info = {'host': source_name(source), 'source': source, 'platform': None, 'platforms': list(platforms or []),
+            'facts': {}, 'hives': [], 'errors': []}
+    try:
+        view = open_source(source, platforms)
+    except registry_hive.HiveError as e:
+        info['errors'].append(str(e))
+        return info, []
+    try:
+        info['hives'] = sorted(view.files)
+        facts = host_facts(view)
+        info['facts'] = facts
+        if not platforms:
+            windows = detect_platform(facts)
+            platforms = ([windows] if windows else []) + detect_office_platforms(facts)
+        info['platforms'] = platforms
+        info['platform'] = next((p for p in platforms if p in WINDOWS_PLATFORMS), None)
+        if not platforms:
+            info['errors'].extend(view.errors)
+            info['errors'].append("Could not determine the Windows version from the SOFTWARE hive (use --platform)")
+            return info, []
+        results = []
+        found = set()
+        for platform in platforms:
+            rules = load_platform_rules(platform)
+            for check_id in rule_ids or rules:
+                rule = rules.get(check_id)
+                if rule is None:
+                    continue
+                found.add(check_id)
+                try:
+                    status, details = evaluate_rule(rule, view, facts)
+                except (registry_hive.HiveError, ValueError, OSError) as e:
+                    status, details = 'ERROR', str(e)
+                results.append({
+                    'vuln_id': rule['vuln_id'],
+                    'stig_id': rule['stig_id'],
+                    'check_id': rule['check_id'],
+                    'platform': platform,
+                    'severity': rule['severity'],
+                    'host': info['host'],
+                    'status': status,
+                    'finding_details': details,
+                    'timestamp': timestamp,
+                })
+        for check_id in rule_ids or []:
+            if check_id not in found:
+                results.append({
+                    'vuln_id': check_id, 'stig_id': '', 'check_id': check_id, 'platform': None,
+                    'severity': 'medium', 'host': info['host'], 'status': 'ERROR',
+                    'finding_details': f"{check_id} is not a registry rule of {', '.join(platforms)}",
+                    'timestamp': timestamp,
+                })
+        info['errors'].extend(view.errors)
+        return info, results
+    finally:
+        view.close()
+
+
+def run_rule(check_id, platform, hive_dir=None, reg_files=None):
+    """
+    Evaluate one rule for a check script.
+
+    Args:
+        check_id: Vuln ID of a Windows check, STIG ID of an Office check
+        platform: Check directory name (e.g. windows_server_2019_v2r7, ms_word_2016)
+        hive_dir: Directory of collected hives (default: $STIG_HIVE_DIR)
+        reg_files: .reg export files (default: $STIG_REG_EXPORT, else the live registry)
+
+    Returns:
+        tuple: (status, finding_details, exit_code)
+    """
+    rule = load_platform_rules(platform).get(check_id)
+    if rule is None:
+        return 'Not_Reviewed', f"{check_id} has no registry requirement to evaluate", EXIT_CODES['Not_Reviewed']
+    try:
+        view = open_view(hive_dir, reg_files, [platform])
+    except registry_hive.HiveError as e:
+        return 'ERROR', str(e), EXIT_CODES['ERROR']
+    try:
+        status, details = evaluate_rule(rule, view, host_facts(view) if PLATFORMS[platform]['server'] else None)
+    except (registry_hive.HiveError, OSError) as e:
+        status, details = 'ERROR', str(e)
+    finally:
+        view.close()
+    return status, details, EXIT_CODES.get(status, 3)
+
+
+################################################################################
+# OUTPUT
+################################################################################
+
+def host_dir_name(name):
+    return re.sub(r'[^A-Za-z0-9_.#-]+', '_', name).strip('_') or 'host'
+
+
+def write_host(output_root, name, info, results):
+    host_dir = Path(output_root) / host_dir_name(name)
+    host_dir.mkdir(parents=True, exist_ok=True)
+    counts = defaultdict(int)
+    for result in results:
+        counts[result['status']] += 1
+        result_dir = host_dir / (result['platform'] or 'unknown')
+        result_dir.mkdir(exist_ok=True)
+        (result_dir / f"{result['check_id']}.json").write_text(json.dumps(result, indent=2))
+    summary = dict(info, host=name, status_counts=dict(counts))
+    (host_dir / 'summary.json').write_text(json.dumps(dict(summary, results=[
+        {k: r[k] for k in ('platform', 'vuln_id', 'stig_id', 'status')} for r in results]), indent=2))
+    return summary
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Evaluate Windows and Office registry STIG rules against collected hives or .reg exports',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--hives', help='Directory of one host\'s hive files (default: $STIG_HIVE_DIR)')
+    parser.add_argument('--reg', action='append', default=[],
+                        help='.reg export of one host (may be repeated, e.g. HKLM and HKCU exports)')
+    parser.add_argument('--hosts-dir', help='Directory with one hive directory, export directory or .reg file per host')
+    parser.add_argument('--platform', action='append', choices=list(PLATFORMS),
+                        help='STIG platform (may be repeated; default: Windows and Office detected from SOFTWARE)')
+    parser.add_argument('--rule', action='append', default=[],
+                        help='Vuln ID (Windows) or STIG ID (Office) to evaluate (may be repeated; default: all)')
+    parser.add_argument('--output-json', help='Write the result of a single --rule to this file')
+    parser.add_argument('--output-dir', help='Directory for per-host results')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for --hosts-dir (default: CPU count)')
+    parser.add_argument('--list-rules', action='store_true', help='List the extracted registry requirements and exit')
+    args = parser.parse_args()
+
+    if args.list_rules:
+        if not args.platform:
+            print("ERROR: --list-rules requires --platform")
+            return 3
+        rules = [rule for platform in args.platform for rule in load_platform_rules(platform).values()]
+        for rule in rules:
+            print(f"{rule['vuln_id']}\t{rule['stig_id']}")
+            for group in rule['groups']:
+                flags = group['mode'] + (' alternative' if group['alternative'] is not None else '') + \
+                    (' legacy' if group['legacy'] else '')
+                for requirement in group['values']:
+                    print(f"    [{flags}] {describe(requirement)} {requirement['type'] or ''} "
+                          f"{requirement['expected']['kind']}: {requirement['expected']['text']}")
+            if not rule['groups']:
+                print(f"    [manual] {rule.get('key', '')}")
+        return 0
+
+    if args.hosts_dir:
+        hosts = sorted(os.path.join(args.hosts_dir, entry) for entry in os.listdir(args.hosts_dir)
+                       if os.path.isdir(os.path.join(args.hosts_dir, entry)) or entry.lower().endswith('.reg'))
+        if not hosts:
+            print(f"ERROR: No host directories or .reg files in {args.hosts_dir}")
+            return 3
+        output_root = Path(args.output_dir or 'results/windows_registry')
+        totals = defaultdict(int)
+        summary = []
+        print("=" * 80)
+        print("Windows Registry STIG Evaluation")
+        print("=" * 80)
+        print(f"Hosts: {len(hosts)}")
+        print(f"Workers: {args.workers}")
+        print()
+        with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(hosts)))) as executor:
+            jobs = executor.map(evaluate_host, hosts, [args.platform] * len(hosts), [args.rule] * len(hosts),
+                                chunksize=max(1, len(hosts) // (args.workers * 8) or 1))
+            for info, results in jobs:
+                host_summary = write_host(output_root, info['host'], info, results)
+                summary.append(host_summary)
+                for status, count in host_summary['status_counts'].items():
+                    totals[status] += count
+                counts = host_summary['status_counts']
+                print(f"  {info['host'][:32]:<32} {str(info['platform'] or '-'):<26} "
+                      f"office={len(info['platforms']) - bool(info['platform'])} open={counts.get('Open', 0):<3} "
+                      f"pass={counts.get('NotAFinding', 0):<3} review={counts.get('Not_Reviewed', 0)}"
+                      + (f"  ({'; '.join(info['errors'])})" if info['errors'] else ''))
+        (output_root / 'summary.json').write_text(json.dumps({
+            'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'status_counts': dict(totals),
+            'hosts': summary,
+        }, indent=2))
+        print()
+        print(f"Results written to {output_root}/<host>/")
+        if totals['ERROR'] or any(h['errors'] for h in summary):
+            return 3
+        return 1 if totals['Open'] else 0
+
+    source = args.reg or args.hives or os.environ.get('STIG_HIVE_DIR') or \
+        [p for p in os.environ.get('STIG_REG_EXPORT', '').split(os.pathsep) if p]
+    if not source:
+        print("ERROR: Use --hives, --reg or --hosts-dir (or set STIG_HIVE_DIR/STIG_REG_EXPORT)")
+        return 3
+    info, results = evaluate_host(source, args.platform, args.rule or None)
+    for error in info['errors']:
+        print(f"ERROR: {error}")
+    if not results:
+        return 3
+
+    if args.output_dir:
+        write_host(args.output_dir, info['host'], info, results)
+    if args.output_json and len(results) == 1:
+        with open(args.output_json, 'w') as f:
+            json.dump(results[0], f, indent=2)
+
+    for result in results:
+        print(f"{result['vuln_id']:<10} {result['stig_id']:<16} {result['status']:<15} {result['finding_details']}")
+    worst = min((r['status'] for r in results), key=STATUS_PRIORITY.index)
+    return EXIT_CODES[worst]
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+DISA STIG XCCDF importer
+Reads STIG packages as published by DISA (the U_<product>_V<v>R<r>_STIG.zip
+files, library bundles holding one zip per STIG, or a bare *-xccdf.xml) and
+imports their rules into the rule catalog (stig_catalog.py) without an
+intermediate JSON dump.
+
+Each XCCDF document is streamed with iterparse: a Group is turned into a
+record with the field names of the STIG Viewer export (Group ID, Rule ID,
+STIG ID, SRG ID, Check Content, Fix Text, CCIs, ...) and discarded as soon as
+it is read, so memory stays flat for the large Windows and Oracle benchmarks.
+Files are parsed in parallel worker processes that pass records to the
+importer in batches; the importer upserts them into the catalog as they
+arrive and replaces the previous import of a package only when it completes.
+Packages whose size and modification time match the catalog are skipped.
+
+With --write-json the benchmarks of every given package (imported or already
+current) are also written as <benchmark>_v<V>r<R>_checks.json dumps for the
+generators that read them.
+
+Usage:
+    python3 xccdf_import.py U_RHEL_9_V2R5_STIG.zip
+    python3 xccdf_import.py --dir /srv/stig_library --workers 8
+    python3 xccdf_import.py U_MS_Windows_10_V3R4_STIG.zip --write-json .
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import queue as queue_module
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import unescape
+
+import stig_catalog
+
+BATCH_SIZE = 200
+
+# Rule description sub-elements -> STIG Viewer export field names
+DESCRIPTION_FIELDS = OrderedDict([
+    ('VulnDiscussion', 'Discussion'),
+    ('IAControls', 'IA Controls'),
+    ('FalsePositives', 'False Positives'),
+    ('FalseNegatives', 'False Negatives'),
+    ('Documentable', 'Documentable'),
+    ('SeverityOverrideGuidance', 'Security Override Guidance'),
+    ('PotentialImpacts', 'Potential Impacts'),
+    ('ThirdPartyTools', 'Third Party Tools'),
+    ('Responsibility', 'Responsibility'),
+    ('Mitigations', 'Mitigations'),
+    ('MitigationControl', 'Mitigation Control'),
+])
+
+CCI_SYSTEM = 'http://cyber.mil/cci'
+LEGACY_SYSTEM = 'http://cyber.mil/legacy'
+
+DESCRIPTION_RE = re.compile(r'<(\w+)>(.*?)</\1>', re.S)
+TITLE_SUFFIX_RE = re.compile(r'\s+(?:Security Technical Implementation Guide|STIG)\s*$', re.I)
+
+
+class XccdfError(Exception):
+    """Raised when a file holds no XCCDF benchmark"""
+
+
+def local_name(tag):
+    """'{http://checklists.nist.gov/xccdf/1.1}Rule' -> 'Rule'"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def child(elem, name):
+    for sub in elem:
+        if local_name(sub.tag) == name:
+            return sub
+    return None
+
+
+def children(elem, name):
+    return [sub for sub in elem if local_name(sub.tag) == name]
+
+
+def child_text(elem, name, strip=True):
+    sub = child(elem, name) if elem is not None else None
+    text = (sub.text or '') if sub is not None else ''
+    return text.strip() if strip else text
+
+
+################################################################################
+# XCCDF PARSING
+################################################################################
+
+def parse_description(text):
+    """Split a rule description ('<VulnDiscussion>...</VulnDiscussion>...') into its fields"""
+    fields = {}
+    for tag, value in DESCRIPTION_RE.findall(text or ''):
+        fields[tag] = unescape(value)
+    return fields
+
+
+def group_record(group, header):
+    """STIG Viewer style record of a Group and its Rule, or None for a Group without a Rule"""
+    rule = child(group, 'Rule')
+    if rule is None:
+        return None
+    description = parse_description(child_text(rule, 'description'))
+    idents = [(i.get('system', ''), (i.text or '').strip()) for i in children(rule, 'ident')]
+    check = child(rule, 'check')
+    content_ref = child(check, 'check-content-ref') if check is not None else None
+    weight = rule.get('weight', '')
+    record = OrderedDict(header)
+    record.update([
+        ('Group ID', group.get('id', '')),
+        ('Severity', rule.get('severity', '')),
+        ('Rule ID', re.sub(r'_rule$', '', rule.get('id', ''))),
+        ('STIG ID', child_text(rule, 'version')),
+        ('SRG ID', child_text(group, 'title')),
+        ('Rule Title', child_text(rule, 'title', strip=False)),
+        ('Fix Text', child_text(rule, 'fixtext', strip=False)),
+        ('Discussion', description.get('VulnDiscussion', '')),
+        ('CCIs', '\n'.join(value for system, value in idents if system == CCI_SYSTEM)),
+        ('Legacy IDs', ', '.join(value for system, value in idents if system == LEGACY_SYSTEM)),
+        ('Check Content', child_text(check, 'check-content', strip=False)),
+        ('Check Content Ref', f"{content_ref.get('name', '')}:{content_ref.get('href', '')}"
+                              if content_ref is not None else ''),
+        ('Weight', int(float(weight)) if re.match(r'^\d+(\.\d+)?$', weight) else weight),
+    ])
+    for tag, name in DESCRIPTION_FIELDS.items():
+        if tag == 'VulnDiscussion':
+            continue
+        value = description.get(tag, '')
+        record[name] = (value.strip().lower() == 'true') if tag == 'Documentable' else value
+    return record
+
+
+def iter_xccdf(stream):
+    """
+    Stream the rules of an XCCDF benchmark.
+
+    Elements are released as soon as each Group has been read, so only one
+    Group is held in memory at a time.
+
+    Yields:
+        OrderedDict: one STIG Viewer style record per rule
+    """
+    header = OrderedDict([('Benchmark Name', ''), ('Benchmark ID', ''), ('Release Info', ''), ('Version', '')])
+    path = []
+    root = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                if local_name(elem.tag) != 'Benchmark':
+                    raise XccdfError(f"not an XCCDF benchmark (root element {local_name(elem.tag)})")
+                root = elem
+                header['Benchmark ID'] = elem.get('id', '')
+            path.append(elem)
+            continue
+        path.pop()
+        if len(path) != 1:
+            continue
+        # Direct children of the Benchmark
+        tag = local_name(elem.tag)
+        if tag == 'title':
+            header['Benchmark Name'] = TITLE_SUFFIX_RE.sub('', (elem.text or '').strip())
+        elif tag == 'plain-text' and elem.get('id') == 'release-info':
+            header['Release Info'] = (elem.text or '').strip()
+        elif tag == 'version':
+            version = (elem.text or '').strip()
+            header['Version'] = int(version) if version.isdigit() else version
+        elif tag == 'Group':
+            record = group_record(elem, header)
+            if record is not None:
+                yield record
+        root.clear()
+    if root is None:
+        raise XccdfError('empty document')
+
+
+def is_xccdf_name(name):
+    return name.lower().endswith('xccdf.xml')
+
+
+def iter_zip(archive, label, nested_zip=False):
+    """
+    Records of every XCCDF document in a zip, descending into nested STIG zips.
+
+    Library bundles also hold zips without a benchmark (documentation,
+    supplemental files); those are skipped. Only an archive that yields no
+    XCCDF document at any depth is an error.
+    """
+    found = False
+    for info in archive.infolist():
+        name = info.filename
+        if is_xccdf_name(name):
+            found = True
+            with archive.open(info) as stream:
+                for record in iter_xccdf(stream):
+                    yield record
+        elif name.lower().endswith('.zip'):
+            with archive.open(info) as stream:
+                data = stream.read()
+            try:
+                nested = zipfile.ZipFile(io.BytesIO(data))
+            except zipfile.BadZipFile:
+                continue
+            with nested:
+                for record in iter_zip(nested, f"{label}!{name}", nested_zip=True):
+                    found = True
+                    yield record
+    if not found and not nested_zip:
+        raise XccdfError(f"{label}: no XCCDF document in archive")
+
+
+def iter_source(path):
+    """Records of a STIG package (.zip) or XCCDF document (.xml)"""
+    path = str(path)
+    if path.lower().endswith('.zip') and not zipfile.is_zipfile(path):
+        raise XccdfError(f"{path}: not a zip archive")
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for record in iter_zip(archive, path):
+                yield record
+    else:
+        with open(path, 'rb') as stream:
+            for record in iter_xccdf(stream):
+                yield record
+
+
+def find_packages(directory):
+    """STIG zips and XCCDF documents in a directory tree"""
+    packages = []
+    for root, _, files in os.walk(str(directory)):
+        for name in files:
+            if name.lower().endswith('.zip') or is_xccdf_name(name):
+                packages.append(Path(root) / name)
+    return sorted(packages)
+
+
+################################################################################
+# IMPORT
+################################################################################
+
+def stream_source(path, queue, batch_size=BATCH_SIZE):
+    """Worker: parse one package and pass its records to the importer in batches"""
+    key = stig_catalog.source_key(path)
+    try:
+        batch = []
+        for record in iter_source(path):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                queue.put(('records', key, batch))
+                batch = []
+        if batch:
+            queue.put(('records', key, batch))
+        queue.put(('done', key, None))
+    except (OSError, zipfile.BadZipFile, ET.ParseError, XccdfError) as e:
+        message = str(e) if str(path) in str(e) else f"{path}: {e}"
+        queue.put(('error', key, message))
+
+
+def import_sources(catalog, paths, workers=None, force=False, batch_size=BATCH_SIZE):
+    """
+    Import STIG packages into the catalog, parsing them in parallel.
+
+    Returns:
+        dict: imported (source -> rule count), skipped (sources), errors (messages)
+    """
+    report = {'imported': OrderedDict(), 'skipped': [], 'errors': []}
+    pending = OrderedDict()
+    for path in paths:
+        key = stig_catalog.source_key(path)
+        if not force and catalog.is_current(path):
+            report['skipped'].append(key)
+            continue
+        try:
+            pending[key] = (str(path), os.stat(str(path)))
+        except OSError as e:
+            report['errors'].append(f"{path}: {e}")
+    if not pending:
+        return report
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+    writers = {}
+    with multiprocessing.Manager() as manager:
+        queue = manager.Queue(maxsize=workers * 4)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(stream_source, path, queue, batch_size): key
+                       for key, (path, _) in pending.items()}
+            remaining = set(pending)
+            while remaining:
+                try:
+                    kind, key, payload = queue.get(timeout=1)
+                except queue_module.Empty:
+                    for future, key in futures.items():
+                        if key in remaining and future.done() and future.exception() is not None:
+                            if key in writers:
+                                writers.pop(key).abort()
+                            report['errors'].append(f"{pending[key][0]}: {future.exception()}")
+                            remaining.discard(key)
+                    continue
+                if key not in writers and kind != 'error':
+                    stat = pending[key][1]
+                    writers[key] = stig_catalog.SourceWriter(catalog, key, stat.st_size, stat.st_mtime_ns)
+                if kind == 'records':
+                    writers[key].add(payload)
+                    continue
+                if kind == 'done':
+                    report['imported'][key] = writers.pop(key).finish()
+                else:
+                    if key in writers:
+                        writers.pop(key).abort()
+                    report['errors'].append(payload)
+                remaining.discard(key)
+    if report['imported']:
+        catalog.prune_texts()
+    return report
+
+
+def dump_name(record):
+    """File name of the JSON dump for a record's benchmark ('RHEL_9_STIG' V2R5 -> rhel_9_v2r5_checks.json)"""
+    benchmark_id = re.sub(r'_STIG$', '', record.get('Benchmark ID', ''), flags=re.I)
+    stem = re.sub(r'[^a-z0-9.]+', '_', benchmark_id.lower()).strip('_') or 'stig'
+    release = re.search(r'Release:\s*(\d+)', record.get('Release Info', ''))
+    return f"{stem}_v{record.get('Version', '')}r{release.group(1) if release else ''}_checks.json"
+
+
+def write_dumps(catalog, source, directory):
+    """Write the records of an imported source as one JSON dump per benchmark; returns the paths"""
+    dumps = OrderedDict()
+    for record in catalog.records(source):
+        dumps.setdefault(dump_name(record), []).append(record)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, records in dumps.items():
+        path = Path(directory) / name
+        path.write_text(json.dumps(records, indent=2))
+        written.append(path)
+    return written
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Import DISA STIG packages (XCCDF) into the rule catalog',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('package', nargs='*', help='STIG zip or XCCDF file')
+    parser.add_argument('--dir', action='append', default=[], help='Directory of STIG packages (may be repeated)')
+    parser.add_argument('--catalog', help=f'Catalog database (default: $STIG_CATALOG or {stig_catalog.CATALOG_FILE})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Re-import packages that are unchanged')
+    parser.add_argument('--write-json', metavar='DIR', help='Also write each benchmark as a JSON dump (DIR is created)')
+    args = parser.parse_args()
+
+    packages = [Path(p) for p in args.package]
+    for directory in args.dir:
+        packages.extend(find_packages(directory))
+    if not packages:
+        parser.error('no STIG packages given')
+
+    try:
+        catalog = stig_catalog.Catalog(args.catalog)
+    except stig_catalog.CatalogError as e:
+        print(f"ERROR: {e}")
+        return 3
+
+    started = time.time()
+    with catalog:
+        report = import_sources(catalog, packages, args.workers, args.force)
+        for source, count in report['imported'].items():
+            print(f"  imported {source} ({count} rules)")
+        if args.write_json:
+            # Current packages are dumped from the catalog too, so DIR is complete on re-runs
+            for source in list(report['imported']) + report['skipped']:
+                for path in write_dumps(catalog, source, args.write_json):
+                    print(f"    wrote {path}")
+        for error in report['errors']:
+            print(f"ERROR: {error}")
+        print(f"{len(report['imported'])} imported, {len(report['skipped'])} current, {len(report['errors'])} failed "
+              f"in {time.time() - started:.1f}s -> {catalog.path}")
+    return 3 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())